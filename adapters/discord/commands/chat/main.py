@@ -38,6 +38,7 @@ from .commands import ChatCommandHandler
 
 # New services
 from services.core.context import ContextManager
+from services.core.rate_limiter import Priority, request_priority
 from services.persona.lorebook import LorebookService
 from services.persona.behavior import BehaviorEngine
 
@@ -201,6 +202,7 @@ class ChatCog(commands.Cog):
                 system_prompt=system_prompt,
                 temperature=temperature,
                 max_tokens=max_tokens,
+                persona_id=self._persona_id(),
             )
             return response
         else:
@@ -210,8 +212,14 @@ class ChatCog(commands.Cog):
                 system_prompt=system_prompt,
                 temperature=temperature,
                 max_tokens=max_tokens,
+                persona_id=self._persona_id(),
             )
 
+    def _persona_id(self) -> Optional[str]:
+        """Persona answering the current message, scoping semantic cache hits."""
+        persona = getattr(self.behavior_engine, "current_persona", None)
+        return getattr(persona, "persona_id", None)
+
     def _prepare_response_content(self, response: str, channel) -> tuple[str, str]:
         """Prepare response content for Discord display and TTS.
 
@@ -463,13 +471,27 @@ class ChatCog(commands.Cog):
                             text_stream, interaction, guild
                         )
 
-                    # Parallel Execution
-                    results = await asyncio.gather(
-                        text_handler,
-                        streaming_tts.process_stream(
-                            tts_stream, voice_client, speed=kokoro_speed, rate=edge_rate
-                        ),
+                    # Barge-in token: user speech cancels synthesis and playback
+                    listener = getattr(voice_cog, "enhanced_listener", None)
+                    cancel_token = (
+                        listener.response_token(guild.id) if listener else None
                     )
+
+                    # Parallel Execution
+                    try:
+                        results = await asyncio.gather(
+                            text_handler,
+                            streaming_tts.process_stream(
+                                tts_stream,
+                                voice_client,
+                                speed=kokoro_speed,
+                                rate=edge_rate,
+                                cancel_token=cancel_token,
+                            ),
+                        )
+                    finally:
+                        if cancel_token is not None:
+                            listener.release_response_token(guild.id, cancel_token)
                     response = results[0]  # The text response
                     return response
 
@@ -489,7 +511,10 @@ class ChatCog(commands.Cog):
 
         # 4. Standard Non-Streaming
         response = await self.ollama.chat(
-            final_messages, system_prompt=None, max_tokens=optimal_max_tokens
+            final_messages,
+            system_prompt=None,
+            max_tokens=optimal_max_tokens,
+            persona_id=self._persona_id(),
         )
         return response
 
@@ -1150,15 +1175,19 @@ class ChatCog(commands.Cog):
                     except Exception as e:
                         logger.warning(f"Failed to prepare webhook for streaming: {e}")
 
-            # 4. Generate Response
-            response = await self._generate_response(
-                final_messages,
-                channel,
-                interaction,
-                optimal_max_tokens,
-                recent_image_url,
-                webhook_data=webhook_data,
-            )
+            # 4. Generate Response (user-facing: served ahead of background LLM work)
+            guild = getattr(channel, "guild", None)
+            with request_priority(
+                Priority.INTERACTIVE, tenant=guild.id if guild else None
+            ):
+                response = await self._generate_response(
+                    final_messages,
+                    channel,
+                    interaction,
+                    optimal_max_tokens,
+                    recent_image_url,
+                    webhook_data=webhook_data,
+                )
 
             # Validate and clean response (remove thinking tags, fix hallucinations)
             response = ResponseValidator.validate_response(response)
@@ -138,7 +138,8 @@ class MemoryCommandsCog(commands.Cog):
                 channel_id=interaction.channel_id,
                 participants=[interaction.user.name], # Simple single user assumption for now
                 store_in_rag=True,
-                store_in_file=True
+                store_in_file=True,
+                guild_id=interaction.guild_id,
             )
 
             if summary_data:
@@ -69,6 +69,7 @@ class VoiceCommands(commands.Cog):
             await interaction.followup.send("❌ Not connected to any voice channel!")
             return
 
+        await self.voice_cog.playback.close(guild_id)
         if await self.manager.leave_channel(guild_id):
             await interaction.followup.send(
                 format_success("Disconnected from voice channel!")
@@ -6,12 +6,17 @@ import logging
 from pathlib import Path
 from typing import Optional
 import asyncio
+import functools
 import uuid
 
 from config import Config
+from core.cancellation import cancellable
+from core.schemas import TextOutput
+from services.core.rate_limiter import Priority, request_priority
 from services.voice.tts import TTSService
 from services.voice.rvc import UnifiedRVCService
 from services.voice.listener import EnhancedVoiceListener
+from services.voice.playback import PlaybackManager
 from services.voice.commands import VoiceCommandParser, CommandType
 from utils.helpers import format_error, format_success
 from .manager import VoiceManager
@@ -50,6 +55,9 @@ class VoiceCog(commands.Cog):
         self.voice_activity_detector = voice_activity_detector
         self.enhanced_listener = enhanced_voice_listener
         self.voice_manager = VoiceManager(bot)
+        self.playback = PlaybackManager(
+            worker_pool=getattr(enhanced_voice_listener, "workers", None)
+        )
 
     async def cog_load(self):
         """Load sub-cogs (commands)."""
@@ -400,7 +408,7 @@ class VoiceCog(commands.Cog):
                 except Exception as e:
                     logger.error(f"Failed to send transcription: {e}")
 
-            async def on_bot_response_needed(text: str):
+            async def on_bot_response_needed(text: str, user_id=None):
                 """Called when bot should respond to the transcription."""
                 try:
                     # Update dashboard
@@ -612,81 +620,58 @@ class VoiceCog(commands.Cog):
 
                         return  # Don't continue to chat response
 
-                    # Regular chat - get the chat cog to generate a response
-                    chat_cog = self.bot.get_cog("ChatCog")
-                    if not chat_cog:
-                        logger.warning("ChatCog not found - cannot generate response")
-                        return
-
                     logger.info(f"Generating response for voice input: {text}")
 
-                    # Build simple history with the voice transcription
-                    history = [{"role": "user", "content": text}]
-
-                    # Generate response using Ollama
-                    response = await chat_cog.ollama.chat(
-                        history, system_prompt=chat_cog.system_prompt
-                    )
-
-                    if not response:
-                        logger.warning("Empty response from Ollama")
-                        return
-
-                    # Send response as text
-                    await channel.send(f"🤖 {response[:1900]}")
-                    logger.info(f"Sent voice response: {response[:100]}...")
-
-                    # Speak the response if connected to voice
-                    if guild_id not in self.voice_clients:
-                        return
-                    vc = self.voice_manager.get_voice_client(guild_id)
-
-                    if vc and not vc.is_playing():
-                        try:
-                            # Generate TTS
-                            audio_file = (
-                                Config.TEMP_DIR / f"voice_response_{uuid.uuid4()}.wav"
+                    # The user speaking again cancels generation and playback
+                    cancel_token = self.enhanced_listener.response_token(guild_id)
+                    try:
+                        with request_priority(Priority.INTERACTIVE, tenant=guild_id):
+                            response = await self._generate_voice_reply(
+                                text, channel, user_id, cancel_token
                             )
-                            await self.tts.generate(response, audio_file)
-
-                            # Apply RVC if enabled
-                            if (
-                                self.rvc
-                                and self.rvc.is_enabled()
-                                and Config.RVC_ENABLED
-                            ):
-                                rvc_file = (
-                                    Config.TEMP_DIR / f"rvc_response_{uuid.uuid4()}.wav"
-                                )
-                                await self.rvc.convert(
-                                    audio_file,
-                                    rvc_file,
-                                    model_name=Config.DEFAULT_RVC_MODEL,
-                                    pitch_shift=Config.RVC_PITCH_SHIFT,
-                                    index_rate=Config.RVC_INDEX_RATE,
-                                    protect=Config.RVC_PROTECT,
-                                )
-                                audio_file = rvc_file
 
-                            # Play audio with explicit FFmpeg options for proper conversion
-                            audio_source = discord.FFmpegPCMAudio(
-                                str(audio_file),
-                                before_options="-f wav",
-                                options="-vn -af aresample=48000,aformat=sample_fmts=s16:channel_layouts=stereo",
-                            )
-                            vc.play(
-                                audio_source,
-                                after=lambda e: asyncio.run_coroutine_threadsafe(
-                                    self._cleanup_audio(audio_file, e), self.bot.loop
-                                ),
+                        if cancel_token is not None and cancel_token.cancelled:
+                            logger.info("Voice response cancelled - user kept speaking")
+                            return
+                        if not response:
+                            logger.warning("Empty voice response")
+                            return
+
+                        # Send response as text
+                        await channel.send(f"🤖 {response[:1900]}")
+                        logger.info(f"Sent voice response: {response[:100]}...")
+
+                        # Speak the response if connected to voice; it is
+                        # pre-encoded and queued like the bot's other speech
+                        if guild_id in self.voice_clients:
+                            # speak_in_voice releases the token after playback
+                            speaking, cancel_token = cancel_token, None
+                            await self.speak_in_voice(
+                                response, guild_id, cancel_token=speaking
                             )
-                            logger.info("Playing voice response audio")
-                        except Exception as tts_error:
-                            logger.error(f"Failed to generate/play TTS: {tts_error}")
+                    finally:
+                        self._release_response(guild_id, cancel_token)
 
                 except Exception as e:
                     logger.error(f"Failed to generate bot response: {e}")
 
+            runtime = getattr(self.bot, "runtime", None)
+
+            async def on_partial_transcription(partial):
+                """Called with each partial transcript while the user speaks."""
+                try:
+                    await runtime.handle_voice_partial(
+                        session_id=f"discord:{channel.id}:{partial.user_id}",
+                        partial_text=partial.text,
+                        stable_text=partial.stable_text,
+                        user_id=str(partial.user_id),
+                        platform="discord",
+                        room_id=str(channel.id),
+                        revision=partial.revision,
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to handle partial transcription: {e}")
+
             # Start smart listening
             success = await self.enhanced_listener.start_smart_listen(
                 guild_id=guild_id,
@@ -695,6 +680,11 @@ class VoiceCog(commands.Cog):
                 temp_dir=Config.TEMP_DIR,
                 on_transcription=on_transcription,
                 on_bot_response_needed=on_bot_response_needed,
+                on_partial_transcription=(
+                    on_partial_transcription
+                    if hasattr(runtime, "handle_voice_partial")
+                    else None
+                ),
             )
 
             if success:
@@ -979,14 +969,26 @@ class VoiceCog(commands.Cog):
             logger.error(f"Toggle sounds command failed: {e}")
             await interaction.followup.send(format_error(e), ephemeral=True)
 
-    async def speak_in_voice(self, text: str, guild_id: int, priority: bool = False):
+    async def speak_in_voice(
+        self,
+        text: str,
+        guild_id: int,
+        priority: bool = False,
+        cancel_token=None,
+    ):
         """Speak text in voice channel without Discord interaction.
 
         Args:
             text: Text to speak
             guild_id: Guild ID
             priority: If True, interrupt current playback
+            cancel_token: Response token the reply was generated under. It is
+                released once playback ends; a fresh one is taken if omitted.
         """
+        # Speech from the user after this point cancels the reply
+        if cancel_token is None and self.enhanced_listener:
+            cancel_token = self.enhanced_listener.response_token(guild_id)
+        queued = False
         try:
             # Check if connected to voice
             if guild_id not in self.voice_clients:
@@ -996,8 +998,13 @@ class VoiceCog(commands.Cog):
                 return
             voice_client = self.voice_manager.get_voice_client(guild_id)
 
-            # Check if already playing
-            if voice_client.is_playing() and not priority:
+            # Queue behind our own speech, but don't talk over other audio
+            queue = self.playback.queue(guild_id, voice_client)
+            if (
+                voice_client.is_playing()
+                and not priority
+                and not queue.owns_current_playback()
+            ):
                 logger.debug("Skipping voice response - already playing")
                 return
 
@@ -1018,29 +1025,99 @@ class VoiceCog(commands.Cog):
                 )
                 audio_file = rvc_file
 
-            # Stop current playback if priority
-            if priority and voice_client.is_playing():
-                voice_client.stop()
-
-            # Play audio with explicit FFmpeg options for proper conversion
-            audio_source = discord.FFmpegPCMAudio(
-                str(audio_file),
-                options="-vn -af aresample=48000,aformat=sample_fmts=s16:channel_layouts=stereo",
-            )
-            # Mark as TTS for smart barge-in
-            audio_source._is_tts = True
+            if cancel_token is not None and cancel_token.cancelled:
+                cancel_token.record("playback")
+                logger.debug("Dropping voice response - user started speaking")
+                await self._cleanup_audio(audio_file, None)
+                return
 
-            voice_client.play(
-                audio_source,
-                after=lambda e: asyncio.run_coroutine_threadsafe(
-                    self._cleanup_audio(audio_file, e), self.bot.loop
-                ),
+            unregister = []
+
+            def on_done(error):
+                # Playback over: the token no longer needs to cancel anything
+                for remove in unregister:
+                    remove()
+                self._release_response(guild_id, cancel_token)
+                return self._cleanup_audio(audio_file, error)
+
+            # Pre-encode off the event loop; priority speech interrupts the queue
+            await self.playback.play(
+                guild_id,
+                voice_client,
+                audio_file,
+                priority=priority,
+                on_done=on_done,
             )
+            queued = True
+            if cancel_token is not None:
+                unregister.append(
+                    cancel_token.add_callback(
+                        functools.partial(
+                            self._cancel_playback, guild_id, cancel_token
+                        ),
+                        loop=asyncio.get_running_loop(),
+                    )
+                )
 
             logger.info(f"Speaking in voice: {text[:50]}...")
 
         except Exception as e:
             logger.error(f"Speak in voice failed: {e}")
+        finally:
+            if not queued:
+                self._release_response(guild_id, cancel_token)
+
+    async def _generate_voice_reply(
+        self, text: str, channel, user_id, cancel_token
+    ) -> Optional[str]:
+        """Generate the reply to a voice turn under ``cancel_token``.
+
+        Uses the runtime when the bot has one, in the session whose partial
+        transcripts prefetched context; otherwise streams the chat cog's model.
+
+        Returns:
+            Reply text (partial if cancelled), or None if nothing can reply
+        """
+        runtime = getattr(self.bot, "runtime", None)
+        if hasattr(runtime, "handle_voice_transcription"):
+            envelope = await runtime.handle_voice_transcription(
+                session_id=f"discord:{channel.id}:{user_id}",
+                transcription=text,
+                user_id=str(user_id or ""),
+                platform="discord",
+                room_id=str(channel.id),
+                cancel_token=cancel_token,
+            )
+            for output in envelope.outputs:
+                if isinstance(output, TextOutput):
+                    return output.text
+            return None
+
+        chat_cog = self.bot.get_cog("ChatCog")
+        if not chat_cog:
+            logger.warning("ChatCog not found - cannot generate response")
+            return None
+
+        # Build simple history with the voice transcription
+        history = [{"role": "user", "content": text}]
+        parts = []
+        async for chunk in cancellable(
+            chat_cog.ollama.chat_stream(history, system_prompt=chat_cog.system_prompt),
+            cancel_token,
+        ):
+            parts.append(chunk)
+        if cancel_token is not None and cancel_token.cancelled:
+            cancel_token.record("provider_streams")
+        return "".join(parts)
+
+    def _release_response(self, guild_id: int, cancel_token):
+        """Drop the listener's reference to a finished reply's token."""
+        if cancel_token is not None and self.enhanced_listener:
+            self.enhanced_listener.release_response_token(guild_id, cancel_token)
+
+    def _cancel_playback(self, guild_id: int, cancel_token):
+        """Barge-in: drop this guild's queued and playing speech."""
+        cancel_token.record("playback", self.playback.clear(guild_id))
 
     async def _cleanup_audio(self, audio_file: Path, error):
         """Clean up audio file after playback.
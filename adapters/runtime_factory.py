@@ -20,6 +20,7 @@ from personas.loader import load_persona_catalog
 from providers.openai_compat import OpenAICompatProvider
 from providers.router import LegacyLLMProvider, ProviderRouter
 from providers.registry import PROVIDER_SPECS, canonical_provider_name
+from services.core.rate_limiter import get_rate_limiter
 from plugins.context import (
     MemoryPluginRegistry,
     PluginConfig,
@@ -309,6 +310,9 @@ def build_gestalt_runtime(legacy_llm: Any | None = None) -> GestaltRuntime:
             return base_url, api_key, model
 
         timeout_seconds = int(os.getenv("OPENAI_COMPAT_TIMEOUT_SECONDS", "60"))
+        stream_idle_timeout = float(
+            os.getenv("OPENAI_COMPAT_STREAM_IDLE_TIMEOUT_SECONDS", "30")
+        )
         for provider_name in ["openai", "openrouter", "ollama"]:
             base_url, api_key, model = _provider_config(provider_name)
             provider = OpenAICompatProvider(
@@ -316,6 +320,15 @@ def build_gestalt_runtime(legacy_llm: Any | None = None) -> GestaltRuntime:
                 api_key=api_key,
                 model=model,
                 timeout_seconds=timeout_seconds,
+                stream_idle_timeout_seconds=stream_idle_timeout or None,
+                # Shared per endpoint with the legacy services' limiter
+                rate_limiter=get_rate_limiter(
+                    f"{provider_name}:{base_url}",
+                    max_concurrent=Config.LLM_RATE_LIMIT_MAX_CONCURRENT,
+                    requests_per_minute=Config.LLM_RATE_LIMIT_RPM,
+                    tenant_requests_per_minute=Config.LLM_RATE_LIMIT_TENANT_RPM
+                    or None,
+                ),
             )
             provider.available_models = list(
                 PROVIDER_SPECS[provider_name].available_models
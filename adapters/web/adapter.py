@@ -13,6 +13,7 @@ The adapter delegates to separate modules:
 - auth.py: Authentication handling
 - routes.py: HTTP API routes
 - websocket.py: WebSocket handlers
+- streaming.py: Delta-framed websocket protocol (v2) and send queues
 """
 
 from __future__ import annotations
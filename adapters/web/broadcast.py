@@ -0,0 +1,279 @@
+"""Broadcast fan-out for runtime websocket sessions.
+
+Connections that opt in as observers subscribe to the topic of the session
+they watch. Each published frame is JSON-encoded once and the encoded text
+is handed to every subscriber's bounded queue; per-subscriber writer tasks
+send concurrently with a per-send timeout, so one slow viewer never delays
+the others or the publisher. Subscribers whose sends keep timing out, or whose queue stays
+full, are evicted after ``evict_after`` seconds.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Frames describing room activity; connection-level frames stay private
+ROOM_FRAME_TYPES = frozenset(
+    {
+        "transcript_delta",
+        "transcript_entry",
+        "trace_entry",
+        "presence_update",
+        "action_request",
+        "expression_set",
+        "request_complete",
+    }
+)
+
+
+def encode_frame(payload: Dict[str, Any]) -> str:
+    """Encode a frame the way Starlette's ``send_json`` does."""
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+
+
+class Subscriber:
+    """One websocket's subscription: a bounded queue and a writer task."""
+
+    def __init__(self, websocket: Any, hub: "BroadcastHub") -> None:
+        self.websocket = websocket
+        self.hub = hub
+        self.queue: Deque[Tuple[str, float]] = deque()
+        self.dropped = 0
+        self.stuck_since: Optional[float] = None
+        self.closed = False
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def offer(self, text: str, published_at: float) -> None:
+        """Queue encoded text, dropping the oldest frame when full."""
+        if len(self.queue) >= self.hub.max_queue:
+            self.queue.popleft()
+            self.dropped += 1
+            self.hub.frames_dropped += 1
+            if self.stuck_since is None:
+                self.stuck_since = published_at
+        self.queue.append((text, published_at))
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        hub = self.hub
+        while not self.closed:
+            while not self.queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            text, published_at = self.queue[0]
+            try:
+                await asyncio.wait_for(
+                    self.websocket.send_text(text), timeout=hub.send_timeout
+                )
+            except asyncio.TimeoutError:
+                hub.send_timeouts += 1
+                if self.stuck_since is None:
+                    self.stuck_since = time.monotonic()
+                if time.monotonic() - self.stuck_since >= hub.evict_after:
+                    hub.evict(self, "send timeout")
+                    return
+                continue
+            except Exception as exc:
+                # Disconnected; the connection handler unsubscribes
+                logger.debug("broadcast subscriber send failed: %s", exc)
+                hub.unsubscribe(self)
+                return
+
+            self.queue.popleft()
+            hub.frames_delivered += 1
+            hub.record_latency(time.monotonic() - published_at)
+            if len(self.queue) <= hub.max_queue // 2:
+                self.stuck_since = None
+
+    async def stop(self) -> None:
+        self.closed = True
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._task = None
+
+
+class BroadcastHub:
+    """Topic-based fan-out with encode-once publishing and slow-client eviction."""
+
+    LATENCY_SAMPLES = 500
+
+    def __init__(
+        self,
+        *,
+        max_queue: int = 128,
+        send_timeout: float = 2.0,
+        evict_after: float = 10.0,
+    ) -> None:
+        """Initialize the hub.
+
+        Args:
+            max_queue: Frames buffered per subscriber before the oldest drop
+            send_timeout: Seconds allowed for one send to a subscriber
+            evict_after: Seconds a subscriber may stay stuck before eviction
+        """
+        self.max_queue = max(1, max_queue)
+        self.send_timeout = send_timeout
+        self.evict_after = evict_after
+
+        self._topics: Dict[str, Dict[int, Subscriber]] = {}
+        self._subscriber_topic: Dict[int, str] = {}
+        self._latencies: Deque[float] = deque(maxlen=self.LATENCY_SAMPLES)
+
+        self.frames_published = 0
+        self.encodes = 0
+        self.frames_delivered = 0
+        self.frames_dropped = 0
+        self.send_timeouts = 0
+        self.evictions = 0
+
+    def subscribe(self, topic: str, websocket: Any) -> Subscriber:
+        """Subscribe a websocket to ``topic``."""
+        subscriber = Subscriber(websocket, self)
+        self._topics.setdefault(topic, {})[id(subscriber)] = subscriber
+        self._subscriber_topic[id(subscriber)] = topic
+        subscriber.start()
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        subscriber.closed = True
+        topic = self._subscriber_topic.pop(id(subscriber), None)
+        members = self._topics.get(topic) if topic is not None else None
+        if members is not None:
+            members.pop(id(subscriber), None)
+            if not members:
+                del self._topics[topic]
+
+    async def remove(self, subscriber: Subscriber) -> None:
+        """Unsubscribe and stop the writer task."""
+        self.unsubscribe(subscriber)
+        await subscriber.stop()
+
+    def subscriber_count(self, topic: str) -> int:
+        return len(self._topics.get(topic, ()))
+
+    def publish(
+        self,
+        topic: str,
+        payload: Dict[str, Any],
+        exclude: Optional[Subscriber] = None,
+    ) -> int:
+        """Encode ``payload`` once and queue it for every subscriber of ``topic``.
+
+        Returns:
+            Number of subscribers the frame was queued for
+        """
+        members = self._topics.get(topic)
+        if not members:
+            return 0
+        targets = [s for s in members.values() if s is not exclude]
+        if not targets:
+            return 0
+
+        text = encode_frame(payload)
+        self.encodes += 1
+        self.frames_published += 1
+        now = time.monotonic()
+        for subscriber in targets:
+            subscriber.offer(text, now)
+            if (
+                subscriber.stuck_since is not None
+                and now - subscriber.stuck_since >= self.evict_after
+            ):
+                self.evict(subscriber, "queue overflow")
+        return len(targets)
+
+    def evict(self, subscriber: Subscriber, reason: str) -> None:
+        """Drop a stuck subscriber now and close its websocket in the background."""
+        if subscriber.closed:
+            return
+        self.unsubscribe(subscriber)
+        self.evictions += 1
+        logger.warning("Evicting stuck websocket subscriber (%s)", reason)
+        asyncio.create_task(self._close_evicted(subscriber))
+
+    async def _close_evicted(self, subscriber: Subscriber) -> None:
+        try:
+            await asyncio.wait_for(
+                subscriber.websocket.close(code=1013), timeout=self.send_timeout
+            )
+        except Exception:
+            pass
+        await subscriber.stop()
+
+    def record_latency(self, seconds: float) -> None:
+        self._latencies.append(seconds)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Fan-out counters, latency (ms) and queue depths."""
+        depths = [
+            len(s.queue) for members in self._topics.values() for s in members.values()
+        ]
+        ordered = sorted(self._latencies)
+        return {
+            "topics": len(self._topics),
+            "subscribers": len(depths),
+            "frames_published": self.frames_published,
+            "encodes": self.encodes,
+            "frames_delivered": self.frames_delivered,
+            "frames_dropped": self.frames_dropped,
+            "send_timeouts": self.send_timeouts,
+            "evictions": self.evictions,
+            "queue_depth": {
+                "total": sum(depths),
+                "max": max(depths) if depths else 0,
+            },
+            "fanout_latency": {
+                "avg_ms": round(sum(ordered) / len(ordered) * 1000, 1) if ordered else 0.0,
+                "p95_ms": round(ordered[int(len(ordered) * 0.95) - 1] * 1000, 1)
+                if ordered
+                else 0.0,
+                "max_ms": round(ordered[-1] * 1000, 1) if ordered else 0.0,
+            },
+        }
+
+
+class RoomTee:
+    """Websocket stand-in that also publishes room frames to observers.
+
+    ``subscriber`` is this connection's own subscription, if it observes the
+    topic, so its frames are not echoed back to it.
+    """
+
+    def __init__(
+        self,
+        websocket: Any,
+        hub: BroadcastHub,
+        topic: str,
+        subscriber: Optional[Subscriber] = None,
+    ) -> None:
+        self.websocket = websocket
+        self.hub = hub
+        self.topic = topic
+        self.subscriber = subscriber
+
+    async def send_json(self, payload: Dict[str, Any]) -> None:
+        await self.websocket.send_json(payload)
+        if payload.get("type") in ROOM_FRAME_TYPES:
+            self.hub.publish(self.topic, payload, exclude=self.subscriber)
+
+    async def receive_json(self) -> Any:
+        return await self.websocket.receive_json()
+
+    async def close(self, *args: Any, **kwargs: Any) -> None:
+        await self.websocket.close(*args, **kwargs)
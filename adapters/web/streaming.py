@@ -0,0 +1,334 @@
+"""Delta-framed runtime websocket protocol (v2) with per-connection backpressure.
+
+Protocol v1 re-sends the whole transcript with every ``transcript_delta`` and
+a presence snapshot after every token, so bytes on the wire grow
+quadratically with response length. Clients opt into v2 by sending
+``"protocol": 2`` in their ``connect`` message. In v2:
+
+- ``transcript_delta`` frames carry only the appended text::
+
+    {"type": "transcript_delta", "entry_id": ..., "seq": 3, "offset": 120,
+     "append": "more text", "length": 129, "done": false}
+
+  ``offset``/``length`` let the client verify it has every byte. Every
+  ``checkpoint_every`` frames, and whenever the text is rewritten rather than
+  extended, the frame also carries the full ``text`` with
+  ``"checkpoint": true`` so clients can resync.
+- Deltas are coalesced: at most one frame per entry per ``flush_interval``.
+- ``presence_update`` frames are only sent when the snapshot changed.
+- Each connection has a bounded send queue. When a slow client fills it,
+  queued deltas merge, a newer presence snapshot replaces the queued one,
+  trace frames are dropped oldest-first, and only then does the producer
+  wait for space.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+PROTOCOL_V1 = 1
+PROTOCOL_V2 = 2
+SUPPORTED_PROTOCOLS = (PROTOCOL_V1, PROTOCOL_V2)
+
+
+def negotiate_protocol(requested: Any) -> int:
+    """Pick the protocol version for a connect request (v1 when unspecified)."""
+    try:
+        version = int(requested)
+    except (TypeError, ValueError):
+        return PROTOCOL_V1
+    if version in SUPPORTED_PROTOCOLS:
+        return version
+    return max(SUPPORTED_PROTOCOLS) if version > max(SUPPORTED_PROTOCOLS) else PROTOCOL_V1
+
+
+class TranscriptStream:
+    """Send-side state of one transcript entry under protocol v2."""
+
+    def __init__(
+        self,
+        entry_id: str,
+        fields: Dict[str, Any],
+        checkpoint_every: int,
+    ) -> None:
+        self.entry_id = entry_id
+        self.fields = fields
+        self.checkpoint_every = max(1, checkpoint_every)
+        self.text = ""
+        self.seq = 0
+        self.sent_length = 0
+        self.done = False
+        self.queued = False
+        self._reset = False
+
+    @property
+    def has_pending(self) -> bool:
+        return self._reset or self.done or len(self.text) > self.sent_length
+
+    def push(self, text: str, aggregate: Optional[str] = None) -> None:
+        """Append streamed text; ``aggregate`` avoids re-joining when known."""
+        if aggregate is not None and len(aggregate) == len(self.text) + len(text):
+            self.text = aggregate
+        else:
+            self.text += text
+
+    def replace(self, text: str) -> None:
+        """Set the full text, sending only the tail when it extends what was sent."""
+        if len(text) >= len(self.text) and text.startswith(self.text):
+            self.text = text
+            return
+        self.text = text
+        self._reset = True
+
+    def finish(self, text: Optional[str] = None) -> None:
+        if text is not None:
+            self.replace(text)
+        self.done = True
+
+    def take_frame(self) -> Dict[str, Any]:
+        """Build the next frame from everything accumulated since the last one."""
+        self.seq += 1
+        text = self.text
+        if self._reset:
+            offset = 0
+            append = ""
+        else:
+            offset = self.sent_length
+            append = text[offset:]
+        frame = {
+            "type": "transcript_delta",
+            **self.fields,
+            "entry_id": self.entry_id,
+            "seq": self.seq,
+            "offset": offset,
+            "append": append,
+            "length": len(text),
+            "done": self.done,
+        }
+        if self._reset or self.seq % self.checkpoint_every == 0:
+            frame["text"] = text
+            frame["checkpoint"] = True
+        self._reset = False
+        self.sent_length = len(text)
+        return frame
+
+
+class _Frame:
+    __slots__ = ("kind", "payload", "stream")
+
+    def __init__(
+        self,
+        kind: str,
+        payload: Optional[Dict[str, Any]] = None,
+        stream: Optional[TranscriptStream] = None,
+    ) -> None:
+        self.kind = kind
+        self.payload = payload
+        self.stream = stream
+
+
+class WebSocketSender:
+    """Bounded, coalescing send queue in front of one websocket (protocol v2).
+
+    Exposes ``send_json`` so it can stand in for the websocket in existing
+    send paths; a background task performs the actual writes.
+    """
+
+    protocol = PROTOCOL_V2
+
+    def __init__(
+        self,
+        websocket: Any,
+        *,
+        max_queue: int = 256,
+        flush_interval: float = 0.05,
+        checkpoint_every: int = 20,
+    ) -> None:
+        """Initialize the sender.
+
+        Args:
+            websocket: Underlying websocket (anything with ``send_json``)
+            max_queue: Maximum queued frames before dropping/merging
+            flush_interval: Minimum seconds between delta frames of one entry
+            checkpoint_every: Include the full text every N delta frames
+        """
+        self.websocket = websocket
+        self.max_queue = max(1, max_queue)
+        self.flush_interval = flush_interval
+        self.checkpoint_every = checkpoint_every
+
+        self._queue: Deque[_Frame] = deque()
+        self._streams: Dict[str, TranscriptStream] = {}
+        self._queued_presence: Optional[_Frame] = None
+        self._last_presence: Any = None
+        self._wakeup = asyncio.Event()
+        self._space = asyncio.Event()
+        self._space.set()
+        self._task: Optional[asyncio.Task] = None
+        self._error: Optional[BaseException] = None
+        self._last_delta_at = 0.0
+
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self.frames_merged = 0
+        self.presence_skipped = 0
+        self.max_depth = 0
+
+    # ==================== PRODUCER SIDE ====================
+
+    def start(self) -> "WebSocketSender":
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return self
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def _enqueue(self, frame: _Frame) -> None:
+        self._queue.append(frame)
+        self.max_depth = max(self.max_depth, len(self._queue))
+        if len(self._queue) >= self.max_queue:
+            self._space.clear()
+        self._wakeup.set()
+
+    def _drop_oldest_trace(self) -> bool:
+        for index, queued in enumerate(self._queue):
+            if queued.kind == "trace":
+                del self._queue[index]
+                self.frames_dropped += 1
+                return True
+        return False
+
+    async def send_json(self, payload: Dict[str, Any]) -> None:
+        """Queue a frame, applying presence de-duplication and backpressure."""
+        self._raise_if_failed()
+        frame_type = payload.get("type")
+
+        if frame_type == "presence_update":
+            snapshot = payload.get("snapshot")
+            if self._queued_presence is not None:
+                self._queued_presence.payload = payload
+                self.frames_merged += 1
+                return
+            if snapshot == self._last_presence:
+                self.presence_skipped += 1
+                return
+            self._queued_presence = _Frame("presence", payload)
+            self._enqueue(self._queued_presence)
+            return
+
+        kind = "trace" if frame_type == "trace_entry" else "control"
+        while len(self._queue) >= self.max_queue:
+            if self._drop_oldest_trace():
+                continue
+            if kind == "trace":
+                self.frames_dropped += 1
+                return
+            self._space.clear()
+            await self._space.wait()
+            self._raise_if_failed()
+        self._enqueue(_Frame(kind, payload))
+
+    def transcript(self, entry_id: str, **fields: Any) -> TranscriptStream:
+        """Get or create the delta stream for a transcript entry."""
+        stream = self._streams.get(entry_id)
+        if stream is None:
+            stream = TranscriptStream(entry_id, fields, self.checkpoint_every)
+            self._streams[entry_id] = stream
+        return stream
+
+    def flush_transcript(self, stream: TranscriptStream) -> None:
+        """Schedule a delta frame unless one is already queued (which merges)."""
+        self._raise_if_failed()
+        if stream.queued:
+            self.frames_merged += 1
+            return
+        stream.queued = True
+        self._enqueue(_Frame("delta", stream=stream))
+
+    # ==================== SENDER TASK ====================
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                while not self._queue:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                frame = self._queue.popleft()
+                if len(self._queue) < self.max_queue:
+                    self._space.set()
+
+                if frame.kind == "delta":
+                    payload = await self._delta_payload(frame.stream)
+                    if payload is None:
+                        continue
+                elif frame.kind == "presence":
+                    self._queued_presence = None
+                    payload = frame.payload
+                    snapshot = payload.get("snapshot")
+                    if snapshot == self._last_presence:
+                        self.presence_skipped += 1
+                        continue
+                    self._last_presence = snapshot
+                else:
+                    payload = frame.payload
+
+                await self.websocket.send_json(payload)
+                self.frames_sent += 1
+        except asyncio.CancelledError:
+            raise
+        except BaseException as exc:
+            self._error = exc
+            self._space.set()
+            logger.debug("websocket sender stopped: %s", exc)
+
+    async def _delta_payload(
+        self, stream: Optional[TranscriptStream]
+    ) -> Optional[Dict[str, Any]]:
+        if stream is None:
+            return None
+        if not stream.done and self.flush_interval > 0:
+            wait = self._last_delta_at + self.flush_interval - time.monotonic()
+            if wait > 0:
+                # Let more text accumulate into this frame
+                await asyncio.sleep(wait)
+        stream.queued = False
+        if not stream.has_pending:
+            return None
+        payload = stream.take_frame()
+        self._last_delta_at = time.monotonic()
+        if stream.done:
+            self._streams.pop(stream.entry_id, None)
+        return payload
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """Drain queued frames (up to ``timeout``) and stop the sender task."""
+        if self._task is None:
+            return
+        deadline = time.monotonic() + timeout
+        while self._queue and self._error is None and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        self._task.cancel()
+        try:
+            await self._task
+        except (asyncio.CancelledError, Exception):
+            pass
+        self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "protocol": self.protocol,
+            "queue_depth": len(self._queue),
+            "max_depth": self.max_depth,
+            "frames_sent": self.frames_sent,
+            "frames_dropped": self.frames_dropped,
+            "frames_merged": self.frames_merged,
+            "presence_skipped": self.presence_skipped,
+        }
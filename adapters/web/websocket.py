@@ -10,9 +10,12 @@ import logging
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
 
+from core.cancellation import CancellationToken
 from core.interfaces import PlatformFacts, build_runtime_event_from_facts
 from core.schemas import Event, EventKind
 from .auth import WebAuth, extract_request_client_scope, extract_request_user_id, resolve_request_actor_id
+from .broadcast import BroadcastHub, RoomTee, Subscriber
+from .streaming import PROTOCOL_V2, WebSocketSender, negotiate_protocol
 
 if TYPE_CHECKING:
     from core.runtime import GestaltRuntime
@@ -128,6 +131,10 @@ class WebSocketManager:
         runtime: "GestaltRuntime",
         api_token: Optional[str] = None,
         event_callback: Optional[Callable[[Any], Any]] = None,
+        send_queue_size: int = 256,
+        flush_interval: float = 0.05,
+        checkpoint_every: int = 20,
+        broadcast_hub: Optional[BroadcastHub] = None,
     ):
         """Initialize WebSocket manager.
 
@@ -135,12 +142,24 @@ class WebSocketManager:
             runtime: The GestaltRuntime instance.
             api_token: Optional API token for authentication.
             event_callback: Optional callback for external event handling.
+            send_queue_size: Per-connection send queue bound (protocol v2).
+            flush_interval: Seconds over which transcript deltas are coalesced (v2).
+            checkpoint_every: Delta frames between full-text checkpoints (v2).
+            broadcast_hub: Fan-out hub shared by viewers of the same room.
         """
         self.runtime = runtime
         self.api_token = api_token
         self.event_callback = event_callback
+        self.send_queue_size = send_queue_size
+        self.flush_interval = flush_interval
+        self.checkpoint_every = checkpoint_every
+        self.broadcast = broadcast_hub or BroadcastHub()
         self._connections: Dict[str, WebSocket] = {}
 
+    def get_stream_stats(self) -> Dict[str, Any]:
+        """Broadcast fan-out metrics (latency, queue depths, evictions)."""
+        return self.broadcast.get_stats()
+
     def _authorize_token(self, token: str) -> bool:
         """Validate authentication token."""
         if not self.api_token:
@@ -157,7 +176,14 @@ class WebSocketManager:
             websocket: The FastAPI WebSocket connection.
         """
         await websocket.accept()
+        raw_websocket = websocket
         session_context: Optional[Dict[str, Any]] = None
+        sender: Optional[WebSocketSender] = None
+        subscriber: Optional[Subscriber] = None
+        requests: asyncio.Queue = asyncio.Queue()
+        # Token of the request being handled, cancelled by a cancel frame
+        active: Dict[str, CancellationToken] = {}
+        worker: Optional[asyncio.Task] = None
 
         try:
             # Expect initial connect message
@@ -228,12 +254,34 @@ class WebSocketManager:
                 "flags": flags,
             }
 
+            # Room frames are fanned out per session (and protocol); only
+            # connections that connect with ``observe: true`` receive them
+            protocol = negotiate_protocol(initial.get("protocol"))
+            topic = (
+                f"{session_context['platform']}:{session_context['room_id']}:"
+                f"{session_context['session_id']}:v{protocol}"
+            )
+            if initial.get("observe") is True:
+                subscriber = self.broadcast.subscribe(topic, raw_websocket)
+            websocket = RoomTee(raw_websocket, self.broadcast, topic, subscriber)  # type: ignore[assignment]
+
+            # Protocol v2 routes every send through a coalescing, bounded queue
+            if protocol >= PROTOCOL_V2:
+                sender = WebSocketSender(
+                    websocket,
+                    max_queue=self.send_queue_size,
+                    flush_interval=self.flush_interval,
+                    checkpoint_every=self.checkpoint_every,
+                ).start()
+                websocket = sender  # type: ignore[assignment]
+
             # Send connection confirmation
             await websocket.send_json(
                 {
                     "type": "connected",
                     "session_id": session_context["session_id"],
                     "command": "web runtime",
+                    "protocol": protocol,
                 }
             )
             await websocket.send_json(
@@ -245,28 +293,24 @@ class WebSocketManager:
                 }
             )
 
+            # Requests run in order on a worker task so the read loop can
+            # still see cancel frames and disconnects while one is in flight
+            worker = asyncio.create_task(
+                self._process_requests(websocket, requests, session_context, active)
+            )
+
             # Main message loop
             while True:
-                payload = await websocket.receive_json()
+                payload = await raw_websocket.receive_json()
                 if not isinstance(payload, dict):
                     continue
 
-                message_type = str(payload.get("type") or "")
-                if message_type == "send_event":
-                    await self._handle_runtime_event(websocket, payload, session_context)
+                if str(payload.get("type") or "") == "cancel":
+                    token = active.get("token")
+                    if token is not None:
+                        token.cancel("client_cancel")
                     continue
-                if message_type == "observation":
-                    await self._handle_observation_event(
-                        websocket, payload, session_context
-                    )
-                    continue
-                await websocket.send_json(
-                    {
-                        "type": "request_error",
-                        "session_id": session_context["session_id"],
-                        "message": f"Unsupported websocket message type: {message_type or 'unknown'}",
-                    }
-                )
+                requests.put_nowait(payload)
 
         except WebSocketDisconnect:
             logger.info("Runtime websocket disconnected: %s", session_context)
@@ -286,12 +330,66 @@ class WebSocketManager:
                 )
             except Exception:
                 pass
+        finally:
+            token = active.get("token")
+            if token is not None:
+                token.cancel("disconnected")
+            if worker is not None:
+                worker.cancel()
+                try:
+                    await worker
+                except BaseException:
+                    pass
+            if sender is not None:
+                await sender.close()
+            if subscriber is not None:
+                await self.broadcast.remove(subscriber)
+
+    async def _process_requests(
+        self,
+        websocket: WebSocket,
+        requests: asyncio.Queue,
+        session_context: Dict[str, Any],
+        active: Dict[str, CancellationToken],
+    ) -> None:
+        """Handle queued websocket requests one at a time.
+
+        Args:
+            websocket: The WebSocket connection.
+            requests: Queue of received message payloads.
+            session_context: The current session context.
+            active: Holds the in-flight request's cancellation token.
+        """
+        while True:
+            payload = await requests.get()
+            message_type = str(payload.get("type") or "")
+            if message_type == "send_event":
+                token = CancellationToken()
+                active["token"] = token
+                try:
+                    await self._handle_runtime_event(
+                        websocket, payload, session_context, cancel_token=token
+                    )
+                finally:
+                    active.pop("token", None)
+                continue
+            if message_type == "observation":
+                await self._handle_observation_event(websocket, payload, session_context)
+                continue
+            await websocket.send_json(
+                {
+                    "type": "request_error",
+                    "session_id": session_context["session_id"],
+                    "message": f"Unsupported websocket message type: {message_type or 'unknown'}",
+                }
+            )
 
     async def _handle_runtime_event(
         self,
         websocket: WebSocket,
         payload: Dict[str, Any],
         session_context: Dict[str, Any],
+        cancel_token: Optional[CancellationToken] = None,
     ) -> None:
         """Handle a single runtime event from websocket.
 
@@ -299,6 +397,8 @@ class WebSocketManager:
             websocket: The WebSocket connection.
             payload: The received message payload.
             session_context: The current session context.
+            cancel_token: Cancelled when the client disconnects or sends a
+                cancel frame.
         """
         kind = str(payload.get("kind") or EventKind.CHAT.value).strip().lower()
         text = str(payload.get("text") or "")
@@ -327,7 +427,7 @@ class WebSocketManager:
         try:
             # Try streaming if available
             if kind == EventKind.CHAT.value and hasattr(self.runtime, "stream_event"):
-                async for item in self.runtime.stream_event(event):
+                async for item in self.runtime.stream_event(event, cancel_token=cancel_token):
                     await self._send_stream_item(
                         websocket, item, event, session_context
                     )
@@ -429,8 +529,28 @@ class WebSocketManager:
             session_context: The session context.
         """
         item_type = str(item.get("type") or "")
-
-        if item_type == "text_delta":
+        entry_id = f"{event.event_id}:stream"
+
+        if item_type == "text_delta" and isinstance(websocket, WebSocketSender):
+            stream = websocket.transcript(
+                entry_id,
+                lane="TAI",
+                event_id=event.event_id,
+                session_id=session_context["session_id"],
+            )
+            first_delta = stream.seq == 0 and not stream.queued
+            stream.push(str(item.get("text") or ""), item.get("aggregate_text"))
+            websocket.flush_transcript(stream)
+            if first_delta:
+                # Presence is de-duplicated by the sender; one check per reply suffices
+                await websocket.send_json(
+                    {
+                        "type": "presence_update",
+                        "session_id": session_context["session_id"],
+                        "snapshot": self.runtime.get_presence_snapshot(**session_context),
+                    }
+                )
+        elif item_type == "text_delta":
             aggregate = str(item.get("aggregate_text") or "")
             await websocket.send_json(
                 {
@@ -438,7 +558,7 @@ class WebSocketManager:
                     "lane": "TAI",
                     "text": aggregate,
                     "done": False,
-                    "entry_id": f"{event.event_id}:stream",
+                    "entry_id": entry_id,
                     "event_id": event.event_id,
                     "session_id": session_context["session_id"],
                 }
@@ -463,7 +583,16 @@ class WebSocketManager:
             lane = _lane_for_output(output)
             if lane is not None:
                 text = _text_for_output(output)
-                if lane == "TAI":
+                if lane == "TAI" and isinstance(websocket, WebSocketSender):
+                    stream = websocket.transcript(
+                        entry_id,
+                        lane=lane,
+                        event_id=event.event_id,
+                        session_id=session_context["session_id"],
+                    )
+                    stream.finish(text)
+                    websocket.flush_transcript(stream)
+                elif lane == "TAI":
                     frames = _progressive_text_frames(text)
                     for idx, frame in enumerate(frames):
                         await websocket.send_json(
@@ -472,7 +601,7 @@ class WebSocketManager:
                                 "lane": lane,
                                 "text": frame,
                                 "done": idx == len(frames) - 1,
-                                "entry_id": f"{event.event_id}:stream",
+                                "entry_id": entry_id,
                                 "event_id": event.event_id,
                                 "session_id": session_context["session_id"],
                             }
@@ -529,7 +658,16 @@ class WebSocketManager:
             lane = _lane_for_output(output)
             if lane is not None:
                 text = _text_for_output(output)
-                if lane == "TAI":
+                if lane == "TAI" and isinstance(websocket, WebSocketSender):
+                    stream = websocket.transcript(
+                        f"{event_id}:{output_idx}",
+                        lane=lane,
+                        event_id=event_id,
+                        session_id=session_id,
+                    )
+                    stream.finish(text)
+                    websocket.flush_transcript(stream)
+                elif lane == "TAI":
                     frames = _progressive_text_frames(text)
                     for idx, frame in enumerate(frames):
                         await websocket.send_json(
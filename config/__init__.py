@@ -172,6 +172,15 @@ class Config:
     LLM_CACHE_ENABLED = llm.CACHE_ENABLED
     LLM_CACHE_MAX_SIZE = llm.CACHE_MAX_SIZE
     LLM_CACHE_TTL_SECONDS = llm.CACHE_TTL_SECONDS
+    LLM_CACHE_PERSISTENT = llm.CACHE_PERSISTENT
+    LLM_CACHE_PATH = llm.CACHE_PATH
+    LLM_CACHE_MAX_DISK_ENTRIES = llm.CACHE_MAX_DISK_ENTRIES
+    LLM_CACHE_SEMANTIC_ENABLED = llm.CACHE_SEMANTIC_ENABLED
+    LLM_CACHE_SEMANTIC_THRESHOLD = llm.CACHE_SEMANTIC_THRESHOLD
+    LLM_RATE_LIMIT_MAX_CONCURRENT = llm.RATE_LIMIT_MAX_CONCURRENT
+    LLM_RATE_LIMIT_RPM = llm.RATE_LIMIT_RPM
+    LLM_RATE_LIMIT_TENANT_RPM = llm.RATE_LIMIT_TENANT_RPM
+    LLM_STREAM_IDLE_TIMEOUT = llm.STREAM_IDLE_TIMEOUT
     LLM_FALLBACK_ENABLED = llm.FALLBACK_ENABLED
     LLM_FALLBACK_MODELS = llm.FALLBACK_MODELS
     LLM_FREQUENCY_PENALTY = llm.FREQUENCY_PENALTY
@@ -327,6 +336,12 @@ class Config:
 
     # Voice
     TTS_ENGINE = voice.ENGINE
+    TTS_STREAMING_LOOKAHEAD = voice.STREAMING_LOOKAHEAD
+    TTS_CACHE_ENABLED = voice.CACHE_ENABLED
+    TTS_CACHE_DIR = voice.CACHE_DIR
+    TTS_CACHE_MAX_MB = voice.CACHE_MAX_MB
+    TTS_CACHE_MAX_CHARS = voice.CACHE_MAX_CHARS
+    TTS_CACHE_PREWARM = voice.CACHE_PREWARM
     AUDIO_BITRATE = voice.BITRATE
     AUDIO_SAMPLE_RATE = voice.SAMPLE_RATE
 
@@ -374,6 +389,11 @@ class Config:
     # Voice Listener
     VOICE_ENERGY_THRESHOLD = voice_listener.ENERGY_THRESHOLD
     VOICE_BOT_TRIGGER_WORDS = voice_listener.BOT_TRIGGER_WORDS
+    VOICE_STREAMING_STT = voice_listener.STREAMING_STT
+    VOICE_PARTIAL_INTERVAL = voice_listener.PARTIAL_INTERVAL
+    VOICE_WORKER_PROCESSES = voice_listener.WORKER_PROCESSES
+    VOICE_WORKER_HEARTBEAT_TIMEOUT = voice_listener.WORKER_HEARTBEAT_TIMEOUT
+    VOICE_WORKER_MAX_RESTARTS = voice_listener.WORKER_MAX_RESTARTS
 
     # LuxTTS
     LUXTTS_API_URL = luxtts.API_URL
@@ -401,10 +421,18 @@ class Config:
     RL_REWARD_SPEED_THRESHOLD = rl.REWARD_SPEED_THRESHOLD
     RL_ALGORITHM = rl.ALGORITHM
     RL_REPLAY_BUFFER_SIZE = rl.REPLAY_BUFFER_SIZE
+    RL_PRIORITIZED_REPLAY = rl.PRIORITIZED_REPLAY
     RL_BATCH_SIZE = rl.BATCH_SIZE
     RL_WARMUP_STEPS = rl.WARMUP_STEPS
     RL_TRAIN_EVERY = rl.TRAIN_EVERY
     RL_STATE_DIM = rl.STATE_DIM
+    RL_INFERENCE_BATCHING = rl.INFERENCE_BATCHING
+    RL_INFERENCE_WINDOW_MS = rl.INFERENCE_WINDOW_MS
+    RL_BACKGROUND_TRAINING = rl.BACKGROUND_TRAINING
+    RL_TRAIN_INTERVAL_SEC = rl.TRAIN_INTERVAL_SEC
+    RL_TRAIN_BUDGET_MS = rl.TRAIN_BUDGET_MS
+    RL_TRAIN_PAUSE_LATENCY_MS = rl.TRAIN_PAUSE_LATENCY_MS
+    RL_PRIOR_REFRESH_SEC = rl.PRIOR_REFRESH_SEC
     RL_USE_HIERARCHICAL = rl.USE_HIERARCHICAL
     RL_USE_TRANSFER = rl.USE_TRANSFER
     RL_USE_MULTI_OBJECTIVE = rl.USE_MULTI_OBJECTIVE
@@ -412,6 +440,7 @@ class Config:
     RL_REWARD_LONG_MSG_CHAR = rl.REWARD_LONG_MSG_CHAR
     RL_CONTEXT_MAX_AGE = rl.CONTEXT_MAX_AGE
     RL_MAX_AGENTS_PER_CHANNEL = rl.MAX_AGENTS_PER_CHANNEL
+    RL_BANDIT_MAX_RESIDENT = rl.BANDIT_MAX_RESIDENT
 
     # Analytics
     METRICS_ENABLED = analytics.ENABLED
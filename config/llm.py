@@ -1,5 +1,6 @@
 """LLM (Large Language Model) configuration."""
 
+from pathlib import Path
 from typing import Dict
 from .base import BaseConfig
 
@@ -17,6 +18,35 @@ class LLMConfig(BaseConfig):
     CACHE_ENABLED: bool = BaseConfig._get_env_bool("LLM_CACHE_ENABLED", True)
     CACHE_MAX_SIZE: int = BaseConfig._get_env_int("LLM_CACHE_MAX_SIZE", 1000)
     CACHE_TTL_SECONDS: int = BaseConfig._get_env_int("LLM_CACHE_TTL_SECONDS", 3600)
+    CACHE_PERSISTENT: bool = BaseConfig._get_env_bool("LLM_CACHE_PERSISTENT", False)
+    CACHE_PATH: Path = BaseConfig._get_env_path(
+        "LLM_CACHE_PATH", "./data/llm_cache.db"
+    )
+    CACHE_MAX_DISK_ENTRIES: int = BaseConfig._get_env_int(
+        "LLM_CACHE_MAX_DISK_ENTRIES", 20000
+    )
+    CACHE_SEMANTIC_ENABLED: bool = BaseConfig._get_env_bool(
+        "LLM_CACHE_SEMANTIC_ENABLED", False
+    )
+    CACHE_SEMANTIC_THRESHOLD: float = BaseConfig._get_env_float(
+        "LLM_CACHE_SEMANTIC_THRESHOLD", 0.95
+    )
+
+    # Rate limiting (shared per provider host). A per-tenant (guild) limit
+    # of 0 disables per-guild buckets; fair queuing between guilds still applies.
+    RATE_LIMIT_MAX_CONCURRENT: int = BaseConfig._get_env_int(
+        "LLM_RATE_LIMIT_MAX_CONCURRENT", 5
+    )
+    RATE_LIMIT_RPM: int = BaseConfig._get_env_int("LLM_RATE_LIMIT_RPM", 60)
+    RATE_LIMIT_TENANT_RPM: int = BaseConfig._get_env_int(
+        "LLM_RATE_LIMIT_TENANT_RPM", 0
+    )
+
+    # Streaming: max seconds between streamed chunks before a stream is
+    # treated as stalled (0 disables stall detection)
+    STREAM_IDLE_TIMEOUT: float = BaseConfig._get_env_float(
+        "LLM_STREAM_IDLE_TIMEOUT", 30.0
+    )
 
     # Fallback Models
     FALLBACK_ENABLED: bool = BaseConfig._get_env_bool("LLM_FALLBACK_ENABLED", False)
@@ -34,6 +34,9 @@ class RLConfig(BaseConfig):
     MAX_AGENTS_PER_CHANNEL: int = BaseConfig._get_env_int(
         "RL_MAX_AGENTS_PER_CHANNEL", 100
     )
+    BANDIT_MAX_RESIDENT: int = BaseConfig._get_env_int(
+        "RL_BANDIT_MAX_RESIDENT", 10000
+    )
 
     # DQN (Neural RL) and related environment variables
     # Algorithm selection
@@ -41,10 +44,30 @@ class RLConfig(BaseConfig):
 
     # Neural RL (DQN) settings
     REPLAY_BUFFER_SIZE: int = BaseConfig._get_env_int("RL_REPLAY_BUFFER_SIZE", 10000)
+    PRIORITIZED_REPLAY: bool = BaseConfig._get_env_bool("RL_PRIORITIZED_REPLAY", False)
     BATCH_SIZE: int = BaseConfig._get_env_int("RL_BATCH_SIZE", 32)
     WARMUP_STEPS: int = BaseConfig._get_env_int("RL_WARMUP_STEPS", 1000)
     TRAIN_EVERY: int = BaseConfig._get_env_int("RL_TRAIN_EVERY", 4)
     STATE_DIM: int = BaseConfig._get_env_int("RL_STATE_DIM", 128)
+    INFERENCE_BATCHING: bool = BaseConfig._get_env_bool(
+        "RL_INFERENCE_BATCHING", False
+    )
+    INFERENCE_WINDOW_MS: float = BaseConfig._get_env_float(
+        "RL_INFERENCE_WINDOW_MS", 2.0
+    )
+    BACKGROUND_TRAINING: bool = BaseConfig._get_env_bool(
+        "RL_BACKGROUND_TRAINING", True
+    )
+    TRAIN_INTERVAL_SEC: float = BaseConfig._get_env_float(
+        "RL_TRAIN_INTERVAL_SEC", 1.0
+    )
+    TRAIN_BUDGET_MS: float = BaseConfig._get_env_float("RL_TRAIN_BUDGET_MS", 200.0)
+    TRAIN_PAUSE_LATENCY_MS: float = BaseConfig._get_env_float(
+        "RL_TRAIN_PAUSE_LATENCY_MS", 250.0
+    )
+    PRIOR_REFRESH_SEC: float = BaseConfig._get_env_float(
+        "RL_PRIOR_REFRESH_SEC", 300.0
+    )
 
     # Feature flags for advanced RL capabilities
     USE_HIERARCHICAL: bool = BaseConfig._get_env_bool("RL_USE_HIERARCHICAL", True)
@@ -13,6 +13,16 @@ class TTSConfig(BaseConfig):
     BITRATE: int = BaseConfig._get_env_int("AUDIO_BITRATE", 96)
     SAMPLE_RATE: int = BaseConfig._get_env_int("AUDIO_SAMPLE_RATE", 48000)
 
+    # Streaming: sentences synthesized ahead of the one currently playing
+    STREAMING_LOOKAHEAD: int = BaseConfig._get_env_int("TTS_STREAMING_LOOKAHEAD", 2)
+
+    # Phrase audio cache (short, recurring utterances)
+    CACHE_ENABLED: bool = BaseConfig._get_env_bool("TTS_CACHE_ENABLED", True)
+    CACHE_DIR: Path = BaseConfig._get_env_path("TTS_CACHE_DIR", "./data/tts_cache")
+    CACHE_MAX_MB: int = BaseConfig._get_env_int("TTS_CACHE_MAX_MB", 256)
+    CACHE_MAX_CHARS: int = BaseConfig._get_env_int("TTS_CACHE_MAX_CHARS", 200)
+    CACHE_PREWARM: bool = BaseConfig._get_env_bool("TTS_CACHE_PREWARM", False)
+
 
 class KokoroConfig(BaseConfig):
     """Kokoro TTS configuration."""
@@ -87,6 +97,17 @@ class VoiceListenerConfig(BaseConfig):
         "VOICE_BOT_TRIGGER_WORDS", ["bot", "assistant", "hey", "help", "question"]
     )
 
+    # Streaming STT: transcribe the utterance in progress for partial transcripts
+    STREAMING_STT: bool = BaseConfig._get_env_bool("VOICE_STREAMING_STT", False)
+    PARTIAL_INTERVAL: float = BaseConfig._get_env_float("VOICE_PARTIAL_INTERVAL", 0.8)
+
+    # Per-guild worker processes for resampling, VAD and playback encoding
+    WORKER_PROCESSES: bool = BaseConfig._get_env_bool("VOICE_WORKER_PROCESSES", False)
+    WORKER_HEARTBEAT_TIMEOUT: float = BaseConfig._get_env_float(
+        "VOICE_WORKER_HEARTBEAT_TIMEOUT", 5.0
+    )
+    WORKER_MAX_RESTARTS: int = BaseConfig._get_env_int("VOICE_WORKER_MAX_RESTARTS", 5)
+
 
 class LuxTTSConfig(BaseConfig):
     """LuxTTS configuration."""
@@ -0,0 +1,163 @@
+"""Cancellation tokens for work the user can interrupt (voice barge-in).
+
+A token is shared by every stage producing one reply: the provider stream,
+TTS synthesis and playback. ``cancel()`` is safe to call from any thread;
+the voice receive thread calls it in the same audio frame that detected
+new speech. Stages register callbacks to stop promptly and record how much
+work they dropped, so the runtime can attach the totals to its trace.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Any, AsyncIterable, AsyncIterator, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class CancellationToken:
+    """Thread-safe, one-shot cancellation signal with work accounting."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._callbacks: list[tuple[Callable[[], Any], asyncio.AbstractEventLoop | None]] = []
+        self.reason = ""
+        self.cancelled_at: float | None = None
+        self.cancelled_work: dict[str, int] = {}
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self, reason: str = "cancelled") -> bool:
+        """Cancel the token; returns False if it was already cancelled."""
+        with self._lock:
+            if self._cancelled:
+                return False
+            self._cancelled = True
+            self.reason = reason
+            self.cancelled_at = time.monotonic()
+            callbacks = self._callbacks
+            self._callbacks = []
+        for callback, loop in callbacks:
+            self._dispatch(callback, loop)
+        return True
+
+    def add_callback(
+        self,
+        callback: Callable[[], Any],
+        loop: asyncio.AbstractEventLoop | None = None,
+    ) -> Callable[[], None]:
+        """Run ``callback`` on cancellation (on ``loop`` if given).
+
+        Runs immediately if the token is already cancelled. Returns a
+        function that unregisters the callback.
+        """
+        entry = (callback, loop)
+        with self._lock:
+            if not self._cancelled:
+                self._callbacks.append(entry)
+                registered = True
+            else:
+                registered = False
+        if not registered:
+            self._dispatch(callback, loop)
+
+        def remove() -> None:
+            with self._lock:
+                try:
+                    self._callbacks.remove(entry)
+                except ValueError:
+                    pass
+
+        return remove
+
+    @staticmethod
+    def _dispatch(
+        callback: Callable[[], Any], loop: asyncio.AbstractEventLoop | None
+    ) -> None:
+        if loop is None:
+            callback()
+            return
+        try:
+            loop.call_soon_threadsafe(callback)
+        except RuntimeError:
+            # Loop closed during shutdown
+            pass
+
+    async def wait(self) -> None:
+        """Wait until the token is cancelled."""
+        if self._cancelled:
+            return
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+
+        def wake() -> None:
+            if not waiter.done():
+                waiter.set_result(None)
+
+        remove = self.add_callback(wake, loop=loop)
+        try:
+            await waiter
+        finally:
+            remove()
+
+    def record(self, kind: str, amount: int = 1) -> None:
+        """Account for ``amount`` units of ``kind`` work dropped by cancellation."""
+        if amount <= 0:
+            return
+        with self._lock:
+            self.cancelled_work[kind] = self.cancelled_work.get(kind, 0) + amount
+
+    def summary(self) -> dict[str, Any]:
+        with self._lock:
+            work = dict(self.cancelled_work)
+        return {
+            "cancelled": self._cancelled,
+            "reason": self.reason,
+            "cancelled_work": work,
+        }
+
+
+async def cancellable(
+    iterable: AsyncIterable[T],
+    token: CancellationToken | None,
+) -> AsyncIterator[T]:
+    """Iterate ``iterable`` until it ends or ``token`` is cancelled.
+
+    A pending ``__anext__`` is cancelled as soon as the token fires rather
+    than after the next item arrives, and the source iterator is closed.
+    """
+    iterator = iterable.__aiter__()
+    if token is None:
+        async for item in iterator:
+            yield item
+        return
+
+    cancel_wait = asyncio.ensure_future(token.wait())
+    try:
+        while not token.cancelled:
+            next_item = asyncio.ensure_future(iterator.__anext__())
+            done, _ = await asyncio.wait(
+                {next_item, cancel_wait}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if next_item not in done:
+                next_item.cancel()
+                await asyncio.gather(next_item, return_exceptions=True)
+                return
+            try:
+                item = next_item.result()
+            except StopAsyncIteration:
+                return
+            yield item
+    finally:
+        cancel_wait.cancel()
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            try:
+                await aclose()
+            except Exception:
+                pass
@@ -8,7 +8,7 @@ import hashlib
 import inspect
 from dataclasses import dataclass, field
 import json
-from time import perf_counter
+from time import monotonic, perf_counter
 from datetime import datetime, timedelta, timezone
 import uuid
 from pathlib import Path
@@ -16,6 +16,7 @@ from typing import Any, AsyncIterator
 
 from config import Config
 from core.auth import AuthStore
+from core.cancellation import CancellationToken, cancellable
 from core.commands import CommandRegistry
 from core.schemas import (
     ErrorOutput,
@@ -43,7 +44,7 @@ from providers.router import ProviderRouter
 from providers.registry import canonical_provider_name
 from tools.mcp_source import MCPToolSource
 from tools.policy import ToolPolicy
-from tools.runner import ToolRunner
+from tools.runner import StreamingToolDispatch, ToolRunner
 
 from .persona_engine import PersonaEngine
 from .router import Router
@@ -81,6 +82,7 @@ class RuntimeSessionState:
     last_context_cache_hit: bool = False
     last_context_cache_reason: str = ""
     last_context_memory_revision: str = ""
+    last_voice_prefetch: str = ""
 
 
 @dataclass(slots=True)
@@ -102,6 +104,31 @@ class ContextCacheEntry:
     hit_count: int = 0
 
 
+@dataclass(slots=True)
+class VoicePrefetchEntry:
+    """Turn context assembled from a stable partial transcript.
+
+    ``task`` resolves to ``(memory_context, rag_results)`` for ``query``;
+    the final voice transcript reuses it when it still matches.
+    """
+
+    session_id: str
+    persona_id: str
+    room_id: str
+    query: str
+    task: asyncio.Task
+    created_at: float
+
+
+# Final transcript must start with the prefetched words, and those words must
+# cover at least this share of it, for prefetched RAG results to be reused
+VOICE_PREFETCH_MIN_COVERAGE = 0.75
+
+
+def _voice_words(text: str) -> list[str]:
+    return [w.strip(".,!?;:\"'").lower() for w in text.split() if w.strip(".,!?;:\"'")]
+
+
 @dataclass
 class ContextBudget:
     """Tracks token/cost budget for a session with per-provider cost tracking."""
@@ -236,6 +263,9 @@ class GestaltRuntime:
     _goal_scheduling_enabled: bool = False
     trace_emitter: TraceEmitter = field(default_factory=TraceEmitter)
     memory_coordinator: MemoryCoordinator | None = None
+    voice_prefetch: dict[str, VoicePrefetchEntry] = field(default_factory=dict)
+    voice_prefetch_ttl_seconds: float = 15.0
+    voice_prefetch_min_words: int = 3
 
     async def handle_event(self, event: Event) -> Response:
         envelope = await self.handle_event_envelope(event)
@@ -311,6 +341,10 @@ class GestaltRuntime:
         self.context_cache_ttl_seconds = max(30, ttl_raw)
         self.context_cache_max_entries = max(20, max_entries_raw)
         self.context_cache_max_per_session = max(1, max_per_session_raw)
+        self.voice_prefetch_ttl_seconds = max(
+            1.0,
+            float(os.getenv("GESTALT_VOICE_PREFETCH_TTL_SECONDS", "15") or "15"),
+        )
         # Initialize memory_coordinator if not provided (backward compatibility)
         if self.memory_coordinator is None:
             self.memory_coordinator = MemoryCoordinator(manager=self.memory_manager)
@@ -687,7 +721,11 @@ class GestaltRuntime:
             mutations=mutations,
         )
 
-    async def stream_event(self, event: Event) -> AsyncIterator[dict[str, Any]]:
+    async def stream_event(
+        self,
+        event: Event,
+        cancel_token: CancellationToken | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
         session_id = event.session_id or f"{event.platform}:{event.room_id or 'default'}"
         event.session_id = session_id
         session = self._get_or_create_session(event)
@@ -705,7 +743,9 @@ class GestaltRuntime:
                 yield {"type": "mutation", "mutation": mutation, "event_id": envelope.event_id}
             return
 
-        async for item in self._stream_chat_flow(event=event, session=session):
+        async for item in self._stream_chat_flow(
+            event=event, session=session, cancel_token=cancel_token
+        ):
             payload_type = str(item.get("type") or "")
             if payload_type == "final":
                 response = item["response"]
@@ -734,8 +774,10 @@ class GestaltRuntime:
         namespace = MemoryNamespace(
             persona_id=persona.persona_id, room_id=event.room_id or "default"
         )
-        memory_context = await self.memory_manager.load_context(namespace=namespace, limit=12)
-        
+        memory_context, rag_results = await self._load_turn_context(
+            event=event, session=session, persona_id=persona.persona_id, namespace=namespace
+        )
+
         # Emit memory assembly trace
         root_span_id = str(uuid.uuid4())
         mem_span_id = str(uuid.uuid4())
@@ -748,15 +790,11 @@ class GestaltRuntime:
                 "message_count": len(memory_context.recent_history),
                 "summary_length": len(memory_context.summary),
                 "fact_count": len(memory_context.facts),
+                "voice_prefetch": session.last_voice_prefetch,
             },
             parent_span_id=root_span_id,
         )
-        
-        rag_results = await self.rag_store.search(
-            persona_id=persona.persona_id,
-            room_id=namespace.room_id,
-            query=event.text,
-        )
+
         rag_context = "\n".join([r.content for r in rag_results])
         mode_name = session.mode or self._default_mode_for_persona(persona)
         provider_name = (
@@ -1144,10 +1182,79 @@ class GestaltRuntime:
         )
         return response, traces
 
+    async def _assemble_turn_context(
+        self, persona_id: str, namespace: MemoryNamespace, query: str
+    ) -> tuple[MemoryContextBundle, list[Any]]:
+        memory_context, rag_results = await asyncio.gather(
+            self.memory_manager.load_context(namespace=namespace, limit=12),
+            self.rag_store.search(
+                persona_id=persona_id,
+                room_id=namespace.room_id,
+                query=query,
+            ),
+        )
+        return memory_context, rag_results
+
+    async def _load_turn_context(
+        self,
+        event: Event,
+        session: RuntimeSessionState,
+        persona_id: str,
+        namespace: MemoryNamespace,
+    ) -> tuple[MemoryContextBundle, list[Any]]:
+        """Load memory and RAG context, reusing a voice prefetch when valid."""
+        session.last_voice_prefetch = ""
+        self._expire_voice_prefetch()
+        entry = None
+        if event.kind == EventKind.VOICE_TRANSCRIPTION.value:
+            entry = self.voice_prefetch.pop(session.session_id, None)
+        if entry is None:
+            return await self._assemble_turn_context(persona_id, namespace, event.text)
+
+        stale = (
+            entry.persona_id != persona_id
+            or entry.room_id != namespace.room_id
+            or perf_counter() - entry.created_at > self.voice_prefetch_ttl_seconds
+        )
+        prefetched = None
+        if stale:
+            entry.task.cancel()
+        else:
+            try:
+                prefetched = await entry.task
+            except asyncio.CancelledError:
+                if not entry.task.cancelled():
+                    raise
+            except Exception:
+                prefetched = None
+        if prefetched is None:
+            session.last_voice_prefetch = "miss"
+            return await self._assemble_turn_context(persona_id, namespace, event.text)
+
+        memory_context, rag_results = prefetched
+        query_words = _voice_words(entry.query)
+        final_words = _voice_words(event.text)
+        if (
+            final_words[: len(query_words)] == query_words
+            and len(query_words) >= VOICE_PREFETCH_MIN_COVERAGE * len(final_words)
+        ):
+            session.last_voice_prefetch = "hit"
+            return memory_context, rag_results
+
+        # Memory context does not depend on the wording; only RAG does
+        session.last_voice_prefetch = "memory_only"
+        rag_results = await self.rag_store.search(
+            persona_id=persona_id,
+            room_id=namespace.room_id,
+            query=event.text,
+        )
+        return memory_context, rag_results
+
     async def _stream_chat_flow(
         self,
         event: Event,
         session: RuntimeSessionState,
+        cancel_token: CancellationToken | None = None,
     ) -> AsyncIterator[dict[str, Any]]:
         persona = self.router.select_persona(event, self.personas)
         if not session.persona_id:
@@ -1155,11 +1262,8 @@ class GestaltRuntime:
         namespace = MemoryNamespace(
             persona_id=persona.persona_id, room_id=event.room_id or "default"
         )
-        memory_context = await self.memory_manager.load_context(namespace=namespace, limit=12)
-        rag_results = await self.rag_store.search(
-            persona_id=persona.persona_id,
-            room_id=namespace.room_id,
-            query=event.text,
+        memory_context, rag_results = await self._load_turn_context(
+            event=event, session=session, persona_id=persona.persona_id, namespace=namespace
         )
         rag_context = "\n".join([r.content for r in rag_results])
         mode_name = session.mode or self._default_mode_for_persona(persona)
@@ -1218,31 +1322,81 @@ class GestaltRuntime:
             yield {"type": "final", "response": response, "traces": traces}
             return
 
+        if cancel_token is not None and cancel_token.cancelled:
+            yield await self._cancelled_stream_turn(
+                event=event,
+                session=session,
+                persona_id=persona.persona_id,
+                namespace=namespace,
+                cancel_token=cancel_token,
+                stage="before_provider",
+                content="",
+                parent_span_id=root_span_id,
+            )
+            return
+
         provider_started = perf_counter()
         content = ""
         provider_response = None
-        async for chunk in stream_chat(
-            messages=provider_messages,
-            tools=tool_schemas,
-            model_override=model_override,
-            request_hints=request_hints,
-        ):
-            if chunk.kind == "text_delta" and chunk.text:
-                content += chunk.text
-                session.last_provider_at = datetime.now(timezone.utc)
-                session.last_response_at = datetime.now(timezone.utc)
-                session.last_persona_text = content
-                yield {
-                    "type": "text_delta",
-                    "text": chunk.text,
-                    "aggregate_text": content,
-                    "persona_id": persona.persona_id,
-                }
-                continue
-            if chunk.kind == "response" and chunk.response is not None:
-                provider_response = chunk.response
+        tool_dispatch = StreamingToolDispatch(
+            self.tool_runner,
+            persona_id=persona.persona_id,
+            environment=event.platform,
+            yolo_enabled=session.yolo_enabled,
+        )
+        try:
+            async for chunk in cancellable(
+                stream_chat(
+                    messages=provider_messages,
+                    tools=tool_schemas,
+                    model_override=model_override,
+                    request_hints=request_hints,
+                ),
+                cancel_token,
+            ):
+                if chunk.kind == "tool_call" and chunk.tool_call is not None:
+                    tool_dispatch.start(
+                        ToolCall(name=chunk.tool_call.name, arguments=chunk.tool_call.arguments)
+                    )
+                    continue
+                if chunk.kind == "text_delta" and chunk.text:
+                    content += chunk.text
+                    session.last_provider_at = datetime.now(timezone.utc)
+                    session.last_response_at = datetime.now(timezone.utc)
+                    session.last_persona_text = content
+                    yield {
+                        "type": "text_delta",
+                        "text": chunk.text,
+                        "aggregate_text": content,
+                        "persona_id": persona.persona_id,
+                    }
+                    continue
+                if chunk.kind == "response" and chunk.response is not None:
+                    provider_response = chunk.response
+        except BaseException:
+            tool_dispatch.cancel()
+            raise
+
+        if cancel_token is not None and cancel_token.cancelled:
+            tool_dispatch.cancel()
+            if provider_response is None:
+                cancel_token.record("provider_streams")
+            else:
+                cancel_token.record("tool_calls", len(provider_response.tool_calls))
+            yield await self._cancelled_stream_turn(
+                event=event,
+                session=session,
+                persona_id=persona.persona_id,
+                namespace=namespace,
+                cancel_token=cancel_token,
+                stage="provider_stream" if provider_response is None else "tool_calls",
+                content=content,
+                parent_span_id=root_span_id,
+            )
+            return
 
         if provider_response is None:
+            tool_dispatch.cancel()
             response, traces = await self._run_chat_flow(event=event, session=session)
             yield {"type": "final", "response": response, "traces": traces}
             return
@@ -1275,6 +1429,8 @@ class GestaltRuntime:
         tool_traces: list[TraceOutput] = []
         approval_outputs: list[StructuredOutput] = []
         text = provider_response.content or content
+        if not tool_calls:
+            tool_dispatch.cancel()
         if tool_calls:
             executable_calls, gated_results, gated_trace_dicts, approval_outputs = (
                 await self._partition_tool_calls_for_approval(
@@ -1287,11 +1443,7 @@ class GestaltRuntime:
             executed_results.extend(gated_results)
             trace_dicts = list(gated_trace_dicts)
             if executable_calls:
-                runner_results, runner_trace_dicts = await self.tool_runner.execute_with_trace(
-                    persona_id=persona.persona_id,
-                    environment=event.platform,
-                    tool_calls=executable_calls,
-                )
+                runner_results, runner_trace_dicts = await tool_dispatch.execute(executable_calls)
                 executed_results.extend(runner_results)
                 trace_dicts.extend(runner_trace_dicts)
                 await self._record_tool_results(
@@ -1299,6 +1451,8 @@ class GestaltRuntime:
                     session=session,
                     results=runner_results,
                 )
+            else:
+                tool_dispatch.cancel()
             tool_traces = [
                 self._build_span_trace(
                     trace_type=str(item.get("trace_type") or "tool"),
@@ -1316,7 +1470,8 @@ class GestaltRuntime:
                     session_id=session.session_id,
                     span_id=result_span_id,
                     tool_name=result.name,
-                    output=str(result.output)[:200] if result.output else "",
+                    success=result.error is None,
+                    result_preview={"output": str(result.output)[:200] if result.output else ""},
                     error=result.error,
                     parent_span_id=root_span_id,
                 )
@@ -1438,6 +1593,68 @@ class GestaltRuntime:
         traces = [provider_trace] + tool_traces + state_mutation_trace + [cache_trace]
         yield {"type": "final", "response": response, "traces": traces}
 
+    async def _cancelled_stream_turn(
+        self,
+        *,
+        event: Event,
+        session: RuntimeSessionState,
+        persona_id: str,
+        namespace: MemoryNamespace,
+        cancel_token: CancellationToken,
+        stage: str,
+        content: str,
+        parent_span_id: str,
+    ) -> dict[str, Any]:
+        """Close out a streamed turn the user interrupted (barge-in).
+
+        Tools, the follow-up provider call and summary/persona updates are
+        skipped; the user message and the partial reply stay in the buffer
+        so the next turn sees what was said before the interruption.
+        """
+        if event.type != "tick":
+            await self.memory_manager.write_buffer_message(
+                namespace,
+                {"role": "user", "content": event.text, "user_id": event.user_id},
+            )
+            if content.strip():
+                await self.memory_manager.write_buffer_message(
+                    namespace,
+                    {
+                        "role": "assistant",
+                        "content": content,
+                        "persona_id": persona_id,
+                        "interrupted": True,
+                    },
+                )
+        summary = cancel_token.summary()
+        latency_ms = 0
+        if cancel_token.cancelled_at is not None:
+            latency_ms = int((monotonic() - cancel_token.cancelled_at) * 1000)
+        cancel_trace = self._build_span_trace(
+            trace_type="cancellation",
+            session_id=session.session_id,
+            parent_span_id=parent_span_id,
+            data={
+                "reason": summary["reason"],
+                "stage": stage,
+                "streamed_chars": len(content),
+                "cancel_latency_ms": latency_ms,
+                "cancelled_work": summary["cancelled_work"],
+            },
+        )
+        response = Response(
+            text=content,
+            persona_id=persona_id,
+            metadata={
+                "platform": event.platform,
+                "room_id": event.room_id,
+                "streamed": True,
+                "cancelled": True,
+                "cancel_reason": summary["reason"],
+            },
+        )
+        return {"type": "final", "response": response, "traces": [cancel_trace]}
+
     async def _handle_command_event(
         self,
         event: Event,
@@ -4928,12 +5145,15 @@ class GestaltRuntime:
         room_id: str = "",
         language: str = "",
         confidence: float = 0.0,
+        cancel_token: CancellationToken | None = None,
         **kwargs: Any,
     ) -> ResponseEnvelope:
         """Handle transcribed voice input by routing through runtime chat flow.
 
         This is the runtime-first entry point for voice transcription events.
         Adapters should call this instead of directly invoking TTS/RVC services.
+        Context prefetched by ``handle_voice_partial`` for the same session is
+        reused when it still matches.
 
         Args:
             session_id: Unique session identifier
@@ -4943,6 +5163,8 @@ class GestaltRuntime:
             room_id: Room/channel identifier
             language: Detected language code
             confidence: STT confidence score
+            cancel_token: Cancels the reply (e.g. when the user speaks again);
+                the turn is then streamed so the provider call stops early
             **kwargs: Additional metadata
 
         Returns:
@@ -4968,7 +5190,13 @@ class GestaltRuntime:
         )
 
         # Run through standard chat flow
-        envelope = await self.handle_event_envelope(event)
+        if cancel_token is None:
+            envelope = await self.handle_event_envelope(event)
+        else:
+            envelope = await self._collect_stream_envelope(event, cancel_token)
+        if cancel_token is not None and cancel_token.cancelled:
+            # Interrupted: nothing to speak
+            return envelope
 
         # Check if response should include voice output intent
         # This allows the runtime to signal TTS intent without directly controlling audio
@@ -4994,6 +5222,134 @@ class GestaltRuntime:
 
         return envelope
 
+    async def _collect_stream_envelope(
+        self, event: Event, cancel_token: CancellationToken
+    ) -> ResponseEnvelope:
+        """Run ``stream_event`` to completion and gather it into an envelope."""
+        outputs: list[TextOutput | StructuredOutput | TraceOutput | ErrorOutput] = []
+        mutations = []
+        async for item in self.stream_event(event, cancel_token=cancel_token):
+            if item.get("type") == "output":
+                outputs.append(item["output"])
+            elif item.get("type") == "mutation":
+                mutations.append(item["mutation"])
+        return ResponseEnvelope(
+            event_id=event.event_id,
+            session_id=event.session_id,
+            outputs=outputs,
+            mutations=mutations,
+        )
+
+    async def handle_voice_partial(
+        self,
+        session_id: str,
+        partial_text: str,
+        stable_text: str = "",
+        user_id: str = "",
+        platform: str = "",
+        room_id: str = "",
+        revision: int = 0,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """Handle a partial transcript while the user is still speaking.
+
+        Publishes the partial as a session activity event and, once the
+        stable (agreed) prefix is long enough, starts assembling memory and
+        RAG context for it in the background. ``handle_voice_transcription``
+        reuses that work when the final transcript still matches.
+
+        Args:
+            session_id: Unique session identifier
+            partial_text: Latest partial hypothesis
+            stable_text: Prefix of the hypothesis unlikely to change
+            user_id: User who is speaking
+            platform: Platform identifier (e.g., "discord")
+            room_id: Room/channel identifier
+            revision: Partial sequence number within the utterance
+            **kwargs: Additional metadata
+
+        Returns:
+            Partial event payload, including the prefetch state
+        """
+        from core.schemas import Event, EventKind
+
+        event = Event(
+            type="voice_partial",
+            kind=EventKind.VOICE_TRANSCRIPTION.value,
+            text=stable_text or partial_text,
+            user_id=user_id,
+            room_id=room_id,
+            platform=platform,
+            session_id=session_id,
+            metadata={"source": "voice", "partial": True, **kwargs},
+        )
+        session = self._get_or_create_session(event)
+        prefetch = self._start_voice_prefetch(event, session, stable_text)
+
+        payload = {
+            "type": "voice_partial",
+            "session_id": session_id,
+            "user_id": user_id,
+            "text": partial_text,
+            "stable_text": stable_text,
+            "revision": revision,
+            "prefetch": prefetch,
+        }
+        self.trace_emitter.emit_session_activity(
+            session_id=session_id,
+            span_id=str(uuid.uuid4()),
+            activity_type="voice_partial",
+            data={k: v for k, v in payload.items() if k not in ("type", "session_id")},
+        )
+        return payload
+
+    def _start_voice_prefetch(
+        self, event: Event, session: RuntimeSessionState, stable_text: str
+    ) -> str:
+        self._expire_voice_prefetch()
+        if len(_voice_words(stable_text)) < self.voice_prefetch_min_words:
+            return "skipped"
+
+        persona = self.router.select_persona(event, self.personas)
+        room_id = event.room_id or "default"
+        existing = self.voice_prefetch.get(session.session_id)
+        if (
+            existing is not None
+            and existing.query == stable_text
+            and existing.persona_id == persona.persona_id
+            and existing.room_id == room_id
+        ):
+            return "pending"
+        if existing is not None:
+            existing.task.cancel()
+
+        namespace = MemoryNamespace(persona_id=persona.persona_id, room_id=room_id)
+        task = asyncio.create_task(
+            self._assemble_turn_context(persona.persona_id, namespace, stable_text)
+        )
+        # Superseded prefetches are never awaited; don't log their errors
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self.voice_prefetch[session.session_id] = VoicePrefetchEntry(
+            session_id=session.session_id,
+            persona_id=persona.persona_id,
+            room_id=room_id,
+            query=stable_text,
+            task=task,
+            created_at=perf_counter(),
+        )
+        return "started"
+
+    def _expire_voice_prefetch(self) -> None:
+        """Drop prefetches no final transcript claimed within the TTL."""
+        now = perf_counter()
+        stale = [
+            session_id
+            for session_id, entry in self.voice_prefetch.items()
+            if now - entry.created_at > self.voice_prefetch_ttl_seconds
+        ]
+        for session_id in stale:
+            self.voice_prefetch.pop(session_id).task.cancel()
+
     def _extract_voice_intent_from_envelope(
         self, envelope: ResponseEnvelope
     ) -> "VoiceOutputIntent | None":
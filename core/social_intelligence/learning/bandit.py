@@ -22,12 +22,19 @@ Reward:
 from __future__ import annotations
 
 import json
+import logging
+import os
 import time
 from dataclasses import dataclass, field
 from typing import Any
 
 import numpy as np
 
+from core.social_intelligence.learning.bandit_store import BanditStore
+from core.social_intelligence.learning.linucb import LinUCBEngine
+
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class BanditAction:
@@ -87,7 +94,9 @@ class LinUCB:
     """Linear Upper Confidence Bound bandit algorithm.
 
     Learns optimal actions based on context using linear regression
-    with exploration via confidence bounds.
+    with exploration via confidence bounds. The numerics live in
+    ``LinUCBEngine``; each ``BanditAction``'s ``A``/``b``/``theta`` are
+    views into the engine's stacked arrays.
 
     Reference:
         Li et al. "A Contextual-Bandit Approach to Personalized News Article Recommendation"
@@ -106,13 +115,17 @@ class LinUCB:
         self.alpha = alpha
         self.user_id = user_id
 
+        self.engine = LinUCBEngine(len(self.ACTIONS), n_features, alpha=alpha)
+
         # Initialize actions
         self.actions: dict[str, BanditAction] = {}
         for i, name in enumerate(self.ACTIONS):
             self.actions[name] = BanditAction(
                 name=name,
                 index=i,
-                theta=np.zeros(n_features),
+                theta=self.engine.theta[i],
+                A=self.engine.A[i],
+                b=self.engine.b[i],
             )
 
         # Statistics
@@ -129,32 +142,14 @@ class LinUCB:
         Returns:
             Tuple of (action_name, confidence)
         """
-        x = context.to_vector()
-
-        best_action = None
-        best_ucb = -float("inf")
-
-        for name, action in self.actions.items():
-            # Compute parameter estimate
-            theta = np.linalg.solve(action.A, action.b)
-
-            # Compute predicted reward
-            pred_reward = np.dot(theta, x)
-
-            # Compute confidence interval
-            # UCB = x^T theta + alpha * sqrt(x^T A^{-1} x)
-            A_inv = np.linalg.inv(action.A)
-            uncertainty = np.sqrt(np.dot(x, np.dot(A_inv, x)))
-            ucb = pred_reward + self.alpha * uncertainty
-
-            if ucb > best_ucb:
-                best_ucb = ucb
-                best_action = action
+        # UCB = x^T theta + alpha * sqrt(x^T A^{-1} x), all actions at once
+        self.engine.alpha = self.alpha
+        index, best_ucb = self.engine.select(context.to_vector())
 
         # Calculate confidence
         confidence = min(1.0, best_ucb / (1 + self.alpha))
 
-        return best_action.name, confidence
+        return self.ACTIONS[index], confidence
 
     def update(
         self,
@@ -175,9 +170,8 @@ class LinUCB:
         action = self.actions[action_name]
         x = context.to_vector()
 
-        # Update design matrix and response vector
-        action.A += np.outer(x, x)
-        action.b += reward * x
+        # Rank-one update of the design matrix inverse and response vector
+        self.engine.update(action.index, x, reward)
 
         # Update statistics
         action.count += 1
@@ -204,8 +198,8 @@ class LinUCB:
         if len(self.history) > 10000:
             self.history = self.history[-5000:]
 
+    @staticmethod
     def calculate_reward(
-        self,
         user_responded: bool,
         response_time_seconds: float | None = None,
         response_quality: float = 0.5,  # Estimated quality
@@ -298,8 +292,12 @@ class LinUCB:
         for name, action_data in data.get("actions", {}).items():
             if name in bandit.actions:
                 action = bandit.actions[name]
-                action.A = np.array(action_data["A"])
-                action.b = np.array(action_data["b"])
+                bandit.engine.set_arm(
+                    action.index,
+                    np.array(action_data["A"]),
+                    np.array(action_data["b"]),
+                    action_data.get("count", 0),
+                )
                 action.count = action_data.get("count", 0)
                 action.total_reward = action_data.get("total_reward", 0.0)
 
@@ -319,40 +317,180 @@ class LinUCB:
 
 
 class UserBanditManager:
-    """Manages per-user bandit instances."""
+    """Manages per-user bandits in one shared ``BanditStore``.
+
+    Users are rows of the store rather than ``LinUCB`` objects, so memory
+    stays flat as the user count grows; cold users are paged to
+    ``<storage_dir>/.swap``. Per-user JSON files keep the ``LinUCB.save``
+    format and are only rewritten for users that changed. History entries
+    recorded since the last save are held in memory and appended to the
+    history already on disk when the user is saved.
+    """
+
+    HISTORY_LIMIT = 1000
 
-    def __init__(self, storage_dir: str = "data/bandits"):
+    def __init__(
+        self,
+        storage_dir: str = "data/bandits",
+        n_features: int = 8,
+        alpha: float = 1.0,
+        max_resident: int | None = 10000,
+    ):
         self.storage_dir = storage_dir
-        self._bandits: dict[str, LinUCB] = {}
+        self.n_features = n_features
+        self.alpha = alpha
+        self.store = BanditStore(
+            len(LinUCB.ACTIONS),
+            n_features,
+            alpha=alpha,
+            max_resident=max_resident,
+            page_dir=os.path.join(storage_dir, ".swap"),
+        )
+        # user_id -> history entries not yet saved
+        self._pending_history: dict[str, list[dict[str, Any]]] = {}
+
+    def _filepath(self, user_id: str) -> str:
+        return f"{self.storage_dir}/{user_id}.json"
+
+    def _ensure_loaded(self, user_id: str) -> None:
+        """Load a user's saved bandit into the store on first access."""
+        if user_id in self.store:
+            return
+        filepath = self._filepath(user_id)
+        if not os.path.exists(filepath):
+            return
+        try:
+            with open(filepath, "r") as f:
+                data = json.load(f)
+            actions = data.get("actions", {})
+            self.store.set_user(
+                user_id,
+                [actions[name]["A"] for name in LinUCB.ACTIONS],
+                [actions[name]["b"] for name in LinUCB.ACTIONS],
+                [actions[name].get("count", 0) for name in LinUCB.ACTIONS],
+                [actions[name].get("total_reward", 0.0) for name in LinUCB.ACTIONS],
+            )
+        except (OSError, KeyError, ValueError, np.linalg.LinAlgError) as e:
+            logger.warning(f"Ignoring unreadable bandit state {filepath}: {e}")
+
+    def select_action(
+        self, user_id: str, context: BanditContext
+    ) -> tuple[str, float]:
+        """Select the best action for a user (see ``LinUCB.select_action``)."""
+        self._ensure_loaded(user_id)
+        index, ucb = self.store.select(user_id, context.to_vector())
+        return LinUCB.ACTIONS[index], min(1.0, ucb / (1 + self.alpha))
+
+    def select_actions(
+        self, user_ids: list[str], contexts: list[BanditContext]
+    ) -> list[tuple[str, float]]:
+        """Select actions for many users in one batched evaluation."""
+        for user_id in user_ids:
+            self._ensure_loaded(user_id)
+        indices, ucbs = self.store.select_many(
+            user_ids, np.stack([context.to_vector() for context in contexts])
+        )
+        return [
+            (LinUCB.ACTIONS[index], min(1.0, ucb / (1 + self.alpha)))
+            for index, ucb in zip(indices.tolist(), ucbs.tolist())
+        ]
 
-    def get_bandit(self, user_id: str) -> LinUCB:
-        """Get or create bandit for user."""
-        if user_id not in self._bandits:
-            # Try to load existing
-            import os
+    def update(
+        self,
+        user_id: str,
+        action_name: str,
+        context: BanditContext,
+        reward: float,
+    ) -> None:
+        """Update a user's bandit with an observed reward."""
+        if action_name not in LinUCB.ACTIONS:
+            raise ValueError(f"Unknown action: {action_name}")
+        self._ensure_loaded(user_id)
+        self.store.update(
+            user_id, LinUCB.ACTIONS.index(action_name), context.to_vector(), reward
+        )
+        pending = self._pending_history.setdefault(user_id, [])
+        pending.append(
+            {
+                "timestamp": time.time(),
+                "action": action_name,
+                "context": {
+                    "sentiment": context.sentiment,
+                    "time_of_day": context.time_of_day,
+                    "relationship_depth": context.relationship_depth,
+                    "conversation_phase": context.conversation_phase,
+                },
+                "reward": reward,
+            }
+        )
+        if len(pending) > self.HISTORY_LIMIT:
+            del pending[: -self.HISTORY_LIMIT]
+
+    def _history(self, user_id: str) -> list[dict[str, Any]]:
+        """Saved history of a user followed by entries not yet saved."""
+        saved: list[dict[str, Any]] = []
+        filepath = self._filepath(user_id)
+        if os.path.exists(filepath):
+            try:
+                with open(filepath, "r") as f:
+                    saved = json.load(f).get("history", [])
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable bandit history {filepath}: {e}")
+        history = saved + self._pending_history.get(user_id, [])
+        return history[-self.HISTORY_LIMIT :]
+
+    def _to_dict(self, user_id: str, with_history: bool = True) -> dict[str, Any]:
+        """User state in the ``LinUCB.to_dict`` format."""
+        state = self.store.get_user(user_id)
+        return {
+            "user_id": user_id,
+            "n_features": self.n_features,
+            "alpha": self.alpha,
+            "total_rounds": int(state["counts"].sum()),
+            "total_reward": float(state["rewards"].sum()),
+            "actions": {
+                name: {
+                    "A": state["A"][i].tolist(),
+                    "b": state["b"][i].tolist(),
+                    "count": int(state["counts"][i]),
+                    "total_reward": float(state["rewards"][i]),
+                }
+                for i, name in enumerate(LinUCB.ACTIONS)
+            },
+            "history": self._history(user_id) if with_history else [],
+        }
 
-            filepath = f"{self.storage_dir}/{user_id}.json"
-            if os.path.exists(filepath):
-                self._bandits[user_id] = LinUCB.load(filepath)
-            else:
-                # Create new
-                self._bandits[user_id] = LinUCB(user_id=user_id)
+    def get_bandit_snapshot(self, user_id: str) -> LinUCB:
+        """Detached ``LinUCB`` copy of a user's bandit.
 
-        return self._bandits[user_id]
+        Changes to the copy are not written back; use ``update`` instead.
+        """
+        self._ensure_loaded(user_id)
+        self.store.row(user_id)
+        return LinUCB.from_dict(self._to_dict(user_id))
 
-    def save_all(self) -> None:
-        """Save all bandit states."""
-        import os
+    def get_performance(self, user_id: str) -> dict[str, Any]:
+        """Get bandit performance metrics for a user."""
+        return self.get_bandit_snapshot(user_id).get_performance()
 
+    def save_all(self) -> None:
+        """Save the bandit state of every user changed since the last save."""
         os.makedirs(self.storage_dir, exist_ok=True)
 
-        for user_id, bandit in self._bandits.items():
-            filepath = f"{self.storage_dir}/{user_id}.json"
-            bandit.save(filepath)
+        saved = []
+        for user_id in self.store.dirty_keys():
+            data = self._to_dict(user_id)
+            with open(self._filepath(user_id), "w") as f:
+                json.dump(data, f)
+            self._pending_history.pop(user_id, None)
+            saved.append(user_id)
+        self.store.mark_clean(saved)
 
     def get_all_stats(self) -> dict[str, dict[str, Any]]:
         """Get statistics for all users."""
         return {
-            user_id: bandit.get_performance()
-            for user_id, bandit in self._bandits.items()
+            user_id: LinUCB.from_dict(
+                self._to_dict(user_id, with_history=False)
+            ).get_performance()
+            for user_id in self.store
         }
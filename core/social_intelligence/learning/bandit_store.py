@@ -0,0 +1,407 @@
+"""Struct-of-arrays LinUCB store for many users.
+
+Keeping one bandit object per user costs a Python object, a dict of actions
+and several small matrices each, which dominates memory and GC time once
+tens of thousands of users are tracked. ``BanditStore`` keeps every user's
+statistics in a few contiguous tensors instead:
+
+    A        (rows, arms, d, d)  design matrices
+    A_inv    (rows, arms, d, d)  inverse design matrices
+    b        (rows, arms, d)     response vectors
+    theta    (rows, arms, d)     cached A_inv @ b
+    counts   (rows, arms)        pulls per arm
+    rewards  (rows, arms)        summed reward per arm
+    pending  (rows,)             updates since A_inv was last re-derived
+
+As in ``LinUCBEngine``, ``A_inv`` follows Sherman-Morrison updates and is
+recomputed exactly from ``A`` every ``refresh_interval`` updates of a user,
+and ``A`` is what gets persisted.
+
+An LRU index maps user keys to rows. When ``max_resident`` rows are in use,
+the least recently used user is paged out to a swap file in ``page_dir`` and
+paged back in on its next access. Swap files only live for the lifetime of
+the store; owners persist state through ``get_user``/``set_user``. An owner
+may pass a ``loader`` that returns a user's persisted state: a miss then
+restores the user from it, clean users are evicted outright, and only users
+with unsaved changes go to swap.
+
+Public methods take an internal lock, so a saver thread can export users
+while the event loop keeps selecting and updating.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import shutil
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterator, Sequence
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from core.social_intelligence.learning.linucb import sherman_morrison
+
+logger = logging.getLogger(__name__)
+
+
+class BanditStore:
+    """Disjoint LinUCB statistics for many users in shared arrays."""
+
+    _FIELDS = ("A", "A_inv", "b", "theta", "counts", "rewards", "pending")
+
+    def __init__(
+        self,
+        n_arms: int,
+        n_features: int,
+        alpha: float = 1.0,
+        regularization: float = 1.0,
+        max_resident: int | None = None,
+        page_dir: str | Path | None = None,
+        initial_capacity: int = 64,
+        refresh_interval: int = 1000,
+        loader: Callable[[Hashable], dict[str, np.ndarray] | None] | None = None,
+    ):
+        if max_resident is not None and max_resident < 1:
+            raise ValueError("max_resident must be at least 1")
+        if max_resident is not None and page_dir is None:
+            raise ValueError("page_dir is required when max_resident is set")
+
+        self.n_arms = n_arms
+        self.n_features = n_features
+        self.alpha = alpha
+        self.regularization = regularization
+        self.refresh_interval = refresh_interval
+        self.max_resident = max_resident
+        self.page_dir = Path(page_dir) if page_dir is not None else None
+        self.loader = loader
+
+        capacity = initial_capacity
+        if max_resident is not None:
+            capacity = min(capacity, max_resident)
+        self.A = np.empty((capacity, n_arms, n_features, n_features))
+        self.A_inv = np.empty_like(self.A)
+        self.b = np.empty((capacity, n_arms, n_features))
+        self.theta = np.empty((capacity, n_arms, n_features))
+        self.counts = np.empty((capacity, n_arms), dtype=np.int64)
+        self.rewards = np.empty((capacity, n_arms))
+        self.pending = np.empty(capacity, dtype=np.int64)
+        self.dirty = np.zeros(capacity, dtype=bool)
+
+        # key -> row, least recently used first
+        self._rows: OrderedDict[Hashable, int] = OrderedDict()
+        self._free: list[int] = list(range(capacity - 1, -1, -1))
+        # key -> (swap file, dirty flag)
+        self._paged: dict[Hashable, tuple[Path, bool]] = {}
+
+        self.page_outs = 0
+        self.page_ins = 0
+        self.drops = 0
+        self._lock = threading.RLock()
+
+        if self.page_dir is not None:
+            # Swap from a previous process is stale; owners reload from
+            # their own persistence.
+            shutil.rmtree(self.page_dir, ignore_errors=True)
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._rows) + len(self._paged)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._rows or key in self._paged
+
+    def __iter__(self) -> Iterator[Hashable]:
+        with self._lock:
+            keys = list(self._rows) + list(self._paged)
+        return iter(keys)
+
+    @property
+    def resident(self) -> int:
+        return len(self._rows)
+
+    def row(self, key: Hashable) -> int:
+        """Row holding ``key``, paging or loading it in, else at the prior."""
+        with self._lock:
+            row = self._rows.get(key)
+            if row is not None:
+                self._rows.move_to_end(key)
+                return row
+
+            row = self._allocate()
+            paged = self._paged.pop(key, None)
+            if paged is not None:
+                self._page_in(row, *paged)
+            else:
+                state = self.loader(key) if self.loader is not None else None
+                if state is None:
+                    self._reset_row(row)
+                else:
+                    self._restore_row(row, state)
+            self._rows[key] = row
+            return row
+
+    def _allocate(self) -> int:
+        if not self._free:
+            limit = self.max_resident
+            if limit is not None and len(self._rows) >= limit:
+                self._page_out_lru()
+            else:
+                self._grow()
+        return self._free.pop()
+
+    def _grow(self) -> None:
+        old = len(self.dirty)
+        new = old * 2
+        if self.max_resident is not None:
+            new = min(new, self.max_resident)
+        for name in self._FIELDS + ("dirty",):
+            array = getattr(self, name)
+            grown = np.zeros((new,) + array.shape[1:], dtype=array.dtype)
+            grown[:old] = array
+            setattr(self, name, grown)
+        self._free.extend(range(new - 1, old - 1, -1))
+
+    def _reset_row(self, row: int) -> None:
+        eye = np.eye(self.n_features)
+        self.A[row] = eye * self.regularization
+        self.A_inv[row] = eye / self.regularization
+        self.b[row] = 0.0
+        self.theta[row] = 0.0
+        self.counts[row] = 0
+        self.rewards[row] = 0.0
+        self.pending[row] = 0
+        self.dirty[row] = False
+
+    # ------------------------------------------------------------------
+    # Paging
+    # ------------------------------------------------------------------
+
+    def _swap_path(self, key: Hashable) -> Path:
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return self.page_dir / f"{digest}.npz"
+
+    def _page_out_lru(self) -> None:
+        key, row = self._rows.popitem(last=False)
+        self._free.append(row)
+        if self.loader is not None and not self.dirty[row]:
+            # The loader brings this user back from the owner's persistence
+            self.drops += 1
+            return
+
+        self.page_dir.mkdir(parents=True, exist_ok=True)
+        path = self._swap_path(key)
+        np.savez(
+            path,
+            **{name: getattr(self, name)[row] for name in self._FIELDS},
+        )
+        self._paged[key] = (path, bool(self.dirty[row]))
+        self.page_outs += 1
+
+    def _page_in(self, row: int, path: Path, dirty: bool) -> None:
+        with np.load(path) as data:
+            for name in self._FIELDS:
+                getattr(self, name)[row] = data[name]
+        path.unlink(missing_ok=True)
+        self.dirty[row] = dirty
+        self.page_ins += 1
+
+    # ------------------------------------------------------------------
+    # Selection and updates
+    # ------------------------------------------------------------------
+
+    def scores(self, key: Hashable, x: np.ndarray) -> np.ndarray:
+        """Upper confidence bound of every arm for one user."""
+        with self._lock:
+            row = self.row(key)
+            x = np.asarray(x, dtype=np.float64)
+            variance = np.einsum("i,aij,j->a", x, self.A_inv[row], x)
+            mean = self.theta[row] @ x
+            return mean + self.alpha * np.sqrt(np.maximum(variance, 0.0))
+
+    def select(self, key: Hashable, x: np.ndarray) -> tuple[int, float]:
+        """Arm with the highest UCB for one user and its score."""
+        ucb = self.scores(key, x)
+        arm = int(np.argmax(ucb))
+        return arm, float(ucb[arm])
+
+    def select_many(
+        self, keys: Sequence[Hashable], contexts: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Select arms for many users in one batched evaluation.
+
+        Args:
+            keys: One user key per row of ``contexts``; at most
+                ``max_resident`` distinct keys so no row is paged out
+                mid-batch
+            contexts: ``(len(keys), n_features)`` context matrix
+
+        Returns:
+            Tuple of (arm indices, UCB scores), one entry per key
+        """
+        with self._lock:
+            X = np.asarray(contexts, dtype=np.float64).reshape(len(keys), -1)
+            if self.max_resident is not None and len(set(keys)) > self.max_resident:
+                raise ValueError("batch has more users than max_resident")
+            rows = np.fromiter((self.row(key) for key in keys), np.intp, len(keys))
+
+            variance = np.einsum("ni,naij,nj->na", X, self.A_inv[rows], X)
+            mean = np.einsum("nai,ni->na", self.theta[rows], X)
+            ucb = mean + self.alpha * np.sqrt(np.maximum(variance, 0.0))
+            arms = np.argmax(ucb, axis=1)
+            return arms, ucb[np.arange(len(keys)), arms]
+
+    def update(self, key: Hashable, arm: int, x: np.ndarray, reward: float) -> None:
+        """Add one observation for ``arm`` of ``key``'s bandit."""
+        with self._lock:
+            row = self.row(key)
+            x = np.asarray(x, dtype=np.float64)
+            A_inv = self.A_inv[row, arm]
+            sherman_morrison(A_inv, x)
+            self.A[row, arm] += np.outer(x, x)
+            self.b[row, arm] += reward * x
+            self.counts[row, arm] += 1
+            self.rewards[row, arm] += reward
+            self.dirty[row] = True
+
+            self.pending[row] += 1
+            if self.pending[row] >= self.refresh_interval:
+                self._refresh(row)
+            else:
+                self.theta[row, arm] = A_inv @ self.b[row, arm]
+
+    def _refresh(self, row: int) -> None:
+        """Recompute a row's ``A_inv`` and ``theta`` exactly from ``A``."""
+        self.A_inv[row] = np.linalg.inv(self.A[row])
+        self.theta[row] = np.einsum("aij,aj->ai", self.A_inv[row], self.b[row])
+        self.pending[row] = 0
+
+    # ------------------------------------------------------------------
+    # State exchange
+    # ------------------------------------------------------------------
+
+    def get_user(self, key: Hashable) -> dict[str, np.ndarray]:
+        """Copy of one user's statistics.
+
+        Paged-out users are read from swap without becoming resident.
+        """
+        with self._lock:
+            row = self._rows.get(key)
+            if row is not None:
+                state = {n: getattr(self, n)[row].copy() for n in self._FIELDS}
+            elif key in self._paged:
+                with np.load(self._paged[key][0]) as data:
+                    state = {name: data[name] for name in self._FIELDS}
+            else:
+                raise KeyError(key)
+            return state
+
+    def set_user(
+        self,
+        key: Hashable,
+        A: np.ndarray,
+        b: np.ndarray,
+        counts: Sequence[int] | np.ndarray | None = None,
+        rewards: Sequence[float] | np.ndarray | None = None,
+    ) -> None:
+        """Load persisted ``A``/``b`` (per arm) for one user.
+
+        Raises:
+            ValueError: If the shapes don't match the store
+            numpy.linalg.LinAlgError: If a design matrix is singular
+        """
+        with self._lock:
+            A = np.asarray(A, dtype=np.float64)
+            b = np.asarray(b, dtype=np.float64)
+            if A.shape != self.A_inv.shape[1:] or b.shape != self.b.shape[1:]:
+                raise ValueError(
+                    f"bandit state shape {A.shape}/{b.shape} does not match "
+                    f"{self.A_inv.shape[1:]}/{self.b.shape[1:]}"
+                )
+            A_inv = np.linalg.inv(A)
+
+            row = self.row(key)
+            self.A[row] = A
+            self.A_inv[row] = A_inv
+            self.b[row] = b
+            self.theta[row] = np.einsum("aij,aj->ai", A_inv, b)
+            self.counts[row] = 0 if counts is None else counts
+            self.rewards[row] = 0.0 if rewards is None else rewards
+            self.pending[row] = 0
+            self.dirty[row] = False
+
+    def restore_user(self, key: Hashable, state: dict[str, np.ndarray]) -> None:
+        """Load a ``get_user`` result back exactly (no re-inversion).
+
+        ``theta`` and ``pending`` may be omitted; records saved before ``A``
+        was tracked get it rebuilt from ``A_inv``.
+        """
+        with self._lock:
+            row = self._rows.get(key)
+            if row is not None:
+                self._rows.move_to_end(key)
+            else:
+                # Skip the loader; ``state`` replaces whatever it would return
+                row = self._allocate()
+                paged = self._paged.pop(key, None)
+                if paged is not None:
+                    paged[0].unlink(missing_ok=True)
+                self._rows[key] = row
+            self._restore_row(row, state)
+
+    def _restore_row(self, row: int, state: dict[str, np.ndarray]) -> None:
+        self.A_inv[row] = state["A_inv"]
+        self.A[row] = state["A"] if "A" in state else np.linalg.inv(state["A_inv"])
+        self.b[row] = state["b"]
+        self.theta[row] = np.einsum("aij,aj->ai", self.A_inv[row], self.b[row])
+        self.counts[row] = state["counts"]
+        self.rewards[row] = state["rewards"]
+        self.pending[row] = state.get("pending", 0)
+        self.dirty[row] = False
+
+    def dirty_keys(self) -> list[Hashable]:
+        """Users changed since they were last marked clean."""
+        with self._lock:
+            keys = [key for key, row in self._rows.items() if self.dirty[row]]
+            keys.extend(key for key, (_, dirty) in self._paged.items() if dirty)
+            return keys
+
+    def mark_clean(self, keys: Sequence[Hashable] | None = None) -> None:
+        """Clear the dirty flag of ``keys`` (all users if omitted)."""
+        with self._lock:
+            for key in self if keys is None else keys:
+                row = self._rows.get(key)
+                if row is not None:
+                    self.dirty[row] = False
+                elif key in self._paged:
+                    self._paged[key] = (self._paged[key][0], False)
+
+    def mark_dirty(self, keys: Sequence[Hashable]) -> None:
+        """Flag ``keys`` as changed again (e.g. after a failed save)."""
+        with self._lock:
+            for key in keys:
+                row = self._rows.get(key)
+                if row is not None:
+                    self.dirty[row] = True
+                elif key in self._paged:
+                    self._paged[key] = (self._paged[key][0], True)
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "users": len(self),
+                "resident": len(self._rows),
+                "paged": len(self._paged),
+                "capacity": len(self.dirty),
+                "resident_bytes": sum(getattr(self, n).nbytes for n in self._FIELDS),
+                "page_outs": self.page_outs,
+                "page_ins": self.page_ins,
+                "drops": self.drops,
+            }
@@ -93,14 +93,11 @@ class TriggerLearningLoop:
                 reason="User has quiet mode enabled",
             )
 
-        # Get user's bandit
-        bandit = self.bandit_manager.get_bandit(user_id)
-
         # Build context
         context = self._build_context(social_context)
 
         # Get bandit recommendation
-        action, confidence = bandit.select_action(context)
+        action, confidence = self.bandit_manager.select_action(user_id, context)
 
         # Decide whether to explore
         import random
@@ -109,7 +106,7 @@ class TriggerLearningLoop:
 
         if is_exploration:
             # Random action for exploration
-            action = random.choice(list(bandit.ACTIONS))
+            action = random.choice(list(LinUCB.ACTIONS))
             confidence = 0.5
             reason = f"Exploration: trying '{action}'"
         else:
@@ -174,21 +171,19 @@ class TriggerLearningLoop:
         context = pending["context"]
 
         # Calculate reward
-        bandit = self.bandit_manager.get_bandit(user_id)
-
         if user_feedback is not None:
             # Use explicit feedback
             reward = user_feedback
         else:
             # Calculate from behavior
-            reward = bandit.calculate_reward(
+            reward = LinUCB.calculate_reward(
                 user_responded=user_responded,
                 response_time_seconds=response_time_seconds,
                 response_quality=response_quality,
             )
 
         # Update bandit
-        bandit.update(action, context, reward)
+        self.bandit_manager.update(user_id, action, context, reward)
 
         # Remove pending decision
         del self._pending_decisions[user_id]
@@ -216,8 +211,7 @@ class TriggerLearningLoop:
 
     def get_user_stats(self, user_id: str) -> dict[str, Any]:
         """Get learning statistics for a user."""
-        bandit = self.bandit_manager.get_bandit(user_id)
-        return bandit.get_performance()
+        return self.bandit_manager.get_performance(user_id)
 
     def get_all_stats(self) -> dict[str, dict[str, Any]]:
         """Get learning statistics for all users."""
@@ -237,8 +231,6 @@ class TriggerLearningLoop:
             user_id: User to adjust for
             interactions: Number of interactions so far
         """
-        bandit = self.bandit_manager.get_bandit(user_id)
-
         # Gradually reduce exploration
         if interactions < 50:
             # High exploration for new users
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+import asyncio
 import json
+import os
 import sys
 from dataclasses import asdict
-from typing import Any
+from typing import Any, Callable
 
+from core.cancellation import CancellationToken
 from core.schemas import Event, EventKind
 from gestalt.runtime_bootstrap import RuntimeHost, create_runtime, create_runtime_host
 
+DEFAULT_MAX_CONCURRENCY = 8
+CANCEL_METHODS = frozenset({"cancel", "$/cancelRequest"})
+
+Notify = Callable[[dict[str, Any]], None]
+
 
 def _serialize_output(output: Any) -> dict[str, Any]:
     return {"type": output.__class__.__name__, **asdict(output)}
@@ -38,7 +46,49 @@ def _serialize_envelope(envelope: Any) -> dict[str, Any]:
     }
 
 
-async def _dispatch(runtime, payload: dict[str, Any]) -> dict[str, Any]:
+def _serialize_stream_item(item: dict[str, Any]) -> dict[str, Any] | None:
+    item_type = str(item.get("type") or "")
+    if item_type == "text_delta":
+        return {"type": "text_delta", "text": str(item.get("text") or "")}
+    if item_type == "trace":
+        return {"type": "trace", "trace": _serialize_output(item["trace"])}
+    if item_type == "output":
+        return {"type": "output", "output": _serialize_output(item["output"])}
+    return None
+
+
+async def _stream_event(
+    runtime,
+    event: Event,
+    notify: Notify,
+    cancel_token: CancellationToken | None = None,
+) -> dict[str, Any]:
+    """Run ``event`` through ``stream_event``, notifying progress as it arrives."""
+    outputs: list[dict[str, Any]] = []
+    mutations: list[dict[str, Any]] = []
+    async for item in runtime.stream_event(event, cancel_token=cancel_token):
+        item_type = str(item.get("type") or "")
+        if item_type == "output":
+            outputs.append(_serialize_output(item["output"]))
+        elif item_type == "mutation":
+            mutations.append(_serialize_mutation(item["mutation"]))
+        progress = _serialize_stream_item(item)
+        if progress is not None:
+            notify(progress)
+    return {
+        "event_id": event.event_id,
+        "session_id": event.session_id,
+        "outputs": outputs,
+        "mutations": mutations,
+    }
+
+
+async def _dispatch(
+    runtime,
+    payload: dict[str, Any],
+    notify: Notify | None = None,
+    cancel_token: CancellationToken | None = None,
+) -> dict[str, Any]:
     method = str(payload.get("method") or "")
     params = payload.get("params")
     args = params if isinstance(params, dict) else {}
@@ -56,6 +106,8 @@ async def _dispatch(runtime, payload: dict[str, Any]) -> dict[str, Any]:
                 args.get("metadata") if isinstance(args.get("metadata"), dict) else {}
             ),
         )
+        if args.get("stream") and notify is not None and hasattr(runtime, "stream_event"):
+            return await _stream_event(runtime, event, notify, cancel_token)
         envelope = await runtime.handle_event_envelope(event)
         return _serialize_envelope(envelope)
 
@@ -172,10 +224,130 @@ async def _dispatch(runtime, payload: dict[str, Any]) -> dict[str, Any]:
     return await _dispatch_command(text)
 
 
+def _write_message(message: dict[str, Any]) -> None:
+    # One write per message; tasks never interleave partial lines
+    sys.stdout.write(json.dumps(message, ensure_ascii=True, default=str) + "\n")
+    sys.stdout.flush()
+
+
+def _error_response(
+    request_id: Any, message: str, code: str = "RUNTIME_STDIO_ERROR"
+) -> dict[str, Any]:
+    return {"id": request_id, "ok": False, "error": {"code": code, "message": message}}
+
+
+def _cancelled_response(request_id: Any) -> dict[str, Any]:
+    return _error_response(request_id, "request cancelled", code="RUNTIME_STDIO_CANCELLED")
+
+
+def _max_concurrency_from_env() -> int:
+    try:
+        return max(1, int(os.getenv("GESTALT_STDIO_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)))
+    except ValueError:
+        return DEFAULT_MAX_CONCURRENCY
+
+
+class _StdioDispatcher:
+    """Runs each request as its own task and writes responses as they finish.
+
+    Requests beyond ``max_concurrency`` wait for a slot. ``cancel`` (or
+    ``$/cancelRequest``) with ``params.id`` cancels an in-flight request,
+    which then answers with a ``RUNTIME_STDIO_CANCELLED`` error. A request
+    reusing the id of one still in flight is rejected with
+    ``RUNTIME_STDIO_DUPLICATE_ID``. Streaming
+    ``send_event`` calls emit ``{"method": "progress", "params": {"id", "item"}}``
+    notifications before their response.
+    """
+
+    def __init__(self, runtime: Any, max_concurrency: int) -> None:
+        self.runtime = runtime
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._tasks: set[asyncio.Task] = set()
+        self._inflight: dict[Any, asyncio.Task] = {}
+        self._tokens: dict[Any, CancellationToken] = {}
+
+    def submit(self, line: str) -> None:
+        request_id: Any = None
+        try:
+            payload = json.loads(line)
+            if not isinstance(payload, dict):
+                raise ValueError("request must be an object")
+            request_id = payload.get("id")
+            method = str(payload.get("method") or "")
+            if method in CANCEL_METHODS:
+                self._cancel(request_id, payload)
+                return
+            if request_id is not None and request_id in self._inflight:
+                # The earlier request keeps its id so it can still be cancelled
+                _write_message(
+                    _error_response(
+                        request_id,
+                        "request id is already in flight",
+                        code="RUNTIME_STDIO_DUPLICATE_ID",
+                    )
+                )
+                return
+        except Exception as exc:
+            _write_message(_error_response(request_id, str(exc)))
+            return
+
+        token = CancellationToken()
+        task = asyncio.create_task(self._run(request_id, payload, token))
+        self._tasks.add(task)
+        task.add_done_callback(lambda done: self._finished(request_id, done))
+        if request_id is not None:
+            self._inflight[request_id] = task
+            self._tokens[request_id] = token
+
+    def _finished(self, request_id: Any, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if self._inflight.get(request_id) is task:
+            del self._inflight[request_id]
+            del self._tokens[request_id]
+        if task.cancelled():
+            # Cancelled before it started running, so _run never answered
+            _write_message(_cancelled_response(request_id))
+
+    def _cancel(self, request_id: Any, payload: dict[str, Any]) -> None:
+        params = payload.get("params")
+        target = params.get("id") if isinstance(params, dict) else None
+        task = self._inflight.get(target)
+        if task is not None:
+            # The token stops work the runtime handed off (TTS, tool tasks)
+            self._tokens[target].cancel("client_cancel")
+        cancelled = task is not None and task.cancel()
+        if request_id is not None:
+            _write_message({"id": request_id, "ok": True, "result": {"cancelled": cancelled}})
+
+    async def _run(
+        self, request_id: Any, payload: dict[str, Any], cancel_token: CancellationToken
+    ) -> None:
+        def notify(item: dict[str, Any]) -> None:
+            _write_message({"method": "progress", "params": {"id": request_id, "item": item}})
+
+        try:
+            async with self._slots:
+                result = await _dispatch(
+                    self.runtime, payload, notify=notify, cancel_token=cancel_token
+                )
+            response = {"id": request_id, "ok": True, "result": result}
+        except asyncio.CancelledError:
+            response = _cancelled_response(request_id)
+        except Exception as exc:
+            response = _error_response(request_id, str(exc))
+        _write_message(response)
+
+    async def drain(self) -> None:
+        """Wait for every in-flight request to answer."""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+
 async def run_stdio_server(
     runtime: Any | None = None,
     *,
     runtime_host: RuntimeHost | None = None,
+    max_concurrency: int | None = None,
 ) -> int:
     host = runtime_host
     active_runtime = runtime
@@ -187,27 +359,21 @@ async def run_stdio_server(
     else:
         active_runtime = active_runtime or create_runtime()
 
+    dispatcher = _StdioDispatcher(
+        active_runtime,
+        max_concurrency or _max_concurrency_from_env(),
+    )
+    lines = iter(sys.stdin)
     try:
-        for raw_line in sys.stdin:
+        while True:
+            # Blocking stdin reads happen off-loop so in-flight requests keep running
+            raw_line = await asyncio.to_thread(next, lines, None)
+            if raw_line is None:
+                break
             line = raw_line.strip()
-            if not line:
-                continue
-            request_id: Any = None
-            try:
-                payload = json.loads(line)
-                if not isinstance(payload, dict):
-                    raise ValueError("request must be an object")
-                request_id = payload.get("id")
-                result = await _dispatch(active_runtime, payload)
-                response = {"id": request_id, "ok": True, "result": result}
-            except Exception as exc:
-                response = {
-                    "id": request_id,
-                    "ok": False,
-                    "error": {"code": "RUNTIME_STDIO_ERROR", "message": str(exc)},
-                }
-            sys.stdout.write(json.dumps(response, ensure_ascii=True) + "\n")
-            sys.stdout.flush()
+            if line:
+                dispatcher.submit(line)
+        await dispatcher.drain()
         return 0
     finally:
         if host is not None:
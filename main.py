@@ -197,6 +197,23 @@ class OllamaBot(commands.Bot):
             )
             logger.info("Loaded VoiceCog")
 
+            # Pre-warm the TTS phrase cache with persona greetings/catchphrases
+            compiled_persona = self.services.get("compiled_persona")
+            if (
+                Config.TTS_CACHE_PREWARM
+                and compiled_persona
+                and getattr(self.tts, "cache", None)
+            ):
+                from services.voice.tts_cache import persona_prewarm_phrases
+
+                phrases = persona_prewarm_phrases(
+                    compiled_persona, max_chars=Config.TTS_CACHE_MAX_CHARS
+                )
+                # No persona in the key: voice replies call generate() without one
+                asyncio.create_task(
+                    self.tts.prewarm(phrases, temp_dir=Config.TEMP_DIR)
+                )
+
         # Load RL Commands
         if self._should_load_rl_commands():
             await self.add_cog(RLCommands(self))
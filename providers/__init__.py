@@ -6,6 +6,7 @@ from .base import (
     ProviderToolCall,
     ProviderUsage,
 )
+from .coalescing import RequestCoalescer, get_request_coalescer
 from .openai_compat import OpenAICompatProvider
 from .router import LegacyLLMProvider, ProviderRouter
 
@@ -19,4 +20,6 @@ __all__ = [
     "OpenAICompatProvider",
     "LegacyLLMProvider",
     "ProviderRouter",
+    "RequestCoalescer",
+    "get_request_coalescer",
 ]
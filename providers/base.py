@@ -47,6 +47,8 @@ class LLMStreamChunk:
     text: str = ""
     response: LLMResponse | None = None
     raw: dict[str, Any] = field(default_factory=dict)
+    # Set on "tool_call" chunks, emitted as soon as a call's arguments close
+    tool_call: ProviderToolCall | None = None
 
 
 class LLMProvider(Protocol):
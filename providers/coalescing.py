@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from services.core.rate_limiter import Priority, resolve_request_context
+
+logger = logging.getLogger(__name__)
+
+
+def request_key(
+    kind: str,
+    scope: str,
+    messages: Any,
+    *,
+    priority: Priority | None = None,
+    tenant: Any = None,
+    **params: Any,
+) -> str:
+    """Build a stable coalescing key for an LLM request.
+
+    ``scope`` identifies the backend (base URL, model, service name) so that
+    identical prompts sent to different backends are never merged. The
+    rate-limiter priority and tenant (explicit, or the ambient
+    ``request_priority``) are part of the key: the leader's call queues at
+    the leader's priority, so an interactive duplicate must never wait on a
+    background leader.
+    """
+    lane = resolve_request_context(priority, tenant)
+
+    def _default(value: Any) -> Any:
+        if dataclasses.is_dataclass(value) and not isinstance(value, type):
+            return dataclasses.asdict(value)
+        return str(value)
+
+    payload = json.dumps(
+        {
+            "kind": kind,
+            "scope": scope,
+            "lane": lane,
+            "messages": messages,
+            "params": params,
+        },
+        sort_keys=True,
+        ensure_ascii=True,
+        default=_default,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass(slots=True)
+class _InflightCall:
+    task: asyncio.Task[Any]
+    waiters: int = 0
+
+
+@dataclass(slots=True)
+class _InflightStream:
+    chunks: list[Any] = field(default_factory=list)
+    changed: asyncio.Condition = field(default_factory=asyncio.Condition)
+    done: bool = False
+    error: BaseException | None = None
+    subscribers: int = 0
+    task: asyncio.Task[None] | None = None
+
+
+@dataclass(slots=True)
+class CoalescerStats:
+    started: int = 0
+    coalesced: int = 0
+    streams_started: int = 0
+    streams_coalesced: int = 0
+    cancelled: int = 0
+
+
+class RequestCoalescer:
+    """Share one backend call between identical concurrent requests.
+
+    ``run`` merges awaitable calls; ``stream`` merges async iterators and
+    replays every chunk to each subscriber, including ones that join after
+    the first chunk arrived. Entries are dropped as soon as the underlying
+    call finishes, so completed results are never served from here (that is
+    the response cache's job). When every waiter of a call goes away, the
+    backend call is cancelled.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[str, _InflightCall] = {}
+        self._streams: dict[str, _InflightStream] = {}
+        self.stats = CoalescerStats()
+
+    async def run(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Await ``factory()`` once per key, sharing the result with duplicates."""
+        call = self._calls.get(key)
+        if call is None:
+            task = asyncio.ensure_future(factory())
+            call = _InflightCall(task=task)
+            self._calls[key] = call
+            task.add_done_callback(lambda _t, k=key, c=call: self._drop_call(k, c))
+            self.stats.started += 1
+        else:
+            self.stats.coalesced += 1
+            logger.debug("Coalescing request with key: %s...", key[:16])
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.task.done():
+                call.task.cancel()
+                self.stats.cancelled += 1
+            raise
+        finally:
+            call.waiters -= 1
+
+    async def stream(
+        self, key: str, factory: Callable[[], AsyncIterator[Any]]
+    ) -> AsyncIterator[Any]:
+        """Iterate ``factory()`` once per key, fanning chunks out to duplicates."""
+        entry = self._streams.get(key)
+        if entry is None:
+            entry = _InflightStream()
+            self._streams[key] = entry
+            entry.task = asyncio.ensure_future(self._pump(key, entry, factory))
+            self.stats.streams_started += 1
+        else:
+            self.stats.streams_coalesced += 1
+            logger.debug("Coalescing stream with key: %s...", key[:16])
+
+        entry.subscribers += 1
+        index = 0
+        try:
+            while True:
+                if index < len(entry.chunks):
+                    chunk = entry.chunks[index]
+                    index += 1
+                    yield chunk
+                    continue
+                if entry.done:
+                    if entry.error is not None:
+                        raise entry.error
+                    return
+                async with entry.changed:
+                    await entry.changed.wait_for(
+                        lambda: entry.done or index < len(entry.chunks)
+                    )
+        finally:
+            entry.subscribers -= 1
+            if entry.subscribers == 0 and not entry.done and entry.task is not None:
+                entry.task.cancel()
+                self.stats.cancelled += 1
+                self._drop_stream(key, entry)
+
+    async def _pump(
+        self,
+        key: str,
+        entry: _InflightStream,
+        factory: Callable[[], AsyncIterator[Any]],
+    ) -> None:
+        try:
+            async for chunk in factory():
+                entry.chunks.append(chunk)
+                async with entry.changed:
+                    entry.changed.notify_all()
+        except asyncio.CancelledError:
+            entry.error = asyncio.CancelledError()
+            raise
+        except Exception as exc:
+            entry.error = exc
+        finally:
+            entry.done = True
+            self._drop_stream(key, entry)
+            async with entry.changed:
+                entry.changed.notify_all()
+
+    def _drop_call(self, key: str, call: _InflightCall) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def _drop_stream(self, key: str, entry: _InflightStream) -> None:
+        if self._streams.get(key) is entry:
+            del self._streams[key]
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return counters plus the number of calls currently in flight."""
+        return {
+            **dataclasses.asdict(self.stats),
+            "inflight_calls": len(self._calls),
+            "inflight_streams": len(self._streams),
+        }
+
+
+_shared_coalescer: RequestCoalescer | None = None
+
+
+def get_request_coalescer() -> RequestCoalescer:
+    """Return the process-wide coalescer shared by every LLM backend."""
+    global _shared_coalescer
+    if _shared_coalescer is None:
+        _shared_coalescer = RequestCoalescer()
+    return _shared_coalescer
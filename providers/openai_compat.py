@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+from contextlib import nullcontext
 from typing import Any
 
 import aiohttp
@@ -14,6 +15,9 @@ from .base import (
     ProviderToolCall,
     ProviderUsage,
 )
+from .coalescing import RequestCoalescer, get_request_coalescer, request_key
+from .streaming import SSEParser, StreamMetrics, StreamStalledError, iter_sse_events
+from .tool_calls import ToolCallExtractor
 
 
 class OpenAICompatProvider(LLMProvider):
@@ -23,12 +27,19 @@ class OpenAICompatProvider(LLMProvider):
         api_key: str,
         model: str,
         timeout_seconds: int = 60,
+        coalescer: RequestCoalescer | None = None,
+        stream_idle_timeout_seconds: float | None = None,
+        rate_limiter: Any | None = None,
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
         self.model = model
         self.available_models: list[str] = []
         self.timeout_seconds = timeout_seconds
+        self.stream_idle_timeout_seconds = stream_idle_timeout_seconds
+        self.coalescer = coalescer or get_request_coalescer()
+        # Optional shared limiter with an ``acquire()`` async context manager
+        self.rate_limiter = rate_limiter
         self._session: aiohttp.ClientSession | None = None
 
     async def _session_or_create(self) -> aiohttp.ClientSession:
@@ -39,6 +50,11 @@ class OpenAICompatProvider(LLMProvider):
             self._session = aiohttp.ClientSession(headers=headers)
         return self._session
 
+    def _request_slot(self) -> Any:
+        if self.rate_limiter is None:
+            return nullcontext()
+        return self.rate_limiter.acquire()
+
     async def close(self) -> None:
         if self._session is not None:
             await self._session.close()
@@ -54,6 +70,20 @@ class OpenAICompatProvider(LLMProvider):
     ) -> LLMResponse:
         del request_hints
         model = str(kwargs.get("model_override") or self.model)
+        key = request_key(
+            "chat", self.base_url, messages, model=model, tools=tools, stream=stream
+        )
+        return await self.coalescer.run(
+            key, lambda: self._chat(messages, tools, stream, model)
+        )
+
+    async def _chat(
+        self,
+        messages: list[ProviderMessage],
+        tools: list[dict[str, Any]] | None,
+        stream: bool,
+        model: str,
+    ) -> LLMResponse:
         payload: dict[str, Any] = {
             "model": model,
             "messages": [
@@ -73,7 +103,7 @@ class OpenAICompatProvider(LLMProvider):
         session = await self._session_or_create()
         url = f"{self.base_url}/chat/completions"
         try:
-            async with session.post(
+            async with self._request_slot(), session.post(
                 url,
                 json=payload,
                 timeout=aiohttp.ClientTimeout(total=self.timeout_seconds),
@@ -137,6 +167,18 @@ class OpenAICompatProvider(LLMProvider):
     ):
         del request_hints
         model = str(kwargs.get("model_override") or self.model)
+        key = request_key("stream_chat", self.base_url, messages, model=model, tools=tools)
+        async for chunk in self.coalescer.stream(
+            key, lambda: self._stream_chat(messages, tools, model)
+        ):
+            yield chunk
+
+    async def _stream_chat(
+        self,
+        messages: list[ProviderMessage],
+        tools: list[dict[str, Any]] | None,
+        model: str,
+    ):
         payload: dict[str, Any] = {
             "model": model,
             "messages": [
@@ -157,12 +199,22 @@ class OpenAICompatProvider(LLMProvider):
         url = f"{self.base_url}/chat/completions"
         content_parts: list[str] = []
         tool_chunks: dict[int, dict[str, Any]] = {}
+        # Reports each native call once complete, so callers can start it
+        # while the rest of the response streams
+        extractor = ToolCallExtractor(text_formats=False)
         usage = ProviderUsage()
+        metrics = StreamMetrics()
+        idle_timeout = self.stream_idle_timeout_seconds
+        # With stall detection on, bound the gap between chunks instead of
+        # the whole response so long generations are not cut off.
+        timeout = (
+            aiohttp.ClientTimeout(total=None, connect=self.timeout_seconds)
+            if idle_timeout
+            else aiohttp.ClientTimeout(total=self.timeout_seconds)
+        )
         try:
-            async with session.post(
-                url,
-                json=payload,
-                timeout=aiohttp.ClientTimeout(total=self.timeout_seconds),
+            async with self._request_slot(), session.post(
+                url, json=payload, timeout=timeout
             ) as resp:
                 if resp.status >= 400:
                     body = await resp.text()
@@ -174,35 +226,32 @@ class OpenAICompatProvider(LLMProvider):
                     )
                     yield LLMStreamChunk(kind="response", response=response, raw=dict(response.raw))
                     return
-                while True:
-                    raw_line = await resp.content.readline()
-                    if not raw_line:
-                        break
-                    line = raw_line.decode("utf-8", errors="ignore").strip()
-                    if not line or not line.startswith("data:"):
-                        continue
-                    data_text = line[5:].strip()
-                    if data_text == "[DONE]":
+                async for event in iter_sse_events(resp.content, idle_timeout):
+                    if event == SSEParser.DONE:
                         break
                     try:
-                        data = json.loads(data_text)
+                        data = json.loads(event)
                     except json.JSONDecodeError:
                         continue
                     if data.get("usage"):
                         usage = self._parse_usage(data)
+                    for call in extractor.feed_delta(data):
+                        yield self._tool_call_chunk(call, data)
                     choices = data.get("choices") or []
                     if not choices:
                         continue
                     delta = choices[0].get("delta") or {}
-                    text_delta = str(delta.get("content") or "")
+                    text_delta = delta.get("content")
                     if text_delta:
+                        text_delta = str(text_delta)
+                        metrics.record()
                         content_parts.append(text_delta)
                         yield LLMStreamChunk(
                             kind="text_delta",
                             text=text_delta,
                             raw=data,
                         )
-                    for call in delta.get("tool_calls") or []:
+                    for call in delta.get("tool_calls") or ():
                         index = int(call.get("index") or 0)
                         target = tool_chunks.setdefault(
                             index,
@@ -216,15 +265,21 @@ class OpenAICompatProvider(LLMProvider):
                         if fn.get("arguments"):
                             target["arguments"] += str(fn.get("arguments"))
         except Exception as exc:
+            metrics.stalled = isinstance(exc, StreamStalledError)
+            metrics.finish()
             response = LLMResponse(
                 content="",
                 tool_calls=[],
                 usage=ProviderUsage(),
-                raw={"error": str(exc)},
+                raw={"error": str(exc), "stream_metrics": metrics.as_dict()},
             )
             yield LLMStreamChunk(kind="response", response=response, raw=dict(response.raw))
             return
 
+        for call in extractor.flush():
+            yield self._tool_call_chunk(call, {})
+        metrics.finish(tokens=usage.output_tokens)
+
         parsed_tool_calls: list[ProviderToolCall] = []
         for item in tool_chunks.values():
             raw_arguments = str(item.get("arguments") or "{}")
@@ -243,10 +298,26 @@ class OpenAICompatProvider(LLMProvider):
             content="".join(content_parts),
             tool_calls=parsed_tool_calls,
             usage=usage,
-            raw={"streamed": True, "model": model},
+            raw={
+                "streamed": True,
+                "model": model,
+                "stream_metrics": metrics.as_dict(),
+            },
         )
         yield LLMStreamChunk(kind="response", response=response, raw=dict(response.raw))
 
+    @staticmethod
+    def _tool_call_chunk(call: dict[str, Any], raw: dict[str, Any]) -> LLMStreamChunk:
+        return LLMStreamChunk(
+            kind="tool_call",
+            tool_call=ProviderToolCall(
+                name=call["tool"],
+                arguments=call["args"],
+                call_id=call.get("tool_call_id"),
+            ),
+            raw=raw,
+        )
+
     @staticmethod
     def _parse_usage(payload: dict[str, Any]) -> ProviderUsage:
         usage = payload.get("usage")
@@ -13,6 +13,7 @@ from .base import (
     ProviderMessage,
     ProviderRequestHints,
 )
+from .coalescing import RequestCoalescer, get_request_coalescer, request_key
 from .registry import ProviderSpec, canonical_provider_name
 
 
@@ -61,6 +62,7 @@ class ProviderRouter:
     provider_specs: dict[str, ProviderSpec] | None = None
     mode_config: ModeRoutingConfig = field(default_factory=ModeRoutingConfig)
     cost_tracking: dict[str, ProviderCostEntry] = field(default_factory=dict)
+    coalescer: RequestCoalescer = field(default_factory=get_request_coalescer)
 
     def resolve_provider_name(
         self, persona_id: str | None = None, mode: str | None = None
@@ -162,6 +164,10 @@ class ProviderRouter:
             },
         }
 
+    def get_coalescing_stats(self) -> dict[str, Any]:
+        """Get in-flight request coalescing statistics shared by all providers."""
+        return self.coalescer.get_stats()
+
     async def close(self) -> None:
         """Close provider resources when providers expose close hooks."""
         for provider in self.providers.values():
@@ -241,8 +247,11 @@ class ProviderRouter:
 
 
 class LegacyLLMProvider(LLMProvider):
-    def __init__(self, llm: LLMInterface) -> None:
+    def __init__(
+        self, llm: LLMInterface, coalescer: RequestCoalescer | None = None
+    ) -> None:
         self.llm = llm
+        self.coalescer = coalescer or get_request_coalescer()
 
     async def chat(
         self,
@@ -254,7 +263,8 @@ class LegacyLLMProvider(LLMProvider):
     ) -> LLMResponse:
         del tools, stream, request_hints, kwargs
         payload = [{"role": m.role, "content": m.content} for m in messages]
-        content = await self.llm.chat(messages=payload)
+        key = request_key("chat", f"legacy:{id(self.llm)}", payload)
+        content = await self.coalescer.run(key, lambda: self.llm.chat(messages=payload))
         return LLMResponse(content=content)
 
     async def stream_chat(
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator
+
+# Finished-stream metrics kept per service for stats
+STREAM_METRICS_HISTORY = 50
+
+
+class StreamStalledError(asyncio.TimeoutError):
+    """Raised when a streaming response produces no bytes for too long."""
+
+    def __init__(self, idle_seconds: float) -> None:
+        super().__init__(f"stream stalled: no data for {idle_seconds:.1f}s")
+        self.idle_seconds = idle_seconds
+
+
+class SSEParser:
+    """Incremental Server-Sent Events parser over raw bytes.
+
+    ``feed`` accepts arbitrary network chunks and returns the ``data``
+    payloads of every event completed by that chunk, as bytes (``json.loads``
+    accepts bytes directly, so no per-line decode is needed). Lines are
+    located with ``bytearray.find`` on a single reusable buffer rather than
+    by splitting and stripping strings.
+    """
+
+    __slots__ = ("_buffer", "_data", "_scan_from")
+
+    DONE = b"[DONE]"
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._data: list[bytes] = []
+        self._scan_from = 0
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        buffer = self._buffer
+        buffer += chunk
+        events: list[bytes] = []
+        start = 0
+        while True:
+            newline = buffer.find(b"\n", max(start, self._scan_from))
+            if newline < 0:
+                break
+            end = newline - 1 if newline > start and buffer[newline - 1] == 13 else newline
+            self._scan_from = 0
+            if end == start:
+                # Blank line: dispatch the pending event
+                if self._data:
+                    events.append(
+                        self._data[0] if len(self._data) == 1 else b"\n".join(self._data)
+                    )
+                    self._data = []
+            elif buffer.startswith(b"data:", start):
+                value_start = start + 5
+                if value_start < end and buffer[value_start] == 32:
+                    value_start += 1
+                self._data.append(bytes(buffer[value_start:end]))
+            # Comments (":"), "event:", "id:" and "retry:" fields are ignored
+            start = newline + 1
+        if start:
+            del buffer[:start]
+        self._scan_from = len(buffer)
+        return events
+
+    def flush(self) -> list[bytes]:
+        """Return any event left pending when the connection closed."""
+        if self._buffer.startswith(b"data:"):
+            value = bytes(self._buffer[5:]).strip()
+            self._data.append(value)
+        self._buffer.clear()
+        self._scan_from = 0
+        events = [b"\n".join(self._data)] if self._data else []
+        self._data = []
+        return events
+
+
+class NDJSONParser:
+    """Incremental newline-delimited JSON splitter over raw bytes."""
+
+    __slots__ = ("_buffer", "_scan_from")
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._scan_from = 0
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        buffer = self._buffer
+        buffer += chunk
+        lines: list[bytes] = []
+        start = 0
+        while True:
+            newline = buffer.find(b"\n", max(start, self._scan_from))
+            if newline < 0:
+                break
+            self._scan_from = 0
+            if newline > start:
+                lines.append(bytes(buffer[start:newline]))
+            start = newline + 1
+        if start:
+            del buffer[:start]
+        self._scan_from = len(buffer)
+        return lines
+
+    def flush(self) -> list[bytes]:
+        """Return a trailing line that was not newline-terminated."""
+        tail = bytes(self._buffer).strip()
+        self._buffer.clear()
+        self._scan_from = 0
+        return [tail] if tail else []
+
+
+async def iter_stream_bytes(
+    content: Any, idle_timeout: float | None = None
+) -> AsyncIterator[bytes]:
+    """Yield raw chunks from an aiohttp ``StreamReader`` with stall detection.
+
+    Args:
+        content: ``resp.content`` (anything exposing ``readany()``)
+        idle_timeout: Max seconds between chunks; ``None`` disables the check
+
+    Raises:
+        StreamStalledError: When no bytes arrive within ``idle_timeout``
+    """
+    while True:
+        if idle_timeout:
+            try:
+                chunk = await asyncio.wait_for(content.readany(), idle_timeout)
+            except asyncio.TimeoutError as exc:
+                raise StreamStalledError(idle_timeout) from exc
+        else:
+            chunk = await content.readany()
+        if not chunk:
+            return
+        yield chunk
+
+
+async def iter_sse_events(
+    content: Any, idle_timeout: float | None = None
+) -> AsyncIterator[bytes]:
+    """Yield SSE ``data`` payloads, including a final unterminated event.
+
+    Providers often close the connection right after the last delta or usage
+    chunk without the trailing blank line; the parser is flushed at end of
+    stream so that event is not lost.
+    """
+    parser = SSEParser()
+    async for chunk in iter_stream_bytes(content, idle_timeout):
+        for event in parser.feed(chunk):
+            yield event
+    for event in parser.flush():
+        yield event
+
+
+async def iter_ndjson_lines(
+    content: Any, idle_timeout: float | None = None
+) -> AsyncIterator[bytes]:
+    """Yield NDJSON lines, including a final line without a newline."""
+    parser = NDJSONParser()
+    async for chunk in iter_stream_bytes(content, idle_timeout):
+        for line in parser.feed(chunk):
+            yield line
+    for line in parser.flush():
+        yield line
+
+
+@dataclass(slots=True)
+class StreamMetrics:
+    """Per-request streaming timings: time-to-first-token and tokens/sec."""
+
+    started_at: float = field(default_factory=time.perf_counter)
+    first_token_at: float | None = None
+    finished_at: float | None = None
+    chunks: int = 0
+    tokens: int = 0
+    stalled: bool = False
+
+    def record(self, tokens: int = 1) -> None:
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+        self.chunks += 1
+        self.tokens += tokens
+
+    def finish(self, tokens: int | None = None) -> None:
+        """Close the measurement; ``tokens`` overrides the chunk-based count."""
+        self.finished_at = time.perf_counter()
+        if tokens:
+            self.tokens = tokens
+
+    @property
+    def ttft_ms(self) -> float | None:
+        if self.first_token_at is None:
+            return None
+        return (self.first_token_at - self.started_at) * 1000
+
+    @property
+    def tokens_per_second(self) -> float:
+        if self.first_token_at is None or self.tokens == 0:
+            return 0.0
+        end = self.finished_at or time.perf_counter()
+        generation = end - self.first_token_at
+        if generation <= 0:
+            return 0.0
+        return self.tokens / generation
+
+    def as_dict(self) -> dict[str, Any]:
+        end = self.finished_at or time.perf_counter()
+        ttft = self.ttft_ms
+        return {
+            "ttft_ms": round(ttft, 1) if ttft is not None else None,
+            "duration_ms": round((end - self.started_at) * 1000, 1),
+            "chunks": self.chunks,
+            "tokens": self.tokens,
+            "tokens_per_second": round(self.tokens_per_second, 1),
+            "stalled": self.stalled,
+        }
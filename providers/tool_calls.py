@@ -0,0 +1,531 @@
+"""Single-pass, incremental tool-call extraction for LLM responses.
+
+``ToolCallExtractor`` scans model output once, as it streams, and recognizes
+every tool-call format the bot supports:
+
+- Legacy textual calls: ``TOOL: name(arg="value", n=3)``
+- JSON blocks in the text: ``{"name": "calc", "arguments": {...}}``,
+  ``{"tool": "calc", "args": {...}}`` or ``{"tool_calls": [...]}``
+- Native function-call payloads from OpenAI-style streaming deltas and
+  complete responses (``tool_calls`` / ``function_call``)
+
+Each call is reported as soon as its closing bracket arrives, so callers
+can start executing a tool while the model is still generating.
+"""
+
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_IDLE = 0
+_LEGACY_NAME = 1
+_LEGACY_ARGS = 2
+_JSON = 3
+
+_LEGACY_MARKER = "tool"
+
+
+class _JsonScanner:
+    """Incremental bracket matcher that understands JSON strings and escapes."""
+
+    __slots__ = ("depth", "in_string", "escape")
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+
+    def feed(self, text: str, start: int, end: int) -> int:
+        """Scan ``text[start:end]``; return the index closing the object or -1."""
+        depth = self.depth
+        in_string = self.in_string
+        escape = self.escape
+        for i in range(start, end):
+            c = text[i]
+            if in_string:
+                if escape:
+                    escape = False
+                elif c == "\\":
+                    escape = True
+                elif c == '"':
+                    in_string = False
+            elif c == '"':
+                in_string = depth > 0
+            elif c == "{" or c == "[":
+                depth += 1
+            elif (c == "}" or c == "]") and depth:
+                depth -= 1
+                if depth == 0:
+                    self.depth, self.in_string, self.escape = 0, False, False
+                    return i
+        self.depth, self.in_string, self.escape = depth, in_string, escape
+        return -1
+
+
+def _coerce_literal(value: str) -> Any:
+    """Convert an unquoted legacy argument to int/float/bool where possible."""
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    lowered = value.lower()
+    if lowered == "true":
+        return True
+    if lowered == "false":
+        return False
+    return value
+
+
+def parse_legacy_args(args_str: str) -> Dict[str, Any]:
+    """Parse ``key="value", n=3`` argument lists from legacy ``TOOL:`` calls.
+
+    Quoted values are kept verbatim (commas and parentheses included);
+    unquoted values are coerced to int, float or bool when they look like one.
+    """
+    args: Dict[str, Any] = {}
+    i = 0
+    n = len(args_str)
+    while i < n:
+        eq = args_str.find("=", i)
+        if eq < 0:
+            break
+        key = args_str[i:eq].strip().lstrip(",").strip()
+        i = eq + 1
+        while i < n and args_str[i].isspace():
+            i += 1
+        if i < n and args_str[i] in "\"'":
+            quote = args_str[i]
+            close = args_str.find(quote, i + 1)
+            if close < 0:
+                close = n
+            value: Any = args_str[i + 1 : close]
+            comma = args_str.find(",", close)
+            i = n if comma < 0 else comma + 1
+        else:
+            comma = args_str.find(",", i)
+            end = n if comma < 0 else comma
+            value = _coerce_literal(args_str[i:end].strip())
+            i = end + 1
+        if key.isidentifier():
+            args[key] = value
+    return args
+
+
+def _load_arguments(raw: Any) -> Optional[Dict[str, Any]]:
+    """Decode function arguments, which providers send as a dict or JSON text."""
+    if raw is None or raw == "":
+        return {}
+    if isinstance(raw, dict):
+        return raw
+    if isinstance(raw, str):
+        try:
+            decoded = json.loads(raw)
+        except json.JSONDecodeError:
+            logger.debug(f"Malformed tool arguments: {raw[:200]}")
+            return None
+        return decoded if isinstance(decoded, dict) else None
+    return None
+
+
+def _make_call(
+    name: Any, raw_args: Any, call_id: Any, fmt: str, full_match: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    if not isinstance(name, str) or not name:
+        return None
+    args = _load_arguments(raw_args)
+    if args is None:
+        return None
+    call: Dict[str, Any] = {"tool": name, "args": args, "format": fmt}
+    if call_id:
+        call["tool_call_id"] = call_id
+    if full_match is not None:
+        call["full_match"] = full_match
+    return call
+
+
+def normalize_tool_calls(
+    payload: Any, fmt: str = "json", full_match: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Turn any supported tool-call object into a list of call dicts.
+
+    Accepts ``{"tool_calls": [...]}``, OpenAI ``{"function": {...}}`` entries,
+    legacy ``{"function_call": {...}}``, ``{"name", "arguments"}`` and
+    ``{"tool", "args"}`` shapes. Anything else yields an empty list.
+    """
+    if not isinstance(payload, dict):
+        return []
+
+    tool_calls = payload.get("tool_calls")
+    if isinstance(tool_calls, list):
+        calls = []
+        for item in tool_calls:
+            calls.extend(normalize_tool_calls(item, fmt, full_match))
+        return calls
+
+    function = payload.get("function") or payload.get("function_call")
+    if isinstance(function, dict):
+        call = _make_call(
+            function.get("name"),
+            function.get("arguments"),
+            payload.get("id"),
+            fmt,
+            full_match,
+        )
+        return [call] if call else []
+
+    if "name" in payload and ("arguments" in payload or "parameters" in payload):
+        raw = payload.get("arguments", payload.get("parameters"))
+        call = _make_call(payload["name"], raw, payload.get("id"), fmt, full_match)
+        return [call] if call else []
+
+    if "tool" in payload and ("args" in payload or "arguments" in payload):
+        raw = payload.get("args", payload.get("arguments"))
+        call = _make_call(payload["tool"], raw, payload.get("id"), fmt, full_match)
+        return [call] if call else []
+
+    return []
+
+
+def extract_response_tool_calls(response: Any) -> List[Dict[str, Any]]:
+    """Extract native tool calls from a complete OpenAI-style response dict."""
+    if not response or not isinstance(response, dict):
+        return []
+    choices = response.get("choices") or [{}]
+    message = choices[0].get("message") or response.get("message") or {}
+    if not isinstance(message, dict):
+        return []
+    if message.get("tool_calls"):
+        return normalize_tool_calls(
+            {"tool_calls": message["tool_calls"]}, fmt="native"
+        )
+    if message.get("function_call"):
+        return normalize_tool_calls(
+            {"function_call": message["function_call"]}, fmt="native"
+        )
+    return []
+
+
+class ToolCallExtractor:
+    """Incremental tool-call extractor over streamed model output.
+
+    Feed text deltas with ``feed`` (or raw OpenAI stream chunks with
+    ``feed_delta``) and each returns the calls completed by that input.
+    Plain text is skipped with ``str.find`` jumps to the next ``:`` or
+    ``{``; only candidate calls are walked character by character, and
+    every character is examined once. A candidate that never closes is
+    abandoned after ``max_call_chars`` and the text after its start is
+    scanned once more for the other format only, so a stray ``{`` cannot
+    hide a later ``TOOL:`` call and the worst case stays linear.
+
+    Usage:
+        extractor = ToolCallExtractor(tool_names=tools.keys())
+        async for delta in stream:
+            for call in extractor.feed(delta):
+                dispatch(call)
+        for call in extractor.flush():
+            dispatch(call)
+    """
+
+    def __init__(
+        self,
+        tool_names: Optional[Iterable[str]] = None,
+        max_call_chars: int = 16384,
+        text_formats: bool = True,
+    ):
+        """
+        Initialize the extractor.
+
+        Args:
+            tool_names: Known tool names; JSON blocks naming anything else are
+                treated as ordinary text. Legacy ``TOOL:`` calls are always
+                reported so unknown tools still get an error result.
+            max_call_chars: Longest candidate call before it is abandoned
+            text_formats: Scan message text for legacy and JSON calls.
+                Disable for providers with native function calling, whose
+                text is the reply itself.
+        """
+        self.tool_names = set(tool_names) if tool_names is not None else None
+        self.max_call_chars = max_call_chars
+        self.text_formats = text_formats
+        self.calls_found = 0
+        self._reset_text()
+        self._native: Dict[int, Dict[str, Any]] = {}
+
+    def _reset_text(self) -> None:
+        self._buf = ""
+        self._pos = 0
+        self._state = _IDLE
+        self._start = 0
+        self._name_start = -1
+        self._args_start = 0
+        self._quote: Optional[str] = None
+        self._prev = ""
+        self._scanner = _JsonScanner()
+        # Candidates starting before these offsets were already abandoned
+        self._json_floor = 0
+        self._legacy_floor = 0
+
+    def _accept(self, calls: List[Dict[str, Any]], out: List[Dict[str, Any]]) -> None:
+        for call in calls:
+            if (
+                call["format"] == "json"
+                and self.tool_names is not None
+                and call["tool"] not in self.tool_names
+            ):
+                continue
+            out.append(call)
+            self.calls_found += 1
+
+    # ==================== TEXT ====================
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        """Consume a text delta and return the tool calls it completed."""
+        out: List[Dict[str, Any]] = []
+        if not text:
+            return out
+        self._buf += text
+        self._scan(out)
+        self._compact()
+        return out
+
+    def _abandon(self) -> None:
+        """Drop the current candidate and rescan the text after its start."""
+        if self._state == _JSON:
+            self._json_floor = self._pos
+        else:
+            self._legacy_floor = self._pos
+        self._pos = self._start + 1
+        self._state = _IDLE
+        self._quote = None
+        self._scanner = _JsonScanner()
+
+    def _scan(self, out: List[Dict[str, Any]]) -> None:
+        while True:
+            self._scan_text(out)
+            if self._state == _IDLE or self._pos - self._start <= self.max_call_chars:
+                return
+            self._abandon()
+
+    def _scan_text(self, out: List[Dict[str, Any]]) -> None:
+        buf = self._buf
+        n = len(buf)
+        pos = self._pos
+
+        while pos < n:
+            state = self._state
+
+            if state == _IDLE:
+                colon = buf.find(":", pos)
+                brace = buf.find("{", max(pos, self._json_floor))
+                if brace >= 0 and (colon < 0 or brace < colon):
+                    self._start = brace
+                    self._state = _JSON
+                    pos = brace
+                elif colon >= 0:
+                    marker = colon - len(_LEGACY_MARKER)
+                    if (
+                        marker >= self._legacy_floor
+                        and marker >= 0
+                        and buf[marker:colon].lower() == _LEGACY_MARKER
+                    ):
+                        self._start = marker
+                        self._name_start = -1
+                        self._state = _LEGACY_NAME
+                    pos = colon + 1
+                else:
+                    pos = n
+
+            elif state == _LEGACY_NAME:
+                if self._name_start < 0:
+                    while pos < n and buf[pos].isspace():
+                        pos += 1
+                    if pos == n:
+                        break
+                    self._name_start = pos
+                while pos < n and (buf[pos].isalnum() or buf[pos] == "_"):
+                    pos += 1
+                if pos == n:
+                    break
+                if buf[pos] == "(" and pos > self._name_start:
+                    self._args_start = pos + 1
+                    self._quote = None
+                    self._prev = "("
+                    self._state = _LEGACY_ARGS
+                    pos += 1
+                else:
+                    # Not a call after all; rescan from here
+                    self._state = _IDLE
+
+            elif state == _LEGACY_ARGS:
+                quote = self._quote
+                prev = self._prev
+                while pos < n:
+                    c = buf[pos]
+                    if quote:
+                        if c == quote:
+                            quote = None
+                    elif c == ")":
+                        break
+                    elif (c == '"' or c == "'") and prev in "=,(":
+                        quote = c
+                    if not c.isspace():
+                        prev = c
+                    pos += 1
+                self._quote, self._prev = quote, prev
+                if pos == n:
+                    break
+                name = buf[self._name_start : self._args_start - 1]
+                full_match = buf[self._start : pos + 1]
+                out.append(
+                    {
+                        "tool": name,
+                        "args": parse_legacy_args(buf[self._args_start : pos]),
+                        "format": "legacy",
+                        "full_match": full_match,
+                    }
+                )
+                self.calls_found += 1
+                self._state = _IDLE
+                pos += 1
+
+            else:  # _JSON
+                end = self._scanner.feed(buf, pos, n)
+                if end < 0:
+                    pos = n
+                    break
+                raw = buf[self._start : end + 1]
+                try:
+                    payload = json.loads(raw)
+                except json.JSONDecodeError:
+                    payload = None
+                self._accept(normalize_tool_calls(payload, "json", raw), out)
+                self._scanner = _JsonScanner()
+                self._state = _IDLE
+                pos = end + 1
+
+        self._pos = pos
+
+    def _compact(self) -> None:
+        """Discard text that can no longer be part of a call."""
+        if self._state == _IDLE:
+            keep = max(self._pos - len(_LEGACY_MARKER), 0)
+        else:
+            keep = self._start
+        if keep <= 0:
+            return
+        self._buf = self._buf[keep:]
+        self._pos -= keep
+        self._start -= keep
+        self._args_start -= keep
+        self._json_floor -= keep
+        self._legacy_floor -= keep
+        if self._name_start >= 0:
+            self._name_start -= keep
+
+    # ==================== NATIVE PAYLOADS ====================
+
+    def feed_delta(self, chunk: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Consume one OpenAI-style streaming chunk.
+
+        Handles ``delta.content`` text, ``delta.tool_calls`` fragments
+        (accumulated per index and reported once their arguments close) and
+        ``message.tool_calls`` from providers that send whole calls, such as
+        Ollama.
+        """
+        out: List[Dict[str, Any]] = []
+        if not chunk or not isinstance(chunk, dict):
+            return out
+
+        message = chunk.get("message")
+        if isinstance(message, dict):
+            if self.text_formats and message.get("content"):
+                out.extend(self.feed(message["content"]))
+            self._accept(extract_response_tool_calls(chunk), out)
+
+        choices = chunk.get("choices") or []
+        if not choices:
+            return out
+        choice = choices[0]
+        delta = choice.get("delta") or {}
+
+        if self.text_formats and delta.get("content"):
+            out.extend(self.feed(delta["content"]))
+
+        for fragment in delta.get("tool_calls") or []:
+            self._feed_native_fragment(fragment, out)
+        if delta.get("function_call"):
+            self._feed_native_fragment({"function": delta["function_call"]}, out)
+
+        if choice.get("finish_reason"):
+            self._flush_native(out)
+        return out
+
+    def _feed_native_fragment(
+        self, fragment: Dict[str, Any], out: List[Dict[str, Any]]
+    ) -> None:
+        index = fragment.get("index", 0)
+        entry = self._native.get(index)
+        if entry is None or entry["done"]:
+            if entry is not None and entry["done"] and not fragment.get("id"):
+                return  # Trailing fragment of a call already dispatched
+            entry = {
+                "id": None,
+                "name": "",
+                "arguments": "",
+                "scanner": _JsonScanner(),
+                "done": False,
+            }
+            self._native[index] = entry
+
+        if fragment.get("id"):
+            entry["id"] = fragment["id"]
+        function = fragment.get("function") or {}
+        if function.get("name"):
+            entry["name"] += function["name"]
+        arguments = function.get("arguments")
+        if isinstance(arguments, dict):
+            entry["arguments"] = arguments
+            self._complete_native(entry, out)
+        elif arguments:
+            offset = len(entry["arguments"])
+            entry["arguments"] += arguments
+            closed = entry["scanner"].feed(entry["arguments"], offset, len(entry["arguments"]))
+            if closed >= 0 and entry["name"]:
+                self._complete_native(entry, out)
+
+    def _complete_native(
+        self, entry: Dict[str, Any], out: List[Dict[str, Any]]
+    ) -> None:
+        call = _make_call(entry["name"], entry["arguments"], entry["id"], "native")
+        entry["done"] = True
+        if call:
+            out.append(call)
+            self.calls_found += 1
+
+    def _flush_native(self, out: List[Dict[str, Any]]) -> None:
+        for index in sorted(self._native):
+            entry = self._native[index]
+            if not entry["done"] and entry["name"]:
+                self._complete_native(entry, out)
+        self._native.clear()
+
+    def flush(self) -> List[Dict[str, Any]]:
+        """Finish the stream and return any calls completed by its end.
+
+        An unterminated candidate is dropped and the text after its start
+        is scanned once more, so a ``TOOL:`` call that followed a stray
+        ``{`` is still found.
+        """
+        out: List[Dict[str, Any]] = []
+        self._flush_native(out)
+        while self._state != _IDLE:
+            self._abandon()
+            self._scan(out)
+        self._reset_text()
+        return out
@@ -14,7 +14,7 @@ import json
 import logging
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 import numpy as np
 import torch
@@ -26,10 +26,9 @@ from services.persona.rl.neural_agent import NeuralAgent
 from services.persona.rl.offline_rl import (
     CQLTrainer,
     OfflineRLDataset,
+    StreamingOfflineRLDataset,
     Transition,
-    TransitionBatch,
-    collate_transitions,
-    validate_agent,
+    validate_agent_batches,
 )
 from services.persona.rl.replay_buffer import ReplayBuffer
 from services.persona.rl.types import RLAction
@@ -95,15 +94,15 @@ def create_synthetic_dataset(
 
 def train_epoch(
     trainer: CQLTrainer,
-    dataset: OfflineRLDataset,
+    dataset: Union[OfflineRLDataset, StreamingOfflineRLDataset],
     batch_size: int,
     device: torch.device,
 ) -> dict:
-    """Train for one epoch.
+    """Train for one epoch (one shuffled pass over the training split).
 
     Args:
         trainer: CQLTrainer instance
-        dataset: OfflineRLDataset
+        dataset: In-memory or streaming offline dataset
         batch_size: Batch size for training
         device: Device to use
 
@@ -114,23 +113,7 @@ def train_epoch(
     epoch_bellman_errors = []
     epoch_cql_penalties = []
 
-    # Calculate number of batches
-    num_train = len(dataset._train_indices)
-    if num_train == 0:
-        return {
-            "loss": 0.0,
-            "bellman_error": 0.0,
-            "cql_penalty": 0.0,
-        }
-
-    num_batches = max(1, num_train // batch_size)
-
-    for _ in range(num_batches):
-        batch_transitions = dataset.get_train_batch(batch_size)
-        if not batch_transitions:
-            break
-
-        batch = collate_transitions(batch_transitions, device)
+    for batch in dataset.iter_batches(batch_size, device=device):
         metrics = trainer.train_step(batch)
 
         epoch_losses.append(metrics["loss"])
@@ -161,6 +144,8 @@ def main(
     max_conversations: int = 10000,
     state_dim: int = 128,
     action_dim: int = 4,
+    shard_dir: str = "data/offline_rl_shards",
+    shard_size: int = 50000,
 ) -> int:
     """Main training loop.
 
@@ -174,9 +159,11 @@ def main(
         val_ratio: Validation split ratio
         save_path: Path to save trained model
         min_quality_score: Minimum quality score for data filtering
-        max_conversations: Maximum conversations to load
+        max_conversations: Maximum transitions to load (0 = entire history)
         state_dim: State dimension for agent
         action_dim: Action dimension for agent
+        shard_dir: Directory for streamed dataset shards
+        shard_size: Transitions per shard
 
     Returns:
         Exit code (0 for success)
@@ -211,11 +198,16 @@ def main(
             logger.error("Must specify --db-path or use --dry-run")
             return 1
 
-        logger.info(f"Loading data from {db_path}")
-        dataset = OfflineRLDataset(db_path=db_path)
-        num_loaded = dataset.load_from_history(
+        logger.info(f"Streaming data from {db_path} into {shard_dir}")
+        dataset = StreamingOfflineRLDataset(
+            db_path=db_path,
+            shard_dir=shard_dir,
+            shard_size=shard_size,
+            state_dim=state_dim,
+        )
+        num_loaded = dataset.build(
             min_quality_score=min_quality_score,
-            max_conversations=max_conversations,
+            max_transitions=max_conversations or None,
         )
 
         if num_loaded == 0:
@@ -259,8 +251,12 @@ def main(
 
         # Validate every 10 epochs
         if epoch % 10 == 0 or epoch == epochs - 1:
-            val_transitions = dataset.get_val_data()
-            val_metrics = validate_agent(agent, val_transitions, device)
+            val_metrics = validate_agent_batches(
+                agent,
+                dataset.iter_batches(
+                    batch_size, device=device, shuffle=False, split="val"
+                ),
+            )
 
             logger.info(
                 f"Epoch {epoch:3d}/{epochs}: "
@@ -293,8 +289,10 @@ def main(
     # Final validation
     logger.info("-" * 60)
     logger.info("Final validation...")
-    val_transitions = dataset.get_val_data()
-    final_val_metrics = validate_agent(agent, val_transitions, device)
+    final_val_metrics = validate_agent_batches(
+        agent,
+        dataset.iter_batches(batch_size, device=device, shuffle=False, split="val"),
+    )
     logger.info(f"Final val_q={final_val_metrics['avg_q']:.4f}")
 
     # Save model
@@ -386,7 +384,7 @@ if __name__ == "__main__":
         "--max-conversations",
         type=int,
         default=10000,
-        help="Maximum conversations to load",
+        help="Maximum transitions to load (0 = entire history)",
     )
     parser.add_argument(
         "--state-dim",
@@ -400,6 +398,18 @@ if __name__ == "__main__":
         default=4,
         help="Action dimension",
     )
+    parser.add_argument(
+        "--shard-dir",
+        type=str,
+        default="data/offline_rl_shards",
+        help="Directory for streamed dataset shards",
+    )
+    parser.add_argument(
+        "--shard-size",
+        type=int,
+        default=50000,
+        help="Transitions per on-disk shard",
+    )
 
     args = parser.parse_args()
 
@@ -416,6 +426,8 @@ if __name__ == "__main__":
         max_conversations=args.max_conversations,
         state_dim=args.state_dim,
         action_dim=args.action_dim,
+        shard_dir=args.shard_dir,
+        shard_size=args.shard_size,
     )
 
     sys.exit(exit_code)
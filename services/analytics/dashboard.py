@@ -789,7 +789,7 @@ ANALYTICS_PASSWORD=admin
                 # Sample transitions to analyze feature distribution
                 try:
                     # Get raw buffer data for analysis
-                    buffer_data = list(rl_service.replay_buffer.buffer)[-sample_size:]
+                    buffer_data = rl_service.replay_buffer.recent(sample_size)
 
                     # Calculate coverage for each feature dimension
                     coverage = {}
@@ -1033,7 +1033,7 @@ ANALYTICS_PASSWORD=admin
                 ):
                     # Sample a few transitions to show state distribution
                     try:
-                        sample = await rl_service.replay_buffer.sample(
+                        sample = rl_service.replay_buffer.sample_sync(
                             min(10, len(rl_service.replay_buffer))
                         )
                         state_counts = {}
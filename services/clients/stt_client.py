@@ -1,6 +1,7 @@
 """Parakeet STT API Client - connects to external Parakeet FastAPI service."""
 
 import aiohttp
+import io
 import logging
 from pathlib import Path
 from typing import Optional
@@ -58,13 +59,36 @@ class ParakeetAPIClient:
         include_timestamps: bool = False,
     ) -> Optional[str]:
         """Transcribe audio file."""
+        try:
+            audio = open(audio_path, "rb")
+        except OSError as e:
+            logger.error(f"Parakeet transcription error: {e}")
+            return None
+        with audio:
+            return await self._post_transcribe(
+                audio, audio_path.name, include_timestamps
+            )
+
+    async def transcribe_bytes(
+        self,
+        wav_data: bytes,
+        include_timestamps: bool = False,
+    ) -> Optional[str]:
+        """Transcribe an in-memory WAV file (no temp file round-trip)."""
+        return await self._post_transcribe(
+            wav_data, "audio.wav", include_timestamps
+        )
+
+    async def _post_transcribe(
+        self, audio, filename: str, include_timestamps: bool
+    ) -> Optional[str]:
         try:
             session = await self._get_session()
             data = aiohttp.FormData()
             data.add_field(
                 "file",
-                open(audio_path, "rb"),
-                filename=audio_path.name,
+                audio,
+                filename=filename,
                 content_type="audio/wav",
             )
             data.add_field("include_timestamps", str(include_timestamps).lower())
@@ -156,7 +180,38 @@ class ParakeetAPIService:
             Dictionary with transcription results
         """
         text = await self._client.transcribe(audio_path)
+        return self._result(text)
+
+    async def transcribe_pcm(
+        self,
+        pcm_data: bytes,
+        sample_rate: int = 16000,
+        channels: int = 1,
+    ) -> dict:
+        """Transcribe raw 16-bit PCM held in memory.
+
+        Used for streaming partial transcription, where a temp file per
+        window would add disk I/O to every partial.
+
+        Args:
+            pcm_data: Raw PCM audio (16-bit)
+            sample_rate: Sample rate of audio
+            channels: Channel count of audio
+
+        Returns:
+            Transcription result dict
+        """
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav_file:
+            wav_file.setnchannels(channels)
+            wav_file.setsampwidth(2)  # 16-bit
+            wav_file.setframerate(sample_rate)
+            wav_file.writeframes(pcm_data)
+
+        text = await self._client.transcribe_bytes(buffer.getvalue())
+        return self._result(text)
 
+    def _result(self, text: Optional[str]) -> dict:
         if text is None:
             raise RuntimeError("Parakeet API transcription failed")
 
@@ -18,6 +18,7 @@ from services.llm.fallback import LLMFallbackManager, ModelConfig
 
 # Voice domain
 from services.voice.tts import TTSService
+from services.voice.tts_cache import PhraseAudioCache
 from services.voice.rvc import UnifiedRVCService
 from services.voice.listener import EnhancedVoiceListener, VOICE_AVAILABLE
 from services.clients.stt_client import ParakeetAPIService
@@ -223,6 +224,17 @@ class ServiceFactory:
     def _init_audio(self):
         """Initialize audio services."""
         # TTS
+        tts_cache = None
+        if Config.TTS_CACHE_ENABLED:
+            try:
+                tts_cache = PhraseAudioCache(
+                    cache_dir=Config.TTS_CACHE_DIR,
+                    max_bytes=Config.TTS_CACHE_MAX_MB * 1024 * 1024,
+                    max_chars=Config.TTS_CACHE_MAX_CHARS,
+                )
+            except OSError as e:
+                logger.warning(f"TTS phrase cache disabled: {e}")
+
         self.services["tts"] = TTSService(
             engine=Config.TTS_ENGINE,
             kokoro_voice=Config.KOKORO_VOICE,
@@ -238,6 +250,7 @@ class ServiceFactory:
             supertonic_voice=Config.SUPERTONIC_VOICE,
             supertonic_steps=Config.SUPERTONIC_STEPS,
             supertonic_speed=Config.SUPERTONIC_SPEED,
+            cache=tts_cache,
         )
 
         # RVC
@@ -276,6 +289,11 @@ class ServiceFactory:
                 silence_threshold=Config.WHISPER_SILENCE_THRESHOLD,
                 energy_threshold=Config.VOICE_ENERGY_THRESHOLD,
                 bot_trigger_words=trigger_words,
+                streaming_partials=Config.VOICE_STREAMING_STT,
+                partial_interval=Config.VOICE_PARTIAL_INTERVAL,
+                worker_processes=Config.VOICE_WORKER_PROCESSES,
+                worker_heartbeat_timeout=Config.VOICE_WORKER_HEARTBEAT_TIMEOUT,
+                worker_max_restarts=Config.VOICE_WORKER_MAX_RESTARTS,
             )
             logger.info("Enhanced voice listener initialized")
         elif not VOICE_AVAILABLE:
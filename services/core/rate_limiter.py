@@ -1,75 +1,340 @@
 """Rate limiting service for API calls."""
 import asyncio
+import heapq
 import time
 import logging
-from contextlib import asynccontextmanager
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Deque, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
 
+class Priority(IntEnum):
+    """Request priority; lower values are served first."""
+
+    INTERACTIVE = 0  # User-facing replies
+    NORMAL = 1  # Default for untagged calls
+    BACKGROUND = 2  # Summaries, ambient behavior, RL training
+
+
+# Ambient priority/tenant so deep call stacks don't need to thread arguments
+_current_priority: ContextVar[Priority] = ContextVar(
+    "llm_request_priority", default=Priority.NORMAL
+)
+_current_tenant: ContextVar[Optional[str]] = ContextVar(
+    "llm_request_tenant", default=None
+)
+
+
+@contextmanager
+def request_priority(priority: Priority, tenant: Optional[Any] = None):
+    """Tag every rate-limited call made inside the block.
+
+    Usage:
+        with request_priority(Priority.BACKGROUND, tenant=guild_id):
+            await llm.generate(prompt)
+    """
+    priority_token = _current_priority.set(Priority(priority))
+    tenant_token = (
+        _current_tenant.set(str(tenant)) if tenant is not None else None
+    )
+    try:
+        yield
+    finally:
+        _current_priority.reset(priority_token)
+        if tenant_token is not None:
+            _current_tenant.reset(tenant_token)
+
+
+def resolve_request_context(
+    priority: Optional[Priority] = None, tenant: Optional[Any] = None
+) -> tuple[Priority, Optional[str]]:
+    """Effective priority and tenant for a call, defaulting to the ambient tags."""
+    priority = Priority(priority if priority is not None else _current_priority.get())
+    if tenant is None:
+        tenant = _current_tenant.get()
+    return priority, str(tenant) if tenant is not None else None
+
+
+class TokenBucket:
+    """Classic token bucket: ``rate`` tokens per second up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float):
+        """Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until one token is available (0 if available now)."""
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self, now: float):
+        """Consume one token; callers must check ``wait_time`` first."""
+        self._refill(now)
+        self.tokens -= 1
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    tag: int
+    seq: int
+    tenant: Optional[str] = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
 class RateLimiter:
-    """Rate limiter using a semaphore and time-based tracking.
+    """Priority-aware rate limiter built on token buckets.
 
-    This implementation combines concurrency limiting (Semaphore)
-    with rate limiting (requests per minute).
+    Combines a concurrency limit with a global token bucket
+    (requests per minute) and optional per-tenant buckets. Waiters are
+    served strictly by priority; within a priority, tenants (e.g. guilds)
+    are interleaved with start-time fair queuing so one busy tenant cannot
+    starve the others.
     """
 
-    def __init__(self, max_concurrent: int = 5, requests_per_minute: int = 60):
+    WAIT_SAMPLES = 500
+
+    def __init__(
+        self,
+        max_concurrent: int = 5,
+        requests_per_minute: int = 60,
+        tenant_requests_per_minute: Optional[int] = None,
+        burst: Optional[int] = None,
+    ):
         """Initialize rate limiter.
 
         Args:
             max_concurrent: Maximum concurrent requests allowed
             requests_per_minute: Maximum requests allowed per minute
+            tenant_requests_per_minute: Optional per-tenant (guild) limit
+            burst: Bucket capacity; defaults to ``requests_per_minute``
         """
-        self.semaphore = asyncio.Semaphore(max_concurrent)
-        self.requests = []  # List of timestamps
+        self.max_concurrent = max_concurrent
         self.rpm_limit = requests_per_minute
-        self._lock = asyncio.Lock()
+        self.tenant_rpm_limit = tenant_requests_per_minute
+        self.burst = burst or requests_per_minute
+
+        self._bucket = TokenBucket(requests_per_minute / 60.0, self.burst)
+        self._tenant_buckets: Dict[str, TokenBucket] = {}
+
+        self._heap: List[_Waiter] = []
+        self._active = 0
+        self._seq = 0
+        # Start-time fair queuing state
+        self._virtual_time = 0
+        self._tenant_tags: Dict[str, int] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        self._waits: Dict[Priority, Deque[float]] = {
+            p: deque(maxlen=self.WAIT_SAMPLES) for p in Priority
+        }
+        self._granted: Dict[Priority, int] = {p: 0 for p in Priority}
+
+    def _tenant_bucket(self, tenant: Optional[str]) -> Optional[TokenBucket]:
+        if tenant is None or not self.tenant_rpm_limit:
+            return None
+        bucket = self._tenant_buckets.get(tenant)
+        if bucket is None:
+            bucket = TokenBucket(self.tenant_rpm_limit / 60.0, self.tenant_rpm_limit)
+            self._tenant_buckets[tenant] = bucket
+        return bucket
+
+    def _enqueue(self, priority: Priority, tenant: Optional[str]) -> _Waiter:
+        key = tenant or ""
+        tag = max(self._virtual_time, self._tenant_tags.get(key, 0)) + 1
+        self._tenant_tags[key] = tag
+        self._seq += 1
+        waiter = _Waiter(
+            priority=int(priority),
+            tag=tag,
+            seq=self._seq,
+            tenant=tenant,
+            future=asyncio.get_running_loop().create_future(),
+        )
+        heapq.heappush(self._heap, waiter)
+        return waiter
+
+    def _dispatch(self):
+        """Grant slots to eligible waiters in priority/fairness order."""
+        self._timer = None
+        now = time.monotonic()
+        retry_in: Optional[float] = None
+
+        while self._active < self.max_concurrent and self._heap:
+            global_wait = self._bucket.wait_time(now)
+            if global_wait > 0:
+                retry_in = global_wait
+                break
+
+            granted: Optional[_Waiter] = None
+            blocked: List[_Waiter] = []
+            while self._heap:
+                waiter = heapq.heappop(self._heap)
+                if waiter.future.done():
+                    continue  # Cancelled while queued
+                bucket = self._tenant_bucket(waiter.tenant)
+                tenant_wait = bucket.wait_time(now) if bucket else 0.0
+                if tenant_wait == 0:
+                    granted = waiter
+                    break
+                blocked.append(waiter)
+                retry_in = tenant_wait if retry_in is None else min(retry_in, tenant_wait)
+            for waiter in blocked:
+                heapq.heappush(self._heap, waiter)
+            if granted is None:
+                break
+
+            self._bucket.take(now)
+            bucket = self._tenant_bucket(granted.tenant)
+            if bucket:
+                bucket.take(now)
+            self._active += 1
+            self._virtual_time = max(self._virtual_time, granted.tag)
+            key = granted.tenant or ""
+            if self._tenant_tags.get(key, 0) <= self._virtual_time:
+                # No later request queued for this tenant
+                self._tenant_tags.pop(key, None)
+            granted.future.set_result(None)
+
+        if not self._heap:
+            self._prune_tenants(now)
+
+        if retry_in is not None and self._heap:
+            logger.debug(f"Rate limit reached ({self.rpm_limit}/min), retrying in {retry_in:.2f}s")
+            self._timer = asyncio.get_running_loop().call_later(retry_in, self._dispatch)
+
+    def _prune_tenants(self, now: float):
+        """Drop per-tenant state that no longer affects scheduling.
+
+        Tags at or behind the virtual time are equivalent to no tag, and a
+        full bucket is equivalent to a fresh one.
+        """
+        self._tenant_tags = {
+            key: tag
+            for key, tag in self._tenant_tags.items()
+            if tag > self._virtual_time
+        }
+        for tenant, bucket in list(self._tenant_buckets.items()):
+            bucket.wait_time(now)  # Refills
+            if bucket.tokens >= bucket.capacity:
+                del self._tenant_buckets[tenant]
+
+    def _schedule_dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._dispatch()
+
+    def _release(self):
+        self._active -= 1
+        if self._heap:
+            self._schedule_dispatch()
 
     @asynccontextmanager
-    async def acquire(self):
+    async def acquire(
+        self, priority: Optional[Priority] = None, tenant: Optional[Any] = None
+    ):
         """Acquire a slot for making a request.
 
         This context manager yields when a slot is available and rate limits are respected.
 
+        Args:
+            priority: Request priority; defaults to the ambient ``request_priority``
+            tenant: Fairness/limit key such as a guild ID; defaults to ambient tenant
+
         Usage:
-            async with rate_limiter.acquire():
+            async with rate_limiter.acquire(priority=Priority.INTERACTIVE):
                 await make_api_call()
         """
-        # First wait for concurrency slot
-        async with self.semaphore:
-            # Check rate limit in a loop to ensure we re-check after sleeping
-            while True:
-                wait_time = 0
-
-                async with self._lock:
-                    now = time.time()
-
-                    # Filter out requests older than 1 minute
-                    self.requests = [t for t in self.requests if now - t < 60]
-
-                    if len(self.requests) < self.rpm_limit:
-                        # Record this request and break loop
-                        self.requests.append(now)
-                        break
-                    else:
-                        # Calculate wait time
-                        oldest_request = self.requests[0]
-                        wait_time = 60 - (now - oldest_request)
-                        if wait_time < 0:
-                            wait_time = 0
-
-                # Sleep outside the lock if we need to wait
-                if wait_time > 0:
-                    logger.warning(f"Rate limit reached ({self.rpm_limit}/min), waiting {wait_time:.1f}s")
-                    await asyncio.sleep(wait_time)
-                else:
-                    # Should rarely happen if logic is correct, but safe guard
-                    if len(self.requests) >= self.rpm_limit:
-                         await asyncio.sleep(0.1)
-
-            # Yield control to the caller
-            try:
-                yield
-            finally:
-                pass
+        priority, tenant = resolve_request_context(priority, tenant)
+
+        started = time.monotonic()
+        waiter = self._enqueue(priority, tenant)
+        self._schedule_dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted just before the cancellation landed
+                self._release()
+            raise
+
+        self._waits[priority].append(time.monotonic() - started)
+        self._granted[priority] += 1
+        try:
+            yield
+        finally:
+            self._release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limiter state and wait-time metrics per priority.
+
+        Returns:
+            Dictionary with active/queued counts and wait statistics (ms)
+        """
+        queued = {p.name.lower(): 0 for p in Priority}
+        for waiter in self._heap:
+            if not waiter.future.done():
+                queued[Priority(waiter.priority).name.lower()] += 1
+
+        waits = {}
+        for priority, samples in self._waits.items():
+            ordered = sorted(samples)
+            waits[priority.name.lower()] = {
+                "granted": self._granted[priority],
+                "avg_ms": round(sum(ordered) / len(ordered) * 1000, 1) if ordered else 0.0,
+                "p95_ms": round(ordered[int(len(ordered) * 0.95) - 1] * 1000, 1)
+                if ordered
+                else 0.0,
+                "max_ms": round(ordered[-1] * 1000, 1) if ordered else 0.0,
+            }
+
+        return {
+            "active": self._active,
+            "max_concurrent": self.max_concurrent,
+            "requests_per_minute": self.rpm_limit,
+            "tenant_requests_per_minute": self.tenant_rpm_limit,
+            "tokens_available": round(self._bucket.tokens, 2),
+            "queued": queued,
+            "wait": waits,
+        }
+
+
+_limiters: Dict[str, RateLimiter] = {}
+
+
+def get_rate_limiter(provider: str, **kwargs) -> RateLimiter:
+    """Get the shared limiter for a provider, creating it on first use.
+
+    Every service talking to the same backend shares one limiter, so
+    background and interactive traffic are prioritized against each other.
+
+    Args:
+        provider: Provider key (e.g. ``"ollama:http://localhost:11434"``)
+        **kwargs: ``RateLimiter`` arguments used when creating the limiter
+    """
+    limiter = _limiters.get(provider)
+    if limiter is None:
+        limiter = RateLimiter(**kwargs)
+        _limiters[provider] = limiter
+    return limiter
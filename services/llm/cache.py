@@ -1,11 +1,17 @@
 """LLM response caching service to reduce API calls."""
+import asyncio
 import hashlib
 import json
 import logging
+import sqlite3
+import threading
 import time
 from collections import OrderedDict
+from pathlib import Path
 from typing import Optional, Dict, List, Any
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -206,3 +212,685 @@ class LLMCache:
             f"hits={stats['hits']}, misses={stats['misses']}, "
             f"hit_rate={stats['hit_rate_percent']}%)"
         )
+
+    async def aget(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float,
+        system_prompt: Optional[str] = None,
+        persona_id: Optional[str] = None,
+        **kwargs
+    ) -> Optional[str]:
+        """Async lookup; the in-memory cache only has an exact-match tier.
+
+        Args:
+            messages: Conversation messages
+            model: Model name
+            temperature: Temperature parameter
+            system_prompt: Optional system prompt
+            persona_id: Optional persona scope (unused by the in-memory cache)
+            **kwargs: Additional cache key parameters
+
+        Returns:
+            Cached response or None if not found/expired
+        """
+        return self.get(
+            messages=messages,
+            model=model,
+            temperature=temperature,
+            system_prompt=system_prompt,
+            **kwargs
+        )
+
+    async def aset(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float,
+        response: str,
+        system_prompt: Optional[str] = None,
+        persona_id: Optional[str] = None,
+        **kwargs
+    ):
+        """Async store; mirrors ``set`` for the in-memory cache.
+
+        Args:
+            messages: Conversation messages
+            model: Model name
+            temperature: Temperature parameter
+            response: LLM response to cache
+            system_prompt: Optional system prompt
+            persona_id: Optional persona scope (unused by the in-memory cache)
+            **kwargs: Additional cache key parameters
+        """
+        self.set(
+            messages=messages,
+            model=model,
+            temperature=temperature,
+            response=response,
+            system_prompt=system_prompt,
+            **kwargs
+        )
+
+
+class PersistentLLMCache(LLMCache):
+    """SQLite-backed LLM cache with an exact tier and an optional semantic tier.
+
+    The in-memory LRU inherited from ``LLMCache`` stays in front of the
+    database, so hot keys never touch disk. Misses fall through to SQLite,
+    which survives restarts. When an embedding provider is configured, the
+    async ``aget`` additionally matches near-duplicate prompts by cosine
+    similarity, scoped to the same model, system prompt and persona.
+
+    The async entry points run all SQLite work in a worker thread. The
+    database is opened on first use, so a disabled cache never creates it.
+    The prompt embedding computed by a missed ``aget`` is reused by the
+    ``aset`` that follows it, so each miss embeds the prompt once.
+    """
+
+    # Prune the database every N writes instead of on every write
+    PRUNE_INTERVAL = 100
+
+    def __init__(
+        self,
+        db_path: Path,
+        max_size: int = 1000,
+        ttl_seconds: int = 3600,
+        enabled: bool = True,
+        max_disk_entries: int = 20000,
+        embedding_provider: Optional[Any] = None,
+        semantic_threshold: float = 0.95,
+    ):
+        """Initialize persistent LLM cache.
+
+        Args:
+            db_path: Path to SQLite database file
+            max_size: Maximum entries kept in the in-memory LRU
+            ttl_seconds: Time-to-live for cached entries
+            enabled: Whether caching is enabled
+            max_disk_entries: Maximum rows kept on disk (LRU by last access)
+            embedding_provider: Optional provider with ``async embed(text)``;
+                enables the semantic tier when set
+            semantic_threshold: Minimum cosine similarity for a semantic hit
+        """
+        super().__init__(max_size=max_size, ttl_seconds=ttl_seconds, enabled=enabled)
+        self.db_path = Path(db_path)
+        self.max_disk_entries = max_disk_entries
+        self.embedding_provider = embedding_provider
+        self.semantic_threshold = semantic_threshold
+
+        self.disk_hits = 0
+        self.semantic_hits = 0
+        self._writes_since_prune = 0
+        # Row count, maintained by the worker-thread writers for get_stats
+        self._disk_size = 0
+
+        # Embeddings of missed prompts, awaiting the matching aset
+        self._miss_embeddings: OrderedDict[str, List[float]] = OrderedDict()
+
+        # Per-scope embedding matrices: {scope: (keys, unit-normalized matrix)}
+        self._scope_index: Dict[str, tuple[List[str], np.ndarray]] = {}
+
+        # Opened lazily; the lock serializes worker threads on the connection
+        self._conn: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.RLock()
+
+    def _db(self) -> sqlite3.Connection:
+        """Return the connection, creating the database on first use."""
+        with self._db_lock:
+            if self._conn is None:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+                self._init_db()
+            return self._conn
+
+    def _init_db(self):
+        """Create tables if they don't exist."""
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                cache_key TEXT PRIMARY KEY,
+                scope TEXT NOT NULL,
+                response TEXT NOT NULL,
+                embedding BLOB,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_scope ON responses (scope)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_access ON responses (last_access)"
+        )
+        self._conn.commit()
+        self._disk_size = self._conn.execute(
+            "SELECT COUNT(*) FROM responses"
+        ).fetchone()[0]
+
+    @staticmethod
+    def _scope_key(
+        model: str,
+        temperature: float,
+        system_prompt: Optional[str],
+        persona_id: Optional[str],
+    ) -> str:
+        """Build the semantic scope: only prompts within one scope may match."""
+        scope_data = {
+            "model": model,
+            "temperature": round(temperature, 2),
+            "system_prompt": system_prompt,
+            "persona_id": persona_id,
+        }
+        scope_json = json.dumps(scope_data, sort_keys=True, ensure_ascii=True)
+        return hashlib.sha256(scope_json.encode()).hexdigest()
+
+    @staticmethod
+    def _semantic_text(messages: List[Dict[str, str]]) -> str:
+        """Flatten messages into the text that gets embedded."""
+        return "\n".join(
+            f"{msg.get('role', 'user')}: {msg.get('content', '')}" for msg in messages
+        )
+
+    def _from_memory(self, cache_key: str) -> Optional[str]:
+        """Return a non-expired in-memory response, dropping an expired one."""
+        entry = self.cache.get(cache_key)
+        if entry is None:
+            return None
+        if time.time() - entry[1] > self.ttl_seconds:
+            del self.cache[cache_key]
+            return None
+        self.cache.move_to_end(cache_key)
+        return entry[0]
+
+    def _fetch_row(self, cache_key: str) -> Optional[tuple[str, float]]:
+        """Read a non-expired row and touch its last access.
+
+        Only touches the database, so it is safe to run in a worker thread.
+
+        Returns:
+            ``(response, created_at)`` or None if missing/expired
+        """
+        with self._db_lock:
+            conn = self._db()
+            row = conn.execute(
+                "SELECT response, created_at FROM responses WHERE cache_key = ?",
+                (cache_key,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            response, created_at = row
+            now = time.time()
+            if now - created_at > self.ttl_seconds:
+                conn.execute("DELETE FROM responses WHERE cache_key = ?", (cache_key,))
+                conn.commit()
+                self._disk_size -= 1
+                self._scope_index.clear()
+                self.ttl_expirations += 1
+                return None
+
+            conn.execute(
+                "UPDATE responses SET last_access = ? WHERE cache_key = ?",
+                (now, cache_key),
+            )
+            conn.commit()
+        return response, created_at
+
+    def _store_row(
+        self,
+        cache_key: str,
+        scope: str,
+        response: str,
+        blob: Optional[bytes],
+        now: float,
+    ):
+        """Write a row, pruning every ``PRUNE_INTERVAL`` writes.
+
+        Only touches the database, so it is safe to run in a worker thread.
+        """
+        with self._db_lock:
+            conn = self._db()
+            exists = conn.execute(
+                "SELECT 1 FROM responses WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO responses
+                    (cache_key, scope, response, embedding, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (cache_key, scope, response, blob, now, now),
+            )
+            conn.commit()
+            if exists is None:
+                self._disk_size += 1
+            if blob is not None:
+                self._scope_index.pop(scope, None)
+
+            self._writes_since_prune += 1
+            if self._writes_since_prune >= self.PRUNE_INTERVAL:
+                self._prune()
+
+    def _remember(self, cache_key: str, response: str, timestamp: float):
+        """Insert into the in-memory LRU, evicting the oldest entry if full."""
+        if len(self.cache) >= self.max_size and cache_key not in self.cache:
+            self.cache.popitem(last=False)
+            self.evictions += 1
+        self.cache[cache_key] = (response, timestamp)
+        self.cache.move_to_end(cache_key)
+
+    def _prune(self):
+        """Drop expired rows, then trim to ``max_disk_entries`` by last access."""
+        with self._db_lock:
+            conn = self._db()
+            cutoff = time.time() - self.ttl_seconds
+            expired = conn.execute(
+                "DELETE FROM responses WHERE created_at < ?", (cutoff,)
+            ).rowcount
+            self.ttl_expirations += max(expired, 0)
+
+            count = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            self._disk_size = min(count, self.max_disk_entries)
+            overflow = count - self.max_disk_entries
+            if overflow > 0:
+                conn.execute(
+                    """
+                    DELETE FROM responses WHERE cache_key IN (
+                        SELECT cache_key FROM responses ORDER BY last_access ASC LIMIT ?
+                    )
+                    """,
+                    (overflow,),
+                )
+                self.evictions += overflow
+            conn.commit()
+            if expired or overflow > 0:
+                self._scope_index.clear()
+            self._writes_since_prune = 0
+
+    def get(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float,
+        system_prompt: Optional[str] = None,
+        **kwargs
+    ) -> Optional[str]:
+        """Exact-match lookup: memory first, then disk.
+
+        Blocks on SQLite; async callers should use ``aget``.
+
+        Args:
+            messages: Conversation messages
+            model: Model name
+            temperature: Temperature parameter
+            system_prompt: Optional system prompt
+            **kwargs: Additional cache key parameters
+
+        Returns:
+            Cached response or None if not found/expired
+        """
+        if not self.enabled:
+            return None
+
+        cache_key = self._generate_cache_key(
+            messages=messages,
+            model=model,
+            temperature=temperature,
+            system_prompt=system_prompt,
+            **kwargs
+        )
+
+        response = self._from_memory(cache_key)
+        if response is not None:
+            self.hits += 1
+            return response
+
+        row = self._fetch_row(cache_key)
+        if row is not None:
+            return self._disk_hit(cache_key, row)
+
+        self.misses += 1
+        return None
+
+    def _disk_hit(self, cache_key: str, row: tuple[str, float]) -> str:
+        """Promote a row read from disk into memory and count the hit."""
+        self._remember(cache_key, *row)
+        self.hits += 1
+        self.disk_hits += 1
+        logger.debug(f"Cache HIT from disk (key: {cache_key[:16]}...)")
+        return row[0]
+
+    def set(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float,
+        response: str,
+        system_prompt: Optional[str] = None,
+        persona_id: Optional[str] = None,
+        embedding: Optional[List[float]] = None,
+        **kwargs
+    ):
+        """Store response in memory and on disk.
+
+        Blocks on SQLite; async callers should use ``aset``.
+
+        Args:
+            messages: Conversation messages
+            model: Model name
+            temperature: Temperature parameter
+            response: LLM response to cache
+            system_prompt: Optional system prompt
+            persona_id: Optional persona scope for the semantic tier
+            embedding: Optional precomputed prompt embedding
+            **kwargs: Additional cache key parameters
+        """
+        if not self.enabled:
+            return
+        row = self._prepare_row(
+            messages,
+            model,
+            temperature,
+            response,
+            system_prompt,
+            persona_id,
+            embedding,
+            **kwargs
+        )
+        self._store_row(*row)
+
+    def _prepare_row(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float,
+        response: str,
+        system_prompt: Optional[str],
+        persona_id: Optional[str],
+        embedding: Optional[List[float]],
+        **kwargs
+    ) -> tuple[str, str, str, Optional[bytes], float]:
+        """Remember a response in memory and build its database row."""
+        cache_key = self._generate_cache_key(
+            messages=messages,
+            model=model,
+            temperature=temperature,
+            system_prompt=system_prompt,
+            **kwargs
+        )
+        scope = self._scope_key(model, temperature, system_prompt, persona_id)
+        blob = (
+            np.asarray(embedding, dtype=np.float32).tobytes()
+            if embedding is not None
+            else None
+        )
+        now = time.time()
+        self._remember(cache_key, response, now)
+        return cache_key, scope, response, blob, now
+
+    def _semantic_index(self, scope: str) -> tuple[List[str], np.ndarray]:
+        """Load (and memoize) the normalized embedding matrix for a scope."""
+        # Held throughout so a concurrent write can't leave a stale index
+        with self._db_lock:
+            index = self._scope_index.get(scope)
+            if index is not None:
+                return index
+
+            cutoff = time.time() - self.ttl_seconds
+            rows = self._db().execute(
+                """
+                SELECT cache_key, embedding FROM responses
+                WHERE scope = ? AND embedding IS NOT NULL AND created_at >= ?
+                """,
+                (scope, cutoff),
+            ).fetchall()
+
+            keys = [row[0] for row in rows]
+            if rows:
+                matrix = np.stack(
+                    [np.frombuffer(row[1], dtype=np.float32) for row in rows]
+                )
+                norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                matrix = matrix / np.where(norms > 0, norms, 1.0)
+            else:
+                matrix = np.empty((0, 0), dtype=np.float32)
+
+            self._scope_index[scope] = (keys, matrix)
+            return keys, matrix
+
+    async def _embed(self, messages: List[Dict[str, str]]) -> Optional[List[float]]:
+        """Embed the prompt, returning None if the provider fails."""
+        if self.embedding_provider is None:
+            return None
+        try:
+            return await self.embedding_provider.embed(self._semantic_text(messages))
+        except Exception as e:
+            logger.warning(f"Semantic cache embedding failed: {e}")
+            return None
+
+    async def aget(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float,
+        system_prompt: Optional[str] = None,
+        persona_id: Optional[str] = None,
+        **kwargs
+    ) -> Optional[str]:
+        """Exact lookup, falling back to the semantic tier when enabled.
+
+        Args:
+            messages: Conversation messages
+            model: Model name
+            temperature: Temperature parameter
+            system_prompt: Optional system prompt
+            persona_id: Persona scope for semantic matches
+            **kwargs: Additional cache key parameters
+
+        Returns:
+            Cached response or None if not found/expired
+        """
+        if not self.enabled:
+            return None
+
+        cache_key = self._generate_cache_key(
+            messages=messages,
+            model=model,
+            temperature=temperature,
+            system_prompt=system_prompt,
+            **kwargs
+        )
+        response = self._from_memory(cache_key)
+        if response is not None:
+            self.hits += 1
+            return response
+
+        row = await asyncio.to_thread(self._fetch_row, cache_key)
+        if row is not None:
+            return self._disk_hit(cache_key, row)
+
+        if self.embedding_provider is None:
+            self.misses += 1
+            return None
+
+        embedding = await self._embed(messages)
+        response = await self._semantic_get(
+            embedding, model, temperature, system_prompt, persona_id
+        )
+        if response is None:
+            self.misses += 1
+            if embedding is not None:
+                self._remember_miss_embedding(cache_key, embedding)
+        return response
+
+    def _remember_miss_embedding(self, cache_key: str, embedding: List[float]):
+        """Keep a missed prompt's embedding for the ``aset`` that follows."""
+        self._miss_embeddings[cache_key] = embedding
+        self._miss_embeddings.move_to_end(cache_key)
+        # Requests that fail never call aset; don't let their entries pile up
+        while len(self._miss_embeddings) > self.max_size:
+            self._miss_embeddings.popitem(last=False)
+
+    async def _semantic_get(
+        self,
+        embedding: Optional[List[float]],
+        model: str,
+        temperature: float,
+        system_prompt: Optional[str],
+        persona_id: Optional[str],
+    ) -> Optional[str]:
+        """Best near-duplicate response within the scope, if similar enough."""
+        if embedding is None:
+            return None
+
+        scope = self._scope_key(model, temperature, system_prompt, persona_id)
+        keys, matrix = await asyncio.to_thread(self._semantic_index, scope)
+        if not keys:
+            return None
+        query = np.asarray(embedding, dtype=np.float32)
+        if query.shape[0] != matrix.shape[1]:
+            return None
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return None
+
+        scores = matrix @ (query / norm)
+        best = int(np.argmax(scores))
+        if scores[best] < self.semantic_threshold:
+            return None
+
+        row = await asyncio.to_thread(self._fetch_row, keys[best])
+        if row is None:
+            return None
+
+        self._remember(keys[best], *row)
+        self.hits += 1
+        self.semantic_hits += 1
+        logger.debug(f"Semantic cache HIT (similarity: {scores[best]:.3f})")
+        return row[0]
+
+    async def aset(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float,
+        response: str,
+        system_prompt: Optional[str] = None,
+        persona_id: Optional[str] = None,
+        **kwargs
+    ):
+        """Store response, embedding the prompt when the semantic tier is on.
+
+        Args:
+            messages: Conversation messages
+            model: Model name
+            temperature: Temperature parameter
+            response: LLM response to cache
+            system_prompt: Optional system prompt
+            persona_id: Persona scope for semantic matches
+            **kwargs: Additional cache key parameters
+        """
+        if not self.enabled:
+            return
+        cache_key = self._generate_cache_key(
+            messages=messages,
+            model=model,
+            temperature=temperature,
+            system_prompt=system_prompt,
+            **kwargs
+        )
+        embedding = self._miss_embeddings.pop(cache_key, None)
+        if embedding is None:
+            embedding = await self._embed(messages)
+        row = self._prepare_row(
+            messages,
+            model,
+            temperature,
+            response,
+            system_prompt,
+            persona_id,
+            embedding,
+            **kwargs
+        )
+        await asyncio.to_thread(self._store_row, *row)
+
+    def clear(self):
+        """Clear all cached entries from memory and disk."""
+        super().clear()
+        self._miss_embeddings.clear()
+        with self._db_lock:
+            if self._conn is not None or self.db_path.exists():
+                self._db().execute("DELETE FROM responses")
+                self._conn.commit()
+            self._scope_index.clear()
+            self._disk_size = 0
+
+    def close(self):
+        """Close the database connection, if it was opened."""
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics, including disk and semantic tiers.
+
+        Never touches SQLite, so it is safe to call on the event loop.
+        ``disk_size`` is counted once the database has been opened.
+
+        Returns:
+            Dictionary with cache stats
+        """
+        stats = super().get_stats()
+        stats.update(
+            {
+                "persistent": True,
+                "db_path": str(self.db_path),
+                "disk_size": self._disk_size,
+                "max_disk_entries": self.max_disk_entries,
+                "disk_hits": self.disk_hits,
+                "semantic_enabled": self.embedding_provider is not None,
+                "semantic_threshold": self.semantic_threshold,
+                "semantic_hits": self.semantic_hits,
+            }
+        )
+        return stats
+
+
+def create_llm_cache() -> LLMCache:
+    """Build the LLM cache described by the current configuration.
+
+    Returns:
+        ``PersistentLLMCache`` when ``LLM_CACHE_PERSISTENT`` is set, otherwise
+        the in-memory ``LLMCache``.
+    """
+    from config import Config
+
+    if not Config.LLM_CACHE_PERSISTENT:
+        return LLMCache(
+            max_size=Config.LLM_CACHE_MAX_SIZE,
+            ttl_seconds=Config.LLM_CACHE_TTL_SECONDS,
+            enabled=Config.LLM_CACHE_ENABLED,
+        )
+
+    embedding_provider = None
+    if Config.LLM_CACHE_SEMANTIC_ENABLED:
+        try:
+            from providers.embeddings import get_provider
+
+            embedding_provider = get_provider()
+        except Exception as e:
+            logger.warning(f"Semantic LLM cache disabled, no embedding provider: {e}")
+
+    return PersistentLLMCache(
+        db_path=Config.LLM_CACHE_PATH,
+        max_size=Config.LLM_CACHE_MAX_SIZE,
+        ttl_seconds=Config.LLM_CACHE_TTL_SECONDS,
+        enabled=Config.LLM_CACHE_ENABLED,
+        max_disk_entries=Config.LLM_CACHE_MAX_DISK_ENTRIES,
+        embedding_provider=embedding_provider,
+        semantic_threshold=Config.LLM_CACHE_SEMANTIC_THRESHOLD,
+    )
@@ -45,6 +45,7 @@ class LLMFallbackManager:
         system_prompt: Optional[str] = None,
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
+        **kwargs,
     ) -> tuple[str, str]:
         """Send chat request with automatic fallback.
 
@@ -54,6 +55,7 @@ class LLMFallbackManager:
             system_prompt: Optional system prompt
             temperature: Temperature override
             max_tokens: Max tokens override
+            **kwargs: Passed through to ``llm_service.chat`` (e.g. persona_id)
 
         Returns:
             Tuple of (response, model_used)
@@ -86,7 +88,8 @@ class LLMFallbackManager:
                     messages=messages,
                     system_prompt=system_prompt,
                     temperature=actual_temp,
-                    max_tokens=max_tokens
+                    max_tokens=max_tokens,
+                    **kwargs
                 )
 
                 elapsed = time.time() - start_time
@@ -4,12 +4,19 @@ import aiohttp
 import logging
 import json
 import asyncio
-import hashlib
-from typing import List, Dict, Optional, Any, AsyncGenerator
+from collections import deque
+from typing import List, Dict, Optional, Any, AsyncGenerator, Deque
 
 from config import Config
-from services.llm.cache import LLMCache
-from services.core.rate_limiter import RateLimiter
+from providers.coalescing import get_request_coalescer, request_key
+from providers.streaming import (
+    STREAM_METRICS_HISTORY,
+    StreamMetrics,
+    StreamStalledError,
+    iter_ndjson_lines,
+)
+from services.llm.cache import create_llm_cache
+from services.core.rate_limiter import Priority, get_rate_limiter
 from services.interfaces import LLMInterface
 from utils.error_handlers import (
     handle_service_error,
@@ -22,110 +29,6 @@ from utils.error_handlers import (
 logger = logging.getLogger(__name__)
 
 
-class RequestDeduplicator:
-    """Deduplicates concurrent identical requests to avoid redundant API calls."""
-
-    def __init__(self):
-        """Initialize request deduplicator."""
-        self.pending_requests: Dict[str, asyncio.Task] = {}
-        self._cleanup_delay = 5  # seconds to keep completed requests cached
-
-    def _hash_request(
-        self,
-        messages: List[Dict],
-        model: str,
-        temperature: float,
-        system_prompt: Optional[str] = None,
-    ) -> str:
-        """Create a hash key for a request.
-
-        Args:
-            messages: List of message dicts
-            model: Model name
-            temperature: Temperature value
-            system_prompt: Optional system prompt
-
-        Returns:
-            Hash string
-        """
-        # Create stable string representation
-        request_str = json.dumps(
-            {
-                "messages": messages,
-                "model": model,
-                "temperature": temperature,
-                "system_prompt": system_prompt or "",
-            },
-            sort_keys=True,
-        )
-
-        return hashlib.sha256(request_str.encode()).hexdigest()
-
-    def create_request_key(
-        self,
-        messages: List[Dict],
-        model: str,
-        temperature: float,
-        system_prompt: Optional[str] = None,
-    ) -> str:
-        """Create a request key for deduplication."""
-        return self._hash_request(messages, model, temperature, system_prompt)
-
-    async def deduplicate(self, key: str, coro):
-        """Deduplicate a request by key.
-
-        If an identical request is already pending, waits for its result.
-        Otherwise, creates a new request.
-
-        Args:
-            key: Request hash key
-            coro: Coroutine to execute if not deduplicated
-
-        Returns:
-            Result from the coroutine
-        """
-        # Check if identical request is already pending
-        if key in self.pending_requests:
-            task = self.pending_requests[key]
-            if not task.done():
-                logger.debug(f"Deduplicating request with key: {key[:16]}...")
-                # Wait for the existing request to complete
-                return await task
-
-        # Create new task for this request
-        task = asyncio.create_task(coro)
-        self.pending_requests[key] = task
-
-        try:
-            result = await task
-
-            # Schedule cleanup after a short delay (allows immediate duplicates to benefit)
-            async def cleanup():
-                await asyncio.sleep(self._cleanup_delay)
-                self.pending_requests.pop(key, None)
-
-            asyncio.create_task(cleanup())
-
-            return result
-        except Exception as e:
-            # Remove failed request immediately
-            self.pending_requests.pop(key, None)
-            raise e
-
-    def get_stats(self) -> Dict:
-        """Get deduplication statistics.
-
-        Returns:
-            Dict with pending request count
-        """
-        return {
-            "pending_requests": len(self.pending_requests),
-            "active_deduplication": sum(
-                1 for task in self.pending_requests.values() if not task.done()
-            ),
-        }
-
-
 class OllamaService(LLMInterface):
     """Service for interacting with Ollama LLM."""
 
@@ -167,23 +70,28 @@ class OllamaService(LLMInterface):
         self.presence_penalty = presence_penalty
         self.top_p = top_p
         self.session: Optional[aiohttp.ClientSession] = None
+        # One entry per finished stream; concurrent streams don't overwrite
+        # each other
+        self.recent_stream_metrics: Deque[Dict[str, Any]] = deque(
+            maxlen=STREAM_METRICS_HISTORY
+        )
 
         # Initialize Rate Limiter
-        # Limits concurrent requests to avoid OOM and rate limits API calls
-        self.rate_limiter = RateLimiter(
-            max_concurrent=5,  # Max 5 parallel generations
-            requests_per_minute=60,  # Max 60 requests per minute
+        # Limits concurrent requests to avoid OOM and rate limits API calls.
+        # Shared per host so background and interactive calls are prioritized
+        # against each other across every OllamaService instance.
+        self.rate_limiter = get_rate_limiter(
+            f"ollama:{self.host}",
+            max_concurrent=Config.LLM_RATE_LIMIT_MAX_CONCURRENT,
+            requests_per_minute=Config.LLM_RATE_LIMIT_RPM,
+            tenant_requests_per_minute=Config.LLM_RATE_LIMIT_TENANT_RPM or None,
         )
 
         # Initialize LLM response cache
-        self.cache = LLMCache(
-            max_size=Config.LLM_CACHE_MAX_SIZE,
-            ttl_seconds=Config.LLM_CACHE_TTL_SECONDS,
-            enabled=Config.LLM_CACHE_ENABLED,
-        )
+        self.cache = create_llm_cache()
 
-        # Initialize request deduplicator
-        self.deduplicator = RequestDeduplicator()
+        # Identical in-flight requests (from any backend) share one call
+        self.coalescer = get_request_coalescer()
 
     async def initialize(self):
         """Initialize the HTTP session."""
@@ -253,11 +161,15 @@ class OllamaService(LLMInterface):
 
         # Check cache first
         temp = temperature or self.temperature
-        cached_response = self.cache.get(
+        persona_id = kwargs.get("persona_id")
+        priority = kwargs.get("priority")
+        guild_id = kwargs.get("guild_id")
+        cached_response = await self.cache.aget(
             messages=messages,
             model=self.model,
             temperature=temp,
             system_prompt=system_prompt,
+            persona_id=persona_id,
         )
         if cached_response:
             logger.debug(
@@ -266,11 +178,15 @@ class OllamaService(LLMInterface):
             return cached_response
 
         # Create deduplication key
-        dedup_key = self.deduplicator.create_request_key(
-            messages=messages,
+        dedup_key = request_key(
+            "chat",
+            f"ollama:{self.host}",
+            messages,
             model=self.model,
             temperature=temp,
             system_prompt=system_prompt,
+            priority=priority,
+            tenant=guild_id,
         )
 
         # Define the actual request coroutine
@@ -300,7 +216,7 @@ class OllamaService(LLMInterface):
             }
 
             try:
-                async with self.rate_limiter.acquire():
+                async with self.rate_limiter.acquire(priority=priority, tenant=guild_id):
                     url = f"{self.host}/api/chat"
                     assert self.session is not None  # For mypy
                     async with self.session.post(
@@ -315,16 +231,17 @@ class OllamaService(LLMInterface):
                         data = await resp.json()
                         response = data["message"]["content"]
 
-                        # Cache the response
-                        self.cache.set(
-                            messages=messages,
-                            model=self.model,
-                            temperature=temp,
-                            response=response,
-                            system_prompt=system_prompt,
-                        )
+                # Cache the response once the limiter slot is released
+                await self.cache.aset(
+                    messages=messages,
+                    model=self.model,
+                    temperature=temp,
+                    response=response,
+                    system_prompt=system_prompt,
+                    persona_id=persona_id,
+                )
 
-                        return response
+                return response
 
             except aiohttp.ClientError as e:
                 logger.error(f"Ollama request failed: {e}")
@@ -334,7 +251,7 @@ class OllamaService(LLMInterface):
                 raise Exception("Invalid response from Ollama")
 
         # Deduplicate the request
-        return await self.deduplicator.deduplicate(dedup_key, perform_request())
+        return await self.coalescer.run(dedup_key, perform_request)
 
     @handle_service_error(error_type=ErrorType.API_ERROR)
     @retry_with_backoff(
@@ -363,12 +280,42 @@ class OllamaService(LLMInterface):
         Raises:
             Exception: If request fails
         """
-        if not self.session:
-            await self.initialize()
-
         # Clean messages to remove extra metadata fields
         messages = self._clean_messages(messages)
 
+        # Identical concurrent streams share one upstream request
+        key = request_key(
+            "chat_stream",
+            f"ollama:{self.host}",
+            messages,
+            model=self.model,
+            temperature=temperature or self.temperature,
+            system_prompt=system_prompt,
+        )
+        async for chunk in self.coalescer.stream(
+            key,
+            lambda: self._stream_request(
+                messages,
+                system_prompt,
+                temperature,
+                priority=kwargs.get("priority"),
+                guild_id=kwargs.get("guild_id"),
+            ),
+        ):
+            yield chunk
+
+    async def _stream_request(
+        self,
+        messages: List[Dict[str, str]],
+        system_prompt: Optional[str],
+        temperature: Optional[float],
+        priority: Optional[Priority] = None,
+        guild_id: Optional[Any] = None,
+    ) -> AsyncGenerator[str, None]:
+        """Perform a single streaming request against Ollama."""
+        if not self.session:
+            await self.initialize()
+
         # Prepend system message if provided
         if system_prompt:
             messages = [{"role": "system", "content": system_prompt}] + messages
@@ -391,7 +338,7 @@ class OllamaService(LLMInterface):
         }
 
         try:
-            async with self.rate_limiter.acquire():
+            async with self.rate_limiter.acquire(priority=priority, tenant=guild_id):
                 url = f"{self.host}/api/chat"
                 assert self.session is not None  # For type checker
                 async with self.session.post(
@@ -403,18 +350,33 @@ class OllamaService(LLMInterface):
                             f"Ollama API error ({resp.status}): {error_text}"
                         )
 
-                    # Stream response chunks
-                    async for line in resp.content:
-                        if line:
+                    # Stream response chunks (NDJSON, parsed incrementally)
+                    metrics = StreamMetrics()
+                    eval_count = 0
+                    try:
+                        async for line in iter_ndjson_lines(
+                            resp.content, Config.LLM_STREAM_IDLE_TIMEOUT or None
+                        ):
                             try:
                                 chunk = json.loads(line)
-                                if "message" in chunk and "content" in chunk["message"]:
-                                    content = chunk["message"]["content"]
-                                    if content:
-                                        yield content
                             except json.JSONDecodeError:
                                 # Skip invalid JSON lines
                                 continue
+                            content = (chunk.get("message") or {}).get("content")
+                            if content:
+                                metrics.record()
+                                yield content
+                            if chunk.get("done"):
+                                eval_count = int(chunk.get("eval_count") or 0)
+                    except StreamStalledError:
+                        metrics.stalled = True
+                        logger.warning(
+                            f"Ollama stream stalled after {metrics.chunks} chunks"
+                        )
+                        raise
+                    finally:
+                        metrics.finish(tokens=eval_count)
+                        self.recent_stream_metrics.append(metrics.as_dict())
 
         except aiohttp.ClientError as e:
             logger.error(f"Ollama streaming request failed: {e}")
@@ -437,7 +399,7 @@ class OllamaService(LLMInterface):
             Generated text
         """
         messages = [{"role": "user", "content": prompt}]
-        return await self.chat(messages, system_prompt=system_prompt)
+        return await self.chat(messages, system_prompt=system_prompt, **kwargs)
 
     async def chat_with_vision(
         self,
@@ -569,9 +531,14 @@ class OllamaService(LLMInterface):
             Dictionary with cache statistics
         """
         cache_stats = self.cache.get_stats()
-        dedup_stats = self.deduplicator.get_stats()
+        dedup_stats = self.coalescer.get_stats()
 
-        return {**cache_stats, "deduplication": dedup_stats}
+        return {
+            **cache_stats,
+            "deduplication": dedup_stats,
+            "rate_limiter": self.rate_limiter.get_stats(),
+            "recent_streams": list(self.recent_stream_metrics),
+        }
 
     def clear_cache(self):
         """Clear the LLM response cache."""
@@ -5,10 +5,20 @@ import asyncio
 import logging
 import json
 import time
-from typing import List, Dict, Optional, AsyncGenerator, Any
+from collections import deque
+from typing import List, Dict, Optional, AsyncGenerator, Any, Deque
 
 from config import Config
-from services.llm.cache import LLMCache
+from providers.coalescing import get_request_coalescer, request_key
+from providers.streaming import (
+    STREAM_METRICS_HISTORY,
+    SSEParser,
+    StreamMetrics,
+    StreamStalledError,
+    iter_sse_events,
+)
+from services.llm.cache import create_llm_cache
+from services.core.rate_limiter import get_rate_limiter
 from services.interfaces import LLMInterface
 
 logger = logging.getLogger(__name__)
@@ -67,6 +77,11 @@ class OpenRouterService(LLMInterface):
 
         self.last_response_time = 0.0
         self.last_tps = 0.0
+        # One entry per finished stream; concurrent streams don't overwrite
+        # each other
+        self.recent_stream_metrics: Deque[Dict[str, Any]] = deque(
+            maxlen=STREAM_METRICS_HISTORY
+        )
         self.total_requests = 0
         self.total_tokens_generated = 0
         self.average_response_time = 0.0
@@ -74,12 +89,17 @@ class OpenRouterService(LLMInterface):
 
         self.context_length: Optional[int] = None
 
-        self.cache = LLMCache(
-            max_size=Config.LLM_CACHE_MAX_SIZE,
-            ttl_seconds=Config.LLM_CACHE_TTL_SECONDS,
-            enabled=Config.LLM_CACHE_ENABLED,
+        # Shared with every client of this endpoint, like OllamaService's
+        self.rate_limiter = get_rate_limiter(
+            f"openrouter:{self.base_url}",
+            max_concurrent=Config.LLM_RATE_LIMIT_MAX_CONCURRENT,
+            requests_per_minute=Config.LLM_RATE_LIMIT_RPM,
+            tenant_requests_per_minute=Config.LLM_RATE_LIMIT_TENANT_RPM or None,
         )
 
+        self.cache = create_llm_cache()
+        self.coalescer = get_request_coalescer()
+
     async def initialize(self):
         """Initialize the HTTP session and fetch model info."""
         if not self.session:
@@ -116,6 +136,7 @@ class OpenRouterService(LLMInterface):
         system_prompt: Optional[str] = None,
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
+        persona_id: Optional[str] = None,
     ) -> str:
         """Send a chat request to OpenRouter.
 
@@ -124,21 +145,25 @@ class OpenRouterService(LLMInterface):
             system_prompt: Optional system prompt
             temperature: Optional temperature override
             max_tokens: Optional max tokens override
+            persona_id: Optional persona scope for semantic cache matches
         """
         if not self.session:
             await self.initialize()
 
         # Clean messages
         messages = self._clean_messages(messages)
+        # Snapshot for the cache key; the system prompt merge below mutates messages
+        cache_messages = [dict(msg) for msg in messages]
 
         # Check cache first
         temp = temperature or self.temperature
         max_tok = max_tokens or self.max_tokens
-        cached_response = self.cache.get(
-            messages=messages,
+        cached_response = await self.cache.aget(
+            messages=cache_messages,
             model=self.model,
             temperature=temp,
             system_prompt=system_prompt,
+            persona_id=persona_id,
             max_tokens=max_tok,
         )
         if cached_response:
@@ -147,6 +172,40 @@ class OpenRouterService(LLMInterface):
             )
             return cached_response
 
+        key = request_key(
+            "chat",
+            f"openrouter:{self.base_url}",
+            cache_messages,
+            model=self.model,
+            temperature=temp,
+            system_prompt=system_prompt,
+            max_tokens=max_tok,
+        )
+        return await self.coalescer.run(
+            key,
+            lambda: self._perform_chat(
+                messages=messages,
+                cache_messages=cache_messages,
+                system_prompt=system_prompt,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                persona_id=persona_id,
+            ),
+        )
+
+    async def _perform_chat(
+        self,
+        messages: List[Dict[str, str]],
+        cache_messages: List[Dict[str, str]],
+        system_prompt: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        persona_id: Optional[str],
+    ) -> str:
+        """Send a (cache-missed, coalesced) chat request and cache the reply."""
+        temp = temperature or self.temperature
+        max_tok = max_tokens or self.max_tokens
+
         # Prepend system message if provided
         if system_prompt:
             # Check if there is already a system message at the start
@@ -187,7 +246,7 @@ class OpenRouterService(LLMInterface):
 
         try:
             url = f"{self.base_url}/chat/completions"
-            async with self.session.post(
+            async with self.rate_limiter.acquire(), self.session.post(
                 url, json=payload, timeout=aiohttp.ClientTimeout(total=self.timeout)
             ) as resp:
                 if resp.status != 200:
@@ -257,17 +316,18 @@ class OpenRouterService(LLMInterface):
 
                 response = data["choices"][0]["message"]["content"]
 
-                # Cache the response
-                self.cache.set(
-                    messages=messages,
-                    model=self.model,
-                    temperature=temp,
-                    response=response,
-                    system_prompt=system_prompt,
-                    max_tokens=max_tok,
-                )
+            # Cache the response once the limiter slot is released
+            await self.cache.aset(
+                messages=cache_messages,
+                model=self.model,
+                temperature=temp,
+                response=response,
+                system_prompt=system_prompt,
+                persona_id=persona_id,
+                max_tokens=max_tok,
+            )
 
-                return response
+            return response
 
         except asyncio.TimeoutError:
             elapsed = time.time() - start_time
@@ -291,16 +351,45 @@ class OpenRouterService(LLMInterface):
     ) -> AsyncGenerator[str, None]:
         """Stream chat responses from OpenRouter.
 
+        Identical concurrent streams share one upstream request; every caller
+        receives the full chunk sequence.
+
         Args:
             messages: List of message dicts with 'role' and 'content'
             system_prompt: Optional system prompt
             temperature: Optional temperature override
             max_tokens: Optional max tokens override
         """
+        messages = self._clean_messages(messages)
+        key = request_key(
+            "chat_stream",
+            f"openrouter:{self.base_url}",
+            messages,
+            model=self.model,
+            temperature=temperature or self.temperature,
+            system_prompt=system_prompt,
+            max_tokens=max_tokens or self.max_tokens,
+        )
+        async for chunk in self.coalescer.stream(
+            key,
+            lambda: self._stream_request(
+                messages, system_prompt, temperature, max_tokens
+            ),
+        ):
+            yield chunk
+
+    async def _stream_request(
+        self,
+        messages: List[Dict[str, str]],
+        system_prompt: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+    ) -> AsyncGenerator[str, None]:
+        """Perform a single streaming request against OpenRouter."""
         if not self.session:
             await self.initialize()
 
-        messages = self._clean_messages(messages)
+        messages = [dict(msg) for msg in messages]
 
         if system_prompt:
             if messages and messages[0]["role"] == "system":
@@ -336,8 +425,7 @@ class OpenRouterService(LLMInterface):
 
         # Streaming metrics
         start_time = time.time()
-        first_token_time = None
-        token_count = 0
+        metrics = StreamMetrics()
 
         try:
             url = f"{self.base_url}/chat/completions"
@@ -346,51 +434,49 @@ class OpenRouterService(LLMInterface):
             timeout = aiohttp.ClientTimeout(
                 total=None, sock_read=self.stream_timeout, connect=self.timeout
             )
-            async with self.session.post(url, json=payload, timeout=timeout) as resp:
+            async with self.rate_limiter.acquire(), self.session.post(
+                url, json=payload, timeout=timeout
+            ) as resp:
                 if resp.status != 200:
                     error_text = await resp.text()
                     raise Exception(
                         f"OpenRouter API error ({resp.status}): {error_text}"
                     )
 
-                async for line in resp.content:
-                    line = line.strip()
-                    if not line or line == b"data: [DONE]":
+                usage_tokens = 0
+                async for event in iter_sse_events(
+                    resp.content, Config.LLM_STREAM_IDLE_TIMEOUT or None
+                ):
+                    if event == SSEParser.DONE:
                         continue
-
-                    if line.startswith(b"data: "):
-                        try:
-                            json_str = line[6:].decode("utf-8")
-                            chunk = json.loads(json_str)
-                            if "choices" in chunk and len(chunk["choices"]) > 0:
-                                delta = chunk["choices"][0].get("delta", {})
-                                content = delta.get("content", "")
-                                if content:
-                                    # Track first token time (TTFT - Time To First Token)
-                                    if first_token_time is None:
-                                        first_token_time = time.time()
-                                        ttft = first_token_time - start_time
-                                        logger.debug(f"OpenRouter TTFT: {ttft:.2f}s")
-
-                                    # Estimate token count (rough approximation)
-                                    token_count += len(content.split())
-
-                                    yield content
-                        except json.JSONDecodeError:
-                            continue
-
-                # Calculate final metrics
-                end_time = time.time()
-                total_time = end_time - start_time
+                    try:
+                        chunk = json.loads(event)
+                    except json.JSONDecodeError:
+                        continue
+                    usage = chunk.get("usage")
+                    if usage:
+                        usage_tokens = int(usage.get("completion_tokens") or 0)
+                    choices = chunk.get("choices")
+                    if not choices:
+                        continue
+                    content = (choices[0].get("delta") or {}).get("content")
+                    if content:
+                        if metrics.first_token_at is None:
+                            logger.debug(
+                                f"OpenRouter TTFT: {time.time() - start_time:.2f}s"
+                            )
+                        metrics.record()
+                        yield content
+
+                # Calculate final metrics (prefer provider-reported token usage)
+                metrics.finish(tokens=usage_tokens)
+                self.recent_stream_metrics.append(metrics.as_dict())
+                total_time = time.time() - start_time
+                token_count = metrics.tokens
                 self.last_response_time = total_time
                 self.total_requests += 1
                 self.total_tokens_generated += token_count
-
-                # Calculate TPS
-                if total_time > 0 and token_count > 0:
-                    self.last_tps = token_count / total_time
-                else:
-                    self.last_tps = 0.0
+                self.last_tps = metrics.tokens_per_second
 
                 # Update average
                 if self.total_requests > 0:
@@ -404,9 +490,17 @@ class OpenRouterService(LLMInterface):
                     f"OpenRouter stream: {total_time:.2f}s | "
                     f"~{token_count} tokens | "
                     f"TPS: {self.last_tps:.1f} | "
-                    f"TTFT: {(first_token_time - start_time) if first_token_time else 0:.2f}s"
+                    f"TTFT: {(metrics.ttft_ms or 0) / 1000:.2f}s"
                 )
 
+        except StreamStalledError as e:
+            metrics.stalled = True
+            metrics.finish()
+            self.recent_stream_metrics.append(metrics.as_dict())
+            logger.error(f"OpenRouter {e} after {metrics.chunks} chunks")
+            raise Exception(
+                "OpenRouter stream stalled - the model stopped sending tokens"
+            )
         except asyncio.TimeoutError:
             logger.error(
                 f"OpenRouter streaming timeout after {time.time() - start_time:.1f}s"
@@ -472,7 +566,7 @@ class OpenRouterService(LLMInterface):
 
         try:
             url = f"{self.base_url}/chat/completions"
-            async with self.session.post(
+            async with self.rate_limiter.acquire(), self.session.post(
                 url, json=payload, timeout=aiohttp.ClientTimeout(total=self.timeout)
             ) as resp:
                 if resp.status != 200:
@@ -564,6 +658,7 @@ class OpenRouterService(LLMInterface):
             "average_response_time_ms": round(self.average_response_time * 1000, 1),
             "total_requests": self.total_requests,
             "total_tokens_generated": self.total_tokens_generated,
+            "recent_streams": list(self.recent_stream_metrics),
             "model": self.model,
         }
 
@@ -573,7 +668,10 @@ class OpenRouterService(LLMInterface):
         Returns:
             Dictionary with cache statistics
         """
-        return self.cache.get_stats()
+        cache_stats = self.cache.get_stats()
+        dedup_stats = self.coalescer.get_stats()
+
+        return {**cache_stats, "deduplication": dedup_stats}
 
     def clear_cache(self):
         """Clear the LLM response cache."""
@@ -682,7 +780,7 @@ class OpenRouterService(LLMInterface):
 
         try:
             url = f"{self.base_url}/chat/completions"
-            async with self.session.post(
+            async with self.rate_limiter.acquire(), self.session.post(
                 url, json=payload, timeout=aiohttp.ClientTimeout(total=self.timeout)
             ) as resp:
                 if resp.status != 200:
@@ -803,7 +901,9 @@ class OpenRouterService(LLMInterface):
             timeout = aiohttp.ClientTimeout(
                 total=None, sock_read=self.stream_timeout, connect=self.timeout
             )
-            async with self.session.post(url, json=payload, timeout=timeout) as resp:
+            async with self.rate_limiter.acquire(), self.session.post(
+                url, json=payload, timeout=timeout
+            ) as resp:
                 if resp.status != 200:
                     error_text = await resp.text()
                     raise Exception(
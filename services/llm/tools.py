@@ -1,13 +1,16 @@
 """Enhanced tool system with anti-hallucination measures and OpenAI function calling support."""
 
+import inspect
 import logging
 import random
 import json
 import re
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List, Union, Set
+from typing import Dict, Any, Optional, List, Set
 from zoneinfo import ZoneInfo
 
+from providers.tool_calls import ToolCallExtractor, extract_response_tool_calls
+
 logger = logging.getLogger(__name__)
 
 
@@ -155,7 +158,7 @@ class EnhancedToolSystem:
     - Conversions → tools, not estimated
     - User facts → database, not invented
 
-    Supports both legacy regex-based parsing and modern OpenAI function calling.
+    Supports both legacy text-based tool calls and modern OpenAI function calling.
     """
 
     TOOL_SCHEMA: List[Dict[str, Any]] = []
@@ -1370,58 +1373,49 @@ User: "What's the weather like?"
 
     # ==================== TOOL EXECUTION ====================
 
-    def parse_tool_call(self, text: str) -> Optional[Dict[str, Any]]:
+    def create_tool_call_extractor(self) -> ToolCallExtractor:
         """
-        Parse tool call from LLM response (legacy regex-based format).
-
-        Args:
-            text: LLM response text
+        Create an incremental extractor that knows this system's tools.
 
-        Returns:
-            Dict with tool name and arguments, or None
+        Use one extractor per response; feed it streamed text or chunks and
+        dispatch each call it returns immediately.
         """
-        pattern = r"TOOL:\s*(\w+)\((.*?)\)"
-        match = re.search(pattern, text, re.IGNORECASE)
+        return ToolCallExtractor(tool_names=self.tools.keys())
 
-        if not match:
-            return None
+    def parse_tool_calls(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Parse every tool call in a complete LLM response.
 
-        tool_name = match.group(1)
-        args_str = match.group(2)
+        Recognizes legacy ``TOOL: name(...)`` calls and JSON call blocks in a
+        single scan.
 
-        args = {}
-        if args_str.strip():
-            arg_pattern = r'(\w+)\s*=\s*(["\'])(.*?)\2|(\w+)\s*=\s*([^,\)]+)'
+        Args:
+            text: LLM response text
 
-            for arg_match in re.finditer(arg_pattern, args_str):
-                if arg_match.group(1):
-                    key = arg_match.group(1)
-                    value = arg_match.group(3)
-                else:
-                    key = arg_match.group(4)
-                    value = arg_match.group(5).strip()
+        Returns:
+            List of dicts with tool name, arguments and the matched text
+        """
+        extractor = self.create_tool_call_extractor()
+        return extractor.feed(text) + extractor.flush()
 
-                try:
-                    value = int(value)
-                except ValueError:
-                    try:
-                        value = float(value)
-                    except ValueError:
-                        if value.lower() == "true":
-                            value = True
-                        elif value.lower() == "false":
-                            value = False
+    def parse_tool_call(self, text: str) -> Optional[Dict[str, Any]]:
+        """
+        Parse the first tool call from an LLM response (text formats).
 
-                args[key] = value
+        Args:
+            text: LLM response text
 
-        return {"tool": tool_name, "args": args, "full_match": match.group(0)}
+        Returns:
+            Dict with tool name and arguments, or None
+        """
+        calls = self.parse_tool_calls(text)
+        return calls[0] if calls else None
 
     def parse_function_call(self, response: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Parse function call from OpenAI response format.
 
         Handles both modern tool_calls format and legacy function_call format.
-        Supports both streaming and non-streaming responses.
 
         Args:
             response: OpenAI API response dict
@@ -1429,40 +1423,21 @@ User: "What's the weather like?"
         Returns:
             Dict with tool name and arguments, or None if no function call
         """
-        if not response or not isinstance(response, dict):
+        tool_calls = extract_response_tool_calls(response)
+        if not tool_calls:
             return None
-
-        tool_calls = (
-            response.get("choices", [{}])[0].get("message", {}).get("tool_calls")
-        )
-        if tool_calls:
-            if len(tool_calls) > 1:
-                logger.warning(f"Multiple tool calls detected: {len(tool_calls)}")
-            call = tool_calls[0]
-            return {
-                "tool": call["function"]["name"],
-                "args": json.loads(call["function"]["arguments"]),
-                "tool_call_id": call.get("id"),
-            }
-
-        legacy_function_call = (
-            response.get("choices", [{}])[0].get("message", {}).get("function_call")
-        )
-        if legacy_function_call:
-            return {
-                "tool": legacy_function_call["name"],
-                "args": json.loads(legacy_function_call["arguments"]),
-            }
-
-        return None
+        if len(tool_calls) > 1:
+            logger.warning(f"Multiple tool calls detected: {len(tool_calls)}")
+        return tool_calls[0]
 
     def parse_streaming_tool_call(
         self, chunk: Dict[str, Any]
     ) -> Optional[Dict[str, Any]]:
         """
-        Parse function call from streaming OpenAI response.
+        Parse a function call contained entirely in one streaming chunk.
 
-        Streaming responses accumulate tool calls across chunks.
+        Calls split across chunks need state; use
+        ``create_tool_call_extractor().feed_delta`` for the whole stream.
 
         Args:
             chunk: Individual chunk from streaming response
@@ -1470,31 +1445,22 @@ User: "What's the weather like?"
         Returns:
             Dict with tool name and arguments if complete, or None
         """
-        if not chunk or not isinstance(chunk, dict):
-            return None
-
-        delta = chunk.get("choices", [{}])[0].get("delta", {})
+        calls = self.create_tool_call_extractor().feed_delta(chunk)
+        return calls[0] if calls else None
 
-        tool_calls = delta.get("tool_calls")
-        if tool_calls:
-            call = tool_calls[0]
-            function = call.get("function", {})
-            name = function.get("name")
-            arguments = function.get("arguments", "")
-
-            if name and arguments:
-                try:
-                    args = json.loads(arguments)
-                    return {
-                        "tool": name,
-                        "args": args,
-                        "tool_call_id": call.get("id"),
-                    }
-                except json.JSONDecodeError:
-                    logger.debug(f"Partial function arguments: {arguments}")
-                    return None
-
-        return None
+    async def _run_tool_call(self, call: Dict[str, Any]) -> str:
+        """Execute one extracted call; JSON and native arguments are coerced."""
+        if call.get("format") == "legacy":
+            result = self.execute_tool(call["tool"], **call["args"])
+        else:
+            result = self.execute_function_call(call["tool"], call["args"])
+        if inspect.isawaitable(result):
+            try:
+                result = await result
+            except Exception as e:
+                logger.error(f"Tool {call['tool']} execution error: {e}")
+                return f"Error executing {call['tool']}: {e}"
+        return result
 
     def execute_tool(self, tool_name: str, **kwargs) -> str:
         """
@@ -1573,15 +1539,15 @@ User: "What's the weather like?"
                 message, llm_generate_func, system_prompt
             )
         else:
-            return await self._process_with_regex(
+            return await self._process_with_text_calls(
                 message, llm_generate_func, system_prompt
             )
 
-    async def _process_with_regex(
+    async def _process_with_text_calls(
         self, message: str, llm_generate_func, system_prompt: Optional[str] = None
     ) -> str:
         """
-        Process message using legacy regex-based tool parsing.
+        Process message using legacy text-based tool parsing.
         """
         prompt = message
         if system_prompt:
@@ -1591,7 +1557,7 @@ User: "What's the weather like?"
         tool_call = self.parse_tool_call(response)
 
         if tool_call:
-            tool_result = self.execute_tool(tool_call["tool"], **tool_call["args"])
+            tool_result = await self._run_tool_call(tool_call)
 
             tool_context = f"""
 Your previous response included a tool call that has been executed:
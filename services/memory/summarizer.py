@@ -6,6 +6,7 @@ from typing import Dict, List, Optional
 import json
 import aiofiles
 
+from services.core.rate_limiter import Priority, request_priority
 from services.llm.ollama import OllamaService
 from services.memory.rag import RAGService
 
@@ -43,6 +44,7 @@ class ConversationSummarizer:
         messages: List[Dict[str, str]],
         channel_id: int,
         participants: Optional[List[str]] = None,
+        guild_id: Optional[int] = None,
     ) -> Optional[Dict[str, any]]:
         """Summarize a conversation using AI.
 
@@ -50,6 +52,7 @@ class ConversationSummarizer:
             messages: List of message dicts
             channel_id: Discord channel ID
             participants: List of participant names
+            guild_id: Discord guild ID; the rate limiter's tenant
 
         Returns:
             Summary dict or None if failed
@@ -92,12 +95,13 @@ CONVERSATION:
 
 SUMMARY:"""
 
-            # Generate summary using AI
-            summary_text = await self.ollama.generate(
-                summary_prompt,
-                system_prompt="You are an expert at analyzing and summarizing conversations. "
-                "Create clear, structured summaries that capture the essence and key information.",
-            )
+            # Generate summary using AI (background work yields to live replies)
+            with request_priority(Priority.BACKGROUND, tenant=guild_id):
+                summary_text = await self.ollama.generate(
+                    summary_prompt,
+                    system_prompt="You are an expert at analyzing and summarizing conversations. "
+                    "Create clear, structured summaries that capture the essence and key information.",
+                )
             
             # Clean thinking process
             from utils.response_validator import ResponseValidator
@@ -203,6 +207,7 @@ SUMMARY:"""
         participants: Optional[List[str]] = None,
         store_in_rag: bool = True,
         store_in_file: bool = True,
+        guild_id: Optional[int] = None,
     ) -> Optional[Dict[str, any]]:
         """Summarize conversation and store in RAG and/or files.
 
@@ -212,12 +217,13 @@ SUMMARY:"""
             participants: List of participant names
             store_in_rag: Whether to store in RAG system
             store_in_file: Whether to store in file system
+            guild_id: Discord guild ID; the rate limiter's tenant
 
         Returns:
             Summary data dict or None
         """
         summary_data = await self.summarize_conversation(
-            messages, channel_id, participants
+            messages, channel_id, participants, guild_id=guild_id
         )
 
         if not summary_data:
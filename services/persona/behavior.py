@@ -17,6 +17,7 @@ from config import Config
 from core.types import AcoreContext, AcoreMessage, AcoreChannel, AcoreUser
 from services.llm.ollama import OllamaService
 from services.core.context import ContextManager
+from services.core.rate_limiter import Priority, request_priority
 from services.persona.lorebook import LorebookService
 
 # RL components are optional for unit tests. Guard imports to avoid heavy deps
@@ -931,10 +932,20 @@ Topics:"""
             try:
                 await asyncio.sleep(60)  # Check every minute
                 for channel_id, state in list(self.states.items()):
-                    await self._check_ambient_triggers(channel_id, state)
+                    # Ambient chatter must never delay user-facing replies
+                    with request_priority(
+                        Priority.BACKGROUND, tenant=self._guild_id(channel_id)
+                    ):
+                        await self._check_ambient_triggers(channel_id, state)
             except Exception as e:
                 logger.error(f"Error in BehaviorEngine tick: {e}")
 
+    def _guild_id(self, channel_id: int) -> Optional[int]:
+        """Guild a channel belongs to: the rate limiter's tenant key."""
+        channel = self.bot.get_channel(channel_id) if self.bot else None
+        guild = getattr(channel, "guild", None)
+        return guild.id if guild else None
+
     async def _check_ambient_triggers(self, channel_id: int, state: BehaviorState):
         """Check if we should say something during a lull."""
         # Skip if proactive engagement is disabled
@@ -1140,7 +1151,10 @@ Respond with ONLY one word: YES or NO"""
                 # Find a text channel to comment in (usually the system channel or general)
                 # For now, simplistic selection
                 if member.guild.system_channel:
-                    msg = await self._generate_environmental_comment(member, event_type)
+                    with request_priority(Priority.BACKGROUND, tenant=member.guild.id):
+                        msg = await self._generate_environmental_comment(
+                            member, event_type
+                        )
                     if msg:
                         await member.guild.system_channel.send(msg)
 
@@ -1323,7 +1337,8 @@ As {self.current_persona.character.display_name}, is this a topic you would exci
 Reply YES or NO."""
 
         try:
-            res = await self.ollama.generate(prompt)
+            persona_id = getattr(self.current_persona, "persona_id", None)
+            res = await self.ollama.generate(prompt, persona_id=persona_id)
             if "YES" in res.upper():
                 # Generate actual reply with mood context
                 mood_instruction = self._get_mood_instruction(state)
@@ -1333,7 +1348,7 @@ Reply YES or NO."""
 {mood_instruction}
 
 Reply naturally as {self.current_persona.character.display_name}. Keep it short and casual."""
-                reply = await self.ollama.generate(reply_prompt)
+                reply = await self.ollama.generate(reply_prompt, persona_id=persona_id)
                 state.last_proactive_trigger = datetime.now()
                 return reply
         except Exception:
@@ -1578,7 +1593,10 @@ Generate just the question, nothing else:"""
                     prompt, max_tokens=30
                 )
             else:
-                question = await self.ollama.generate(prompt)
+                question = await self.ollama.generate(
+                    prompt,
+                    persona_id=getattr(self.current_persona, "persona_id", None),
+                )
             return question.strip()
 
         except Exception as e:
@@ -1638,7 +1656,9 @@ Say something to break the silence about {selected_topic}. It could be:
 
 Keep it conversational, in character, and short (1-2 sentences max)."""
 
-        return await self.ollama.generate(prompt)
+        return await self.ollama.generate(
+            prompt, persona_id=getattr(active_persona, "persona_id", None)
+        )
 
     async def _generate_environmental_comment(
         self, member, event_type
@@ -1677,4 +1697,6 @@ Keep it conversational, in character, and short (1-2 sentences max)."""
 
 Make a brief, friendly comment about it as {self.current_persona.character.display_name}."""
 
-        return await self.ollama.generate(prompt)
+        return await self.ollama.generate(
+            prompt, persona_id=getattr(self.current_persona, "persona_id", None)
+        )
@@ -5,6 +5,8 @@ import numpy as np
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass, field
 
+from core.social_intelligence.learning.linucb import LinUCBEngine
+
 from .bandit_types import ModeSwitchAction, BanditContext, BanditConfig
 
 logger = logging.getLogger(__name__)
@@ -40,7 +42,11 @@ class BanditState:
 
 
 class LinUCBBandit:
-    """LinUCB contextual bandit for mode switching decisions."""
+    """LinUCB contextual bandit for mode switching decisions.
+
+    Backed by ``LinUCBEngine``, which keeps each action's inverse design
+    matrix up to date with rank-one updates instead of inverting per call.
+    """
 
     def __init__(self, config: Optional[BanditConfig] = None):
         """Initialize LinUCB bandit.
@@ -51,25 +57,28 @@ class LinUCBBandit:
         self.config = config or BanditConfig()
         self.d = self.config.feature_dim
         self.n_actions = len(ModeSwitchAction)
+        self.engine = LinUCBEngine(self.n_actions, self.d, alpha=self.config.alpha)
+
+    # Per-action views into the engine's stacked arrays
+    @property
+    def A(self) -> Dict[int, np.ndarray]:
+        return dict(enumerate(self.engine.A))
 
-        # Initialize parameters for each action
-        # A[a]: d x d matrix (inverse covariance)
-        # b[a]: d-dimensional vector (linear term)
-        # theta[a]: d-dimensional weight vector (computed from A^-1 * b)
-        self.A: Dict[int, np.ndarray] = {}
-        self.b: Dict[int, np.ndarray] = {}
-        self.theta: Dict[int, np.ndarray] = {}
-        self.counts: Dict[int, int] = {}
+    @property
+    def b(self) -> Dict[int, np.ndarray]:
+        return dict(enumerate(self.engine.b))
 
-        self._init_params()
+    @property
+    def theta(self) -> Dict[int, np.ndarray]:
+        return dict(enumerate(self.engine.theta))
+
+    @property
+    def counts(self) -> Dict[int, int]:
+        return {a: int(count) for a, count in enumerate(self.engine.counts)}
 
     def _init_params(self) -> None:
         """Initialize bandit parameters."""
-        for action in ModeSwitchAction:
-            self.A[action.value] = np.eye(self.d)  # Identity matrix
-            self.b[action.value] = np.zeros(self.d)
-            self.theta[action.value] = np.zeros(self.d)
-            self.counts[action.value] = 0
+        self.engine.reset()
 
     def select_action(self, context: BanditContext) -> Tuple[ModeSwitchAction, float]:
         """Select action using LinUCB algorithm.
@@ -80,30 +89,12 @@ class LinUCBBandit:
         Returns:
             Tuple of (selected action, confidence bound)
         """
-        x = np.array(context.to_feature_vector(self.d))  # Context feature vector
-
-        # Compute UCB for each action
-        ucb_values = {}
-        for action in ModeSwitchAction:
-            a_idx = action.value
-            A_inv = np.linalg.inv(self.A[a_idx])
-            self.theta[a_idx] = A_inv @ self.b[a_idx]
-
-            # Estimated reward: theta^T * x
-            estimated_reward = self.theta[a_idx].T @ x
-
-            # Confidence interval: alpha * sqrt(x^T * A^-1 * x)
-            confidence = self.config.alpha * np.sqrt(x.T @ A_inv @ x)
-
-            # UCB = estimated_reward + confidence
-            ucb_values[action] = estimated_reward + confidence
-
-        # Select action with highest UCB
-        best_action = max(ucb_values.keys(), key=lambda a: ucb_values[a])
-        best_ucb = ucb_values[best_action]
+        x = context.to_feature_vector(self.d)
+        a_idx, best_ucb = self.engine.select(x)
+        best_action = ModeSwitchAction(a_idx)
 
         logger.debug(f"Bandit selected {best_action.name} with UCB={best_ucb:.3f}")
-        return best_action, float(best_ucb)
+        return best_action, best_ucb
 
     def update(
         self, action: ModeSwitchAction, context: BanditContext, reward: float
@@ -115,29 +106,18 @@ class LinUCBBandit:
             context: Context when action was taken
             reward: Observed reward
         """
-        x = np.array(context.to_feature_vector(self.d))
-        a_idx = action.value
-
-        # Update A and b for the selected action
-        # A[a] = A[a] + x * x^T
-        # b[a] = b[a] + reward * x
-        self.A[a_idx] += np.outer(x, x)
-        self.b[a_idx] += reward * x
-        self.counts[a_idx] += 1
-
-        # Recompute theta
-        A_inv = np.linalg.inv(self.A[a_idx])
-        self.theta[a_idx] = A_inv @ self.b[a_idx]
+        x = context.to_feature_vector(self.d)
+        self.engine.update(int(action.value), x, reward)
 
         logger.debug(f"Bandit updated {action.name} with reward={reward:.3f}")
 
     def get_state(self) -> BanditState:
         """Get current bandit state for persistence."""
         return BanditState(
-            A=[self.A[a].tolist() for a in range(self.n_actions)],
-            b=[self.b[a].tolist() for a in range(self.n_actions)],
-            theta=[self.theta[a].tolist() for a in range(self.n_actions)],
-            counts=[self.counts[a] for a in range(self.n_actions)],
+            A=self.engine.A.tolist(),
+            b=self.engine.b.tolist(),
+            theta=self.engine.theta.tolist(),
+            counts=self.engine.counts.tolist(),
         )
 
     def set_state(self, state: BanditState) -> None:
@@ -148,22 +128,13 @@ class LinUCBBandit:
             return
 
         try:
-            for a in range(self.n_actions):
-                if a < len(state.A):
-                    self.A[a] = np.array(state.A[a])
-                    self.b[a] = np.array(state.b[a])
-                    self.theta[a] = (
-                        np.array(state.theta[a])
-                        if a < len(state.theta)
-                        else np.zeros(self.d)
-                    )
-                    self.counts[a] = state.counts[a] if a < len(state.counts) else 0
-                else:
-                    self.A[a] = np.eye(self.d)
-                    self.b[a] = np.zeros(self.d)
-                    self.theta[a] = np.zeros(self.d)
-                    self.counts[a] = 0
-        except (IndexError, ValueError) as e:
+            self.engine.reset()
+            for a in range(min(self.n_actions, len(state.A))):
+                count = state.counts[a] if a < len(state.counts) else 0
+                self.engine.set_arm(
+                    a, np.array(state.A[a]), np.array(state.b[a]), count
+                )
+        except (IndexError, ValueError, np.linalg.LinAlgError) as e:
             logger.error(f"Failed to load bandit state: {e}, using defaults")
             self._init_params()
 
@@ -2,99 +2,141 @@
 
 import json
 import logging
+import sqlite3
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, Hashable, Iterable, Mapping, Optional
 
-from .bandit import LinUCBBandit
-from .bandit_types import BanditConfig
+import numpy as np
+from numpy.linalg import LinAlgError
+
+from core.social_intelligence.learning.bandit_store import BanditStore
+
+from .bandit import BanditState
+from .persistence import (
+    RecordStore,
+    decode_arrays,
+    encode_arrays,
+    format_key,
+    parse_key,
+)
 
 logger = logging.getLogger(__name__)
 
 
 class BanditStorage:
-    """Storage for contextual bandit states using atomic JSON writes."""
+    """Storage for contextual bandit states as binary per-bandit records.
+
+    Shares ``RecordStore`` with ``RLStorage``; each (channel_id, user_id)
+    bandit is one record holding its design matrices and their inverses,
+    response vectors and counts, and saves only write the bandits that changed.
+    Records are read on demand: ``load_one`` is the owning ``BanditStore``'s
+    loader, so the store drops clean rows instead of keeping a swap copy of
+    them, and ``load_many`` prefetches bandits off the event loop.
+    """
 
-    def __init__(self, data_dir: Path):
+    NAMESPACE = "bandits"
+
+    def __init__(self, data_dir: Path, records: Optional[RecordStore] = None):
         """Initialize bandit storage.
 
         Args:
             data_dir: Directory for persistence files
+            records: Record backend to share with other RL storage
         """
-        self.file_path = data_dir / "bandit_states.json"
+        self.records = records or RecordStore(data_dir / "rl_state.db")
+        self.legacy_path = data_dir / "bandit_states.json"
+
+    def load(self, store: BanditStore) -> int:
+        """Check the persisted bandits, importing the legacy file if needed.
 
-    def load(self) -> Dict[Tuple[int, int], LinUCBBandit]:
-        """Load all bandit states from disk.
+        Bandits are not restored into ``store`` here; the store loads each
+        one with ``load_one`` on first access.
 
         Returns:
-            Dictionary mapping (channel_id, user_id) to bandit instances
+            Number of (channel_id, user_id) bandits persisted
         """
-        bandits = {}
-
-        if not self.file_path.exists():
-            logger.info("No bandit state file found, starting fresh")
-            return bandits
-
         try:
-            with open(self.file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            raw_bandits = data.get("bandits", {})
-            for key_str, bandit_data in raw_bandits.items():
-                try:
-                    cid_str, uid_str = key_str.split(":")
-                    key = (int(cid_str), int(uid_str))
-
-                    # Create bandit and restore state
-                    from .bandit import BanditState
-
-                    bandit = LinUCBBandit(BanditConfig(**bandit_data.get("config", {})))
-                    bandit.set_state(
-                        BanditState.from_dict(bandit_data.get("state", {}))
-                    )
-                    bandits[key] = bandit
-
-                except (ValueError, IndexError, KeyError) as e:
-                    logger.warning(f"Skipping invalid bandit key {key_str}: {e}")
-                    continue
-
-            logger.info(f"Loaded {len(bandits)} bandit states")
-            return bandits
-
-        except json.JSONDecodeError:
-            logger.error(f"Corrupt bandit data file: {self.file_path}. Starting fresh.")
-            return bandits
-        except Exception as e:
+            persisted = self.records.count(self.NAMESPACE)
+        except sqlite3.Error as e:
             logger.error(f"Failed to load bandit data: {e}")
-            return bandits
+            return 0
 
-    def save(self, bandits: Dict[Tuple[int, int], LinUCBBandit]) -> None:
-        """Save all bandit states to disk atomically.
+        if not persisted and self.legacy_path.exists():
+            persisted = self._load_legacy(store)
 
-        Args:
-            bandits: Dictionary of bandit instances
-        """
+        logger.info(f"Found {persisted} persisted bandit states")
+        return persisted
+
+    def load_one(self, key: Hashable) -> Optional[Dict[str, np.ndarray]]:
+        """Read one bandit's ``BanditStore.restore_user`` state, if persisted."""
+        try:
+            payload = self.records.read(self.NAMESPACE, format_key(key))
+            return decode_arrays(payload) if payload is not None else None
+        except (sqlite3.Error, ValueError, KeyError, OSError) as e:
+            logger.warning(f"Failed to load bandit {key}: {e}")
+            return None
+
+    def load_many(
+        self, keys: Iterable[Hashable]
+    ) -> Dict[Hashable, Dict[str, np.ndarray]]:
+        """``load_one`` for several keys; unknown keys are omitted."""
+        states = {}
+        for key in keys:
+            state = self.load_one(key)
+            if state is not None:
+                states[key] = state
+        return states
+
+    def _load_legacy(self, store: BanditStore) -> int:
+        """Import ``bandit_states.json`` and write it back as records."""
         try:
-            data = {
-                "version": 1,
-                "bandits": {
-                    f"{k[0]}:{k[1]}": {
-                        "config": {
-                            "feature_dim": v.config.feature_dim,
-                            "alpha": v.config.alpha,
-                        },
-                        "state": v.get_state().to_dict(),
-                    }
-                    for k, v in bandits.items()
-                },
-            }
-
-            # Atomic write
-            temp_file = self.file_path.with_suffix(".tmp")
-            with open(temp_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
-
-            temp_file.replace(self.file_path)
-            logger.info(f"Saved {len(bandits)} bandit states")
-
-        except Exception as e:
+            with open(self.legacy_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Corrupt bandit data file: {self.legacy_path}: {e}")
+            return 0
+
+        records = {}
+        for key_str, bandit_data in data.get("bandits", {}).items():
+            try:
+                key = parse_key(key_str)
+                state = BanditState.from_dict(bandit_data.get("state", {}))
+                store.set_user(key, state.A, state.b, state.counts or None)
+                # Encode while resident; a clean row may be dropped later
+                records.update(self.encode(store, [key]))
+            except (ValueError, IndexError, KeyError, LinAlgError) as e:
+                logger.warning(f"Skipping invalid bandit key {key_str}: {e}")
+
+        self.write(records)
+        logger.info(f"Imported {len(records)} bandits from {self.legacy_path.name}")
+        return len(records)
+
+    @staticmethod
+    def encode(store: BanditStore, keys: Iterable) -> Dict[str, bytes]:
+        """Encode the given bandits into records."""
+        records = {}
+        for key in keys:
+            try:
+                user = store.get_user(key)
+            except KeyError:
+                continue
+            records[format_key(key)] = encode_arrays(
+                A=user["A"],
+                A_inv=user["A_inv"],
+                b=user["b"],
+                counts=user["counts"],
+                rewards=user["rewards"],
+            )
+        return records
+
+    def write(self, records: Mapping[str, bytes]) -> int:
+        """Write pre-encoded records; returns the number written."""
+        try:
+            return self.records.write(self.NAMESPACE, records)
+        except sqlite3.Error as e:
             logger.error(f"Failed to save bandit data: {e}")
+            return 0
+
+    def save(self, store: BanditStore, keys: Optional[Iterable] = None) -> int:
+        """Save ``keys`` (all bandits if omitted) from ``store``."""
+        return self.write(self.encode(store, store if keys is None else keys))
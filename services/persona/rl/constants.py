@@ -20,13 +20,24 @@ RL_REWARD_SPEED_THRESHOLD = 60.0  # seconds - threshold for speed bonus
 RL_REWARD_LONG_MSG_CHAR = 100  # character count for long message threshold
 RL_CONTEXT_MAX_AGE = 3600  # seconds - max age of reward context entries
 RL_MAX_AGENTS_PER_CHANNEL = 100  # max agents per channel
+RL_BANDIT_MAX_RESIDENT = 10000  # bandits kept in memory before paging to disk
 
 # Neural RL (DQN) parameters
 RL_ALGORITHM = "tabular"  # "tabular" or "dqn"
 RL_REPLAY_BUFFER_SIZE = 10000  # Capacity of replay buffer
+RL_PRIORITIZED_REPLAY = False  # Sample transitions by TD error instead of uniformly
 RL_BATCH_SIZE = 32  # Batch size for training
 RL_WARMUP_STEPS = 1000  # Transitions to collect before training starts
 RL_TRAIN_EVERY = 4  # Train every N steps after warmup
+RL_INFERENCE_BATCHING = False  # Batch DQN decisions through the shared policy
+RL_INFERENCE_WINDOW_MS = 2.0  # How long decisions wait to be batched together
+RL_POLICY_REFRESH_STEPS = 50  # Training steps between policy snapshot refreshes
+RL_BACKGROUND_TRAINING = True  # Train DQN in a worker thread instead of inline
+RL_TRAIN_INTERVAL_SEC = 1.0  # Seconds between background training intervals
+RL_TRAIN_BUDGET_MS = 200.0  # Worker CPU time per training interval
+RL_TRAIN_PAUSE_LATENCY_MS = 250.0  # Pause training while latency exceeds this
+RL_USE_TRANSFER = True  # Initialize new DQN agents from population policy priors
+RL_PRIOR_REFRESH_SEC = 300.0  # Seconds between rebuilds of cold-start policy priors
 
 # Multi-objective reward weights (must sum to 1.0)
 REWARD_WEIGHT_ENGAGEMENT = 0.25
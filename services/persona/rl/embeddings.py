@@ -7,7 +7,7 @@ using the cheap thinking service for text understanding.
 import hashlib
 import logging
 import time
-from typing import Dict, Optional, Tuple
+from typing import Dict, Optional, Tuple, Union
 
 import numpy as np
 import torch
@@ -50,7 +50,7 @@ class StateEmbeddingEncoder:
         self.thinking_service = thinking_service
         self.target_dim = target_dim
         self.text_embed_dim = text_embed_dim
-        self._cache: Dict[str, Tuple[np.ndarray, float]] = {}
+        self._cache: Dict[bytes, Tuple[np.ndarray, float]] = {}
         self._cache_size = cache_size
         self._cache_hits = 0
         self._cache_misses = 0
@@ -70,14 +70,15 @@ class StateEmbeddingEncoder:
 
     async def encode(
         self,
-        state_features: StateFeatures,
+        state_features: Union[StateFeatures, np.ndarray],
         message_text: Optional[str] = None,
         use_cache: bool = True,
     ) -> np.ndarray:
         """Encode state features and optional message text into embedding vector.
 
         Args:
-            state_features: Rich state features from StateFeatureExtractor
+            state_features: Rich state features from StateFeatureExtractor, or
+                the vector from ``StateFeatureExtractor.extract_vector``
             message_text: Optional message text to embed
             use_cache: Whether to use caching (default True)
 
@@ -88,8 +89,10 @@ class StateEmbeddingEncoder:
         """
         start_time = time.perf_counter()
 
+        structured_vector = self._structured_vector(state_features)
+
         # Generate cache key
-        cache_key = self._generate_cache_key(state_features, message_text)
+        cache_key = self._generate_cache_key(structured_vector, message_text)
 
         # Check cache
         if use_cache and cache_key in self._cache:
@@ -101,11 +104,6 @@ class StateEmbeddingEncoder:
 
         self._cache_misses += 1
 
-        # Get structured features vector (16 dims)
-        structured_vector = np.array(
-            state_features.to_vector(include_one_hot=False), dtype=np.float32
-        )
-
         # Get text embedding (64 dims) if message provided
         if message_text and message_text.strip():
             text_embedding = await self._embed_text(message_text)
@@ -272,26 +270,35 @@ class StateEmbeddingEncoder:
             return vector / norm
         return vector
 
+    @staticmethod
+    def _structured_vector(
+        state_features: Union[StateFeatures, np.ndarray],
+    ) -> np.ndarray:
+        """Structured features as a float32 vector (16 dims)."""
+        if isinstance(state_features, StateFeatures):
+            state_features = state_features.to_vector(include_one_hot=False)
+        return np.asarray(state_features, dtype=np.float32)
+
     def _generate_cache_key(
-        self, state_features: StateFeatures, message_text: Optional[str]
-    ) -> str:
-        """Generate cache key from state features and message.
+        self, structured_vector: np.ndarray, message_text: Optional[str]
+    ) -> bytes:
+        """Generate cache key from the structured vector and message.
 
         Args:
-            state_features: State features
+            structured_vector: Structured feature vector
             message_text: Optional message text
 
         Returns:
-            Cache key string
+            Cache key bytes
         """
-        # Use feature vector + message hash as key
-        feature_str = ",".join(f"{v:.4f}" for v in state_features.to_vector())
+        # Rounded feature bytes + message hash as key
+        feature_bytes = np.round(structured_vector, 4).tobytes()
         message_hash = (
-            hashlib.md5(message_text.encode()).hexdigest()[:16] if message_text else ""
+            hashlib.md5(message_text.encode()).digest() if message_text else b""
         )
-        return f"{feature_str}|{message_hash}"
+        return feature_bytes + b"|" + message_hash
 
-    def _update_cache(self, key: str, embedding: np.ndarray) -> None:
+    def _update_cache(self, key: bytes, embedding: np.ndarray) -> None:
         """Update cache with new embedding.
 
         Implements simple LRU eviction when cache is full.
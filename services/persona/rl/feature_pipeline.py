@@ -0,0 +1,300 @@
+"""Precomputed feature pipelines for RL state vectors.
+
+Features are declared as ``FeatureSpec`` nodes: a compute function, the
+names of the sources or other features it reads, how many vector slots it
+fills, and a cache scope. ``FeaturePipeline`` resolves the dependency
+graph once, at construction, into a flat list of steps whose inputs are
+resolved to integer slots. Extraction walks that list, passing values
+positionally, and assembles the outputs into a preallocated float array
+instead of building dicts and dataclasses per decision.
+
+Slow-changing features (channel statistics, user profile aggregates, the
+hour-of-day block) are cached per scope key. An entry is recomputed when
+
+- its ``stamp`` (a cheap fingerprint of its inputs) changes,
+- it is older than ``ttl`` seconds, or
+- the owner calls ``invalidate`` for its user or channel.
+
+The cache holds at most ``max_cache_entries`` entries; the least recently
+used entry is evicted first.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Cache scopes, keyed by nothing, the user id and the channel id respectively
+SCOPE_MESSAGE = "message"
+SCOPE_GLOBAL = "global"
+SCOPE_USER = "user"
+SCOPE_CHANNEL = "channel"
+SCOPES = (SCOPE_MESSAGE, SCOPE_GLOBAL, SCOPE_USER, SCOPE_CHANNEL)
+
+DEFAULT_MAX_CACHE_ENTRIES = 4096
+
+
+@dataclass(frozen=True)
+class FeatureSpec:
+    """Declaration of one feature (or intermediate value) in a pipeline."""
+
+    name: str
+    compute: Callable[..., Any]
+    # Sources or earlier features passed positionally to compute (and stamp)
+    inputs: Tuple[str, ...] = ()
+    # Vector slots filled; 0 for intermediates shared by other features.
+    # Width-1 features return a float, wider ones a sequence of floats.
+    width: int = 1
+    scope: str = SCOPE_MESSAGE
+    # Cheap fingerprint of the inputs; a change invalidates the cached value
+    stamp: Optional[Callable[..., Hashable]] = None
+    # Seconds a cached value stays valid (None: until stamp or invalidate)
+    ttl: Optional[float] = None
+
+
+@dataclass
+class _Step:
+    slot: int
+    spec: FeatureSpec
+    args: Tuple[int, ...]
+    offset: int
+    width: int
+
+
+class FeaturePipeline:
+    """Evaluates a set of ``FeatureSpec`` nodes into a flat vector."""
+
+    def __init__(
+        self,
+        specs: Sequence[FeatureSpec],
+        sources: Sequence[str],
+        dtype: Any = np.float32,
+        max_cache_entries: int = DEFAULT_MAX_CACHE_ENTRIES,
+    ):
+        """
+        Args:
+            specs: Feature declarations; outputs are laid out in this order
+            sources: Names of the raw values passed to ``extract``
+            dtype: dtype of the output vector
+            max_cache_entries: Cached values kept before evicting the least
+                recently used one
+
+        Raises:
+            ValueError: On duplicate or unknown names, dependency cycles,
+                or cached features that read per-message features
+        """
+        self.sources = tuple(sources)
+        self.dtype = np.dtype(dtype)
+
+        by_name: Dict[str, FeatureSpec] = {}
+        for spec in specs:
+            if spec.name in by_name or spec.name in self.sources:
+                raise ValueError(f"Duplicate feature name: {spec.name}")
+            if spec.scope not in SCOPES:
+                raise ValueError(f"Unknown scope for {spec.name}: {spec.scope}")
+            by_name[spec.name] = spec
+
+        # Output layout follows declaration order
+        self.layout: Dict[str, Tuple[int, int]] = {}
+        dim = 0
+        for spec in specs:
+            if spec.width:
+                self.layout[spec.name] = (dim, spec.width)
+                dim += spec.width
+        self.dim = dim
+
+        self._slots: Dict[str, int] = {name: i for i, name in enumerate(self.sources)}
+        self._plan: List[_Step] = []
+        visiting: set = set()
+        for spec in specs:
+            self._resolve(spec, by_name, visiting)
+
+        self.buffer = np.zeros(self.dim, dtype=self.dtype)
+        self._row: List[float] = [0.0] * self.dim
+        self._values: List[Any] = [None] * len(self._slots)
+        self.max_cache_entries = max_cache_entries
+        self._cache: OrderedDict[
+            Tuple[int, Hashable], Tuple[Hashable, float, Any]
+        ] = OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+    def _resolve(
+        self,
+        spec: FeatureSpec,
+        by_name: Dict[str, FeatureSpec],
+        visiting: set,
+    ) -> None:
+        """Append ``spec`` to the plan after its dependencies."""
+        if spec.name in self._slots:
+            return
+        if spec.name in visiting:
+            raise ValueError(f"Dependency cycle through feature: {spec.name}")
+        visiting.add(spec.name)
+
+        for name in spec.inputs:
+            if name in self.sources:
+                continue
+            if name not in by_name:
+                raise ValueError(f"Feature {spec.name} reads unknown input: {name}")
+            dependency = by_name[name]
+            self._resolve(dependency, by_name, visiting)
+            if spec.scope != SCOPE_MESSAGE and dependency.scope == SCOPE_MESSAGE:
+                raise ValueError(
+                    f"Cached feature {spec.name} cannot read per-message "
+                    f"feature {name}"
+                )
+
+        visiting.discard(spec.name)
+        offset = self.layout[spec.name][0] if spec.width else -1
+        self._slots[spec.name] = len(self._slots)
+        self._plan.append(
+            _Step(
+                slot=self._slots[spec.name],
+                spec=spec,
+                args=tuple(self._slots[name] for name in spec.inputs),
+                offset=offset,
+                width=spec.width,
+            )
+        )
+
+    def _run(
+        self,
+        source_values: Sequence[Any],
+        user_id: Optional[Hashable],
+        channel_id: Optional[Hashable],
+    ) -> List[float]:
+        """Evaluate the plan into ``self._row``."""
+        values = self._values
+        values[: len(source_values)] = source_values
+        row = self._row
+        keys = {SCOPE_GLOBAL: None, SCOPE_USER: user_id, SCOPE_CHANNEL: channel_id}
+
+        for step in self._plan:
+            spec = step.spec
+            args = [values[i] for i in step.args]
+            if spec.scope == SCOPE_MESSAGE:
+                value = spec.compute(*args)
+            else:
+                key = keys[spec.scope]
+                if key is None and spec.scope != SCOPE_GLOBAL:
+                    # No id to cache under: compute every time
+                    value = spec.compute(*args)
+                else:
+                    value = self._cached(step, key, args)
+            values[step.slot] = value
+
+            if step.width == 1:
+                row[step.offset] = value
+            elif step.width:
+                row[step.offset : step.offset + step.width] = value
+        return row
+
+    @property
+    def feature_names(self) -> List[str]:
+        """Names of the features written to the vector, in layout order."""
+        return list(self.layout)
+
+    def extract(
+        self,
+        *source_values: Any,
+        user_id: Optional[Hashable] = None,
+        channel_id: Optional[Hashable] = None,
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Compute all features into a vector.
+
+        Args:
+            *source_values: One value per source, in ``sources`` order
+            user_id: Cache key for user-scoped features (uncached if None)
+            channel_id: Cache key for channel-scoped features (uncached if None)
+            out: Array of shape ``(dim,)`` to fill, e.g. a row of a batch.
+                Defaults to ``self.buffer``, which is reused by the next call.
+
+        Returns:
+            ``out`` (or ``self.buffer``), filled
+        """
+        self._check_sources(source_values)
+        if out is None:
+            out = self.buffer
+        # One conversion instead of a numpy scalar write per feature
+        out[:] = self._run(source_values, user_id, channel_id)
+        return out
+
+    def extract_list(
+        self,
+        *source_values: Any,
+        user_id: Optional[Hashable] = None,
+        channel_id: Optional[Hashable] = None,
+    ) -> List[float]:
+        """Compute all features into a new list, skipping the dtype cast.
+
+        Shares the cache with ``extract``; use it where full-precision
+        Python floats are wanted rather than a vector.
+        """
+        self._check_sources(source_values)
+        return list(self._run(source_values, user_id, channel_id))
+
+    def _check_sources(self, source_values: Sequence[Any]) -> None:
+        if len(source_values) != len(self.sources):
+            raise TypeError(
+                f"Expected {len(self.sources)} source values, "
+                f"got {len(source_values)}"
+            )
+
+    def _cached(self, step: _Step, key: Hashable, args: List[Any]) -> Any:
+        spec = step.spec
+        cache_key = (step.slot, key)
+        stamp = spec.stamp(*args) if spec.stamp is not None else None
+        now = time.monotonic() if spec.ttl is not None else 0.0
+        entry = self._cache.get(cache_key)
+        if entry is not None:
+            cached_stamp, expires_at, value = entry
+            if cached_stamp == stamp and now < expires_at:
+                self._cache_hits += 1
+                self._cache.move_to_end(cache_key)
+                return value
+
+        self._cache_misses += 1
+        value = spec.compute(*args)
+        expires_at = now + spec.ttl if spec.ttl is not None else float("inf")
+        self._cache[cache_key] = (stamp, expires_at, value)
+        self._cache.move_to_end(cache_key)
+        while len(self._cache) > self.max_cache_entries:
+            self._cache.popitem(last=False)
+        return value
+
+    def invalidate(
+        self,
+        user_id: Optional[Hashable] = None,
+        channel_id: Optional[Hashable] = None,
+    ) -> None:
+        """Drop cached features for a user and/or channel."""
+        scoped = {SCOPE_USER: user_id, SCOPE_CHANNEL: channel_id}
+        stale = [
+            (step.slot, scoped[step.spec.scope])
+            for step in self._plan
+            if step.spec.scope in scoped and scoped[step.spec.scope] is not None
+        ]
+        for cache_key in stale:
+            self._cache.pop(cache_key, None)
+
+    def clear_cache(self) -> None:
+        """Drop every cached feature."""
+        self._cache.clear()
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        lookups = self._cache_hits + self._cache_misses
+        return {
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "size": len(self._cache),
+            "hit_rate": self._cache_hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,258 @@
+"""Batched inference for RL policy networks.
+
+Each DQN decision used to run its own forward pass. ``InferenceBatcher``
+collects the Q-value requests that arrive within a short window (from any
+channel) and evaluates them with one batched forward pass per policy, so
+the per-decision cost stays flat as the number of active channels grows.
+
+Policies are served by a ``PolicyRuntime``: a frozen snapshot of a
+``QNetwork`` evaluated with, in order of preference,
+
+- ONNX Runtime on CPU (via ``NeuralAgent.export_onnx_bytes``),
+- PyTorch (a detached copy of the network), or
+- plain NumPy matmuls (works from ``NeuralAgent.to_dict`` weights, so it
+  needs neither torch nor onnxruntime).
+
+Snapshots don't follow training; owners call ``set_policy`` again with a
+fresh runtime when the weights change.
+"""
+
+import asyncio
+import copy
+import logging
+import re
+from typing import Any, Dict, Hashable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .neural_agent import TORCH_AVAILABLE
+
+if TORCH_AVAILABLE:
+    import torch
+
+try:
+    import onnxruntime
+
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW_MS = 2.0
+DEFAULT_MAX_BATCH_SIZE = 256
+
+
+class PolicyRuntime:
+    """Evaluates Q-values for a ``(n, state_dim)`` batch of states."""
+
+    backend = "base"
+
+    def __call__(self, states: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+
+class NumpyPolicy(PolicyRuntime):
+    """ReLU MLP evaluated with NumPy matmuls."""
+
+    backend = "numpy"
+
+    def __init__(self, layers: Sequence[Tuple[np.ndarray, np.ndarray]]):
+        """
+        Args:
+            layers: ``(weight, bias)`` per linear layer, with weights in
+                PyTorch's ``(out_features, in_features)`` layout
+        """
+        # Pre-transpose so the forward pass is x @ W + b
+        self.layers = [
+            (
+                np.ascontiguousarray(np.asarray(w, dtype=np.float32).T),
+                np.asarray(b, dtype=np.float32),
+            )
+            for w, b in layers
+        ]
+
+    @classmethod
+    def from_state_dict(cls, state_dict: Mapping[str, Any]) -> "NumpyPolicy":
+        """Build from a ``QNetwork`` state dict (tensors, arrays or lists)."""
+        layers: Dict[int, Dict[str, np.ndarray]] = {}
+        for name, value in state_dict.items():
+            match = re.fullmatch(r"network\.(\d+)\.(weight|bias)", name)
+            if match is None:
+                continue
+            if TORCH_AVAILABLE and isinstance(value, torch.Tensor):
+                value = value.detach().cpu().numpy()
+            layers.setdefault(int(match.group(1)), {})[match.group(2)] = value
+        return cls([(layers[i]["weight"], layers[i]["bias"]) for i in sorted(layers)])
+
+    def __call__(self, states: np.ndarray) -> np.ndarray:
+        x = np.asarray(states, dtype=np.float32)
+        last = len(self.layers) - 1
+        for i, (weight, bias) in enumerate(self.layers):
+            x = x @ weight + bias
+            if i < last:
+                np.maximum(x, 0.0, out=x)
+        return x
+
+
+class TorchPolicy(PolicyRuntime):
+    """Detached copy of a network evaluated with PyTorch on CPU."""
+
+    backend = "torch"
+
+    def __init__(self, network: "torch.nn.Module"):
+        self.network = copy.deepcopy(network).cpu().eval()
+        for param in self.network.parameters():
+            param.requires_grad = False
+
+    def __call__(self, states: np.ndarray) -> np.ndarray:
+        with torch.no_grad():
+            x = torch.from_numpy(np.asarray(states, dtype=np.float32))
+            return self.network(x).numpy()
+
+
+class OnnxPolicy(PolicyRuntime):
+    """ONNX model evaluated with ONNX Runtime's CPU provider."""
+
+    backend = "onnx"
+
+    def __init__(self, model: bytes):
+        options = onnxruntime.SessionOptions()
+        # Batches are small; threads cost more than they save
+        options.intra_op_num_threads = 1
+        self.session = onnxruntime.InferenceSession(
+            model, options, providers=["CPUExecutionProvider"]
+        )
+
+    def __call__(self, states: np.ndarray) -> np.ndarray:
+        x = np.asarray(states, dtype=np.float32)
+        return self.session.run(["q_values"], {"state": x})[0]
+
+
+def build_policy_runtime(source: Any) -> PolicyRuntime:
+    """Snapshot a policy with the best available backend.
+
+    Args:
+        source: A ``NeuralAgent`` (its online network is used) or a
+            ``QNetwork`` state dict such as ``to_dict()["online_network_state"]``
+
+    Returns:
+        ONNX, torch or NumPy runtime, in that order of preference
+    """
+    if isinstance(source, Mapping):
+        return NumpyPolicy.from_state_dict(source)
+
+    if ONNXRUNTIME_AVAILABLE:
+        try:
+            return OnnxPolicy(source.export_onnx_bytes())
+        except Exception as e:
+            logger.warning(f"ONNX policy export failed, using fallback: {e}")
+
+    if TORCH_AVAILABLE:
+        return TorchPolicy(source.online_network)
+
+    return NumpyPolicy.from_state_dict(source.to_dict()["online_network_state"])
+
+
+class InferenceBatcher:
+    """Micro-batches Q-value requests across callers on one event loop.
+
+    The first request after an idle period opens a window of ``window_ms``;
+    everything queued when it closes (or once ``max_batch_size`` requests
+    are pending) is evaluated in one forward pass per policy.
+    """
+
+    def __init__(
+        self,
+        window_ms: float = DEFAULT_WINDOW_MS,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    ):
+        """
+        Args:
+            window_ms: How long to wait for more requests before evaluating
+            max_batch_size: Evaluate immediately once this many are pending
+        """
+        if max_batch_size <= 0:
+            raise ValueError(f"max_batch_size must be positive, got {max_batch_size}")
+
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self._policies: Dict[Hashable, PolicyRuntime] = {}
+        self._pending: Dict[Hashable, List[Tuple[np.ndarray, asyncio.Future]]] = {}
+        self._pending_count = 0
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+        self._requests = 0
+        self._batches = 0
+        self._max_batch = 0
+
+    def set_policy(self, key: Hashable, runtime: PolicyRuntime) -> None:
+        """Register or replace the runtime serving ``key``.
+
+        Requests already queued are evaluated with the new runtime.
+        """
+        self._policies[key] = runtime
+
+    def has_policy(self, key: Hashable) -> bool:
+        return key in self._policies
+
+    async def q_values(self, key: Hashable, state: np.ndarray) -> np.ndarray:
+        """Q-values of one ``state`` vector under policy ``key``.
+
+        Raises:
+            KeyError: If no runtime is registered for ``key``
+        """
+        if key not in self._policies:
+            raise KeyError(key)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(key, []).append((state, future))
+        self._pending_count += 1
+
+        if self._pending_count >= self.max_batch_size:
+            self.flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window, self.flush)
+
+        return await future
+
+    def flush(self) -> None:
+        """Evaluate everything pending now."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        pending, self._pending = self._pending, {}
+        self._pending_count = 0
+
+        for key, requests in pending.items():
+            try:
+                q_values = self._policies[key](np.stack([s for s, _ in requests]))
+            except Exception as e:
+                for _, future in requests:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), row in zip(requests, q_values):
+                if not future.done():
+                    future.set_result(row)
+
+            self._requests += len(requests)
+            self._batches += 1
+            self._max_batch = max(self._max_batch, len(requests))
+
+    async def close(self) -> None:
+        """Answer any queued requests."""
+        self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self._requests,
+            "batches": self._batches,
+            "mean_batch_size": self._requests / max(self._batches, 1),
+            "max_batch_size": self._max_batch,
+            "window_ms": self.window * 1000.0,
+            "backends": {str(k): p.backend for k, p in self._policies.items()},
+        }
@@ -14,9 +14,11 @@ Components:
 import math
 import re
 from dataclasses import dataclass
-from typing import Dict, Optional, Any, Set
+from typing import Dict, Optional, Any, Sequence, Set, Union
 from collections import deque
 
+import numpy as np
+
 from core.types import AcoreMessage
 from services.persona.rl.constants import (
     REWARD_WEIGHT_ENGAGEMENT,
@@ -31,6 +33,9 @@ from services.persona.rl.constants import (
     RL_EXPLORATION_BONUS_MAX,
 )
 
+# Component order used by vectorized scoring
+REWARD_OBJECTIVES = ("engagement", "quality", "affinity", "curiosity", "exploration")
+
 
 @dataclass
 class RewardComponents:
@@ -52,6 +57,10 @@ class RewardComponents:
     exploration: float
     total: float
 
+    def to_array(self) -> np.ndarray:
+        """Components in ``REWARD_OBJECTIVES`` order (without the total)."""
+        return np.array([getattr(self, obj) for obj in REWARD_OBJECTIVES])
+
 
 class MultiObjectiveReward:
     """Multi-objective reward decomposition calculator.
@@ -499,6 +508,47 @@ class MultiObjectiveReward:
 
         return questions
 
+    def scalarize(
+        self,
+        components: Union[np.ndarray, Sequence[RewardComponents]],
+        weight_sets: Optional[Sequence[Dict[str, float]]] = None,
+    ) -> np.ndarray:
+        """Weighted totals for many component vectors and weightings at once.
+
+        Applies the same clipping and scaling as ``calculate``, as one
+        matrix product instead of a Python loop per candidate and weighting.
+
+        Args:
+            components: ``(n, 5)`` array in ``REWARD_OBJECTIVES`` order, or
+                RewardComponents
+            weight_sets: Weight dictionaries (normalized like ``set_weights``);
+                defaults to the current weights
+
+        Returns:
+            ``(n,)`` totals for the current weights, else ``(n, len(weight_sets))``
+        """
+        if not isinstance(components, np.ndarray):
+            components = np.array(
+                [c.to_array() for c in components], dtype=np.float64
+            ).reshape(-1, len(REWARD_OBJECTIVES))
+        clipped = np.clip(components, -REWARD_CLIP_COMPONENT, REWARD_CLIP_COMPONENT)
+
+        if weight_sets is None:
+            weights = self._weight_vector(self.weights)
+        else:
+            weights = np.stack([self._weight_vector(w) for w in weight_sets], axis=1)
+
+        # Components are [-5, 5]; scale the weighted sum to [-10, 10]
+        totals = (clipped @ weights) * 2.0
+        return np.clip(totals, -REWARD_CLIP_TOTAL, REWARD_CLIP_TOTAL)
+
+    def _weight_vector(self, weights: Dict[str, float]) -> np.ndarray:
+        """Normalized weights in ``REWARD_OBJECTIVES`` order."""
+        total = sum(weights.values())
+        if total <= 0:
+            weights, total = self.weights, 1.0
+        return np.array([weights.get(obj, 0.0) / total for obj in REWARD_OBJECTIVES])
+
     def get_weights(self) -> Dict[str, float]:
         """Get current component weights.
 
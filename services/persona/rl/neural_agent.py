@@ -265,6 +265,36 @@ if TORCH_AVAILABLE:
 
             return RLAction(action_idx)
 
+        def select_action_from_q_values(
+            self, q_values: np.ndarray, epsilon: Optional[float] = None
+        ) -> RLAction:
+            """
+            Epsilon-greedy choice from precomputed Q-values.
+
+            Used when the forward pass ran elsewhere (e.g. batched by an
+            ``InferenceBatcher``); exploration and epsilon decay match
+            ``select_action``.
+
+            Args:
+                q_values: Q-value per action
+                epsilon: Override exploration rate. If None, uses internal epsilon.
+
+            Returns:
+                RLAction enum value
+            """
+            if epsilon is None:
+                epsilon = self.epsilon
+
+            if np.random.random() < epsilon:
+                action_idx = np.random.randint(0, self.action_dim)
+            else:
+                action_idx = int(np.argmax(q_values))
+
+            self.epsilon = max(self.epsilon_end, self.epsilon * self.epsilon_decay)
+            self._stats.epsilon = self.epsilon
+
+            return RLAction(action_idx)
+
         def get_q_values(
             self, state: Union[RLState, np.ndarray, torch.Tensor, List[float]]
         ) -> np.ndarray:
@@ -341,8 +371,113 @@ if TORCH_AVAILABLE:
             self.soft_update()
 
             loss_value = loss.item()
+            self._record_update(loss_value, current_q_value.item(), start_time)
+
+            logger.debug(
+                f"DQN Update: action={RLAction(action_idx).name}, reward={reward:.2f}, "
+                f"Q: {current_q_value.item():.3f}, loss={loss_value:.4f}"
+            )
+
+            return loss_value
+
+        def update_batch(
+            self,
+            states: np.ndarray,
+            actions: np.ndarray,
+            rewards: np.ndarray,
+            next_states: np.ndarray,
+            dones: np.ndarray,
+            weights: Optional[np.ndarray] = None,
+        ) -> Tuple[float, np.ndarray]:
+            """
+            Perform one Double DQN step on a whole minibatch.
+
+            Same target as ``update`` but for ``n`` transitions at once, with
+            one forward/backward pass and one optimizer step.
+
+            Args:
+                states: ``(n, state_dim)`` states
+                actions: ``(n,)`` action indices
+                rewards: ``(n,)`` rewards
+                next_states: ``(n, state_dim)`` next states
+                dones: ``(n,)`` terminal flags
+                weights: Optional ``(n,)`` importance-sampling weights
+                    (prioritized replay); the per-sample loss is scaled by them
+
+            Returns:
+                Tuple of (mean loss, absolute TD error per transition)
+            """
+            start_time = time.perf_counter()
+
+            state_tensor = torch.as_tensor(
+                states, dtype=torch.float32, device=self.device
+            )
+            next_state_tensor = torch.as_tensor(
+                next_states, dtype=torch.float32, device=self.device
+            )
+            action_tensor = torch.as_tensor(
+                actions, dtype=torch.int64, device=self.device
+            ).unsqueeze(1)
+            reward_tensor = torch.as_tensor(
+                rewards, dtype=torch.float32, device=self.device
+            )
+            not_done = 1.0 - torch.as_tensor(
+                dones, dtype=torch.float32, device=self.device
+            )
+
+            with torch.no_grad():
+                best_next_action = self.online_network(next_state_tensor).argmax(
+                    dim=1, keepdim=True
+                )
+                next_q_value = (
+                    self.target_network(next_state_tensor)
+                    .gather(1, best_next_action)
+                    .squeeze(1)
+                )
+                target_q = (
+                    reward_tensor + not_done * self.discount_factor * next_q_value
+                )
+
+            current_q_value = (
+                self.online_network(state_tensor).gather(1, action_tensor).squeeze(1)
+            )
+
+            losses = nn.functional.smooth_l1_loss(
+                current_q_value, target_q, reduction="none"
+            )
+            if weights is not None:
+                losses = losses * torch.as_tensor(
+                    weights, dtype=torch.float32, device=self.device
+                )
+            loss = losses.mean()
+
+            self.optimizer.zero_grad()
+            loss.backward()
+            torch.nn.utils.clip_grad_norm_(
+                self.online_network.parameters(), max_norm=1.0
+            )
+            self.optimizer.step()
+
+            self.soft_update()
+
+            td_errors = (target_q - current_q_value.detach()).abs().cpu().numpy()
+            loss_value = loss.item()
+            self._record_update(
+                loss_value, current_q_value.detach().mean().item(), start_time
+            )
+
+            logger.debug(
+                f"DQN batch update: n={len(td_errors)}, loss={loss_value:.4f}"
+            )
+
+            return loss_value, td_errors
+
+        def _record_update(
+            self, loss_value: float, q_value: float, start_time: float
+        ) -> None:
+            """Track loss, Q-value and timing after an optimizer step."""
             self._loss_history.append(loss_value)
-            self._q_value_history.append(current_q_value.item())
+            self._q_value_history.append(q_value)
 
             if len(self._loss_history) > 1000:
                 self._loss_history = self._loss_history[-1000:]
@@ -360,13 +495,6 @@ if TORCH_AVAILABLE:
 
             self.dirty = True
 
-            logger.debug(
-                f"DQN Update: action={RLAction(action_idx).name}, reward={reward:.2f}, "
-                f"Q: {current_q_value.item():.3f}, loss={loss_value:.4f}"
-            )
-
-            return loss_value
-
         def soft_update(self, tau: Optional[float] = None) -> None:
             """
             Soft update target network: theta_target = tau * theta_online + (1-tau) * theta_target.
@@ -389,6 +517,16 @@ if TORCH_AVAILABLE:
             """Copy online network weights to target network."""
             self.target_network.load_state_dict(self.online_network.state_dict())
 
+        @property
+        def total_updates(self) -> int:
+            """Gradient updates applied to the online network."""
+            return self._stats.total_updates
+
+        @total_updates.setter
+        def total_updates(self, value: int) -> None:
+            # Set when weights trained elsewhere (background learner) are loaded
+            self._stats.total_updates = int(value)
+
         def get_stats(self) -> Dict[str, Any]:
             """Get training statistics for dashboard monitoring."""
             stats = self._stats.to_dict()
@@ -8,11 +8,12 @@ Reference:
     Kumar et al. (2020). Conservative Q-Learning for Offline Reinforcement Learning.
 """
 
+import json
 import logging
 import sqlite3
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 import torch
@@ -20,11 +21,28 @@ import torch.nn.functional as F
 import torch.optim as optim
 
 from .neural_agent import NeuralAgent
-from .replay_buffer import ReplayBuffer, Transition
+from .replay_buffer import ReplayBuffer, Transition, embed_rl_states
 from .types import RLAction
 
 logger = logging.getLogger(__name__)
 
+HISTORY_QUERY = """
+    SELECT
+        m.channel_id,
+        m.role,
+        m.content,
+        m.username,
+        m.user_id,
+        m.timestamp,
+        COALESCE(r.quality_score, 0.5) as quality_score,
+        COALESCE(r.reward, 0.0) as reward,
+        COALESCE(r.action_taken, 0) as action_taken
+    FROM messages m
+    LEFT JOIN rewards r ON m.id = r.message_id
+    WHERE COALESCE(r.quality_score, 0.5) >= ?
+    ORDER BY m.timestamp
+"""
+
 
 @dataclass
 class TransitionBatch:
@@ -342,23 +360,7 @@ class OfflineRLDataset:
                 # Note: This assumes a schema with quality metrics
                 # Adjust query based on actual database schema
                 cursor.execute(
-                    """
-                    SELECT 
-                        m.channel_id,
-                        m.role,
-                        m.content,
-                        m.username,
-                        m.user_id,
-                        m.timestamp,
-                        COALESCE(r.quality_score, 0.5) as quality_score,
-                        COALESCE(r.reward, 0.0) as reward,
-                        COALESCE(r.action_taken, 0) as action_taken
-                    FROM messages m
-                    LEFT JOIN rewards r ON m.id = r.message_id
-                    WHERE COALESCE(r.quality_score, 0.5) >= ?
-                    ORDER BY m.timestamp
-                    LIMIT ?
-                    """,
+                    HISTORY_QUERY + " LIMIT ?",
                     (min_quality_score, max_conversations * 10),
                 )
 
@@ -372,18 +374,7 @@ class OfflineRLDataset:
                     if channel_id not in channel_messages:
                         channel_messages[channel_id] = []
 
-                    channel_messages[channel_id].append(
-                        {
-                            "role": row[1],
-                            "content": row[2],
-                            "username": row[3],
-                            "user_id": row[4],
-                            "timestamp": row[5],
-                            "quality_score": row[6],
-                            "reward": row[7],
-                            "action_taken": row[8],
-                        }
-                    )
+                    channel_messages[channel_id].append(self._row_message(row))
 
                 # Create transitions from message sequences
                 for channel_id, messages in channel_messages.items():
@@ -429,7 +420,22 @@ class OfflineRLDataset:
         logger.info(f"Loaded {len(self.transitions)} transitions from {self.db_path}")
         return len(self.transitions)
 
-    def _extract_state(self, message: Dict, index: int) -> Tuple[int, int, int]:
+    @staticmethod
+    def _row_message(row: tuple) -> Dict[str, Any]:
+        """Message dictionary for a ``HISTORY_QUERY`` row."""
+        return {
+            "role": row[1],
+            "content": row[2],
+            "username": row[3],
+            "user_id": row[4],
+            "timestamp": row[5],
+            "quality_score": row[6],
+            "reward": row[7],
+            "action_taken": row[8],
+        }
+
+    @staticmethod
+    def _extract_state(message: Dict, index: int) -> Tuple[int, int, int]:
         """Extract RL state from message.
 
         Args:
@@ -502,6 +508,39 @@ class OfflineRLDataset:
         """
         return [self.transitions[i] for i in self._val_indices]
 
+    def iter_batches(
+        self,
+        batch_size: int,
+        device: Optional[torch.device] = None,
+        shuffle: bool = True,
+        split: str = "train",
+    ) -> Iterator[TransitionBatch]:
+        """Iterate once over a split in minibatches.
+
+        Args:
+            batch_size: Transitions per batch (the last batch may be smaller)
+            device: Device for the batch tensors (default: CPU)
+            shuffle: Visit transitions in random order
+            split: "train" or "val"; all transitions if the dataset
+                hasn't been split
+
+        Yields:
+            TransitionBatch for each minibatch
+        """
+        if self._train_indices or self._val_indices:
+            indices = np.asarray(
+                self._train_indices if split == "train" else self._val_indices
+            )
+        else:
+            indices = np.arange(len(self.transitions))
+        if shuffle:
+            indices = np.random.permutation(indices)
+
+        device = device if device is not None else torch.device("cpu")
+        for start in range(0, len(indices), batch_size):
+            chunk = indices[start : start + batch_size]
+            yield collate_transitions([self.transitions[i] for i in chunk], device)
+
     def to_replay_buffer(self) -> ReplayBuffer:
         """Convert all transitions to a replay buffer.
 
@@ -539,6 +578,405 @@ class OfflineRLDataset:
         }
 
 
+class StreamingOfflineRLDataset:
+    """Offline RL dataset streamed from SQLite into on-disk shards.
+
+    ``build`` walks the history query with ``fetchmany`` and keeps only the
+    previous message of each channel in memory, emitting transitions into
+    fixed-size ``.npz`` shards as it goes. ``iter_batches`` then loads one
+    shard at a time and yields shuffled minibatches, so memory use is bounded
+    by ``shard_size`` rather than by the length of the history.
+
+    Shards hold raw RLState tuples; they are embedded into ``state_dim``
+    vectors per batch. The train/validation split is a per-row mask derived
+    from ``(seed, shard)``, so it costs no storage and is stable across runs.
+
+    Attributes:
+        db_path: Path to SQLite database
+        shard_dir: Directory holding shards and ``manifest.json``
+        shard_size: Transitions per shard
+        state_dim: Length of embedded state vectors
+    """
+
+    MANIFEST_NAME = "manifest.json"
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        shard_dir: Union[str, Path],
+        shard_size: int = 50000,
+        state_dim: int = 128,
+    ):
+        """Initialize dataset, picking up shards from a previous build.
+
+        Args:
+            db_path: Path to SQLite database file
+            shard_dir: Directory for shard files
+            shard_size: Transitions per shard (default: 50000)
+            state_dim: State embedding dimension (default: 128)
+        """
+        if shard_size <= 0:
+            raise ValueError(f"shard_size must be positive, got {shard_size}")
+
+        self.db_path = Path(db_path)
+        self.shard_dir = Path(shard_dir)
+        self.shard_size = shard_size
+        self.state_dim = state_dim
+        self.val_ratio = 0.0
+        self.seed = 42
+        self.shards: List[Dict[str, Any]] = []
+
+        manifest_path = self.shard_dir / self.MANIFEST_NAME
+        if manifest_path.exists():
+            try:
+                with open(manifest_path, "r", encoding="utf-8") as f:
+                    self.shards = json.load(f)["shards"]
+            except (OSError, json.JSONDecodeError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable shard manifest: {e}")
+
+    def __len__(self) -> int:
+        return sum(shard["size"] for shard in self.shards)
+
+    def build(
+        self,
+        min_quality_score: float = 0.5,
+        max_transitions: Optional[int] = None,
+        reward_threshold: Optional[float] = None,
+        chunk_size: int = 10000,
+    ) -> int:
+        """Stream the history database into shards, replacing any old ones.
+
+        Produces the same transitions as ``OfflineRLDataset.load_from_history``
+        (consecutive messages within a channel), in timestamp order.
+
+        Args:
+            min_quality_score: Minimum quality score for interactions
+            max_transitions: Stop after this many transitions (default: all)
+            reward_threshold: Optional minimum reward threshold
+            chunk_size: Rows fetched from SQLite per round trip
+
+        Returns:
+            Number of transitions written
+        """
+        if not self.db_path.exists():
+            logger.warning(f"Database not found: {self.db_path}")
+            return 0
+
+        self._remove_shards()
+        self.shard_dir.mkdir(parents=True, exist_ok=True)
+        self.shards = []
+        writer = _ShardWriter(self.shard_dir, self.shard_size)
+
+        # channel_id -> (previous message, its index within the channel)
+        previous: Dict[int, Tuple[Dict[str, Any], int]] = {}
+        total = 0
+        skipped = 0
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.execute(HISTORY_QUERY, (min_quality_score,))
+                while max_transitions is None or total < max_transitions:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        channel_id = row[0]
+                        message = OfflineRLDataset._row_message(row)
+                        prev = previous.get(channel_id)
+                        index = 0 if prev is None else prev[1] + 1
+                        previous[channel_id] = (message, index)
+                        if prev is None:
+                            continue
+
+                        prev_message, prev_index = prev
+                        reward = prev_message["reward"]
+                        if reward_threshold is not None and reward < reward_threshold:
+                            continue
+                        try:
+                            action = RLAction(prev_message["action_taken"])
+                        except ValueError:
+                            skipped += 1
+                            continue
+
+                        writer.add(
+                            OfflineRLDataset._extract_state(prev_message, prev_index),
+                            action.value,
+                            reward,
+                            OfflineRLDataset._extract_state(message, index),
+                        )
+                        total += 1
+                        if max_transitions is not None and total >= max_transitions:
+                            break
+                cursor.close()
+        except sqlite3.Error as e:
+            logger.error(f"Database error: {e}")
+            return 0
+
+        self.shards = writer.close()
+        self._write_manifest()
+        if skipped:
+            logger.warning(f"Skipped {skipped} rows with an unknown action")
+        logger.info(
+            f"Streamed {total} transitions from {self.db_path} "
+            f"into {len(self.shards)} shards"
+        )
+        return total
+
+    def _remove_shards(self) -> None:
+        """Delete shards and the manifest from a previous build.
+
+        Only files this class writes are removed; anything else in
+        ``shard_dir`` is left alone.
+        """
+        if not self.shard_dir.is_dir():
+            return
+        for path in self.shard_dir.glob("shard_*.npz"):
+            path.unlink(missing_ok=True)
+        (self.shard_dir / self.MANIFEST_NAME).unlink(missing_ok=True)
+
+    def _write_manifest(self) -> None:
+        path = self.shard_dir / self.MANIFEST_NAME
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"shard_size": self.shard_size, "shards": self.shards}, f)
+        tmp_path.replace(path)
+
+    def split_train_val(
+        self, val_ratio: float = 0.1, seed: int = 42
+    ) -> Tuple[int, int]:
+        """Choose the validation fraction (rows are assigned per shard).
+
+        Args:
+            val_ratio: Fraction of data to use for validation (default: 0.1)
+            seed: Random seed for reproducibility
+
+        Returns:
+            Tuple of (train_size, val_size)
+        """
+        self.val_ratio = val_ratio
+        self.seed = seed
+        val_size = sum(
+            int(self._val_mask(i, shard["size"]).sum())
+            for i, shard in enumerate(self.shards)
+        )
+        train_size = len(self) - val_size
+
+        logger.info(f"Split dataset: {train_size} train, {val_size} val")
+        return train_size, val_size
+
+    def _val_mask(self, shard_index: int, size: int) -> np.ndarray:
+        rng = np.random.default_rng([self.seed, shard_index])
+        return rng.random(size) < self.val_ratio
+
+    def _load_shard(self, shard_index: int, split: str) -> Dict[str, np.ndarray]:
+        shard = self.shards[shard_index]
+        with np.load(self.shard_dir / shard["file"], allow_pickle=False) as data:
+            arrays = {name: data[name] for name in data.files}
+        if self.val_ratio > 0:
+            mask = self._val_mask(shard_index, shard["size"])
+            keep = mask if split == "val" else ~mask
+            arrays = {name: array[keep] for name, array in arrays.items()}
+        return arrays
+
+    def _to_batch(
+        self, arrays: Dict[str, np.ndarray], device: torch.device
+    ) -> TransitionBatch:
+        return TransitionBatch(
+            states=torch.from_numpy(
+                embed_rl_states(arrays["states"], self.state_dim)
+            ).to(device),
+            actions=torch.from_numpy(arrays["actions"]).to(device),
+            rewards=torch.from_numpy(arrays["rewards"]).to(device),
+            next_states=torch.from_numpy(
+                embed_rl_states(arrays["next_states"], self.state_dim)
+            ).to(device),
+            dones=torch.from_numpy(arrays["dones"].astype(np.float32)).to(device),
+        )
+
+    def iter_batches(
+        self,
+        batch_size: int,
+        device: Optional[torch.device] = None,
+        shuffle: bool = True,
+        split: str = "train",
+        seed: Optional[int] = None,
+    ) -> Iterator[TransitionBatch]:
+        """Iterate once over a split in minibatches, one shard at a time.
+
+        Shard order and rows within each shard are shuffled. Rows left over
+        at the end of a shard are carried into the next one, so every batch
+        but the last has ``batch_size`` transitions.
+
+        Args:
+            batch_size: Transitions per batch
+            device: Device for the batch tensors (default: CPU)
+            shuffle: Shuffle shards and rows
+            split: "train" or "val"
+            seed: Seed for the shuffle (default: fresh entropy)
+
+        Yields:
+            TransitionBatch for each minibatch
+        """
+        device = device if device is not None else torch.device("cpu")
+        rng = np.random.default_rng(seed)
+        order = (
+            rng.permutation(len(self.shards)) if shuffle else range(len(self.shards))
+        )
+
+        carry: Optional[Dict[str, np.ndarray]] = None
+        for shard_index in order:
+            arrays = self._load_shard(int(shard_index), split)
+            if carry is not None:
+                arrays = {
+                    name: np.concatenate([carry[name], array])
+                    for name, array in arrays.items()
+                }
+            if shuffle:
+                perm = rng.permutation(len(arrays["actions"]))
+                arrays = {name: array[perm] for name, array in arrays.items()}
+
+            full = len(arrays["actions"]) // batch_size * batch_size
+            for start in range(0, full, batch_size):
+                yield self._to_batch(
+                    {n: a[start : start + batch_size] for n, a in arrays.items()},
+                    device,
+                )
+            carry = {name: array[full:] for name, array in arrays.items()}
+
+        if carry is not None and len(carry["actions"]):
+            yield self._to_batch(carry, device)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get dataset statistics (from the manifest; no shards are read).
+
+        Returns:
+            Dictionary with dataset statistics
+        """
+        total = len(self)
+        if not total:
+            return {"total_transitions": 0}
+
+        reward_sum = sum(shard["reward_sum"] for shard in self.shards)
+        reward_sq_sum = sum(shard["reward_sq_sum"] for shard in self.shards)
+        mean = reward_sum / total
+        action_counts = np.sum([shard["action_counts"] for shard in self.shards], 0)
+
+        return {
+            "total_transitions": total,
+            "num_shards": len(self.shards),
+            "mean_reward": float(mean),
+            "std_reward": float(np.sqrt(max(reward_sq_sum / total - mean**2, 0.0))),
+            "min_reward": float(min(shard["reward_min"] for shard in self.shards)),
+            "max_reward": float(max(shard["reward_max"] for shard in self.shards)),
+            "action_distribution": {
+                action: int(count)
+                for action, count in enumerate(action_counts)
+                if count
+            },
+        }
+
+
+class _ShardWriter:
+    """Accumulates transitions in preallocated arrays and flushes shards."""
+
+    def __init__(self, shard_dir: Path, shard_size: int):
+        self.shard_dir = shard_dir
+        self.shard_size = shard_size
+        self.shards: List[Dict[str, Any]] = []
+        self._states = np.zeros((shard_size, 3), dtype=np.int32)
+        self._next_states = np.zeros((shard_size, 3), dtype=np.int32)
+        self._actions = np.zeros(shard_size, dtype=np.int64)
+        self._rewards = np.zeros(shard_size, dtype=np.float32)
+        self._count = 0
+
+    def add(
+        self,
+        state: Tuple[int, int, int],
+        action: int,
+        reward: float,
+        next_state: Tuple[int, int, int],
+    ) -> None:
+        i = self._count
+        self._states[i] = state
+        self._next_states[i] = next_state
+        self._actions[i] = action
+        self._rewards[i] = reward
+        self._count += 1
+        if self._count == self.shard_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        n = self._count
+        if not n:
+            return
+        name = f"shard_{len(self.shards):05d}.npz"
+        rewards = self._rewards[:n]
+        np.savez(
+            self.shard_dir / name,
+            states=self._states[:n],
+            next_states=self._next_states[:n],
+            actions=self._actions[:n],
+            rewards=rewards,
+            # Episodes don't really end in chat
+            dones=np.zeros(n, dtype=bool),
+        )
+        self.shards.append(
+            {
+                "file": name,
+                "size": n,
+                "reward_sum": float(rewards.sum(dtype=np.float64)),
+                "reward_sq_sum": float(np.square(rewards, dtype=np.float64).sum()),
+                "reward_min": float(rewards.min()),
+                "reward_max": float(rewards.max()),
+                "action_counts": np.bincount(
+                    self._actions[:n], minlength=len(RLAction)
+                ).tolist(),
+            }
+        )
+        self._count = 0
+
+    def close(self) -> List[Dict[str, Any]]:
+        self._flush()
+        return self.shards
+
+
+def validate_agent_batches(
+    agent: NeuralAgent, batches: Iterable[TransitionBatch]
+) -> Dict[str, float]:
+    """Validate agent on held-out minibatches (see ``iter_batches``).
+
+    Args:
+        agent: NeuralAgent to validate
+        batches: Validation batches
+
+    Returns:
+        Dictionary with the same metrics as ``validate_agent``
+    """
+    agent.eval_mode()
+
+    count = 0
+    q_sum = q_sq_sum = reward_sum = 0.0
+    with torch.no_grad():
+        for batch in batches:
+            batch = batch.to(agent.device)
+            q = agent.online_network(batch.states)
+            q = q.gather(1, batch.actions.unsqueeze(1)).squeeze(1).double()
+            count += len(q)
+            q_sum += q.sum().item()
+            q_sq_sum += q.square().sum().item()
+            reward_sum += batch.rewards.double().sum().item()
+
+    if not count:
+        return {"avg_q": 0.0, "avg_reward": 0.0}
+
+    avg_q = q_sum / count
+    return {
+        "avg_q": avg_q,
+        "std_q": float(np.sqrt(max(q_sq_sum / count - avg_q**2, 0.0))),
+        "avg_reward": reward_sum / count,
+        "num_samples": count,
+    }
+
+
 def validate_agent(
     agent: NeuralAgent,
     val_transitions: List[Transition],
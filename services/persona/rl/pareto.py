@@ -10,11 +10,18 @@ Pareto Dominance:
     - A is > B in AT LEAST ONE objective
 
 The Pareto frontier contains all non-dominated actions.
+
+Selection works on an ``(n_actions, n_objectives)`` Q-value matrix:
+dominance is checked for all pairs with broadcasted comparisons, and
+scalarization against many weight vectors is a single matrix product.
+``ParetoFront`` maintains a frontier incrementally as candidates arrive.
 """
 
 import random
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 from .constants import (
     REWARD_WEIGHT_ENGAGEMENT,
@@ -113,6 +120,157 @@ class ActionProfile:
         return min(self.q_values.values())
 
 
+def profiles_to_matrix(
+    action_profiles: Sequence[ActionProfile],
+    objectives: Optional[Sequence[str]] = None,
+) -> Tuple[np.ndarray, List[str]]:
+    """Stack profiles into an ``(n_actions, n_objectives)`` Q-value matrix.
+
+    Args:
+        action_profiles: Profiles to stack
+        objectives: Column order. Defaults to every objective seen, in
+            first-seen order.
+
+    Returns:
+        (matrix, objectives); objectives a profile lacks are NaN
+    """
+    if objectives is None:
+        first = tuple(action_profiles[0].q_values) if action_profiles else ()
+        if all(tuple(p.q_values) == first for p in action_profiles):
+            # Common case: every profile has the same objectives in order
+            matrix = np.array(
+                [tuple(p.q_values.values()) for p in action_profiles],
+                dtype=np.float64,
+            ).reshape(len(action_profiles), len(first))
+            return matrix, list(first)
+
+        seen: Dict[str, None] = {}
+        for profile in action_profiles:
+            seen.update(dict.fromkeys(profile.q_values))
+        objectives = list(seen)
+    else:
+        objectives = list(objectives)
+
+    matrix = np.full((len(action_profiles), len(objectives)), np.nan)
+    for i, profile in enumerate(action_profiles):
+        for j, obj in enumerate(objectives):
+            value = profile.q_values.get(obj)
+            if value is not None:
+                matrix[i, j] = value
+    return matrix, objectives
+
+
+def dominance_matrix(
+    values: np.ndarray, others: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Pairwise Pareto dominance with broadcasted comparisons.
+
+    Only objectives both rows define (non-NaN) are compared, as in
+    ``ActionProfile.dominates``.
+
+    Args:
+        values: ``(n, k)`` objective values
+        others: ``(m, k)`` values to compare against (defaults to ``values``)
+
+    Returns:
+        ``(n, m)`` bool matrix; ``[i, j]`` is True if row i dominates row j
+    """
+    if others is None:
+        others = values
+    a = values[:, None, :]
+    b = others[None, :, :]
+    not_worse = a >= b
+    if np.isnan(values).any() or np.isnan(others).any():
+        # NaN comparisons are False, so uncompared objectives never block or count
+        not_worse |= np.isnan(a) | np.isnan(b)
+    return not_worse.all(axis=-1) & (a > b).any(axis=-1)
+
+
+def pareto_mask(values: np.ndarray) -> np.ndarray:
+    """Mask of the non-dominated rows of an ``(n, k)`` objective matrix."""
+    return ~dominance_matrix(values).any(axis=0)
+
+
+def scalarize(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Weighted sums of objective rows for one or many weight vectors.
+
+    Missing (NaN) objectives contribute nothing, as in
+    ``ActionProfile.weighted_sum``.
+
+    Args:
+        values: ``(n, k)`` objective values
+        weights: ``(k,)`` weight vector or ``(m, k)`` weight matrix
+
+    Returns:
+        ``(n,)`` or ``(n, m)`` scores
+    """
+    return np.nan_to_num(values, nan=0.0) @ np.asarray(weights, dtype=np.float64).T
+
+
+class ParetoFront:
+    """Pareto frontier maintained incrementally as candidates arrive.
+
+    Each ``add`` compares the candidate against the current front only:
+    dominated candidates are rejected, and front members the candidate
+    dominates are dropped.
+    """
+
+    def __init__(self, n_objectives: int, capacity: int = 64):
+        """
+        Args:
+            n_objectives: Objectives per candidate
+            capacity: Initial storage; grows as needed
+        """
+        self._values = np.empty((max(capacity, 1), n_objectives))
+        self._items: List[Any] = []
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def values(self) -> np.ndarray:
+        """``(len(self), n_objectives)`` values of the front (a view)."""
+        return self._values[: len(self._items)]
+
+    @property
+    def items(self) -> List[Any]:
+        return list(self._items)
+
+    def add(self, values: Sequence[float], item: Any = None) -> bool:
+        """Offer a candidate to the front.
+
+        Args:
+            values: The candidate's objective values
+            item: Payload kept alongside the values (e.g. an ActionProfile)
+
+        Returns:
+            True if the candidate joined the front
+        """
+        candidate = np.asarray(values, dtype=np.float64)[None, :]
+        front = self.values
+
+        if len(front):
+            if dominance_matrix(front, candidate)[:, 0].any():
+                return False
+            keep = ~dominance_matrix(candidate, front)[0]
+            if not keep.all():
+                kept = np.flatnonzero(keep)
+                self._values[: len(kept)] = front[kept]
+                self._items = [self._items[i] for i in kept]
+
+        size = len(self._items)
+        if size == len(self._values):
+            grown = np.empty((2 * size, self._values.shape[1]))
+            grown[:size] = self._values
+            self._values = grown
+        self._values[size] = candidate[0]
+        self._items.append(item)
+        return True
+
+    def clear(self) -> None:
+        self._items = []
+
+
 class ParetoSelector:
     """Pareto frontier action selection for multi-objective RL.
 
@@ -162,8 +320,7 @@ class ParetoSelector:
 
         An action is on the Pareto frontier if no other action dominates it.
 
-        Time complexity: O(n^2) where n is number of actions.
-        For small action spaces (4 actions), this is negligible (<1ms).
+        Dominance for all pairs is computed at once from the Q-value matrix.
 
         Args:
             action_profiles: List of ActionProfile to evaluate
@@ -177,22 +334,9 @@ class ParetoSelector:
         if len(action_profiles) == 1:
             return action_profiles.copy()
 
-        frontier: List[ActionProfile] = []
-
-        for candidate in action_profiles:
-            is_dominated = False
-
-            for other in action_profiles:
-                if other is candidate:
-                    continue
-                if other.dominates(candidate):
-                    is_dominated = True
-                    break
-
-            if not is_dominated:
-                frontier.append(candidate)
-
-        return frontier
+        matrix, _ = profiles_to_matrix(action_profiles)
+        mask = pareto_mask(matrix)
+        return [profile for profile, keep in zip(action_profiles, mask) if keep]
 
     def select_action(
         self,
@@ -233,16 +377,10 @@ class ParetoSelector:
         Returns:
             RLAction with highest weighted sum
         """
-        best_action = action_profiles[0].action
-        best_score = action_profiles[0].weighted_sum(self.weights)
-
-        for profile in action_profiles[1:]:
-            score = profile.weighted_sum(self.weights)
-            if score > best_score:
-                best_score = score
-                best_action = profile.action
-
-        return best_action
+        matrix, objectives = profiles_to_matrix(action_profiles)
+        scores = scalarize(matrix, self._weight_vector(objectives))
+        # argmax keeps the first of tied actions
+        return action_profiles[int(np.argmax(scores))].action
 
     def _pareto_epsilon_selection(
         self,
@@ -286,16 +424,51 @@ class ParetoSelector:
         Returns:
             RLAction with highest minimum Q-value
         """
-        best_action = action_profiles[0].action
-        best_min_value = action_profiles[0].min_q_value()
+        matrix, _ = profiles_to_matrix(action_profiles)
+        present = ~np.isnan(matrix)
+        # Profiles without Q-values rank last, like min_q_value()
+        minima = np.where(present, matrix, np.inf).min(axis=1)
+        minima[~present.any(axis=1)] = -np.inf
+        return action_profiles[int(np.argmax(minima))].action
+
+    def select_actions_for_weights(
+        self,
+        action_profiles: List[ActionProfile],
+        weight_sets: Sequence[Dict[str, float]],
+    ) -> List[RLAction]:
+        """Best action by weighted sum under each of many weightings.
 
-        for profile in action_profiles[1:]:
-            min_value = profile.min_q_value()
-            if min_value > best_min_value:
-                best_min_value = min_value
-                best_action = profile.action
+        All weightings are scored with one matrix product, e.g. to sweep
+        preferences or to score every candidate for every user at once.
+
+        Args:
+            action_profiles: List of ActionProfile to choose from
+            weight_sets: Weight dictionaries (normalized like ``set_weights``)
+
+        Returns:
+            One selected RLAction per weight dictionary
+        """
+        if not action_profiles:
+            raise ValueError("action_profiles cannot be empty")
+        if not weight_sets:
+            return []
 
-        return best_action
+        matrix, objectives = profiles_to_matrix(action_profiles)
+        weights = np.array(
+            [[w.get(obj, 0.0) for obj in objectives] for w in weight_sets],
+            dtype=np.float64,
+        )
+        totals = np.array([sum(w.values()) for w in weight_sets], dtype=np.float64)
+        # set_weights replaces non-positive weightings with the defaults
+        weights[totals <= 0] = [DEFAULT_WEIGHTS.get(obj, 0.0) for obj in objectives]
+        totals[totals <= 0] = 1.0
+        weights /= totals[:, None]
+
+        best = np.argmax(scalarize(matrix, weights), axis=0)
+        return [action_profiles[int(i)].action for i in best]
+
+    def _weight_vector(self, objectives: Sequence[str]) -> np.ndarray:
+        return np.array([self.weights.get(obj, 0.0) for obj in objectives])
 
     def set_weights(self, weights: Dict[str, float]) -> None:
         """Update the objective weights.
@@ -1,64 +1,276 @@
+"""Binary, incremental persistence for RL state.
+
+Every agent or bandit is one record in a SQLite table: a small ``.npz``
+payload keyed by ``"<channel_id>:<user_id>"`` within a namespace. Saves
+upsert only the records that changed, in a single transaction, so a
+checkpoint costs time proportional to the number of dirty agents and a
+crash mid-save leaves the previous checkpoint intact. The table doubles as
+the manifest (namespace, key, size, update time).
+
+Legacy ``rl_policies.json`` / ``bandit_states.json`` files are imported the
+first time a namespace is empty.
+"""
+
+import io
 import json
 import logging
-import os
-from pathlib import Path
-from typing import Dict, Tuple
+import sqlite3
+import threading
+import time
 from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Mapping, Optional, Tuple
+
+import numpy as np
 
 from .agent import RLAgent
+from .types import RLAction
 
 logger = logging.getLogger(__name__)
 
+AgentKey = Tuple[int, int]
+
+
+def encode_arrays(**arrays: np.ndarray) -> bytes:
+    """Pack arrays into an uncompressed ``.npz`` payload."""
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+    return buffer.getvalue()
+
+
+def decode_arrays(payload: bytes) -> Dict[str, np.ndarray]:
+    """Unpack an ``encode_arrays`` payload."""
+    with np.load(io.BytesIO(payload), allow_pickle=False) as data:
+        return {name: data[name] for name in data.files}
+
+
+def format_key(key: AgentKey) -> str:
+    return f"{key[0]}:{key[1]}"
+
+
+def parse_key(key_str: str) -> AgentKey:
+    cid_str, uid_str = key_str.split(":")
+    return (int(cid_str), int(uid_str))
+
+
+class RecordStore:
+    """SQLite table of binary records with per-record upserts."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Opened lazily so constructing a disabled service touches no files
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS records (
+                    namespace TEXT NOT NULL,
+                    record_key TEXT NOT NULL,
+                    payload BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, record_key)
+                )
+            """)
+            self._conn.commit()
+        return self._conn
+
+    def write(self, namespace: str, records: Mapping[str, bytes]) -> int:
+        """Upsert ``records`` atomically; returns the number written."""
+        if not records:
+            return 0
+        now = time.time()
+        rows = [
+            (namespace, key, sqlite3.Binary(payload), len(payload), now)
+            for key, payload in records.items()
+        ]
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    """
+                    INSERT INTO records
+                        (namespace, record_key, payload, size, updated_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (namespace, record_key) DO UPDATE SET
+                        payload = excluded.payload,
+                        size = excluded.size,
+                        updated_at = excluded.updated_at
+                    """,
+                    rows,
+                )
+        return len(rows)
+
+    def read(self, namespace: str, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT payload FROM records "
+                    "WHERE namespace = ? AND record_key = ?",
+                    (namespace, key),
+                )
+                .fetchone()
+            )
+        return bytes(row[0]) if row else None
+
+    def read_all(self, namespace: str) -> Iterator[Tuple[str, bytes]]:
+        with self._lock:
+            rows = (
+                self._connect()
+                .execute(
+                    "SELECT record_key, payload FROM records WHERE namespace = ?",
+                    (namespace,),
+                )
+                .fetchall()
+            )
+        for key, payload in rows:
+            yield key, bytes(payload)
+
+    def delete(self, namespace: str, keys: Iterable[str]) -> None:
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "DELETE FROM records WHERE namespace = ? AND record_key = ?",
+                    [(namespace, key) for key in keys],
+                )
+
+    def count(self, namespace: str) -> int:
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT COUNT(*) FROM records WHERE namespace = ?", (namespace,)
+                )
+                .fetchone()
+            )
+        return int(row[0])
+
+    def manifest(self, namespace: str) -> Dict[str, Dict[str, float]]:
+        """Size and last update time of every record in ``namespace``."""
+        with self._lock:
+            rows = (
+                self._connect()
+                .execute(
+                    "SELECT record_key, size, updated_at FROM records "
+                    "WHERE namespace = ?",
+                    (namespace,),
+                )
+                .fetchall()
+            )
+        return {key: {"size": size, "updated_at": at} for key, size, at in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def agent_to_record(agent: RLAgent) -> bytes:
+    """Encode a tabular agent's epsilon and Q-table."""
+    states = list(agent.q_table)
+    q_values = np.array(
+        [[agent.q_table[s].get(a, agent.q_init) for a in RLAction] for s in states],
+        dtype=np.float64,
+    ).reshape(len(states), len(RLAction))
+    return encode_arrays(
+        epsilon=np.float64(agent.epsilon),
+        states=np.array(states, dtype=np.int64).reshape(len(states), 3),
+        q_values=q_values,
+    )
+
+
+def agent_from_record(payload: bytes) -> RLAgent:
+    data = decode_arrays(payload)
+    agent = RLAgent(epsilon=float(data["epsilon"]))
+    actions = list(RLAction)
+    for state, q_row in zip(data["states"].tolist(), data["q_values"].tolist()):
+        agent.q_table[tuple(state)] = dict(zip(actions, q_row))
+    return agent
+
 
 class RLStorage:
-    """Persistence layer for RL agents using atomic JSON file storage."""
+    """Persistence layer for tabular RL agents (one binary record each)."""
 
-    def __init__(self, data_dir: Path):
-        self.file_path = data_dir / "rl_policies.json"
+    NAMESPACE = "agents"
 
-    def load(self) -> OrderedDict[Tuple[int, int], RLAgent]:
-        agents = OrderedDict()
-        if not self.file_path.exists():
-            return agents
+    def __init__(self, data_dir: Path, records: Optional[RecordStore] = None):
+        self.records = records or RecordStore(data_dir / "rl_state.db")
+        self.legacy_path = data_dir / "rl_policies.json"
 
+    def load(self) -> OrderedDict[AgentKey, RLAgent]:
+        agents: OrderedDict[AgentKey, RLAgent] = OrderedDict()
         try:
-            with open(self.file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            raw_agents = data.get("agents", {})
-            for key_str, agent_data in raw_agents.items():
+            for key_str, payload in self.records.read_all(self.NAMESPACE):
                 try:
-                    cid_str, uid_str = key_str.split(":")
-                    key = (int(cid_str), int(uid_str))
-                    agents[key] = RLAgent.from_dict(agent_data)
-                except (ValueError, IndexError) as e:
-                    logger.warning(f"Skipping invalid agent key {key_str}: {e}")
-                    continue
-
-            return agents
-        except json.JSONDecodeError:
-            logger.error(f"Corrupt RL data file: {self.file_path}. Starting fresh.")
-            return agents
-        except Exception as e:
+                    agents[parse_key(key_str)] = agent_from_record(payload)
+                except (ValueError, KeyError, OSError) as e:
+                    logger.warning(f"Skipping invalid agent record {key_str}: {e}")
+        except sqlite3.Error as e:
             logger.error(f"Failed to load RL data: {e}")
             return agents
 
-    def save(self, agents: Dict[Tuple[int, int], RLAgent]) -> None:
-        data = {
-            "version": 1,
-            "agents": {f"{k[0]}:{k[1]}": v.to_dict() for k, v in agents.items()},
-        }
+        if not agents and self.legacy_path.exists():
+            agents = self._load_legacy()
+        return agents
+
+    def load_one(self, key: AgentKey) -> Optional[RLAgent]:
+        """Load a single agent (e.g. one evicted from memory earlier)."""
+        try:
+            payload = self.records.read(self.NAMESPACE, format_key(key))
+            return agent_from_record(payload) if payload is not None else None
+        except (sqlite3.Error, ValueError, KeyError, OSError) as e:
+            logger.warning(f"Failed to load RL agent {key}: {e}")
+            return None
 
-        tmp_path = self.file_path.with_suffix(".tmp")
+    def _load_legacy(self) -> OrderedDict[AgentKey, RLAgent]:
+        """Import ``rl_policies.json``; agents come back dirty so they get saved."""
+        agents: OrderedDict[AgentKey, RLAgent] = OrderedDict()
         try:
-            with open(tmp_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+            with open(self.legacy_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Corrupt RL data file: {self.legacy_path}: {e}")
+            return agents
+
+        for key_str, agent_data in data.get("agents", {}).items():
+            try:
+                agent = RLAgent.from_dict(agent_data)
+            except (ValueError, IndexError, TypeError) as e:
+                logger.warning(f"Skipping invalid agent key {key_str}: {e}")
+                continue
+            try:
+                key = parse_key(key_str)
+            except ValueError as e:
+                logger.warning(f"Skipping invalid agent key {key_str}: {e}")
+                continue
+            agent.dirty = True
+            agents[key] = agent
 
-            os.replace(tmp_path, self.file_path)
-        except Exception as e:
+        logger.info(f"Imported {len(agents)} RL agents from {self.legacy_path.name}")
+        return agents
+
+    @staticmethod
+    def encode(agents: Mapping[AgentKey, RLAgent]) -> Dict[str, bytes]:
+        """Encode agents into records (run on the thread that owns them)."""
+        return {format_key(k): agent_to_record(v) for k, v in agents.items()}
+
+    def write(self, records: Mapping[str, bytes]) -> int:
+        """Write pre-encoded records; returns the number written."""
+        try:
+            return self.records.write(self.NAMESPACE, records)
+        except sqlite3.Error as e:
             logger.error(f"Failed to save RL data: {e}")
-            if tmp_path.exists():
-                try:
-                    os.remove(tmp_path)
-                except OSError:
-                    pass
+            return 0
+
+    def save(self, agents: Mapping[AgentKey, RLAgent]) -> int:
+        """Encode and write ``agents`` (only pass the changed ones)."""
+        return self.write(self.encode(agents))
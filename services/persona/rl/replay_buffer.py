@@ -1,10 +1,16 @@
-"""Experience Replay Buffer for RL training."""
+"""Experience Replay Buffer for RL training.
+
+Transitions are stored column-wise in preallocated NumPy arrays (a ring
+buffer), so inserts are O(1) and sampling is a single fancy-indexing
+operation. ``sample_arrays`` hands training code ready-made batches;
+``sample`` still returns ``Transition`` objects for callers that want them.
+"""
 
 import asyncio
 import logging
-import random
 from dataclasses import dataclass
-from typing import List, Optional, Union
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
@@ -50,44 +56,182 @@ class Transition:
     done: bool = False
 
 
+# RLState tuples are embedded into the first three slots of a state vector
+# with these divisors (see NeuralAgent._state_to_tensor)
+RL_STATE_SCALE = np.array([10.0, 100.0, 50.0])
+
+
+def embed_rl_states(raw: np.ndarray, state_dim: int) -> np.ndarray:
+    """Embed an ``(n, 3)`` array of RLState tuples into ``(n, state_dim)``."""
+    embedded = np.zeros((len(raw), state_dim), dtype=np.float32)
+    embedded[:, :3] = raw[:, :3] / RL_STATE_SCALE
+    return embedded
+
+
+@dataclass
+class ReplayBatch:
+    """A sampled batch as column arrays, ready for a batched update.
+
+    Attributes:
+        states: ``(n, state_dim)`` float32 states
+        actions: ``(n,)`` int64 action indices
+        rewards: ``(n,)`` float32 rewards
+        next_states: ``(n, state_dim)`` float32 next states
+        dones: ``(n,)`` bool terminal flags
+        indices: ``(n,)`` buffer slots (for priority updates)
+        weights: ``(n,)`` float32 importance-sampling weights (all 1.0 for
+            uniform sampling)
+    """
+
+    states: np.ndarray
+    actions: np.ndarray
+    rewards: np.ndarray
+    next_states: np.ndarray
+    dones: np.ndarray
+    indices: np.ndarray
+    weights: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+
+class SumTree:
+    """Binary sum tree over ``capacity`` priorities with vectorized queries."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._leaves = 1 << max(capacity - 1, 0).bit_length()
+        self.tree = np.zeros(2 * self._leaves)
+
+    @property
+    def total(self) -> float:
+        return float(self.tree[1])
+
+    def get(self, indices: np.ndarray) -> np.ndarray:
+        return self.tree[np.asarray(indices) + self._leaves]
+
+    def update(self, indices: Sequence[int], values: Sequence[float]) -> None:
+        """Set leaf priorities and recompute the affected sums."""
+        nodes = np.asarray(indices, dtype=np.int64) + self._leaves
+        self.tree[nodes] = values
+        nodes = np.unique(nodes // 2)
+        while nodes.size:
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+            nodes = np.unique(nodes[nodes > 1] // 2)
+
+    def find(self, values: np.ndarray) -> np.ndarray:
+        """Leaf index whose cumulative range contains each value."""
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        while nodes[0] < self._leaves:
+            left = 2 * nodes
+            left_sum = self.tree[left]
+            go_right = values >= left_sum
+            values = np.where(go_right, values - left_sum, values)
+            nodes = np.where(go_right, left + 1, left)
+        return nodes - self._leaves
+
+    def clear(self) -> None:
+        self.tree[:] = 0.0
+
+
 class ReplayBuffer:
     """
     Experience Replay Buffer for storing and sampling transitions.
 
-    Uses circular buffer implementation for memory efficiency.
-    Thread-safe for async access using asyncio.Lock.
+    Preallocated struct-of-arrays ring buffer: states, actions, rewards,
+    next states and done flags each live in one typed NumPy array. Arrays
+    are allocated on the first insert (sized from the first state) unless
+    ``state_dim`` is given. Thread-safe for async access using asyncio.Lock.
 
     Features:
-    - Circular buffer with configurable capacity
-    - Uniform random sampling
-    - Memory-efficient numpy storage
-    - Thread-safe for async Discord bot context
+    - O(1) insert, overwriting the oldest entry when full
+    - Vectorized uniform sampling (``sample_arrays``)
+    - Single-file binary save/load
     - Tracks buffer utilization
 
     Example:
         buffer = ReplayBuffer(capacity=10000)
         await buffer.add(Transition(state, action, reward, next_state))
-        batch = await buffer.sample(batch_size=32)
+        batch = await buffer.sample_arrays(batch_size=32, state_dim=128)
     """
 
-    def __init__(self, capacity: int = DEFAULT_BUFFER_CAPACITY):
+    def __init__(
+        self,
+        capacity: int = DEFAULT_BUFFER_CAPACITY,
+        state_dim: Optional[int] = None,
+    ):
         """
         Initialize the replay buffer.
 
         Args:
             capacity: Maximum number of transitions to store (default: 10000).
                      Older transitions are overwritten when capacity is reached.
+            state_dim: Length of stored state vectors. Inferred from the first
+                     transition when omitted (3 for RLState tuples).
         """
         if capacity <= 0:
             raise ValueError(f"Capacity must be positive, got {capacity}")
 
         self.capacity = capacity
-        self._buffer: List[Transition] = []
+        self.state_dim = state_dim
+        self._size = 0
         self._position = 0
+        # True when states were added as RLState tuples (stored raw)
+        self._tuple_states: Optional[bool] = None
+        self._rng = np.random.default_rng()
         self._lock = asyncio.Lock()
 
+        self._states: Optional[np.ndarray] = None
+        self._next_states: Optional[np.ndarray] = None
+        self._actions = np.zeros(capacity, dtype=np.int64)
+        self._rewards = np.zeros(capacity, dtype=np.float32)
+        self._dones = np.zeros(capacity, dtype=bool)
+        if state_dim is not None:
+            self._allocate_states(state_dim)
+
         logger.debug(f"ReplayBuffer initialized with capacity={capacity}")
 
+    def _allocate_states(self, state_dim: int) -> None:
+        self.state_dim = state_dim
+        self._states = np.zeros((self.capacity, state_dim), dtype=np.float32)
+        self._next_states = np.zeros_like(self._states)
+
+    @staticmethod
+    def _to_vector(
+        state: Union[RLState, np.ndarray, torch.Tensor, List[float]],
+    ) -> Tuple[np.ndarray, bool]:
+        if isinstance(state, tuple):
+            return np.asarray(state, dtype=np.float32), True
+        if TORCH_AVAILABLE and isinstance(state, torch.Tensor):
+            state = state.detach().cpu().numpy()
+        return np.asarray(state, dtype=np.float32).reshape(-1), False
+
+    def _insert(self, transition: Transition) -> int:
+        """Write ``transition`` into the next slot and return the slot."""
+        state, is_tuple = self._to_vector(transition.state)
+        next_state, _ = self._to_vector(transition.next_state)
+        if self._states is None:
+            self._allocate_states(len(state))
+        if self._tuple_states is None:
+            self._tuple_states = is_tuple
+        if len(state) != self.state_dim or len(next_state) != self.state_dim:
+            raise ValueError(
+                f"State length {len(state)} does not match buffer "
+                f"state_dim {self.state_dim}"
+            )
+
+        index = self._position
+        self._states[index] = state
+        self._next_states[index] = next_state
+        self._actions[index] = int(transition.action)
+        self._rewards[index] = transition.reward
+        self._dones[index] = transition.done
+
+        self._position = (self._position + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        return index
+
     async def add(self, transition: Transition) -> None:
         """
         Add a transition to the buffer.
@@ -99,12 +243,85 @@ class ReplayBuffer:
             transition: The (s, a, r, s', done) transition to store
         """
         async with self._lock:
-            if len(self._buffer) < self.capacity:
-                self._buffer.append(transition)
-            else:
-                self._buffer[self._position] = transition
+            self._insert(transition)
+
+    def add_sync(self, transition: Transition) -> None:
+        """
+        Synchronous version of add for non-async contexts.
+
+        Warning: Not thread-safe. Use add() in async contexts.
+
+        Args:
+            transition: The transition to store
+        """
+        self._insert(transition)
 
-            self._position = (self._position + 1) % self.capacity
+    def _check_batch_size(self, batch_size: int) -> None:
+        if batch_size <= 0:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+
+        if self._size == 0:
+            raise RuntimeError(
+                "Cannot sample from empty buffer. Add transitions before sampling."
+            )
+
+        if batch_size > self._size:
+            raise RuntimeError(
+                f"Cannot sample {batch_size} transitions from buffer "
+                f"with only {self._size} samples. "
+                f"Add more transitions or reduce batch_size."
+            )
+
+    def _sample_indices(self, batch_size: int) -> np.ndarray:
+        """Uniform sample of filled slots without replacement."""
+        self._check_batch_size(batch_size)
+        return self._rng.choice(self._size, size=batch_size, replace=False)
+
+    def _weights(self, indices: np.ndarray) -> np.ndarray:
+        return np.ones(len(indices), dtype=np.float32)
+
+    def _transitions(self, indices: np.ndarray) -> List[Transition]:
+        """Materialize ``Transition`` objects for the given slots."""
+        if self._tuple_states:
+            states = [tuple(int(v) for v in s) for s in self._states[indices]]
+            next_states = [
+                tuple(int(v) for v in s) for s in self._next_states[indices]
+            ]
+        else:
+            states = list(self._states[indices].copy())
+            next_states = list(self._next_states[indices].copy())
+        return [
+            Transition(
+                state=state,
+                action=RLAction(int(action)),
+                reward=float(reward),
+                next_state=next_state,
+                done=bool(done),
+            )
+            for state, action, reward, next_state, done in zip(
+                states,
+                self._actions[indices],
+                self._rewards[indices],
+                next_states,
+                self._dones[indices],
+            )
+        ]
+
+    def _batch(self, indices: np.ndarray, state_dim: Optional[int]) -> ReplayBatch:
+        states = self._states[indices]
+        next_states = self._next_states[indices]
+        if self._tuple_states and state_dim is not None:
+            states = embed_rl_states(states, state_dim)
+            next_states = embed_rl_states(next_states, state_dim)
+        return ReplayBatch(
+            states=states,
+            actions=self._actions[indices],
+            rewards=self._rewards[indices],
+            next_states=next_states,
+            dones=self._dones[indices],
+            indices=indices,
+            weights=self._weights(indices),
+        )
 
     async def sample(self, batch_size: int) -> List[Transition]:
         """
@@ -123,42 +340,8 @@ class ReplayBuffer:
             ValueError: If batch_size <= 0
             RuntimeError: If buffer has fewer samples than requested
         """
-        if batch_size <= 0:
-            raise ValueError(f"batch_size must be positive, got {batch_size}")
-
         async with self._lock:
-            current_size = len(self._buffer)
-
-            if current_size == 0:
-                raise RuntimeError(
-                    "Cannot sample from empty buffer. Add transitions before sampling."
-                )
-
-            if batch_size > current_size:
-                raise RuntimeError(
-                    f"Cannot sample {batch_size} transitions from buffer "
-                    f"with only {current_size} samples. "
-                    f"Add more transitions or reduce batch_size."
-                )
-
-            indices = random.sample(range(current_size), batch_size)
-            return [self._buffer[i] for i in indices]
-
-    def add_sync(self, transition: Transition) -> None:
-        """
-        Synchronous version of add for non-async contexts.
-
-        Warning: Not thread-safe. Use add() in async contexts.
-
-        Args:
-            transition: The transition to store
-        """
-        if len(self._buffer) < self.capacity:
-            self._buffer.append(transition)
-        else:
-            self._buffer[self._position] = transition
-
-        self._position = (self._position + 1) % self.capacity
+            return self._transitions(self._sample_indices(batch_size))
 
     def sample_sync(self, batch_size: int) -> List[Transition]:
         """
@@ -172,33 +355,50 @@ class ReplayBuffer:
         Returns:
             List of randomly sampled Transition objects
         """
-        if batch_size <= 0:
-            raise ValueError(f"batch_size must be positive, got {batch_size}")
+        return self._transitions(self._sample_indices(batch_size))
 
-        current_size = len(self._buffer)
+    async def sample_arrays(
+        self, batch_size: int, state_dim: Optional[int] = None
+    ) -> ReplayBatch:
+        """
+        Sample a batch as column arrays without building Transition objects.
 
-        if current_size == 0:
-            raise RuntimeError(
-                "Cannot sample from empty buffer. Add transitions before sampling."
-            )
+        Args:
+            batch_size: Number of transitions to sample
+            state_dim: If states were added as RLState tuples, embed them
+                into vectors of this length (as NeuralAgent does)
 
-        if batch_size > current_size:
-            raise RuntimeError(
-                f"Cannot sample {batch_size} transitions from buffer "
-                f"with only {current_size} samples."
-            )
+        Returns:
+            ReplayBatch of arrays
+
+        Raises:
+            ValueError: If batch_size <= 0
+            RuntimeError: If buffer has fewer samples than requested
+        """
+        async with self._lock:
+            return self.sample_arrays_sync(batch_size, state_dim)
 
-        indices = random.sample(range(current_size), batch_size)
-        return [self._buffer[i] for i in indices]
+    def sample_arrays_sync(
+        self, batch_size: int, state_dim: Optional[int] = None
+    ) -> ReplayBatch:
+        """Synchronous version of sample_arrays (not thread-safe)."""
+        return self._batch(self._sample_indices(batch_size), state_dim)
+
+    def recent(self, n: int) -> List[Transition]:
+        """Return the ``n`` most recently added transitions, oldest first."""
+        n = min(n, self._size)
+        if n <= 0:
+            return []
+        return self._transitions((self._position - n + np.arange(n)) % self.capacity)
 
     def __len__(self) -> int:
         """Return current number of transitions in buffer."""
-        return len(self._buffer)
+        return self._size
 
     @property
     def is_full(self) -> bool:
         """Return True if buffer has reached capacity."""
-        return len(self._buffer) >= self.capacity
+        return self._size >= self.capacity
 
     @property
     def utilization(self) -> float:
@@ -208,12 +408,13 @@ class ReplayBuffer:
         Returns:
             Current size / capacity * 100
         """
-        return (len(self._buffer) / self.capacity) * 100.0
+        return (self._size / self.capacity) * 100.0
 
     def clear(self) -> None:
         """Clear all transitions from the buffer."""
-        self._buffer.clear()
+        self._size = 0
         self._position = 0
+        self._tuple_states = None
         logger.debug("ReplayBuffer cleared")
 
     def get_stats(self) -> dict:
@@ -224,20 +425,77 @@ class ReplayBuffer:
             Dictionary with buffer stats (size, capacity, utilization, etc.)
         """
         return {
-            "current_size": len(self._buffer),
+            "current_size": self._size,
             "capacity": self.capacity,
             "utilization_percent": self.utilization,
             "is_full": self.is_full,
             "position": self._position,
         }
 
+    # ========== Persistence ==========
+
+    def _state_arrays(self) -> dict:
+        """Arrays (filled slots only) and scalars written by ``save``."""
+        size = self._size
+        tuple_states = -1 if self._tuple_states is None else self._tuple_states
+        arrays = {
+            "capacity": np.int64(self.capacity),
+            "position": np.int64(self._position),
+            "tuple_states": np.int8(tuple_states),
+            "actions": self._actions[:size],
+            "rewards": self._rewards[:size],
+            "dones": self._dones[:size],
+        }
+        if self._states is not None:
+            arrays["states"] = self._states[:size]
+            arrays["next_states"] = self._next_states[:size]
+        return arrays
+
+    def _restore_arrays(self, data: dict) -> None:
+        size = len(data["actions"])
+        if "states" in data:
+            self._allocate_states(data["states"].shape[1])
+            self._states[:size] = data["states"]
+            self._next_states[:size] = data["next_states"]
+        self._actions[:size] = data["actions"]
+        self._rewards[:size] = data["rewards"]
+        self._dones[:size] = data["dones"]
+        self._size = size
+        self._position = int(data["position"]) % self.capacity
+        tuple_states = int(data["tuple_states"])
+        self._tuple_states = None if tuple_states < 0 else bool(tuple_states)
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the buffer to a single ``.npz`` file (atomically)."""
+        path = Path(path)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **self._state_arrays())
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], **kwargs) -> "ReplayBuffer":
+        """Load a buffer written by ``save``.
+
+        Args:
+            path: File written by ``save``
+            **kwargs: Extra constructor arguments (e.g. ``alpha``)
+        """
+        with np.load(path, allow_pickle=False) as npz:
+            data = {name: npz[name] for name in npz.files}
+        buffer = cls(capacity=int(data["capacity"]), **kwargs)
+        buffer._restore_arrays(data)
+        return buffer
+
 
 class PrioritizedReplayBuffer(ReplayBuffer):
     """
-    Prioritized Experience Replay Buffer (placeholder for future implementation).
+    Prioritized Experience Replay Buffer (Schaul et al., 2016).
 
-    TODO: Implement priority-based sampling using TD-error.
-    Currently falls back to uniform sampling.
+    Priorities ``p^alpha`` live in a sum tree, so proportional sampling and
+    priority updates are O(log n) and vectorized across the batch. Sampling
+    is stratified: the total priority is split into ``batch_size`` equal
+    segments and one transition is drawn from each.
     """
 
     def __init__(
@@ -245,6 +503,8 @@ class PrioritizedReplayBuffer(ReplayBuffer):
         capacity: int = DEFAULT_BUFFER_CAPACITY,
         alpha: float = 0.6,
         beta: float = 0.4,
+        state_dim: Optional[int] = None,
+        epsilon: float = 1e-6,
     ):
         """
         Initialize prioritized replay buffer.
@@ -253,14 +513,29 @@ class PrioritizedReplayBuffer(ReplayBuffer):
             capacity: Maximum buffer size
             alpha: Priority exponent (0 = uniform, 1 = full prioritization)
             beta: Importance sampling exponent
+            state_dim: Length of stored state vectors (inferred if omitted)
+            epsilon: Added to priorities so every transition can be sampled
         """
-        super().__init__(capacity)
+        super().__init__(capacity, state_dim=state_dim)
         self.alpha = alpha
         self.beta = beta
-        self._priorities: List[float] = []
+        self.epsilon = epsilon
+        self._tree = SumTree(capacity)
+        self._max_priority = 1.0
 
         logger.debug(f"PrioritizedReplayBuffer initialized: alpha={alpha}, beta={beta}")
 
+    def _insert_with_priority(
+        self, transition: Transition, priority: Optional[float]
+    ) -> None:
+        index = self._insert(transition)
+        if priority is None:
+            priority = self._max_priority
+        else:
+            priority = abs(priority) + self.epsilon
+            self._max_priority = max(self._max_priority, priority)
+        self._tree.update([index], [priority**self.alpha])
+
     async def add(
         self, transition: Transition, priority: Optional[float] = None
     ) -> None:
@@ -273,22 +548,30 @@ class PrioritizedReplayBuffer(ReplayBuffer):
                      If None, uses max priority in buffer.
         """
         async with self._lock:
-            max_priority = max(self._priorities) if self._priorities else 1.0
-            if priority is None:
-                priority = max_priority
+            self._insert_with_priority(transition, priority)
 
-            if len(self._buffer) < self.capacity:
-                self._buffer.append(transition)
-                self._priorities.append(priority)
-            else:
-                self._buffer[self._position] = transition
-                self._priorities[self._position] = priority
-
-            self._position = (self._position + 1) % self.capacity
+    def add_sync(
+        self, transition: Transition, priority: Optional[float] = None
+    ) -> None:
+        """Synchronous version of add (not thread-safe)."""
+        self._insert_with_priority(transition, priority)
+
+    def _sample_indices(self, batch_size: int) -> np.ndarray:
+        self._check_batch_size(batch_size)
+        total = self._tree.total
+        segment = total / batch_size
+        values = (np.arange(batch_size) + self._rng.random(batch_size)) * segment
+        indices = self._tree.find(np.minimum(values, np.nextafter(total, 0)))
+        return np.minimum(indices, self._size - 1)
+
+    def _weights(self, indices: np.ndarray) -> np.ndarray:
+        probs = self._tree.get(indices) / self._tree.total
+        weights = (self._size * probs) ** -self.beta
+        return (weights / weights.max()).astype(np.float32)
 
     async def sample(
         self, batch_size: int
-    ) -> tuple[List[Transition], List[int], List[float]]:
+    ) -> Tuple[List[Transition], List[int], List[float]]:
         """
         Sample batch with importance sampling weights.
 
@@ -298,17 +581,14 @@ class PrioritizedReplayBuffer(ReplayBuffer):
         Returns:
             Tuple of (transitions, indices, importance_weights)
         """
-        transitions = await super().sample(batch_size)
-
         async with self._lock:
-            current_size = len(self._buffer)
-            indices = random.sample(range(current_size), batch_size)
-            weights = [1.0] * batch_size
-
-        return transitions, indices, weights
+            indices = self._sample_indices(batch_size)
+            transitions = self._transitions(indices)
+            weights = self._weights(indices)
+        return transitions, indices.tolist(), weights.tolist()
 
     async def update_priorities(
-        self, indices: List[int], priorities: List[float]
+        self, indices: Sequence[int], priorities: Sequence[float]
     ) -> None:
         """
         Update priorities for sampled transitions.
@@ -318,6 +598,37 @@ class PrioritizedReplayBuffer(ReplayBuffer):
             priorities: New priority values (typically TD-error)
         """
         async with self._lock:
-            for idx, priority in zip(indices, priorities):
-                if 0 <= idx < len(self._priorities):
-                    self._priorities[idx] = priority**self.alpha
+            self.update_priorities_sync(indices, priorities)
+
+    def update_priorities_sync(
+        self, indices: Sequence[int], priorities: Sequence[float]
+    ) -> None:
+        """Synchronous version of update_priorities (not thread-safe)."""
+        indices = np.asarray(indices, dtype=np.int64)
+        priorities = np.abs(np.asarray(priorities, dtype=np.float64)) + self.epsilon
+        valid = (indices >= 0) & (indices < self._size)
+        if not valid.any():
+            return
+        indices, priorities = indices[valid], priorities[valid]
+        self._max_priority = max(self._max_priority, float(priorities.max()))
+        self._tree.update(indices, priorities**self.alpha)
+
+    def clear(self) -> None:
+        """Clear all transitions and priorities."""
+        super().clear()
+        self._tree.clear()
+        self._max_priority = 1.0
+
+    def _state_arrays(self) -> dict:
+        arrays = super()._state_arrays()
+        arrays["priorities"] = self._tree.get(np.arange(self._size))
+        arrays["max_priority"] = np.float64(self._max_priority)
+        return arrays
+
+    def _restore_arrays(self, data: dict) -> None:
+        super()._restore_arrays(data)
+        if "priorities" in data:
+            self._tree.update(np.arange(self._size), data["priorities"])
+            self._max_priority = float(data["max_priority"])
+        else:
+            self._tree.update(np.arange(self._size), np.ones(self._size))
@@ -3,19 +3,29 @@
 import asyncio
 import logging
 from pathlib import Path
-from typing import Dict, Tuple, Optional, Any
+from typing import Dict, List, Tuple, Optional, Any
 from collections import OrderedDict
 
+import numpy as np
+
 from .types import RLAction, RLState
 from .agent import RLAgent
 from .neural_agent import NeuralAgent, TORCH_AVAILABLE
-from .replay_buffer import ReplayBuffer, Transition
+from .replay_buffer import (
+    PrioritizedReplayBuffer,
+    ReplayBuffer,
+    Transition,
+    embed_rl_states,
+)
+from .inference import InferenceBatcher, build_policy_runtime
+from .training import TrainingInterval, TrainingScheduler
 from .constants import (
     RL_EPSILON_START,
     RL_MAX_AGENTS_PER_CHANNEL,
     RL_PERSIST_INTERVAL,
     RL_ALGORITHM,
     RL_REPLAY_BUFFER_SIZE,
+    RL_PRIORITIZED_REPLAY,
     RL_BATCH_SIZE,
     RL_WARMUP_STEPS,
     RL_TRAIN_EVERY,
@@ -24,18 +34,31 @@ from .constants import (
     RL_EXPLORATION_BONUS_MAX,
     RL_EPSILON_BOOST_FACTOR,
     RL_EPSILON_BOOST_DECAY,
+    RL_BANDIT_MAX_RESIDENT,
+    RL_INFERENCE_BATCHING,
+    RL_INFERENCE_WINDOW_MS,
+    RL_POLICY_REFRESH_STEPS,
+    RL_BACKGROUND_TRAINING,
+    RL_TRAIN_INTERVAL_SEC,
+    RL_TRAIN_BUDGET_MS,
+    RL_TRAIN_PAUSE_LATENCY_MS,
+    RL_USE_TRANSFER,
+    RL_PRIOR_REFRESH_SEC,
 )
-from .persistence import RLStorage
+from .persistence import RecordStore, RLStorage
 from .safety import SafetyLayer
 
 
 # Bandit imports
-from .bandit import LinUCBBandit
+from core.social_intelligence.learning.bandit_store import BanditStore
 from .bandit_storage import BanditStorage
 from .bandit_types import ModeSwitchAction, BanditContext, BanditConfig
 from .bandit_reward import compute_mode_switch_reward
 logger = logging.getLogger(__name__)
 
+# Inference batcher key for the network shared by all DQN decisions
+SHARED_POLICY = "shared"
+
 
 class RLService:
     """Service for managing RL agents per (channel_id, user_id)."""
@@ -77,10 +100,36 @@ class RLService:
             )
             self.algorithm = "tabular"
 
+        self.prioritized_replay = (
+            getattr(config, "RL_PRIORITIZED_REPLAY", RL_PRIORITIZED_REPLAY)
+            if config
+            else RL_PRIORITIZED_REPLAY
+        )
+        self.replay_buffer_path = self.data_dir / "replay_buffer.npz"
         if self.algorithm == "dqn":
-            self.replay_buffer = ReplayBuffer(capacity=RL_REPLAY_BUFFER_SIZE)
+            buffer_cls = (
+                PrioritizedReplayBuffer if self.prioritized_replay else ReplayBuffer
+            )
+            self.replay_buffer = buffer_cls(capacity=RL_REPLAY_BUFFER_SIZE)
             logger.info(
-                f"Initialized ReplayBuffer with capacity={RL_REPLAY_BUFFER_SIZE}"
+                f"Initialized {buffer_cls.__name__} with "
+                f"capacity={RL_REPLAY_BUFFER_SIZE}"
+            )
+
+        # Batched decisions against the shared (trained) policy network
+        self.inference_batcher: Optional[InferenceBatcher] = None
+        inference_batching = (
+            getattr(config, "RL_INFERENCE_BATCHING", RL_INFERENCE_BATCHING)
+            if config
+            else RL_INFERENCE_BATCHING
+        )
+        if self.algorithm == "dqn" and inference_batching:
+            self.inference_batcher = InferenceBatcher(
+                window_ms=(
+                    getattr(config, "RL_INFERENCE_WINDOW_MS", RL_INFERENCE_WINDOW_MS)
+                    if config
+                    else RL_INFERENCE_WINDOW_MS
+                )
             )
 
         # Training state for DQN mode
@@ -90,10 +139,53 @@ class RLService:
         self.train_every = RL_TRAIN_EVERY
         self._training_lock = asyncio.Lock()
 
+        # Background training (started with the service in DQN mode)
+        self.training_scheduler: Optional[TrainingScheduler] = None
+        self.background_training = (
+            getattr(config, "RL_BACKGROUND_TRAINING", RL_BACKGROUND_TRAINING)
+            if config
+            else RL_BACKGROUND_TRAINING
+        )
+        self.train_interval = (
+            getattr(config, "RL_TRAIN_INTERVAL_SEC", RL_TRAIN_INTERVAL_SEC)
+            if config
+            else RL_TRAIN_INTERVAL_SEC
+        )
+        self.train_budget_ms = (
+            getattr(config, "RL_TRAIN_BUDGET_MS", RL_TRAIN_BUDGET_MS)
+            if config
+            else RL_TRAIN_BUDGET_MS
+        )
+        self.train_pause_latency_ms = (
+            getattr(config, "RL_TRAIN_PAUSE_LATENCY_MS", RL_TRAIN_PAUSE_LATENCY_MS)
+            if config
+            else RL_TRAIN_PAUSE_LATENCY_MS
+        )
+
+        # Cold-start priors for new DQN agents, rebuilt in the background
+        self.policy_priors = None
+        use_transfer = (
+            getattr(config, "RL_USE_TRANSFER", RL_USE_TRANSFER)
+            if config
+            else RL_USE_TRANSFER
+        )
+        if self.algorithm == "dqn" and use_transfer:
+            # transfer.py needs torch, which DQN mode already requires
+            from .transfer import PolicyPriorCache
+
+            self.policy_priors = PolicyPriorCache(
+                refresh_interval_sec=(
+                    getattr(config, "RL_PRIOR_REFRESH_SEC", RL_PRIOR_REFRESH_SEC)
+                    if config
+                    else RL_PRIOR_REFRESH_SEC
+                )
+            )
+
         self.max_agents = RL_MAX_AGENTS_PER_CHANNEL * 10
         self.save_interval = RL_PERSIST_INTERVAL
 
-        self.storage = RLStorage(self.data_dir)
+        self.records = RecordStore(self.data_dir / "rl_state.db")
+        self.storage = RLStorage(self.data_dir, self.records)
         self.safety = SafetyLayer()
 
         # Training metrics for DQN
@@ -143,14 +235,27 @@ class RLService:
         self._activity_window_seconds = 3600  # 1 hour window
 
         # Contextual bandit for mode switching
-        self.bandits: Dict[Tuple[int, int], LinUCBBandit] = {}
-        self.bandit_storage = BanditStorage(self.data_dir)
         self.bandit_config = BanditConfig(
             feature_dim=7,
             alpha=1.0,
             reply_bonus=1.0,
             no_reply_penalty=-0.5,
         )
+        self.bandit_storage = BanditStorage(self.data_dir, self.records)
+        # One (channel_id, user_id) row per bandit in shared arrays
+        self.bandits = BanditStore(
+            len(ModeSwitchAction),
+            self.bandit_config.feature_dim,
+            alpha=self.bandit_config.alpha,
+            max_resident=(
+                getattr(config, "RL_BANDIT_MAX_RESIDENT", RL_BANDIT_MAX_RESIDENT)
+                if config
+                else RL_BANDIT_MAX_RESIDENT
+            ),
+            page_dir=self.data_dir / "bandit_swap",
+            # Bandits come back from their records instead of a swap copy
+            loader=self.bandit_storage.load_one if self.enabled else None,
+        )
 
         logger.info(f"RLService initialized with algorithm='{self.algorithm}'")
 
@@ -166,12 +271,44 @@ class RLService:
             logger.error(f"Failed to load agents: {e}")
 
         try:
-            loaded_bandits = await asyncio.to_thread(self.bandit_storage.load)
-            self.bandits.update(loaded_bandits)
-            logger.info(f"RL Service loaded {len(self.bandits)} bandits")
+            persisted = await asyncio.to_thread(
+                self.bandit_storage.load, self.bandits
+            )
+            logger.info(f"RL Service has {persisted} persisted bandits")
         except Exception as e:
             logger.error(f"Failed to load bandits: {e}")
 
+        if self.replay_buffer is not None and self.replay_buffer_path.exists():
+            try:
+                self.replay_buffer = await asyncio.to_thread(
+                    type(self.replay_buffer).load, self.replay_buffer_path
+                )
+                logger.info(
+                    f"RL Service loaded {len(self.replay_buffer)} replay transitions"
+                )
+            except Exception as e:
+                logger.error(f"Failed to load replay buffer: {e}")
+
+        if (
+            self.replay_buffer is not None
+            and self.background_training
+            and self.training_scheduler is None
+        ):
+            self.training_scheduler = TrainingScheduler(
+                agent=await self._get_training_agent(),
+                replay_buffer=self.replay_buffer,
+                batch_size=self.batch_size,
+                warmup_steps=self.warmup_steps,
+                interval_sec=self.train_interval,
+                budget_ms=self.train_budget_ms,
+                pause_latency_ms=self.train_pause_latency_ms,
+                on_swap=self._on_weights_swapped,
+            )
+            self.training_scheduler.start()
+
+        if self.policy_priors is not None:
+            self.policy_priors.start(self._prior_groups)
+
         if self._bg_task is None:
             self._bg_task = asyncio.create_task(self._persistence_loop())
             logger.info("RL Service started")
@@ -184,7 +321,25 @@ class RLService:
             except asyncio.CancelledError:
                 pass
 
+        if self.training_scheduler is not None:
+            await self.training_scheduler.stop()
+            self.training_scheduler = None
+
+        if self.policy_priors is not None:
+            await self.policy_priors.stop()
+
+        if self.inference_batcher is not None:
+            await self.inference_batcher.close()
+
         await self._save_all_dirty()
+        if self.enabled and self.replay_buffer is not None and len(self.replay_buffer):
+            try:
+                await asyncio.to_thread(
+                    self.replay_buffer.save, self.replay_buffer_path
+                )
+            except Exception as e:
+                logger.error(f"Failed to save replay buffer: {e}")
+        self.records.close()
         logger.info("RL Service stopped")
 
     async def get_agent(self, channel_id: int, user_id: int) -> RLAgent:
@@ -195,13 +350,23 @@ class RLService:
             self.agents.move_to_end(key)
             return self.agents[key]
 
-        agent = RLAgent(epsilon=RL_EPSILON_START)
+        # Agents evicted earlier (or not loaded at startup) live on disk
+        agent = None
+        if self.enabled:
+            agent = await asyncio.to_thread(self.storage.load_one, key)
+        if agent is None:
+            agent = RLAgent(epsilon=RL_EPSILON_START)
 
-        if len(self.agents) >= self.max_agents:
+        # A concurrent call may have created the agent while we awaited
+        if key not in self.agents and len(self.agents) >= self.max_agents:
             old_key, old_agent = self.agents.popitem(last=False)
             if old_agent.dirty:
                 await self._save_agent(old_key[0], old_key[1], old_agent)
 
+        existing = self.agents.get(key)
+        if existing is not None:
+            self.agents.move_to_end(key)
+            return existing
         self.agents[key] = agent
         return agent
 
@@ -213,6 +378,9 @@ class RLService:
             return self.neural_agents[key]
 
         agent = NeuralAgent()
+        if self.policy_priors is not None:
+            # Start from what similar agents learned instead of from scratch
+            self.policy_priors.init_agent(agent, ("channel", channel_id))
         self.neural_agents[key] = agent
         logger.debug(
             f"Created new NeuralAgent for channel={channel_id}, user={user_id}"
@@ -285,10 +453,18 @@ class RLService:
         # Apply epsilon boost during low activity periods
         boosted_epsilon = self._get_boosted_epsilon(channel_id, agent.epsilon)
 
-        action = agent.select_action(state, epsilon=boosted_epsilon)
+        if self.inference_batcher is not None:
+            # One forward pass (shared with concurrent decisions) serves both
+            # the choice and the log line
+            q_values = await self._batched_q_values(state)
+            action = agent.select_action_from_q_values(
+                q_values, epsilon=boosted_epsilon
+            )
+        else:
+            action = agent.select_action(state, epsilon=boosted_epsilon)
+            q_values = agent.get_q_values(state)
 
         # Log decision for observability
-        q_values = agent.get_q_values(state)
         q_str = ", ".join(
             [f"{RLAction(i).name}={q:.2f}" for i, q in enumerate(q_values)]
         )
@@ -304,6 +480,41 @@ class RLService:
 
         return action, None
 
+    def _prior_groups(self) -> Dict[Tuple[str, int], List[NeuralAgent]]:
+        """Neural agents per channel, for the policy prior cache.
+
+        Agents carry no persona here, so only channel and global priors are
+        built. While decisions use the shared network, only the training
+        agent accumulates updates and every prior copies its weights.
+        """
+        groups: Dict[Tuple[str, int], List[NeuralAgent]] = {}
+        for (channel_id, _), agent in self.neural_agents.items():
+            groups.setdefault(("channel", channel_id), []).append(agent)
+        return groups
+
+    async def _get_training_agent(self) -> NeuralAgent:
+        """The agent whose network is trained and shared by all decisions."""
+        # We use a shared network approach - train one agent, all benefit
+        if not self.neural_agents:
+            # Create a dummy agent for training if none exist
+            await self.get_neural_agent(0, 0)
+        return next(iter(self.neural_agents.values()))
+
+    async def _batched_q_values(self, state: RLState) -> np.ndarray:
+        """Q-values of the shared policy, batched with concurrent decisions."""
+        agent = await self._get_training_agent()
+        if not self.inference_batcher.has_policy(SHARED_POLICY):
+            self.refresh_policy(agent)
+        x = embed_rl_states(np.array([state], dtype=np.float32), agent.state_dim)
+        return await self.inference_batcher.q_values(SHARED_POLICY, x[0])
+
+    def refresh_policy(self, agent: NeuralAgent) -> None:
+        """Snapshot ``agent``'s network into the inference batcher."""
+        if self.inference_batcher is not None:
+            self.inference_batcher.set_policy(
+                SHARED_POLICY, build_policy_runtime(agent)
+            )
+
     async def calculate_reward(
         self,
         channel_id: int,
@@ -462,6 +673,9 @@ class RLService:
         Training conditions:
         1. Buffer has at least warmup_steps transitions
         2. Current step is a multiple of train_every
+
+        When the background training scheduler is running, only the step
+        counter advances here.
         """
         if self.replay_buffer is None:
             return
@@ -469,6 +683,10 @@ class RLService:
         async with self._training_lock:
             self.training_step += 1
 
+            # The background scheduler trains off the message path
+            if self.training_scheduler is not None:
+                return
+
             # Check warmup period
             buffer_size = len(self.replay_buffer)
             if buffer_size < self.warmup_steps:
@@ -498,34 +716,28 @@ class RLService:
             return None
 
         try:
-            # Sample batch from replay buffer
-            batch = await self.replay_buffer.sample(self.batch_size)
-
-            # Get or create a neural agent for training
-            # We use a shared network approach - train one agent, all benefit
-            if not self.neural_agents:
-                # Create a dummy agent for training if none exist
-                await self.get_neural_agent(0, 0)
-
-            # Use the first neural agent for training
-            agent = next(iter(self.neural_agents.values()))
-
-            # Update agent for each transition in batch
-            total_loss = 0.0
-            for transition in batch:
-                loss = agent.update(
-                    state=transition.state,
-                    action=transition.action,
-                    reward=transition.reward,
-                    next_state=transition.next_state,
-                    done=transition.done,
-                )
-                total_loss += loss
+            agent = await self._get_training_agent()
 
-            mean_loss = total_loss / len(batch)
+            # Sample a batch as arrays and take one minibatch gradient step
+            batch = await self.replay_buffer.sample_arrays(
+                self.batch_size, state_dim=agent.state_dim
+            )
+            mean_loss, td_errors = agent.update_batch(
+                batch.states,
+                batch.actions,
+                batch.rewards,
+                batch.next_states,
+                batch.dones,
+                weights=batch.weights,
+            )
+            if isinstance(self.replay_buffer, PrioritizedReplayBuffer):
+                await self.replay_buffer.update_priorities(batch.indices, td_errors)
 
             # Update metrics
             self._training_metrics["total_training_steps"] += 1
+            steps = self._training_metrics["total_training_steps"]
+            if steps % RL_POLICY_REFRESH_STEPS == 0:
+                self.refresh_policy(agent)
             self._training_metrics["total_loss"] += mean_loss
             self._training_metrics["mean_q_value"] = agent.get_stats()["mean_q_value"]
             self._training_metrics["buffer_size"] = len(self.replay_buffer)
@@ -544,6 +756,28 @@ class RLService:
             logger.error(f"Error during DQN training step: {e}")
             return None
 
+    async def _on_weights_swapped(
+        self, agent: NeuralAgent, interval: TrainingInterval
+    ) -> None:
+        """Record a background training interval and refresh served policy."""
+        self._training_metrics["total_training_steps"] += interval.steps
+        self._training_metrics["total_loss"] += interval.mean_loss * interval.steps
+        learner_stats = self.training_scheduler.get_stats()["learner"]
+        self._training_metrics["mean_q_value"] = learner_stats.get("mean_q_value", 0.0)
+        if self.inference_batcher is not None:
+            # ONNX export is not free; build the snapshot off the loop
+            runtime = await asyncio.to_thread(build_policy_runtime, agent)
+            self.inference_batcher.set_policy(SHARED_POLICY, runtime)
+
+    def record_latency(self, seconds: float) -> None:
+        """Report time the event loop was blocked; training pauses while it is high.
+
+        Only pass loop-blocking time here, not wall time spent awaiting LLM
+        or network I/O -- the scheduler already measures its own wake-up lag.
+        """
+        if self.training_scheduler is not None:
+            self.training_scheduler.record_latency(seconds)
+
     def get_training_metrics(self) -> Dict[str, Any]:
         """
         Get current training metrics for monitoring.
@@ -557,27 +791,48 @@ class RLService:
                 self.replay_buffer.utilization
             )
 
-        return self._training_metrics.copy()
+        metrics = self._training_metrics.copy()
+        if self.inference_batcher is not None:
+            metrics["inference"] = self.inference_batcher.get_stats()
+        if self.training_scheduler is not None:
+            metrics["scheduler"] = self.training_scheduler.get_stats()
+        if self.policy_priors is not None:
+            metrics["priors"] = self.policy_priors.get_stats()
+        return metrics
 
     async def _save_agent(self, channel_id: int, user_id: int, agent: RLAgent):
         """Save a single agent."""
-        await self._save_all_dirty()
+        await self._save_agents({(channel_id, user_id): agent})
+
+    async def _save_agents(self, agents: Dict[Tuple[int, int], RLAgent]) -> None:
+        # Encode here, where the agents are updated; only the write is
+        # handed to a thread. Flags are cleared first so updates made
+        # during the write stay dirty.
+        records = self.storage.encode(agents)
+        for agent in agents.values():
+            agent.dirty = False
+        written = await asyncio.to_thread(self.storage.write, records)
+        if written < len(records):
+            for agent in agents.values():
+                agent.dirty = True
 
     async def _save_all_dirty(self):
-        """Save all agents marked as dirty."""
-        any_dirty = any(a.dirty for a in self.agents.values())
-        if not any_dirty and not self.bandits:
+        """Save the agents and bandits changed since the last save."""
+        dirty_agents = {k: a for k, a in self.agents.items() if a.dirty}
+        dirty_bandits = self.bandits.dirty_keys()
+        if not dirty_agents and not dirty_bandits:
             return
 
         try:
-            if any_dirty:
-                await asyncio.to_thread(self.storage.save, self.agents)
+            if dirty_agents:
+                await self._save_agents(dirty_agents)
 
-                for agent in self.agents.values():
-                    agent.dirty = False
-
-            if self.bandits:
-                await asyncio.to_thread(self.bandit_storage.save, self.bandits)
+            if dirty_bandits:
+                records = self.bandit_storage.encode(self.bandits, dirty_bandits)
+                self.bandits.mark_clean(dirty_bandits)
+                written = await asyncio.to_thread(self.bandit_storage.write, records)
+                if written < len(records):
+                    self.bandits.mark_dirty(dirty_bandits)
 
         except Exception as e:
             logger.error(f"Failed to save RL agents: {e}")
@@ -712,12 +967,20 @@ class RLService:
 
     # ========== Contextual Bandit Methods ==========
 
-    def _get_bandit(self, channel_id: int, user_id: int) -> LinUCBBandit:
-        """Get or create bandit for (channel_id, user_id)."""
-        key = (channel_id, user_id)
-        if key not in self.bandits:
-            self.bandits[key] = LinUCBBandit(self.bandit_config)
-        return self.bandits[key]
+    async def _ensure_bandits(self, keys: List[Tuple[int, int]]) -> None:
+        """Read persisted bandits in a thread before the store needs them.
+
+        The store's loader would read them on the loop otherwise; it still
+        covers bandits evicted again before use.
+        """
+        missing = [key for key in keys if key not in self.bandits]
+        if not missing or not self.enabled:
+            return
+        states = await asyncio.to_thread(self.bandit_storage.load_many, missing)
+        for key, state in states.items():
+            # A concurrent call may have loaded or updated it while we awaited
+            if key not in self.bandits:
+                self.bandits.restore_user(key, state)
 
     async def select_mode_switch_action(
         self,
@@ -726,11 +989,28 @@ class RLService:
         context: BanditContext,
     ) -> ModeSwitchAction:
         """Select mode switch action using contextual bandit."""
-        bandit = self._get_bandit(channel_id, user_id)
-        action, confidence = bandit.select_action(context)
+        await self._ensure_bandits([(channel_id, user_id)])
+        arm, confidence = self.bandits.select(
+            (channel_id, user_id),
+            context.to_feature_vector(self.bandit_config.feature_dim),
+        )
+        action = ModeSwitchAction(arm)
         logger.debug(f"Selected action {action.name} with confidence {confidence:.3f}")
         return action
 
+    async def select_mode_switch_actions(
+        self,
+        keys: List[Tuple[int, int]],
+        contexts: List[BanditContext],
+    ) -> List[ModeSwitchAction]:
+        """Select mode switch actions for many (channel_id, user_id) at once."""
+        dim = self.bandit_config.feature_dim
+        await self._ensure_bandits(keys)
+        arms, _ = self.bandits.select_many(
+            keys, [context.to_feature_vector(dim) for context in contexts]
+        )
+        return [ModeSwitchAction(arm) for arm in arms.tolist()]
+
     async def update_bandit(
         self,
         channel_id: int,
@@ -740,8 +1020,13 @@ class RLService:
         reward: float,
     ) -> None:
         """Update bandit after observing reward."""
-        bandit = self._get_bandit(channel_id, user_id)
-        bandit.update(action, context, reward)
+        await self._ensure_bandits([(channel_id, user_id)])
+        self.bandits.update(
+            (channel_id, user_id),
+            int(action),
+            context.to_feature_vector(self.bandit_config.feature_dim),
+            reward,
+        )
         logger.debug(f"Updated bandit with reward {reward:.3f}")
 
     def compute_mode_switch_reward(
@@ -761,4 +1046,15 @@ class RLService:
         key = (channel_id, user_id)
         if key not in self.bandits:
             return {"error": "No bandit found for this user"}
-        return self.bandits[key].get_stats()
+        counts = self.bandits.get_user(key)["counts"].tolist()
+        total_pulls = sum(counts)
+        return {
+            "total_pulls": total_pulls,
+            "action_counts": {
+                action.name: counts[action] for action in ModeSwitchAction
+            },
+            "action_probs": {
+                action.name: counts[action] / max(total_pulls, 1)
+                for action in ModeSwitchAction
+            },
+        }
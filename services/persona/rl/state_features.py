@@ -11,6 +11,9 @@ from datetime import datetime
 from typing import List, Optional, Tuple, Dict, Any
 from collections import deque
 
+import numpy as np
+
+from .feature_pipeline import SCOPE_CHANNEL, SCOPE_GLOBAL, FeaturePipeline, FeatureSpec
 from .types import RLAction
 
 
@@ -125,9 +128,233 @@ class StateFeatures:
         }
 
 
+# URL pattern for content feature extraction
+_URL_PATTERN = re.compile(r'https?://[^\s<>"{}|\\^`\[\]]+', re.IGNORECASE)
+
+# Question indicators
+_QUESTION_PATTERN = re.compile(
+    r"\?|^(?:who|what|when|where|why|how|can|could|would|should|is|are|do|does|did)\b",
+    re.IGNORECASE,
+)
+
+# Raw inputs of the state pipeline, in StateFeatureExtractor.extract order
+STATE_SOURCES = ("message", "behavior_state", "history", "last_action", "timestamp")
+
+
+def _time_features(timestamp: datetime) -> Tuple[float, float, float, float]:
+    """hour_of_day, day_of_week, is_weekend and is_night (10pm - 6am)."""
+    hour = timestamp.hour
+    weekday = timestamp.weekday()
+    return (
+        hour / 23.0,
+        weekday / 6.0,
+        1.0 if weekday >= 5 else 0.0,
+        1.0 if hour >= 22 or hour < 6 else 0.0,
+    )
+
+
+def _time_stamp(timestamp: datetime) -> Tuple[int, int]:
+    return timestamp.hour, timestamp.weekday()
+
+
+def _conversation_features(
+    behavior_state: Optional[Any],
+    history: Optional[List[Dict]],
+    timestamp: datetime,
+) -> Tuple[float, float, float]:
+    """turn_count, message_velocity and time_since_last."""
+    # Turn count from behavior state or history
+    if behavior_state and hasattr(behavior_state, "message_count"):
+        turn_count = behavior_state.message_count
+    elif history:
+        turn_count = len(history)
+    else:
+        turn_count = 0
+
+    velocity = 0.0
+    time_since = MAX_TIME_SINCE  # Default to max if unknown
+    last_time = getattr(behavior_state, "last_message_time", None)
+    if isinstance(last_time, datetime):
+        time_since = (timestamp - last_time).total_seconds()
+        if time_since > 0 and turn_count > 0:
+            # Estimate velocity from recent activity
+            # If we have 5 messages in last 60 seconds, velocity = 5
+            velocity = min(turn_count / max(time_since / 60, 1), MAX_VELOCITY)
+
+    return (
+        min(turn_count / MAX_TURN_COUNT, 1.0),
+        min(velocity / MAX_VELOCITY, 1.0),
+        min(time_since / MAX_TIME_SINCE, 1.0),
+    )
+
+
+def _conversation_depth(history: Optional[List[Dict]]) -> float:
+    """Back-and-forth exchanges in the recent history, normalized."""
+    depth = 0
+    if history:
+        prev_role = None
+        for msg in history[-MAX_DEPTH:]:
+            role = msg.get("role", "")
+            if role != prev_role:
+                depth += 1
+                prev_role = role
+    return min(depth / MAX_DEPTH, 1.0)
+
+
+def _content_features(message: Optional[Any]) -> Tuple[float, float, float, float]:
+    """message_length, has_question, has_url and has_attachment."""
+    if message is None:
+        return (0.0, 0.0, 0.0, 0.0)
+
+    if hasattr(message, "content"):
+        content = message.content or ""
+    elif isinstance(message, dict):
+        content = message.get("content", "")
+    elif isinstance(message, str):
+        content = message
+    else:
+        content = ""
+
+    return (
+        min(len(content) / MAX_MESSAGE_LENGTH, 1.0),
+        1.0 if _QUESTION_PATTERN.search(content) else 0.0,
+        1.0 if _URL_PATTERN.search(content) else 0.0,
+        1.0 if getattr(message, "attachments", None) else 0.0,
+    )
+
+
+def _channel_stamp(behavior_state: Optional[Any]) -> Optional[Tuple]:
+    """The sentiment and topic windows that ``_channel_aggregates`` reads.
+
+    Both windows are short bounded deques, so copying them is cheap, and
+    plain messages (which only bump ``message_count``) keep the cache warm.
+    """
+    if behavior_state is None:
+        return None
+    sentiments = getattr(behavior_state, "sentiment_history", None) or ()
+    topics = getattr(behavior_state, "recent_topics", None) or ()
+    return id(behavior_state), tuple(sentiments), tuple(topics)
+
+
+def _channel_aggregates(behavior_state: Optional[Any]) -> Tuple[float, float]:
+    """sentiment_trend and topic_consistency of the channel.
+
+    - sentiment_trend: average recent sentiment, clamped to [-1, 1]
+    - topic_consistency: 1.0 if all recent topics match, 0.0 if all differ
+    """
+    sentiment_trend = 0.0
+    topic_consistency = 0.0
+    if behavior_state is None:
+        return sentiment_trend, topic_consistency
+
+    sentiments = getattr(behavior_state, "sentiment_history", None)
+    if sentiments:
+        avg = sum(sentiments) / len(sentiments)
+        sentiment_trend = max(-1.0, min(1.0, avg))
+
+    topics = getattr(behavior_state, "recent_topics", None)
+    if topics is not None and len(topics) >= 2:
+        unique_topics = len(set(topics))
+        topic_consistency = max(
+            0.0, 1.0 - (unique_topics - 1) / max(len(topics) - 1, 1)
+        )
+    return sentiment_trend, topic_consistency
+
+
+def _channel_activity(behavior_state: Optional[Any]) -> float:
+    # Assuming ~100 messages is high activity
+    if behavior_state and hasattr(behavior_state, "message_count"):
+        return min(behavior_state.message_count / 100.0, 1.0)
+    return 0.0
+
+
+def _previous_action_scalar(previous_action: Optional[RLAction]) -> float:
+    action = int(previous_action) if previous_action is not None else 0
+    return action / 3.0  # Normalize to [0, 1]
+
+
+def _previous_action_one_hot(
+    previous_action: Optional[RLAction],
+) -> Tuple[float, float, float, float]:
+    # 4 actions: WAIT, REACT, ENGAGE, INITIATE
+    one_hot = [0.0] * 4
+    action = int(previous_action) if previous_action is not None else 0
+    if 0 <= action < 4:
+        one_hot[action] = 1.0
+    return tuple(one_hot)
+
+
+def state_feature_specs(include_one_hot: bool = False) -> List[FeatureSpec]:
+    """Feature declarations matching ``StateFeatures.to_vector`` layout.
+
+    Args:
+        include_one_hot: One-hot encode previous_action (4 slots) instead of
+            a single normalized value
+    """
+    if include_one_hot:
+        previous_action = FeatureSpec(
+            "previous_action",
+            _previous_action_one_hot,
+            ("last_action",),
+            width=4,
+        )
+    else:
+        previous_action = FeatureSpec(
+            "previous_action", _previous_action_scalar, ("last_action",)
+        )
+
+    return [
+        # Time Features: only change on the hour
+        FeatureSpec(
+            "time",
+            _time_features,
+            ("timestamp",),
+            width=4,
+            scope=SCOPE_GLOBAL,
+            stamp=_time_stamp,
+        ),
+        FeatureSpec(
+            "conversation",
+            _conversation_features,
+            ("behavior_state", "history", "timestamp"),
+            width=3,
+        ),
+        FeatureSpec("conversation_depth", _conversation_depth, ("history",)),
+        FeatureSpec("content", _content_features, ("message",), width=4),
+        # Context Features: sentiment_trend and topic_consistency only
+        # change when the channel records a message
+        FeatureSpec(
+            "channel_aggregates",
+            _channel_aggregates,
+            ("behavior_state",),
+            width=2,
+            scope=SCOPE_CHANNEL,
+            stamp=_channel_stamp,
+        ),
+        FeatureSpec("channel_activity", _channel_activity, ("behavior_state",)),
+        previous_action,
+    ]
+
+
+def build_state_pipeline(
+    include_one_hot: bool = False, dtype: Any = np.float32
+) -> FeaturePipeline:
+    """Build the state features into a ``FeaturePipeline``.
+
+    The pipeline's sources are ``STATE_SOURCES``; its vector equals
+    ``StateFeatureExtractor.extract(...).to_vector(include_one_hot)``.
+    """
+    return FeaturePipeline(
+        state_feature_specs(include_one_hot), sources=STATE_SOURCES, dtype=dtype
+    )
+
+
 class StateFeatureExtractor:
     """Extracts rich state features from conversation context.
 
+    Features are computed by a precomputed ``FeaturePipeline``; channel
+    aggregates and time features are cached between calls.
+
     Performance target: < 1ms per extraction
     Dimensionality: 16 base features (configurable up to 128)
     """
@@ -140,14 +367,15 @@ class StateFeatureExtractor:
         """
         self.max_dimensions = max_dimensions
 
-        # URL pattern for content feature extraction
-        self._url_pattern = re.compile(r'https?://[^\s<>"{}|\\^`\[\]]+', re.IGNORECASE)
+        self._url_pattern = _URL_PATTERN
+        self._question_pattern = _QUESTION_PATTERN
 
-        # Question indicators
-        self._question_pattern = re.compile(
-            r"\?|^(?:who|what|when|where|why|how|can|could|would|should|is|are|do|does|did)\b",
-            re.IGNORECASE,
-        )
+        self.pipeline = build_state_pipeline(include_one_hot=False)
+        if self.pipeline.dim > max_dimensions:
+            raise ValueError(
+                f"State features need {self.pipeline.dim} dimensions, "
+                f"max_dimensions is {max_dimensions}"
+            )
 
     def extract(
         self,
@@ -156,6 +384,7 @@ class StateFeatureExtractor:
         history: Optional[List[Dict]] = None,
         previous_action: Optional[RLAction] = None,
         timestamp: Optional[datetime] = None,
+        channel_id: Optional[Any] = None,
     ) -> StateFeatures:
         """Extract rich state features from conversation context.
 
@@ -165,197 +394,71 @@ class StateFeatureExtractor:
             history: Recent conversation history (list of message dicts)
             previous_action: Previous RLAction taken
             timestamp: Timestamp for time features (defaults to now)
+            channel_id: Enables caching of channel aggregates
 
         Returns:
             StateFeatures dataclass with all normalized features
 
         Performance: Target < 1ms
         """
-        features = StateFeatures()
-        ts = timestamp or datetime.now()
-
-        # Extract time features
-        self._extract_time_features(features, ts)
-
-        # Extract conversation features
-        self._extract_conversation_features(features, behavior_state, history, ts)
-
-        # Extract content features
-        self._extract_content_features(features, message)
-
-        # Extract context features
-        self._extract_context_features(
-            features, behavior_state, history, previous_action
+        values = self.pipeline.extract_list(
+            message,
+            behavior_state,
+            history,
+            previous_action,
+            timestamp or datetime.now(),
+            channel_id=channel_id,
+        )
+        return StateFeatures(
+            *values[:12],
+            previous_action=int(previous_action) if previous_action is not None else 0,
+            sentiment_trend=values[12],
+            topic_consistency=values[13],
+            channel_activity=values[14],
         )
 
-        return features
-
-    def _extract_time_features(
+    def extract_vector(
         self,
-        features: StateFeatures,
-        timestamp: datetime,
-    ) -> None:
-        """Extract time-based features.
-
-        Features:
-        - hour_of_day: Hour normalized to [0, 1]
-        - day_of_week: Day normalized to [0, 1]
-        - is_weekend: Binary (Saturday/Sunday)
-        - is_night: Binary (10pm - 6am)
-        """
-        # Hour of day: 0-23 -> [0, 1]
-        features.hour_of_day = timestamp.hour / 23.0
-
-        # Day of week: 0 (Monday) - 6 (Sunday) -> [0, 1]
-        features.day_of_week = timestamp.weekday() / 6.0
-
-        # Is weekend: Saturday (5) or Sunday (6)
-        features.is_weekend = 1.0 if timestamp.weekday() >= 5 else 0.0
+        message: Optional[Any] = None,
+        behavior_state: Optional[Any] = None,
+        history: Optional[List[Dict]] = None,
+        previous_action: Optional[RLAction] = None,
+        timestamp: Optional[datetime] = None,
+        channel_id: Optional[Any] = None,
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Extract features straight into a float32 vector.
 
-        # Is night: 10pm (22) - 6am
-        hour = timestamp.hour
-        features.is_night = 1.0 if hour >= 22 or hour < 6 else 0.0
+        Equivalent to ``extract(...).to_vector()`` without the intermediate
+        dataclass and list.
 
-    def _extract_conversation_features(
-        self,
-        features: StateFeatures,
-        behavior_state: Optional[Any],
-        history: Optional[List[Dict]],
-        timestamp: datetime,
-    ) -> None:
-        """Extract conversation-based features.
-
-        Features:
-        - turn_count: Number of messages in conversation
-        - message_velocity: Messages per minute
-        - time_since_last: Time since last message
-        - conversation_depth: How deep the conversation is
-        """
-        # Turn count from behavior state or history
-        if behavior_state and hasattr(behavior_state, "message_count"):
-            turn_count = behavior_state.message_count
-        elif history:
-            turn_count = len(history)
-        else:
-            turn_count = 0
-        features.turn_count = min(turn_count / MAX_TURN_COUNT, 1.0)
-
-        # Message velocity (messages per minute)
-        velocity = 0.0
-        if behavior_state and hasattr(behavior_state, "last_message_time"):
-            last_time = behavior_state.last_message_time
-            if isinstance(last_time, datetime):
-                time_diff = (timestamp - last_time).total_seconds()
-                if time_diff > 0 and turn_count > 0:
-                    # Estimate velocity from recent activity
-                    # If we have 5 messages in last 60 seconds, velocity = 5
-                    velocity = min(turn_count / max(time_diff / 60, 1), MAX_VELOCITY)
-        features.message_velocity = min(velocity / MAX_VELOCITY, 1.0)
-
-        # Time since last message
-        time_since = MAX_TIME_SINCE  # Default to max if unknown
-        if behavior_state and hasattr(behavior_state, "last_message_time"):
-            last_time = behavior_state.last_message_time
-            if isinstance(last_time, datetime):
-                time_since = (timestamp - last_time).total_seconds()
-        features.time_since_last = min(time_since / MAX_TIME_SINCE, 1.0)
+        Args:
+            out: Array of shape ``(dimensionality,)`` to fill. Defaults to a
+                buffer owned by the extractor and reused by the next call.
 
-        # Conversation depth (estimate from history complexity)
-        depth = 0
-        if history:
-            # Count back-and-forth exchanges
-            prev_role = None
-            for msg in history[-MAX_DEPTH:]:
-                role = msg.get("role", "")
-                if role != prev_role:
-                    depth += 1
-                    prev_role = role
-        features.conversation_depth = min(depth / MAX_DEPTH, 1.0)
-
-    def _extract_content_features(
-        self,
-        features: StateFeatures,
-        message: Optional[Any],
-    ) -> None:
-        """Extract content-based features from message.
-
-        Features:
-        - message_length: Normalized message length
-        - has_question: Binary
-        - has_url: Binary
-        - has_attachment: Binary
+        Returns:
+            The filled vector
         """
-        if message is None:
-            return
-
-        # Get content
-        content = ""
-        if hasattr(message, "content"):
-            content = message.content or ""
-        elif isinstance(message, dict):
-            content = message.get("content", "")
-        elif isinstance(message, str):
-            content = message
-
-        # Message length normalized
-        features.message_length = min(len(content) / MAX_MESSAGE_LENGTH, 1.0)
-
-        # Has question
-        if self._question_pattern.search(content):
-            features.has_question = 1.0
+        return self.pipeline.extract(
+            message,
+            behavior_state,
+            history,
+            previous_action,
+            timestamp or datetime.now(),
+            channel_id=channel_id,
+            out=out,
+        )
 
-        # Has URL
-        if self._url_pattern.search(content):
-            features.has_url = 1.0
+    @property
+    def dimensionality(self) -> int:
+        return self.pipeline.dim
 
-        # Has attachment
-        if hasattr(message, "attachments") and message.attachments:
-            features.has_attachment = 1.0
+    def invalidate(self, channel_id: Any) -> None:
+        """Drop cached aggregates for a channel, e.g. after its state is reset."""
+        self.pipeline.invalidate(channel_id=channel_id)
 
-    def _extract_context_features(
-        self,
-        features: StateFeatures,
-        behavior_state: Optional[Any],
-        history: Optional[List[Dict]],
-        previous_action: Optional[RLAction],
-    ) -> None:
-        """Extract context-based features.
-
-        Features:
-        - previous_action: Previous action taken (for one-hot encoding)
-        - sentiment_trend: Average sentiment direction [-1, 1]
-        - topic_consistency: How consistent topics are [0, 1]
-        - channel_activity: Normalized channel activity level [0, 1]
-        """
-        # Previous action
-        if previous_action is not None:
-            features.previous_action = int(previous_action)
-
-        # Sentiment trend from behavior state
-        if behavior_state and hasattr(behavior_state, "sentiment_history"):
-            sentiments = list(behavior_state.sentiment_history)
-            if sentiments:
-                # Average sentiment as trend
-                avg = sum(sentiments) / len(sentiments)
-                features.sentiment_trend = max(-1.0, min(1.0, avg))
-
-        # Topic consistency (estimate from recent_topics)
-        if behavior_state and hasattr(behavior_state, "recent_topics"):
-            topics = list(behavior_state.recent_topics)
-            if len(topics) >= 2:
-                # Count unique topics - fewer unique = more consistent
-                unique_topics = len(set(topics))
-                # If 1 unique topic in 10 messages = 1.0, if 10 unique = 0.0
-                features.topic_consistency = max(
-                    0.0, 1.0 - (unique_topics - 1) / max(len(topics) - 1, 1)
-                )
-
-        # Channel activity from behavior state
-        if behavior_state and hasattr(behavior_state, "message_count"):
-            # Normalize activity level
-            activity = behavior_state.message_count
-            # Assuming ~100 messages is high activity
-            features.channel_activity = min(activity / 100.0, 1.0)
+    def get_cache_stats(self) -> Dict[str, Any]:
+        return self.pipeline.get_cache_stats()
 
     def to_legacy_state(self, features: StateFeatures) -> Tuple[int, int, int]:
         """Convert rich features back to legacy RLState tuple.
@@ -0,0 +1,267 @@
+"""Background DQN training off the event loop.
+
+``TrainingScheduler`` trains a private *learner* copy of the serving agent
+in a single worker thread. Once per interval it
+
+1. samples a few minibatches from the replay buffer (on the loop, where
+   the buffer is written),
+2. runs gradient steps in the worker until the interval's CPU-time budget
+   is spent, and
+3. swaps the learner's online weights into the serving agent in one
+   ``load_state_dict`` call on the loop, so decisions never observe a
+   half-updated network.
+
+Training is skipped while the event loop is under pressure: the scheduler
+measures its own wake-up lag and accepts reported loop-blocking times
+(``record_latency``); any sample above the threshold within the cool-down
+window pauses training. Time spent awaiting I/O is not pressure and must
+not be reported.
+"""
+
+import asyncio
+import copy
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .neural_agent import NeuralAgent
+from .replay_buffer import PrioritizedReplayBuffer, ReplayBatch, ReplayBuffer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL_SEC = 1.0
+DEFAULT_BUDGET_MS = 200.0
+DEFAULT_PAUSE_LATENCY_MS = 250.0
+MAX_STEPS_PER_INTERVAL = 64
+# Latency samples older than this many intervals no longer pause training
+PAUSE_COOLDOWN_INTERVALS = 5
+
+
+@dataclass
+class TrainingInterval:
+    """Outcome of one training interval."""
+
+    steps: int
+    mean_loss: float
+    cpu_ms: float
+    wall_ms: float
+
+
+class TrainingScheduler:
+    """Runs budgeted DQN training in a worker thread and swaps weights back."""
+
+    def __init__(
+        self,
+        agent: NeuralAgent,
+        replay_buffer: ReplayBuffer,
+        batch_size: int,
+        warmup_steps: int = 0,
+        interval_sec: float = DEFAULT_INTERVAL_SEC,
+        budget_ms: float = DEFAULT_BUDGET_MS,
+        pause_latency_ms: float = DEFAULT_PAUSE_LATENCY_MS,
+        on_swap: Optional[
+            Callable[[NeuralAgent, TrainingInterval], Awaitable[None]]
+        ] = None,
+    ):
+        """
+        Args:
+            agent: Serving agent; receives the trained weights
+            replay_buffer: Buffer to sample from
+            batch_size: Transitions per gradient step
+            warmup_steps: Minimum buffer size before training starts
+            interval_sec: Time between training intervals
+            budget_ms: Worker CPU time allowed per interval
+            pause_latency_ms: Pause training while latency exceeds this
+            on_swap: Awaited on the loop after each weight swap
+        """
+        self.agent = agent
+        self.learner = copy.deepcopy(agent)
+        self.replay_buffer = replay_buffer
+        self.batch_size = batch_size
+        self.warmup_steps = warmup_steps
+        self.interval = interval_sec
+        self.budget = budget_ms / 1000.0
+        self.pause_latency = pause_latency_ms / 1000.0
+        self.on_swap = on_swap
+
+        # (monotonic time, latency in seconds)
+        self._latencies: Deque[Tuple[float, float]] = deque(maxlen=256)
+        # Batches to prepare next interval, adapted to the observed step rate
+        self._steps_hint = 8
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.paused = False
+        self._learner_stats: Dict[str, Any] = {}
+        self._stats: Dict[str, Any] = {
+            "intervals": 0,
+            "paused_intervals": 0,
+            "steps": 0,
+            "swaps": 0,
+            "last_steps": 0,
+            "last_cpu_ms": 0.0,
+            "last_loss": 0.0,
+        }
+
+    def start(self) -> None:
+        if self._task is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="rl-train"
+            )
+            self._task = asyncio.create_task(self._run())
+            logger.info(
+                f"RL training scheduler started: interval={self.interval}s, "
+                f"budget={self.budget * 1000:.0f}ms"
+            )
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._executor is not None:
+            # Let an in-flight interval finish off the loop
+            await asyncio.to_thread(self._executor.shutdown, True)
+            self._executor = None
+
+    # ------------------------------------------------------------------
+    # Latency gate
+    # ------------------------------------------------------------------
+
+    def record_latency(self, seconds: float) -> None:
+        """Report how long the event loop was blocked."""
+        self._latencies.append((time.monotonic(), seconds))
+
+    def should_pause(self) -> bool:
+        horizon = time.monotonic() - self.interval * PAUSE_COOLDOWN_INTERVALS
+        return any(
+            latency > self.pause_latency
+            for at, latency in self._latencies
+            if at >= horizon
+        )
+
+    # ------------------------------------------------------------------
+    # Training
+    # ------------------------------------------------------------------
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            woke_at = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            # A late wake-up means the loop itself is backed up
+            self.record_latency(loop.time() - woke_at)
+
+            self._stats["intervals"] += 1
+            self.paused = self.should_pause()
+            if self.paused:
+                self._stats["paused_intervals"] += 1
+                continue
+
+            try:
+                await self.run_interval()
+            except Exception as e:
+                logger.error(f"RL background training failed: {e}")
+
+    async def run_interval(self) -> Optional[TrainingInterval]:
+        """Train for one interval's budget and swap the weights in.
+
+        Returns:
+            The interval's outcome, or None if the buffer is still warming up
+        """
+        buffer = self.replay_buffer
+        if len(buffer) < max(self.warmup_steps, self.batch_size):
+            return None
+
+        batches = [
+            buffer.sample_arrays_sync(self.batch_size, self.learner.state_dim)
+            for _ in range(self._steps_hint)
+        ]
+        loop = asyncio.get_running_loop()
+        losses, td_errors, weights, cpu_sec, wall_sec = await loop.run_in_executor(
+            self._executor, self._train, batches
+        )
+        steps = len(losses)
+        # Read while the worker is idle
+        self._learner_stats = self.learner.get_stats()
+        self._steps_hint = int(
+            np.clip(steps + max(steps // 2, 1), 1, MAX_STEPS_PER_INTERVAL)
+        )
+        if not steps:
+            return None
+
+        if isinstance(buffer, PrioritizedReplayBuffer):
+            for batch, errors in zip(batches, td_errors):
+                buffer.update_priorities_sync(batch.indices, errors)
+
+        # Swap on the loop: decisions see either the old or the new network
+        self.agent.online_network.load_state_dict(weights)
+        self.agent.total_updates = self._learner_stats["total_updates"]
+
+        interval = TrainingInterval(
+            steps=steps,
+            mean_loss=float(np.mean(losses)),
+            cpu_ms=cpu_sec * 1000.0,
+            wall_ms=wall_sec * 1000.0,
+        )
+        self._stats["steps"] += steps
+        self._stats["swaps"] += 1
+        self._stats["last_steps"] = steps
+        self._stats["last_cpu_ms"] = interval.cpu_ms
+        self._stats["last_loss"] = interval.mean_loss
+
+        if self.on_swap is not None:
+            await self.on_swap(self.agent, interval)
+        return interval
+
+    def _train(
+        self, batches: List[ReplayBatch]
+    ) -> Tuple[List[float], List[np.ndarray], Dict[str, Any], float, float]:
+        """Worker thread: gradient steps until the CPU budget is spent."""
+        cpu_start = time.thread_time()
+        wall_start = time.perf_counter()
+        losses: List[float] = []
+        td_errors: List[np.ndarray] = []
+
+        for batch in batches:
+            if time.thread_time() - cpu_start >= self.budget:
+                break
+            # Never overrun into the next interval
+            if time.perf_counter() - wall_start >= self.interval:
+                break
+            loss, errors = self.learner.update_batch(
+                batch.states,
+                batch.actions,
+                batch.rewards,
+                batch.next_states,
+                batch.dones,
+                weights=batch.weights,
+            )
+            losses.append(loss)
+            td_errors.append(errors)
+
+        weights = {
+            name: tensor.detach().clone()
+            for name, tensor in self.learner.online_network.state_dict().items()
+        }
+        return (
+            losses,
+            td_errors,
+            weights,
+            time.thread_time() - cpu_start,
+            time.perf_counter() - wall_start,
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats["paused"] = self.paused
+        stats["learner"] = self._learner_stats
+        return stats
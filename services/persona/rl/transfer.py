@@ -10,14 +10,29 @@ Key Features:
 - Strategy transfer between meta-controllers
 - Fine-tuning after transfer using CQL
 - Transfer lineage tracking for knowledge ancestry visualization
+- Precomputed policy priors for initializing new agents on cold start
 """
 
+import asyncio
 import json
 import logging
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 import numpy as np
 import torch
@@ -44,6 +59,11 @@ TRAIT_SIMILARITY_WEIGHT = 0.5
 INTEREST_OVERLAP_WEIGHT = 0.3
 STYLE_COMPATIBILITY_WEIGHT = 0.2
 
+# Policy priors
+DEFAULT_PRIOR_REFRESH_SEC = 300.0
+GLOBAL_PRIOR = "global"  # Prior averaged over every qualifying agent
+PERSONA_PRIOR = "persona"  # Context kind of ("persona", persona_id) keys
+
 
 @dataclass
 class PersonaFeatures:
@@ -860,3 +880,264 @@ class KnowledgeTransfer:
         )
 
         return results
+
+
+@dataclass
+class PolicyPrior:
+    """Population-average policy for one context."""
+
+    key: Hashable
+    state_dict: Dict[str, torch.Tensor]
+    epsilon: float
+    agent_count: int
+    updated_at: float
+
+
+class PolicyPriorCache:
+    """
+    Precomputed policy priors for initializing new agents.
+
+    Priors are population averages of the online networks of existing agents,
+    one per context (e.g. ``("channel", channel_id)`` or
+    ``("persona", persona_id)``) plus a global one. They are rebuilt in the
+    background every ``refresh_interval_sec``, so a cold start is a dictionary
+    lookup and one ``load_state_dict`` copy, however many agents exist.
+
+    Example:
+        priors = PolicyPriorCache()
+        priors.start(lambda: {("channel", 1): [agent_a, agent_b]})
+
+        new_agent = NeuralAgent()
+        priors.init_agent(new_agent, ("channel", 1))  # Falls back to global
+    """
+
+    def __init__(
+        self,
+        refresh_interval_sec: float = DEFAULT_PRIOR_REFRESH_SEC,
+        min_updates: int = 1,
+        knowledge_transfer: Optional[KnowledgeTransfer] = None,
+    ):
+        """
+        Args:
+            refresh_interval_sec: Seconds between background rebuilds
+            min_updates: Agents with fewer training updates are left out,
+                so untrained networks don't dilute the average
+            knowledge_transfer: Enables nearest-persona lookup by similarity
+        """
+        self.refresh_interval = refresh_interval_sec
+        self.min_updates = min_updates
+        self.knowledge_transfer = knowledge_transfer
+
+        self._priors: Dict[Hashable, PolicyPrior] = {}
+        # Parameter shapes of a default NeuralAgent, built on first use
+        self._layout: Optional[Dict[str, torch.Size]] = None
+        # persona_id -> nearest persona prior key, reset on refresh
+        self._nearest_persona: Dict[str, Optional[Hashable]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+        self._refreshes = 0
+        self._initialized = 0
+        self._misses = 0
+        self._last_build_ms = 0.0
+
+    def build(
+        self, groups: Mapping[Hashable, Iterable[NeuralAgent]]
+    ) -> Dict[Hashable, PolicyPrior]:
+        """
+        Average the online networks of each group of agents.
+
+        Safe to run in a worker thread: agents are only read. A network
+        updated mid-read contributes a mix of old and new weights, which is
+        harmless for a prior. Only agents with the layout of a default
+        ``NeuralAgent()`` are averaged, since that is what new agents get.
+
+        Args:
+            groups: Agents per context key; an agent may appear in several
+
+        Returns:
+            Priors per context key, plus ``GLOBAL_PRIOR`` over all agents
+        """
+        now = time.time()
+        totals: Dict[Hashable, Tuple[Dict[str, torch.Tensor], float, int]] = {}
+        seen: Set[int] = set()
+        if self._layout is None:
+            self._layout = {
+                name: tensor.shape
+                for name, tensor in NeuralAgent().online_network.state_dict().items()
+            }
+
+        for key, agents in groups.items():
+            for agent in agents:
+                if agent.get_stats()["total_updates"] < self.min_updates:
+                    continue
+                with torch.no_grad():
+                    weights = {
+                        name: tensor.detach().to("cpu", torch.float32)
+                        for name, tensor in agent.online_network.state_dict().items()
+                    }
+                layout = {name: tensor.shape for name, tensor in weights.items()}
+                if layout != self._layout:
+                    # Priors only mix networks of the default architecture
+                    continue
+
+                targets = [key]
+                if id(agent) not in seen:
+                    seen.add(id(agent))
+                    targets.append(GLOBAL_PRIOR)
+                for target in targets:
+                    summed, epsilon, count = totals.get(target, ({}, 0.0, 0))
+                    for name, tensor in weights.items():
+                        if name in summed:
+                            summed[name].add_(tensor)
+                        else:
+                            summed[name] = tensor.clone()
+                    totals[target] = (summed, epsilon + agent.epsilon, count + 1)
+
+        return {
+            key: PolicyPrior(
+                key=key,
+                state_dict={name: t / count for name, t in summed.items()},
+                epsilon=epsilon / count,
+                agent_count=count,
+                updated_at=now,
+            )
+            for key, (summed, epsilon, count) in totals.items()
+        }
+
+    def refresh(self, groups: Mapping[Hashable, Iterable[NeuralAgent]]) -> int:
+        """Rebuild all priors now.
+
+        Returns:
+            Number of priors available
+        """
+        start = time.perf_counter()
+        priors = self.build(groups)
+        self._install(priors, (time.perf_counter() - start) * 1000)
+        return len(priors)
+
+    def _install(self, priors: Dict[Hashable, PolicyPrior], build_ms: float) -> None:
+        # Swapped whole so lookups never see a half-built set
+        self._priors = priors
+        self._nearest_persona = {}
+        self._refreshes += 1
+        self._last_build_ms = build_ms
+
+    def get(self, *keys: Hashable) -> Optional[PolicyPrior]:
+        """First available prior among ``keys``, else the global prior."""
+        priors = self._priors
+        for key in keys:
+            prior = priors.get(key)
+            if prior is not None:
+                return prior
+        return priors.get(GLOBAL_PRIOR)
+
+    def nearest_persona(self, persona_id: str) -> Optional[PolicyPrior]:
+        """
+        Prior of ``persona_id``, or of the most similar persona with a prior.
+
+        Similarities come from ``knowledge_transfer`` and are computed at most
+        once per persona between refreshes.
+        """
+        exact = self._priors.get((PERSONA_PRIOR, persona_id))
+        if exact is not None or self.knowledge_transfer is None:
+            return exact
+
+        if persona_id not in self._nearest_persona:
+            best_key, best_similarity = None, 0.0
+            for key in self._priors:
+                if not (isinstance(key, tuple) and key[0] == PERSONA_PRIOR):
+                    continue
+                similarity = self.knowledge_transfer.compute_persona_similarity(
+                    key[1], persona_id
+                )
+                if (
+                    similarity >= self.knowledge_transfer.similarity_threshold
+                    and similarity > best_similarity
+                ):
+                    best_key, best_similarity = key, similarity
+            self._nearest_persona[persona_id] = best_key
+
+        key = self._nearest_persona[persona_id]
+        return self._priors.get(key) if key is not None else None
+
+    def init_agent(
+        self, agent: NeuralAgent, *keys: Hashable
+    ) -> Optional[PolicyPrior]:
+        """
+        Initialize a new agent from the nearest prior.
+
+        Both online and target networks receive the prior's weights and the
+        agent takes the prior's exploration rate.
+
+        Args:
+            agent: Freshly created agent
+            *keys: Context keys to try in order before the global prior
+
+        Returns:
+            The prior used, or None if none was available or compatible
+        """
+        prior = self.get(*keys)
+        if prior is None:
+            self._misses += 1
+            return None
+
+        try:
+            agent.online_network.load_state_dict(prior.state_dict)
+            agent.target_network.load_state_dict(prior.state_dict)
+        except RuntimeError as e:
+            logger.warning(f"Policy prior {prior.key} incompatible with agent: {e}")
+            self._misses += 1
+            return None
+
+        agent.epsilon = prior.epsilon
+        self._initialized += 1
+        return prior
+
+    def start(
+        self, source: Callable[[], Mapping[Hashable, Iterable[NeuralAgent]]]
+    ) -> None:
+        """
+        Refresh priors in the background, starting now.
+
+        Args:
+            source: Called on the event loop to list agents per context
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(source))
+            logger.info(
+                f"Policy prior cache started: refresh={self.refresh_interval}s"
+            )
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(
+        self, source: Callable[[], Mapping[Hashable, Iterable[NeuralAgent]]]
+    ) -> None:
+        while True:
+            try:
+                # Snapshot group membership on the loop; average off it
+                groups = {key: list(agents) for key, agents in source().items()}
+                start = time.perf_counter()
+                priors = await asyncio.to_thread(self.build, groups)
+                self._install(priors, (time.perf_counter() - start) * 1000)
+            except Exception as e:
+                logger.error(f"Policy prior refresh failed: {e}")
+            await asyncio.sleep(self.refresh_interval)
+
+    def get_stats(self) -> Dict[str, Any]:
+        prior = self._priors.get(GLOBAL_PRIOR)
+        return {
+            "priors": len(self._priors),
+            "global_agents": prior.agent_count if prior else 0,
+            "refreshes": self._refreshes,
+            "initialized_agents": self._initialized,
+            "misses": self._misses,
+            "last_build_ms": self._last_build_ms,
+        }
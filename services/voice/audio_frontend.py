@@ -0,0 +1,296 @@
+"""Streaming audio front-end for the voice listener.
+
+Discord delivers 20ms frames of 48kHz stereo 16-bit PCM per speaking user.
+Each user gets a ``UserAudioStream`` that:
+- downmixes to mono and resamples to 16kHz with a polyphase FIR filter
+  (anti-aliased, and seamless across chunk boundaries)
+- runs frame-level energy VAD with onset confirmation and hangover
+- keeps the current utterance in a fixed-size ring buffer
+
+Utterances are closed as soon as the hangover expires (or the maximum
+length is reached), so transcription can start immediately instead of
+waiting for a polling loop to notice the silence.
+"""
+
+import math
+from typing import List, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+DISCORD_SAMPLE_RATE = 48000
+DISCORD_CHANNELS = 2
+STT_SAMPLE_RATE = 16000
+
+
+def pcm_to_mono(pcm: bytes, channels: int = DISCORD_CHANNELS) -> np.ndarray:
+    """Decode 16-bit interleaved PCM and average the channels (float32)."""
+    samples = np.frombuffer(pcm, dtype=np.int16)
+    usable = len(samples) - len(samples) % channels
+    if channels == 1:
+        return samples.astype(np.float32)
+    return samples[:usable].reshape(-1, channels).astype(np.float32).mean(axis=1)
+
+
+def to_int16(samples: np.ndarray) -> np.ndarray:
+    return np.clip(np.rint(samples), -32768, 32767).astype(np.int16)
+
+
+class PolyphaseResampler:
+    """Rational-ratio FIR resampler that keeps filter state between chunks.
+
+    The low-pass prototype is a Kaiser-windowed sinc at the lower of the two
+    Nyquist rates; only the output samples that are actually needed are
+    computed, one polyphase branch per output.
+    """
+
+    def __init__(
+        self,
+        src_rate: int = DISCORD_SAMPLE_RATE,
+        dst_rate: int = STT_SAMPLE_RATE,
+        taps_per_phase: int = 32,
+        cutoff: float = 0.9,
+        beta: float = 8.0,
+    ):
+        """Initialize the resampler.
+
+        Args:
+            src_rate: Input sample rate
+            dst_rate: Output sample rate
+            taps_per_phase: Filter length per output sample, in input samples
+            cutoff: Passband edge as a fraction of the output Nyquist rate
+            beta: Kaiser window shape (higher = more stopband attenuation)
+        """
+        g = math.gcd(src_rate, dst_rate)
+        self.up = dst_rate // g
+        self.down = src_rate // g
+
+        ntaps = taps_per_phase * max(self.up, self.down)
+        ntaps += -ntaps % self.up
+        fc = cutoff * 0.5 / max(self.up, self.down)
+        n = np.arange(ntaps) - (ntaps - 1) / 2
+        taps = 2 * fc * np.sinc(2 * fc * n) * np.kaiser(ntaps, beta)
+        taps *= self.up / taps.sum()
+
+        # Branch p holds taps[p], taps[p + up], ...; reversed so a window of
+        # ascending input samples can be multiplied directly
+        self._phase_len = ntaps // self.up
+        branches = taps.reshape(self._phase_len, self.up).T
+        self._branches = np.ascontiguousarray(branches[:, ::-1], dtype=np.float32)
+        self.reset()
+
+    def reset(self):
+        self._history = np.zeros(self._phase_len - 1, dtype=np.float32)
+        # Position of the next output sample, in upsampled input units
+        self._t = 0
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """Resample one chunk of mono float samples."""
+        samples = np.asarray(samples, dtype=np.float32)
+        n_in = len(samples)
+        if n_in == 0:
+            return np.empty(0, dtype=np.float32)
+
+        buffer = np.concatenate((self._history, samples))
+        positions = np.arange(self._t, n_in * self.up, self.down)
+        if positions.size:
+            windows = sliding_window_view(buffer, self._phase_len)[positions // self.up]
+            out = np.einsum(
+                "ij,ij->i", windows, self._branches[positions % self.up]
+            ).astype(np.float32)
+            self._t = int(positions[-1]) + self.down - n_in * self.up
+        else:
+            out = np.empty(0, dtype=np.float32)
+            self._t -= n_in * self.up
+
+        if self._phase_len > 1:
+            self._history = buffer[len(buffer) - (self._phase_len - 1) :]
+        return out
+
+
+def convert_for_stt(
+    pcm: bytes,
+    src_rate: int = DISCORD_SAMPLE_RATE,
+    channels: int = DISCORD_CHANNELS,
+) -> bytes:
+    """One-shot conversion of interleaved PCM to 16kHz mono 16-bit PCM."""
+    resampler = PolyphaseResampler(src_rate, STT_SAMPLE_RATE)
+    return to_int16(resampler.process(pcm_to_mono(pcm, channels))).tobytes()
+
+
+class AudioRingBuffer:
+    """Fixed-capacity int16 sample buffer that overwrites its oldest samples."""
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, int(capacity))
+        self._data = np.zeros(self.capacity, dtype=np.int16)
+        self._start = 0
+        self._size = 0
+        self.overwritten = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def write(self, samples: np.ndarray):
+        n = len(samples)
+        if n == 0:
+            return
+        cap = self.capacity
+        if n >= cap:
+            self.overwritten += self._size + n - cap
+            self._data[:] = samples[n - cap :]
+            self._start = 0
+            self._size = cap
+            return
+
+        end = (self._start + self._size) % cap
+        first = min(n, cap - end)
+        self._data[end : end + first] = samples[:first]
+        if first < n:
+            self._data[: n - first] = samples[first:]
+
+        overflow = max(0, self._size + n - cap)
+        self._start = (self._start + overflow) % cap
+        self._size = min(cap, self._size + n)
+        self.overwritten += overflow
+
+    def read(self) -> np.ndarray:
+        """Return the buffered samples, oldest first (a copy)."""
+        end = self._start + self._size
+        if end <= self.capacity:
+            return self._data[self._start : end].copy()
+        return np.concatenate(
+            (self._data[self._start :], self._data[: end - self.capacity])
+        )
+
+    def clear(self):
+        self._start = 0
+        self._size = 0
+
+
+class FeedResult:
+    """What one chunk of audio changed for a user."""
+
+    __slots__ = ("speech_started", "utterances")
+
+    def __init__(self):
+        self.speech_started = False
+        self.utterances: List[bytes] = []
+
+
+class UserAudioStream:
+    """Per-user resampling, VAD and utterance buffering."""
+
+    def __init__(
+        self,
+        energy_threshold: float = 500,
+        hangover: float = 1.0,
+        max_utterance: float = 8.0,
+        min_utterance: float = 0.5,
+        pre_roll: float = 0.3,
+        frame_ms: int = 20,
+        onset_frames: int = 2,
+        trailing_silence: float = 0.2,
+        src_rate: int = DISCORD_SAMPLE_RATE,
+        channels: int = DISCORD_CHANNELS,
+    ):
+        """Initialize the stream.
+
+        Args:
+            energy_threshold: Frame RMS (16-bit scale) counted as speech
+            hangover: Seconds of silence that close an utterance
+            max_utterance: Utterances are force-closed at this length
+            min_utterance: Shorter utterances are discarded as noise
+            pre_roll: Seconds kept from before the speech onset
+            frame_ms: VAD frame length
+            onset_frames: Consecutive voiced frames required to start speech
+            trailing_silence: Seconds of the hangover kept at the end
+            src_rate: Input sample rate
+            channels: Input channel count
+        """
+        rate = STT_SAMPLE_RATE
+        self.energy_threshold = float(energy_threshold)
+        self.channels = channels
+        self.frame_samples = rate * frame_ms // 1000
+        self.onset_frames = max(1, onset_frames)
+        self.hangover_frames = max(1, round(hangover * 1000 / frame_ms))
+        self.trailing_frames = min(
+            self.hangover_frames, round(trailing_silence * 1000 / frame_ms)
+        )
+        self.min_samples = int(min_utterance * rate)
+
+        self.resampler = PolyphaseResampler(src_rate, rate)
+        max_pre_roll = max(int(pre_roll * rate), self.frame_samples * self.onset_frames)
+        self.pre_roll = AudioRingBuffer(max_pre_roll)
+        self.utterance = AudioRingBuffer(int(max_utterance * rate))
+        self._pending = np.empty(0, dtype=np.float32)
+
+        self.speaking = False
+        self._voiced_run = 0
+        self._silent_run = 0
+
+    def feed(self, pcm: bytes) -> FeedResult:
+        """Process one chunk of input PCM."""
+        result = FeedResult()
+        resampled = self.resampler.process(pcm_to_mono(pcm, self.channels))
+        if self._pending.size:
+            resampled = np.concatenate((self._pending, resampled))
+
+        size = self.frame_samples
+        n_frames = len(resampled) // size
+        self._pending = resampled[n_frames * size :]
+        if n_frames == 0:
+            return result
+
+        frames = resampled[: n_frames * size].reshape(n_frames, size)
+        voiced = np.sqrt(np.mean(frames * frames, axis=1)) > self.energy_threshold
+        pcm16 = to_int16(frames)
+
+        for frame, is_voiced in zip(pcm16, voiced):
+            if not self.speaking:
+                self.pre_roll.write(frame)
+                self._voiced_run = self._voiced_run + 1 if is_voiced else 0
+                if self._voiced_run >= self.onset_frames:
+                    self.speaking = True
+                    self._silent_run = 0
+                    self.utterance.clear()
+                    self.utterance.write(self.pre_roll.read())
+                    self.pre_roll.clear()
+                    result.speech_started = True
+                continue
+
+            self.utterance.write(frame)
+            self._silent_run = 0 if is_voiced else self._silent_run + 1
+            if self._silent_run >= self.hangover_frames:
+                self._close(result)
+            elif len(self.utterance) >= self.utterance.capacity:
+                self._close(result)
+
+        return result
+
+    def _close(self, result: FeedResult):
+        audio = self.utterance.read()
+        trim = (self._silent_run - self.trailing_frames) * self.frame_samples
+        if trim > 0:
+            audio = audio[: len(audio) - trim]
+        if len(audio) >= self.min_samples:
+            result.utterances.append(audio.tobytes())
+        self._reset_utterance()
+
+    def _reset_utterance(self):
+        self.utterance.clear()
+        self.speaking = False
+        self._voiced_run = 0
+        self._silent_run = 0
+
+    def peek(self) -> bytes:
+        """Audio of the utterance in progress (16kHz mono PCM)."""
+        return self.utterance.read().tobytes() if self.speaking else b""
+
+    def flush(self) -> Optional[bytes]:
+        """Close the utterance in progress regardless of length."""
+        if not self.speaking:
+            return None
+        audio = self.utterance.read().tobytes()
+        self._reset_utterance()
+        return audio or None
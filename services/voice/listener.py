@@ -1,12 +1,28 @@
-"""Enhanced voice listening with automatic speech detection and smart responses."""
+"""Enhanced voice listening with automatic speech detection and smart responses.
+
+Incoming audio runs through the streaming front-end in
+``services/voice/audio_frontend.py`` (resampling, VAD and per-user ring
+buffers) on the voice receive thread; each closed utterance is handed to
+the event loop and transcribed right away.
+
+A speech onset also cancels the guild's outstanding response tokens
+(barge-in) directly on the receive thread, so the bot's in-flight reply - provider stream, TTS
+synthesis and playback - stops within the frame that detected the speech.
+"""
 
 import logging
 import asyncio
+import functools
 from pathlib import Path
 from typing import Optional, Callable
+import threading
 import wave
 import time
 
+from core.cancellation import CancellationToken
+from services.voice.audio_frontend import STT_SAMPLE_RATE, convert_for_stt
+from services.voice.streaming_stt import PartialTranscript, StreamingTranscriber
+
 # Import handling for voice_recv - critical for graceful degradation
 # when discord-ext-voice-recv is not installed
 try:
@@ -36,7 +52,8 @@ if VOICE_AVAILABLE:
             super().__init__()
             self.listener = listener
             self.guild_id = guild_id
-            self.user_buffers = {}  # user_id -> list of audio frames
+            self.user_streams = {}  # user_id -> UserAudioStream
+            self.partial_marks = {}  # user_id -> samples buffered at last partial
             self.sample_rate = 48000  # Discord sends 48kHz audio
             self.channels = 2  # Stereo
             self.sample_width = 2  # 16-bit
@@ -48,6 +65,9 @@ if VOICE_AVAILABLE:
         def write(self, user, data):
             """Called when audio data is received from a user.
 
+            Runs on the voice receive thread; speech onsets and closed
+            utterances are forwarded to the listener thread-safely.
+
             Args:
                 user: Discord user or member
                 data: VoiceData containing the audio
@@ -62,45 +82,70 @@ if VOICE_AVAILABLE:
                 if not pcm_data:
                     return
 
-                # Initialize buffer for new users
-                if user_id not in self.user_buffers:
-                    self.user_buffers[user_id] = []
-
-                # Add to user's buffer
-                self.user_buffers[user_id].append(pcm_data)
+                worker = self.listener.voice_worker(self.guild_id)
+                if worker is not None:
+                    # Resampling and VAD run in the guild's worker process
+                    worker.feed(user_id, pcm_data)
+                    return
 
-                # Feed to enhanced listener for speech detection
-                self.listener.add_audio_chunk(self.guild_id, pcm_data)
+                stream = self.user_streams.get(user_id)
+                if stream is None:
+                    stream = self.listener.create_audio_stream()
+                    self.user_streams[user_id] = stream
+
+                result = stream.feed(pcm_data)
+                if result.speech_started:
+                    self.listener.notify_speech_started(self.guild_id)
+                for utterance in result.utterances:
+                    self.listener.submit_utterance(self.guild_id, user_id, utterance)
+                if result.speech_started or result.utterances:
+                    self.partial_marks[user_id] = 0
+
+                if self.listener.streaming_partials and stream.speaking:
+                    buffered = len(stream.utterance)
+                    mark = self.partial_marks.get(user_id, 0)
+                    if buffered - mark >= self.listener.partial_samples:
+                        self.partial_marks[user_id] = buffered
+                        self.listener.submit_partial(
+                            self.guild_id, user_id, stream.peek()
+                        )
 
             except Exception as e:
                 logger.error(f"Error in TranscriptionSink.write: {e}")
 
         def get_all_audio(self) -> bytes:
-            """Get combined audio from all users.
+            """Get in-progress utterance audio from all users.
 
             Returns:
-                Combined PCM audio data
+                Combined PCM audio data (16kHz mono)
             """
-            all_audio = []
-            for user_id, chunks in self.user_buffers.items():
-                all_audio.extend(chunks)
-            return b"".join(all_audio)
+            return b"".join(stream.peek() for stream in self.user_streams.values())
 
         def get_user_audio(self, user_id: int) -> bytes:
-            """Get audio from a specific user.
+            """Get the in-progress utterance from a specific user.
 
             Args:
                 user_id: Discord user ID
 
             Returns:
-                PCM audio data from that user
+                PCM audio data from that user (16kHz mono)
             """
-            chunks = self.user_buffers.get(user_id, [])
-            return b"".join(chunks)
+            stream = self.user_streams.get(user_id)
+            return stream.peek() if stream else b""
+
+        def flush_utterances(self) -> list:
+            """Close every in-progress utterance and return their audio."""
+            utterances = []
+            for stream in self.user_streams.values():
+                audio = stream.flush()
+                if audio:
+                    utterances.append(audio)
+            return utterances
 
         def clear_buffers(self):
             """Clear all audio buffers."""
-            self.user_buffers.clear()
+            self.user_streams.clear()
+            self.partial_marks.clear()
 
         def cleanup(self):
             """Cleanup resources."""
@@ -120,7 +165,7 @@ else:
             """
             self.listener = listener
             self.guild_id = guild_id
-            self.user_buffers = {}
+            self.user_streams = {}
 
         def wants_opus(self) -> bool:
             """Dummy method - always returns False."""
@@ -138,6 +183,10 @@ else:
             """Dummy method - returns empty bytes."""
             return b""
 
+        def flush_utterances(self) -> list:
+            """Dummy method - returns no utterances."""
+            return []
+
         def clear_buffers(self):
             """Dummy method - does nothing."""
             pass
@@ -150,25 +199,44 @@ else:
 class EnhancedVoiceListener:
     """Enhanced voice listener with VAD and smart response triggers."""
 
+    # Force-close an utterance after this much continuous 'speech' (or noise)
+    MAX_SPEECH_DURATION = 8.0
+
     def __init__(
         self,
         stt_service,
         silence_threshold: float = 2.0,  # Seconds of silence before transcribing
         energy_threshold: int = 500,  # Audio energy threshold for speech detection
         bot_trigger_words: list = None,  # Words that trigger bot response
+        streaming_partials: bool = False,  # Publish partial transcripts mid-utterance
+        partial_interval: float = 0.8,  # Seconds of new speech between partials
+        worker_processes: bool = False,  # Per-guild voice worker processes
+        worker_heartbeat_timeout: float = 5.0,
+        worker_max_restarts: int = 5,
     ):
         """Initialize enhanced voice listener.
 
         Args:
             stt_service: STT service instance (WhisperSTTService or ParakeetSTTService)
-            silence_threshold: Seconds of silence before auto-transcribing
-            energy_threshold: Energy level to detect speech vs silence
+            silence_threshold: Seconds of silence that end an utterance (VAD hangover)
+            energy_threshold: Frame RMS level to detect speech vs silence
             bot_trigger_words: Keywords that trigger bot response
+            streaming_partials: Transcribe utterances in progress and publish
+                partial transcripts
+            partial_interval: Seconds of new speech between partial transcriptions
+            worker_processes: Run resampling, VAD and playback encoding for
+                each guild in its own worker process
+            worker_heartbeat_timeout: Seconds without a worker heartbeat
+                before it is restarted
+            worker_max_restarts: Restarts per guild before falling back to
+                in-process processing
         """
         self.stt = stt_service
         self.whisper = stt_service  # Backwards compatibility
         self.silence_threshold = silence_threshold
         self.energy_threshold = energy_threshold
+        self.streaming_partials = streaming_partials
+        self.partial_samples = int(partial_interval * STT_SAMPLE_RATE)
 
         # Default trigger words (bot, assistant, hey, question)
         self.bot_trigger_words = bot_trigger_words or [
@@ -200,9 +268,45 @@ class EnhancedVoiceListener:
         # Active listening sessions per guild
         # Format: {guild_id: session_data}
         self.active_sessions = {}
+        # Guards each session's response token set across the receive thread
+        self._token_lock = threading.Lock()
+
+        self.workers = None
+        if worker_processes:
+            from services.voice.voice_worker import VoiceWorkerPool
+
+            if VoiceWorkerPool.supported():
+                self.workers = VoiceWorkerPool(
+                    self._stream_options(),
+                    self.partial_samples if streaming_partials else 0,
+                    on_speech=self.notify_speech_started,
+                    on_utterance=self.submit_utterance,
+                    on_partial=self.submit_partial,
+                    heartbeat_timeout=worker_heartbeat_timeout,
+                    max_restarts=worker_max_restarts,
+                )
+            else:
+                logger.warning("Voice worker processes need POSIX; running in-process")
 
         logger.info("Enhanced voice listener initialized")
 
+    def _stream_options(self) -> dict:
+        return {
+            "energy_threshold": self.energy_threshold,
+            "hangover": self.silence_threshold,
+            "max_utterance": self.MAX_SPEECH_DURATION,
+        }
+
+    def create_audio_stream(self):
+        """Create the per-user audio front-end (resampler, VAD, ring buffer)."""
+        from services.voice.audio_frontend import UserAudioStream
+
+        return UserAudioStream(**self._stream_options())
+
+    def voice_worker(self, guild_id: int):
+        """The guild's voice worker, or None when processing in-process."""
+        return self.workers.get(guild_id) if self.workers is not None else None
+
     async def start_smart_listen(
         self,
         guild_id: int,
@@ -211,6 +315,7 @@ class EnhancedVoiceListener:
         temp_dir: Path,
         on_transcription: Callable = None,
         on_bot_response_needed: Callable = None,
+        on_partial_transcription: Callable = None,
     ) -> bool:
         """Start smart listening with automatic speech detection.
 
@@ -220,7 +325,10 @@ class EnhancedVoiceListener:
             voice_client: Discord voice client
             temp_dir: Temporary directory for audio files
             on_transcription: Callback when transcription completes
-            on_bot_response_needed: Callback when bot should respond
+            on_bot_response_needed: Callback when bot should respond, called
+                with the transcription and the speaker's user ID
+            on_partial_transcription: Callback with each PartialTranscript
+                while a user is still speaking (streaming mode only)
 
         Returns:
             True if started successfully
@@ -250,23 +358,31 @@ class EnhancedVoiceListener:
                 "start_time": time.time(),
                 "voice_client": voice_client,
                 "sink": sink,
-                "audio_chunks": [],
+                "loop": asyncio.get_running_loop(),
+                "utterances": asyncio.Queue(),
                 "last_speech_time": None,
                 "is_recording_speech": False,
                 "on_transcription": on_transcription,
                 "on_bot_response_needed": on_bot_response_needed,
+                "on_partial_transcription": on_partial_transcription,
+                "transcribers": {},
+                "response_tokens": set(),
                 "first_speech_time": None,
             }
 
             self.active_sessions[guild_id] = session
 
+            # Transcribe utterances as the sink closes them
+            session["worker"] = asyncio.create_task(
+                self._transcription_worker(guild_id)
+            )
+            if self.workers is not None:
+                await self.workers.start(guild_id)
+
             # Start listening with the sink
             voice_client.listen(sink)
             logger.info(f"Voice receive sink attached for guild {guild_id}")
 
-            # Start monitoring loop
-            asyncio.create_task(self._monitor_audio(guild_id))
-
             logger.info(f"Started smart listening in guild {guild_id}")
             return True
 
@@ -274,90 +390,154 @@ class EnhancedVoiceListener:
             logger.error(f"Failed to start smart listening: {e}")
             return False
 
-    async def _monitor_audio(self, guild_id: int):
-        """Monitor audio stream and auto-detect speech segments.
+    def notify_speech_started(self, guild_id: int):
+        """Report a speech onset from the voice receive thread.
+
+        Cancels the bot's pending response work right here rather than after
+        a hop to the event loop.
 
         Args:
             guild_id: Discord guild ID
         """
         session = self.active_sessions.get(guild_id)
-        if not session:
-            return
-
-        logger.info(f"Monitoring audio for guild {guild_id}")
+        if session:
+            if self._cancel_responses(session, "barge_in"):
+                logger.info(f"Barge-in: cancelled pending response in guild {guild_id}")
+            self._call_in_loop(session, self.update_speech_detected, guild_id)
 
-        try:
-            while guild_id in self.active_sessions:
-                current_time = time.time()
+    def response_token(self, guild_id: int) -> Optional[CancellationToken]:
+        """Fresh token for one bot reply in a guild.
 
-                # Check if we should auto-stop (silence detected)
-                if session["last_speech_time"]:
-                    silence_duration = current_time - session["last_speech_time"]
+        Each reply gets its own token. The session holds it until the reply
+        calls ``release_response_token`` (after playback finishes), so the
+        next speech onset cancels every reply still in progress.
 
-                    if silence_duration >= self.silence_threshold:
-                        # Silence threshold reached - transcribe!
-                        logger.info(
-                            f"Silence detected ({silence_duration:.1f}s), auto-transcribing..."
-                        )
-                        await self._auto_transcribe(guild_id)
-
-                        # Reset for next segment
-                        session["last_speech_time"] = None
-                        session["is_recording_speech"] = False
-                        session["first_speech_time"] = None
-
-                # Check max speech duration (force transcribe if talking too long or constant noise)
-                if session.get("is_recording_speech") and session.get(
-                    "first_speech_time"
-                ):
-                    MAX_SPEECH_DURATION = (
-                        8.0  # Force transcribe after 8 seconds of continuous 'speech'
-                    )
-                    if (
-                        current_time - session["first_speech_time"]
-                        > MAX_SPEECH_DURATION
-                    ):
-                        logger.info(
-                            f"Max speech duration ({MAX_SPEECH_DURATION}s) reached, forcing transcription..."
-                        )
-                        await self._auto_transcribe(guild_id)
+        Args:
+            guild_id: Discord guild ID
 
-                        # Reset for next segment
-                        session["last_speech_time"] = None
-                        session["is_recording_speech"] = False
-                        session["first_speech_time"] = None
+        Returns:
+            CancellationToken, or None if not listening in the guild
+        """
+        session = self.active_sessions.get(guild_id)
+        if not session:
+            return None
+        token = CancellationToken()
+        with self._token_lock:
+            session["response_tokens"].add(token)
+        return token
 
-                await asyncio.sleep(0.1)  # Check every 100ms for snappier response
+    def release_response_token(self, guild_id: int, token: CancellationToken):
+        """Forget a finished reply's token, and the callbacks it holds."""
+        session = self.active_sessions.get(guild_id)
+        if session:
+            with self._token_lock:
+                session["response_tokens"].discard(token)
 
-        except Exception as e:
-            logger.error(f"Error monitoring audio: {e}")
-        finally:
-            logger.info(f"Stopped monitoring audio for guild {guild_id}")
+    def _cancel_responses(self, session: dict, reason: str) -> int:
+        """Cancel a session's outstanding response tokens; returns how many."""
+        with self._token_lock:
+            tokens = list(session["response_tokens"])
+            session["response_tokens"].clear()
+        return sum(1 for token in tokens if token.cancel(reason))
 
-    def detect_speech_in_audio(self, audio_data: bytes) -> bool:
-        """Simple energy-based speech detection.
+    def submit_utterance(self, guild_id: int, user_id: int, pcm_data: bytes):
+        """Queue a closed utterance for transcription (thread-safe).
 
         Args:
-            audio_data: Raw audio bytes
+            guild_id: Discord guild ID
+            user_id: Speaker's Discord user ID
+            pcm_data: Utterance audio (16kHz, mono, 16-bit)
+        """
+        session = self.active_sessions.get(guild_id)
+        if session:
+            self._call_in_loop(
+                session, self._queue_utterance, guild_id, user_id, pcm_data
+            )
 
-        Returns:
-            True if speech detected
+    def submit_partial(self, guild_id: int, user_id: int, pcm_data: bytes):
+        """Offer the utterance in progress for partial transcription (thread-safe).
+
+        Args:
+            guild_id: Discord guild ID
+            user_id: Speaker's Discord user ID
+            pcm_data: Utterance audio so far (16kHz, mono, 16-bit)
         """
+        session = self.active_sessions.get(guild_id)
+        if session and session.get("on_partial_transcription"):
+            self._call_in_loop(
+                session, self._offer_partial, guild_id, user_id, pcm_data
+            )
+
+    def _queue_utterance(self, guild_id: int, user_id: int, pcm_data: bytes):
+        session = self.active_sessions.get(guild_id)
+        if not session:
+            return
+        transcriber = session.get("transcribers", {}).get(user_id)
+        if transcriber:
+            # The final transcript supersedes any partial still in flight
+            transcriber.reset()
+        session["utterances"].put_nowait((user_id, pcm_data))
+
+    def _offer_partial(self, guild_id: int, user_id: int, pcm_data: bytes):
+        session = self.active_sessions.get(guild_id)
+        if not session:
+            return
+        transcribers = session["transcribers"]
+        transcriber = transcribers.get(user_id)
+        if transcriber is None:
+            transcriber = StreamingTranscriber(
+                self.stt,
+                user_id,
+                on_partial=functools.partial(self._publish_partial, guild_id),
+            )
+            transcribers[user_id] = transcriber
+        transcriber.offer(pcm_data)
+
+    async def _publish_partial(self, guild_id: int, partial: PartialTranscript):
+        session = self.active_sessions.get(guild_id)
+        callback = session.get("on_partial_transcription") if session else None
+        if callback:
+            await callback(partial)
+
+    @staticmethod
+    def _call_in_loop(session: dict, callback: Callable, *args):
+        loop = session["loop"]
         try:
-            import numpy as np
+            loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            # Event loop already closed during shutdown
+            pass
 
-            # Convert to numpy array
-            audio_array = np.frombuffer(audio_data, dtype=np.int16)
+    async def _transcription_worker(self, guild_id: int):
+        """Transcribe utterances in the order they were closed.
 
-            # Calculate energy (RMS - Root Mean Square)
-            energy = np.sqrt(np.mean(audio_array.astype(float) ** 2))
+        Args:
+            guild_id: Discord guild ID
+        """
+        session = self.active_sessions.get(guild_id)
+        if not session:
+            return
 
-            # Check if energy exceeds threshold
-            return energy > self.energy_threshold
+        logger.info(f"Transcribing utterances for guild {guild_id}")
+        queue = session["utterances"]
 
+        try:
+            while guild_id in self.active_sessions:
+                user_id, pcm_data = await queue.get()
+                logger.info(
+                    f"Utterance closed for user {user_id} "
+                    f"({len(pcm_data) / (STT_SAMPLE_RATE * 2):.1f}s), transcribing..."
+                )
+                await self._transcribe_utterance(guild_id, pcm_data, user_id)
+                session["last_speech_time"] = None
+                session["is_recording_speech"] = False
+                session["first_speech_time"] = None
+        except asyncio.CancelledError:
+            pass
         except Exception as e:
-            logger.error(f"Error detecting speech: {e}")
-            return False
+            logger.error(f"Error in transcription worker: {e}")
+        finally:
+            logger.info(f"Stopped transcribing for guild {guild_id}")
 
     def _convert_audio_for_whisper(self, pcm_data: bytes) -> bytes:
         """Convert 48kHz stereo PCM to 16kHz mono for Whisper.
@@ -366,23 +546,9 @@ class EnhancedVoiceListener:
             pcm_data: Raw PCM audio (48kHz, stereo, 16-bit)
 
         Returns:
-            Converted PCM audio (16kHz, mono, 16-bit)
+            Converted PCM audio (16kHz, mono, 16-bit), low-pass filtered
         """
-        import numpy as np
-
-        # Convert bytes to numpy array (16-bit signed integers)
-        audio = np.frombuffer(pcm_data, dtype=np.int16)
-
-        # Convert stereo to mono (average left and right channels)
-        if len(audio) % 2 == 0:
-            audio = audio.reshape(-1, 2)
-            audio = audio.mean(axis=1).astype(np.int16)
-
-        # Resample from 48kHz to 16kHz (divide by 3)
-        # Simple decimation - take every 3rd sample
-        audio = audio[::3]
-
-        return audio.tobytes()
+        return convert_for_stt(pcm_data)
 
     def _write_wav_file(self, audio_file: Path, pcm_data: bytes):
         """Write PCM data to a WAV file.
@@ -394,14 +560,18 @@ class EnhancedVoiceListener:
         with wave.open(str(audio_file), "wb") as wav:
             wav.setnchannels(1)  # Mono
             wav.setsampwidth(2)  # 16-bit
-            wav.setframerate(16000)  # 16kHz for Whisper
+            wav.setframerate(STT_SAMPLE_RATE)  # 16kHz for Whisper
             wav.writeframes(pcm_data)
 
-    async def _auto_transcribe(self, guild_id: int):
-        """Auto-transcribe recorded audio and process response.
+    async def _transcribe_utterance(
+        self, guild_id: int, pcm_data: bytes, user_id: Optional[int] = None
+    ):
+        """Transcribe one utterance and process response.
 
         Args:
             guild_id: Discord guild ID
+            pcm_data: Utterance audio (16kHz, mono, 16-bit)
+            user_id: Speaker's Discord user ID
         """
         session = self.active_sessions.get(guild_id)
         if not session:
@@ -409,33 +579,13 @@ class EnhancedVoiceListener:
 
         try:
             audio_file = session["audio_file"]
-            sink = session.get("sink")
 
-            # Get audio from sink
-            if sink:
-                raw_audio = sink.get_all_audio()
-                # Minimum audio threshold: ~0.5s of audio (48kHz * 2ch * 2bytes * 0.5s = 96000 bytes)
-                if not raw_audio or len(raw_audio) < 96000:
-                    logger.debug("Audio too short to transcribe (< 0.5s)")
-                    logger.warning("No audio recorded to transcribe")
-                    sink.clear_buffers()
-                    return
-
-                # Convert and write to WAV file (offload to thread)
-                loop = asyncio.get_running_loop()
-                bytes_written = await loop.run_in_executor(
-                    None, self._process_audio_sync, raw_audio, audio_file
-                )
-
-                # Clear buffers for next segment
-                sink.clear_buffers()
-
-                logger.info(f"Wrote {bytes_written} bytes to {audio_file}")
-            else:
-                # Fallback: check if file exists (legacy path)
-                if not audio_file.exists() or audio_file.stat().st_size == 0:
-                    logger.warning("No audio recorded to transcribe")
-                    return
+            # Write WAV file (offload to thread)
+            loop = asyncio.get_running_loop()
+            bytes_written = await loop.run_in_executor(
+                None, self._process_audio_sync, pcm_data, audio_file
+            )
+            logger.info(f"Wrote {bytes_written} bytes to {audio_file}")
 
             # Transcribe
             result = await self.whisper.transcribe_file(audio_file)
@@ -488,24 +638,23 @@ class EnhancedVoiceListener:
 
             if should_respond and session["on_bot_response_needed"]:
                 logger.info("Bot response triggered")
-                await session["on_bot_response_needed"](transcription)
+                await session["on_bot_response_needed"](transcription, user_id)
 
         except Exception as e:
             logger.error(f"Error in auto-transcribe: {e}")
 
-    def _process_audio_sync(self, raw_audio: bytes, audio_file: Path) -> int:
-        """Process audio and write to file synchronously (run in executor).
+    def _process_audio_sync(self, pcm_data: bytes, audio_file: Path) -> int:
+        """Write utterance audio to file synchronously (run in executor).
 
         Args:
-            raw_audio: Raw PCM audio
+            pcm_data: PCM audio (16kHz, mono, 16-bit)
             audio_file: Output file path
 
         Returns:
             Number of bytes written
         """
-        converted_audio = self._convert_audio_for_whisper(raw_audio)
-        self._write_wav_file(audio_file, converted_audio)
-        return len(converted_audio)
+        self._write_wav_file(audio_file, pcm_data)
+        return len(pcm_data)
 
     def should_bot_respond(self, transcription: str) -> bool:
         """Determine if bot should respond based on transcription.
@@ -631,17 +780,31 @@ class EnhancedVoiceListener:
                 except Exception as e:
                     logger.warning(f"Error stopping voice client listening: {e}")
 
+            self._cancel_responses(session, "listen_stopped")
+            worker = session.get("worker")
+            if worker:
+                worker.cancel()
+            for transcriber in session.get("transcribers", {}).values():
+                transcriber.reset()
+
             # Get any remaining audio from sink
             sink = session.get("sink")
             audio_file = session["audio_file"]
             result = None
 
             if sink:
-                raw_audio = sink.get_all_audio()
-                if raw_audio and len(raw_audio) >= 1000:
-                    # Convert and write final audio
-                    converted_audio = self._convert_audio_for_whisper(raw_audio)
-                    self._write_wav_file(audio_file, converted_audio)
+                # Utterances not yet transcribed, then whatever was mid-speech
+                remaining = []
+                while not session["utterances"].empty():
+                    remaining.append(session["utterances"].get_nowait()[1])
+                voice_worker = self.voice_worker(guild_id)
+                if voice_worker is not None:
+                    remaining.extend(await voice_worker.flush())
+                remaining.extend(sink.flush_utterances())
+                final_audio = b"".join(remaining)
+                if final_audio and len(final_audio) >= 1000:
+                    # Write final audio (already 16kHz mono)
+                    self._write_wav_file(audio_file, final_audio)
 
                     # Transcribe
                     result = await self.whisper.transcribe_file(audio_file)
@@ -655,6 +818,8 @@ class EnhancedVoiceListener:
 
             # Remove from active sessions
             del self.active_sessions[guild_id]
+            if self.workers is not None:
+                await self.workers.stop(guild_id)
 
             # Cleanup audio file
             try:
@@ -670,6 +835,8 @@ class EnhancedVoiceListener:
             # Ensure session is removed even on error
             if guild_id in self.active_sessions:
                 del self.active_sessions[guild_id]
+            if self.workers is not None:
+                await self.workers.stop(guild_id)
             return None
 
     def is_listening(self, guild_id: int) -> bool:
@@ -716,57 +883,6 @@ class EnhancedVoiceListener:
                         "User speaking but music continues (waiting for command)"
                     )
 
-    def add_audio_chunk(self, guild_id: int, audio_chunk: bytes):
-        """Add audio chunk to recording buffer.
-
-        Args:
-            guild_id: Discord guild ID
-            audio_chunk: Audio data
-        """
-        session = self.active_sessions.get(guild_id)
-        if not session:
-            return
-
-        # Check if music is playing - if so, keep buffers lean
-        voice_client = session.get("voice_client")
-        if voice_client and voice_client.is_playing():
-            # Check if it's music (not TTS)
-            source = voice_client.source if hasattr(voice_client, "source") else None
-            is_tts = getattr(source, "_is_tts", False) if source else False
-            is_sound_effect = (
-                getattr(source, "_is_sound_effect", False) if source else False
-            )
-
-            # If music is playing (not TTS/sound effects), keep only recent chunks
-            if not is_tts and not is_sound_effect:
-                # Keep buffer small during music (only last 5 seconds for commands)
-                # This prevents backlog but still allows "Arby, stop" commands
-                max_music_chunks = 250  # ~5 seconds at 20ms chunks
-                if len(session["audio_chunks"]) > max_music_chunks:
-                    logger.debug(
-                        "Music playing - trimming audio buffer to recent audio only"
-                    )
-                    session["audio_chunks"] = session["audio_chunks"][
-                        -max_music_chunks:
-                    ]
-                # Continue processing - don't return! We need to hear "stop" commands
-
-        # Limit buffer size to prevent memory issues (max ~30 seconds of audio)
-        # 48kHz * 2 channels * 2 bytes * 30 seconds = ~5.7MB
-        max_chunks = 1500  # ~30 seconds at 20ms chunks
-        if len(session["audio_chunks"]) > max_chunks:
-            # Buffer too large - drop old chunks
-            logger.warning(
-                f"Audio buffer overflow ({len(session['audio_chunks'])} chunks) - clearing old data"
-            )
-            session["audio_chunks"] = session["audio_chunks"][-max_chunks:]
-
-        session["audio_chunks"].append(audio_chunk)
-
-        # Detect if this chunk contains speech
-        if self.detect_speech_in_audio(audio_chunk):
-            self.update_speech_detected(guild_id)
-
     def get_session_duration(self, guild_id: int) -> float:
         """Get how long the current session has been active.
 
@@ -0,0 +1,454 @@
+"""Voice output: off-loop Opus pre-encoding and per-guild playback queues.
+
+``discord.FFmpegPCMAudio`` decodes on an FFmpeg pipe and leaves Opus
+encoding to the voice player thread, 20ms at a time; when the event loop
+or CPU is busy, that inline work shows up as stutter. ``prepare_audio``
+instead decodes the synthesized WAV (resampling to 48kHz stereo with the
+polyphase resampler) and encodes Opus frames in a worker thread as soon as
+synthesis finishes. Playback starts once a small buffer is ready and the
+player thread only pops finished frames.
+
+If libopus is not loaded, frames are kept as PCM and discord.py encodes
+them as before; non-WAV audio falls back to FFmpeg.
+
+``GuildPlaybackQueue`` serializes TTS playback per guild, lets priority
+items interrupt the current one, and reports buffer underruns (frames the
+player asked for before the encoder produced them).
+"""
+
+import asyncio
+import logging
+import threading
+import wave
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Union
+
+import discord
+import numpy as np
+
+from services.voice.audio_frontend import PolyphaseResampler, pcm_to_mono, to_int16
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 48000
+CHANNELS = 2
+SAMPLES_PER_FRAME = SAMPLE_RATE // 50  # 20ms
+PCM_FRAME_BYTES = SAMPLES_PER_FRAME * CHANNELS * 2
+PCM_SILENCE = b"\x00" * PCM_FRAME_BYTES
+OPUS_SILENCE = b"\xf8\xff\xfe"
+
+FFMPEG_OPTIONS = "-vn -af aresample=48000,aformat=sample_fmts=s16:channel_layouts=stereo"
+
+
+def _opus_encoder_factory():
+    """Create an Opus encoder, or None when libopus is unavailable."""
+    try:
+        if not discord.opus.is_loaded():
+            discord.opus._load_default()
+        if discord.opus.is_loaded():
+            return discord.opus.Encoder()
+    except Exception as e:
+        logger.debug(f"Opus encoder unavailable: {e}")
+    return None
+
+
+def decode_wav(audio: Union[Path, str, bytes]) -> bytes:
+    """Decode a 16-bit WAV to 48kHz stereo PCM.
+
+    Raises:
+        ValueError: If the audio is not a 16-bit PCM WAV
+    """
+    import io
+
+    handle = io.BytesIO(audio) if isinstance(audio, bytes) else str(audio)
+    try:
+        with wave.open(handle, "rb") as wav:
+            channels = wav.getnchannels()
+            rate = wav.getframerate()
+            width = wav.getsampwidth()
+            pcm = wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError) as e:
+        raise ValueError(f"Not a PCM WAV file: {e}") from e
+    if width != 2:
+        raise ValueError(f"Unsupported sample width: {width * 8} bit")
+
+    if rate == SAMPLE_RATE and channels == CHANNELS:
+        return pcm
+    if channels > CHANNELS:
+        raise ValueError(f"Unsupported channel count: {channels}")
+
+    if rate == SAMPLE_RATE:
+        mono = np.frombuffer(pcm, dtype=np.int16)
+    else:
+        if channels == 2:
+            # Resample each channel, then re-interleave
+            stereo = np.frombuffer(pcm, dtype=np.int16).reshape(-1, 2)
+            left = PolyphaseResampler(rate, SAMPLE_RATE).process(stereo[:, 0])
+            right = PolyphaseResampler(rate, SAMPLE_RATE).process(stereo[:, 1])
+            return np.column_stack((to_int16(left), to_int16(right))).tobytes()
+        mono = to_int16(
+            PolyphaseResampler(rate, SAMPLE_RATE).process(pcm_to_mono(pcm, 1))
+        )
+    return np.repeat(mono, 2).tobytes()
+
+
+class FrameSource(discord.AudioSource):
+    """Audio source over frames produced by a worker thread.
+
+    ``read()`` runs on discord.py's player thread and only pops ready
+    frames; if the producer has fallen behind it plays silence and counts
+    an underrun instead of blocking.
+    """
+
+    def __init__(self, opus: bool):
+        self.opus = opus
+        self._frames: Deque[bytes] = deque()
+        self._finished = threading.Event()
+        self._cancelled = False
+        self.frames_total = 0
+        self.frames_played = 0
+        self.underruns = 0
+        # Mark as TTS for smart barge-in
+        self._is_tts = True
+
+    @property
+    def buffered(self) -> int:
+        return len(self._frames)
+
+    @property
+    def finished(self) -> bool:
+        return self._finished.is_set()
+
+    @property
+    def duration(self) -> float:
+        return self.frames_total * SAMPLES_PER_FRAME / SAMPLE_RATE
+
+    def feed(self, frame: bytes):
+        if not self._cancelled:
+            self._frames.append(frame)
+            self.frames_total += 1
+
+    def finish(self):
+        self._finished.set()
+
+    def is_opus(self) -> bool:
+        return self.opus
+
+    def read(self) -> bytes:
+        try:
+            frame = self._frames.popleft()
+        except IndexError:
+            if self._finished.is_set():
+                return b""
+            self.underruns += 1
+            return OPUS_SILENCE if self.opus else PCM_SILENCE
+        self.frames_played += 1
+        return frame
+
+    def cleanup(self):
+        self._cancelled = True
+        self._frames.clear()
+        self._finished.set()
+
+
+def iter_frames(pcm: bytes, encoder: Any = None) -> Iterator[bytes]:
+    """Split PCM into 20ms frames, Opus-encoded if an encoder is given."""
+    view = memoryview(pcm)
+    for start in range(0, len(pcm), PCM_FRAME_BYTES):
+        frame = bytes(view[start : start + PCM_FRAME_BYTES])
+        if len(frame) < PCM_FRAME_BYTES:
+            frame += b"\x00" * (PCM_FRAME_BYTES - len(frame))
+        if encoder is not None:
+            frame = encoder.encode(frame, SAMPLES_PER_FRAME)
+        yield frame
+
+
+def encode_into(source: FrameSource, pcm: bytes, encoder: Any = None):
+    """Encode ``pcm`` and feed the frames to ``source``. Runs in a worker thread."""
+    try:
+        for frame in iter_frames(pcm, encoder):
+            if source._cancelled:
+                break
+            source.feed(frame)
+    finally:
+        source.finish()
+
+
+async def prepare_audio(
+    audio: Union[Path, str, bytes],
+    min_buffer_frames: int = 10,
+    ffmpeg_fallback: bool = True,
+    encoder_factory: Callable[[], Any] = _opus_encoder_factory,
+) -> discord.AudioSource:
+    """Decode and start encoding ``audio`` off the event loop.
+
+    Returns once ``min_buffer_frames`` frames (200ms by default) are ready
+    or encoding finished, so playback can start without waiting for the
+    whole file while the rest keeps encoding in the background.
+
+    Args:
+        audio: WAV file path or WAV bytes
+        min_buffer_frames: Frames to buffer before returning
+        ffmpeg_fallback: Play non-WAV files through FFmpeg instead of raising
+        encoder_factory: Creates an Opus encoder (None = keep PCM frames)
+    """
+    try:
+        pcm = await asyncio.to_thread(decode_wav, audio)
+    except (ValueError, OSError) as e:
+        if isinstance(audio, bytes) or not ffmpeg_fallback:
+            raise
+        logger.debug(f"Falling back to FFmpeg for {audio}: {e}")
+        source = discord.FFmpegPCMAudio(str(audio), options=FFMPEG_OPTIONS)
+        source._is_tts = True
+        return source
+
+    encoder = encoder_factory()
+    source = FrameSource(opus=encoder is not None)
+    loop = asyncio.get_running_loop()
+    encoding = loop.run_in_executor(None, encode_into, source, pcm, encoder)
+
+    while source.buffered < min_buffer_frames and not source.finished:
+        if encoding.done():
+            break
+        await asyncio.sleep(0.005)
+    if encoding.done() and encoding.exception():
+        raise encoding.exception()
+    return source
+
+
+class PlaybackItem:
+    """One queued source and a future resolved when it stops playing."""
+
+    __slots__ = ("source", "priority", "on_done", "done", "interrupted")
+
+    def __init__(
+        self,
+        source: discord.AudioSource,
+        priority: bool,
+        on_done: Optional[Callable[[Optional[Exception]], Any]],
+    ):
+        self.source = source
+        self.priority = priority
+        self.on_done = on_done
+        self.done: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.interrupted = False
+
+
+class GuildPlaybackQueue:
+    """Sequential TTS playback for one guild with priority interrupts."""
+
+    def __init__(self, guild_id: int, voice_client):
+        self.guild_id = guild_id
+        self.voice_client = voice_client
+        self._items: Deque[PlaybackItem] = deque()
+        self._current: Optional[PlaybackItem] = None
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        self.played = 0
+        self.interrupted = 0
+        self.underruns = 0
+        self.max_depth = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self._items)
+
+    def owns_current_playback(self) -> bool:
+        return self._current is not None
+
+    def enqueue(
+        self,
+        source: discord.AudioSource,
+        priority: bool = False,
+        on_done: Optional[Callable[[Optional[Exception]], Any]] = None,
+    ) -> PlaybackItem:
+        """Queue a source; priority items jump the queue and cut off the current one."""
+        item = PlaybackItem(source, priority, on_done)
+        if priority:
+            # Keep FIFO order among priority items
+            index = 0
+            while index < len(self._items) and self._items[index].priority:
+                index += 1
+            self._items.insert(index, item)
+            self._interrupt_current()
+        else:
+            self._items.append(item)
+        self.max_depth = max(self.max_depth, len(self._items))
+        self._wakeup.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return item
+
+    def _interrupt_current(self):
+        current = self._current
+        if current is not None and not current.priority:
+            current.interrupted = True
+            self.interrupted += 1
+            try:
+                self.voice_client.stop()
+            except Exception as e:
+                logger.debug(f"Failed to stop playback: {e}")
+
+    def clear(self) -> int:
+        """Drop queued items and stop the current one (barge-in).
+
+        Returns:
+            Number of items dropped or interrupted
+        """
+        dropped = 0
+        while self._items:
+            item = self._items.popleft()
+            item.source.cleanup()
+            self._finish(item, None)
+            dropped += 1
+        if self._current is not None and not self._current.interrupted:
+            self._current.interrupted = True
+            self.interrupted += 1
+            dropped += 1
+            try:
+                self.voice_client.stop()
+            except Exception as e:
+                logger.debug(f"Failed to stop playback: {e}")
+        return dropped
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self._items:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=30.0)
+                except asyncio.TimeoutError:
+                    if not self._items:
+                        return
+                continue
+
+            item = self._items.popleft()
+            voice_client = self.voice_client
+            if not voice_client.is_connected():
+                item.source.cleanup()
+                self._finish(item, None)
+                continue
+
+            if voice_client.is_playing():
+                if item.priority:
+                    voice_client.stop()
+                # Another source (music, a reply outside the queue) is finishing
+                while voice_client.is_playing():
+                    await asyncio.sleep(0.02)
+
+            finished = asyncio.Event()
+            error_box: Dict[str, Optional[Exception]] = {"error": None}
+
+            def after(error, finished=finished, error_box=error_box):
+                error_box["error"] = error
+                loop.call_soon_threadsafe(finished.set)
+
+            self._current = item
+            try:
+                voice_client.play(item.source, after=after)
+            except Exception as e:
+                logger.error(f"Playback failed in guild {self.guild_id}: {e}")
+                self._current = None
+                item.source.cleanup()
+                self._finish(item, e)
+                continue
+
+            await finished.wait()
+            self._current = None
+            underruns = getattr(item.source, "underruns", 0)
+            if underruns:
+                self.underruns += underruns
+                logger.warning(
+                    f"Voice playback underran {underruns} frame(s) in guild {self.guild_id}"
+                )
+            if not item.interrupted:
+                self.played += 1
+            self._finish(item, error_box["error"])
+
+    def _finish(self, item: PlaybackItem, error: Optional[Exception]):
+        if not item.done.done():
+            item.done.set_result(not item.interrupted)
+        if item.on_done is not None:
+            try:
+                result = item.on_done(error)
+                if asyncio.iscoroutine(result):
+                    asyncio.ensure_future(result)
+            except Exception as e:
+                logger.error(f"Playback completion callback failed: {e}")
+
+    async def close(self):
+        self.clear()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "depth": len(self._items),
+            "max_depth": self.max_depth,
+            "playing": self._current is not None,
+            "played": self.played,
+            "interrupted": self.interrupted,
+            "underruns": self.underruns,
+        }
+
+
+class PlaybackManager:
+    """Per-guild playback queues for bot speech."""
+
+    def __init__(self, worker_pool=None):
+        """Initialize the manager.
+
+        Args:
+            worker_pool: Optional ``VoiceWorkerPool``; guilds with a running
+                worker have their audio encoded in that process
+        """
+        self.queues: Dict[int, GuildPlaybackQueue] = {}
+        self.worker_pool = worker_pool
+
+    def queue(self, guild_id: int, voice_client) -> GuildPlaybackQueue:
+        queue = self.queues.get(guild_id)
+        if queue is None:
+            queue = GuildPlaybackQueue(guild_id, voice_client)
+            self.queues[guild_id] = queue
+        else:
+            # Voice client changes after a reconnect
+            queue.voice_client = voice_client
+        return queue
+
+    async def play(
+        self,
+        guild_id: int,
+        voice_client,
+        audio: Union[Path, str, bytes],
+        priority: bool = False,
+        on_done: Optional[Callable[[Optional[Exception]], Any]] = None,
+    ) -> PlaybackItem:
+        """Pre-encode ``audio`` and queue it for playback in ``guild_id``."""
+        worker = self.worker_pool.get(guild_id) if self.worker_pool else None
+        if worker is not None:
+            source = await worker.prepare_audio(audio)
+        else:
+            source = await prepare_audio(audio)
+        return self.queue(guild_id, voice_client).enqueue(
+            source, priority=priority, on_done=on_done
+        )
+
+    def clear(self, guild_id: int) -> int:
+        queue = self.queues.get(guild_id)
+        return queue.clear() if queue is not None else 0
+
+    async def close(self, guild_id: int):
+        queue = self.queues.pop(guild_id, None)
+        if queue is not None:
+            await queue.close()
+
+    def get_stats(self) -> Dict[int, Dict[str, Any]]:
+        return {guild_id: q.get_stats() for guild_id, q in self.queues.items()}
@@ -0,0 +1,216 @@
+"""Streaming partial transcription for voice turns.
+
+While a user is still speaking, the listener periodically hands the
+utterance-so-far to a ``StreamingTranscriber``. It transcribes overlapping
+windows (each new window re-covers the tail of the previous one) and
+publishes ``PartialTranscript`` events. Words that two consecutive
+hypotheses agree on are treated as stable (local agreement), so consumers
+can start work such as context assembly before end-of-utterance without
+reacting to words the recognizer is still revising.
+"""
+
+import asyncio
+import logging
+import tempfile
+import time
+import wave
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional
+
+from services.voice.audio_frontend import STT_SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PartialTranscript:
+    """One partial hypothesis for the utterance in progress."""
+
+    user_id: int
+    text: str
+    stable_text: str
+    audio_seconds: float
+    latency: float
+    revision: int
+
+
+def _same_word(left: str, right: str) -> bool:
+    return left.lower().strip(".,!?;:") == right.lower().strip(".,!?;:")
+
+
+def common_word_prefix(a: List[str], b: List[str]) -> List[str]:
+    """Longest shared word prefix, ignoring case and trailing punctuation."""
+    prefix = []
+    for left, right in zip(a, b):
+        if not _same_word(left, right):
+            break
+        prefix.append(right)
+    return prefix
+
+
+def splice_window_words(
+    previous: List[str], window: List[str], max_skip: int = 2
+) -> Optional[List[str]]:
+    """Splice a window hypothesis onto the previous full hypothesis.
+
+    A window that no longer starts at the utterance start re-covers some
+    tail of ``previous``. The window is placed where its leading words
+    longest match a run of ``previous`` (up to ``max_skip`` leading window
+    words may be dropped, since the cut can split a word), and the window
+    replaces everything from there on.
+
+    Returns:
+        The spliced word list, or None when the window shares no words
+        with ``previous``
+    """
+    best_len, best_start, best_skip = 0, 0, 0
+    for skip in range(min(max_skip, len(window) - 1) + 1):
+        for start in range(len(previous)):
+            length = 0
+            while (
+                start + length < len(previous)
+                and skip + length < len(window)
+                and _same_word(previous[start + length], window[skip + length])
+            ):
+                length += 1
+            # Later starts win ties: the window covers the utterance tail
+            if length and length >= best_len:
+                best_len, best_start, best_skip = length, start, skip
+    if not best_len:
+        return None
+    return previous[:best_start] + window[best_skip:]
+
+
+class StreamingTranscriber:
+    """Transcribes overlapping windows of one speaker's utterance in progress.
+
+    ``offer()`` is cheap and latest-wins: while a window is being
+    transcribed, newer audio replaces any queued window, so a slow STT
+    backend only lowers the partial rate instead of building a backlog.
+    """
+
+    def __init__(
+        self,
+        stt_service,
+        user_id: int,
+        on_partial: Callable[[PartialTranscript], Awaitable[None]],
+        window_seconds: float = 10.0,
+        min_seconds: float = 0.6,
+    ):
+        """Initialize the transcriber.
+
+        Args:
+            stt_service: STT service (``transcribe_pcm`` or ``transcribe_file``)
+            user_id: Speaker this transcriber follows
+            on_partial: Async callback for each partial transcript
+            window_seconds: Longest audio tail sent per partial
+            min_seconds: No partials for utterances shorter than this
+        """
+        self.stt = stt_service
+        self.user_id = user_id
+        self.on_partial = on_partial
+        self.window_bytes = int(window_seconds * STT_SAMPLE_RATE) * 2
+        self.min_bytes = int(min_seconds * STT_SAMPLE_RATE) * 2
+
+        self._queued: Optional[bytes] = None
+        self._task: Optional[asyncio.Task] = None
+        self._previous_words: List[str] = []
+        self._stable_words: List[str] = []
+        self._revision = 0
+        self._generation = 0
+
+        self.partials_published = 0
+        self.windows_skipped = 0
+
+    @property
+    def stable_text(self) -> str:
+        return " ".join(self._stable_words)
+
+    def offer(self, pcm_data: bytes):
+        """Submit the utterance so far (16kHz mono PCM) for a partial."""
+        if len(pcm_data) < self.min_bytes:
+            return
+        if self._task is not None and not self._task.done():
+            if self._queued is not None:
+                self.windows_skipped += 1
+            self._queued = pcm_data
+            return
+        self._task = asyncio.create_task(self._run(pcm_data, self._generation))
+
+    def reset(self):
+        """Forget the current utterance (it closed or was abandoned)."""
+        self._generation += 1
+        self._queued = None
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+        self._previous_words = []
+        self._stable_words = []
+        self._revision = 0
+
+    async def _run(self, pcm_data: bytes, generation: int):
+        while pcm_data is not None and generation == self._generation:
+            await self._transcribe_window(pcm_data, generation)
+            pcm_data, self._queued = self._queued, None
+
+    async def _transcribe_window(self, pcm_data: bytes, generation: int):
+        started = time.monotonic()
+        window = pcm_data[-self.window_bytes :]
+        try:
+            result = await self._transcribe(window)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"Partial transcription failed: {e}")
+            return
+        if generation != self._generation:
+            return
+
+        text = (result or {}).get("text", "").strip()
+        if not text:
+            return
+        words = text.split()
+        if len(window) < len(pcm_data):
+            # Window no longer starts at the utterance start; align it on
+            # its overlap with the previous hypothesis
+            spliced = splice_window_words(self._previous_words, words)
+            words = spliced if spliced is not None else self._stable_words + words
+
+        agreed = common_word_prefix(self._previous_words, words)
+        if len(agreed) > len(self._stable_words):
+            self._stable_words = agreed
+        self._previous_words = words
+        self._revision += 1
+
+        partial = PartialTranscript(
+            user_id=self.user_id,
+            text=" ".join(words),
+            stable_text=self.stable_text,
+            audio_seconds=len(pcm_data) / 2 / STT_SAMPLE_RATE,
+            latency=time.monotonic() - started,
+            revision=self._revision,
+        )
+        self.partials_published += 1
+        try:
+            await self.on_partial(partial)
+        except Exception as e:
+            logger.error(f"Partial transcript callback failed: {e}")
+
+    async def _transcribe(self, pcm_data: bytes) -> dict:
+        transcribe_pcm = getattr(self.stt, "transcribe_pcm", None)
+        if transcribe_pcm is not None:
+            return await transcribe_pcm(pcm_data, sample_rate=STT_SAMPLE_RATE)
+
+        # Fallback for STT services that only accept files
+        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
+            temp_path = Path(temp_file.name)
+        try:
+            with wave.open(str(temp_path), "wb") as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(STT_SAMPLE_RATE)
+                wav.writeframes(pcm_data)
+            return await self.stt.transcribe_file(temp_path)
+        finally:
+            temp_path.unlink(missing_ok=True)
@@ -6,7 +6,7 @@ reducing perceived latency for voice responses.
 
 import asyncio
 import logging
-from typing import AsyncIterator, Optional
+from typing import AsyncIterator, Iterable, List, Optional, Set
 from pathlib import Path
 import uuid
 import io
@@ -99,26 +99,172 @@ class BytesAudioSource:
         return False
 
 
+class SentenceSegmenter:
+    """Incremental sentence splitter for streamed LLM text.
+
+    Each chunk is scanned once, so segmentation cost stays linear in the
+    response length no matter how small the chunks are. ``.``, ``!`` and
+    ``?`` only end a sentence when followed by whitespace, which keeps
+    numbers such as "3.5" and URLs in one piece; newlines always end one.
+    """
+
+    def __init__(self, endings: Iterable[str] = (".", "!", "?", "\n")):
+        self.endings = frozenset(endings)
+        self._buffer = ""
+        self._scan_from = 0
+
+    def feed(self, chunk: str) -> List[str]:
+        """Add text and return the sentences it completed."""
+        self._buffer += chunk
+        buffer = self._buffer
+        sentences: List[str] = []
+        start = 0
+        i = self._scan_from
+        end = len(buffer)
+        while i < end:
+            char = buffer[i]
+            if char in self.endings:
+                if char == "\n":
+                    cut = i + 1
+                elif i + 1 < end:
+                    if not buffer[i + 1].isspace():
+                        i += 1
+                        continue
+                    cut = i + 1
+                else:
+                    # Need the next character to decide; rescan this one
+                    break
+                sentences.append(buffer[start:cut])
+                start = cut
+            i += 1
+        self._buffer = buffer[start:]
+        self._scan_from = i - start
+        return sentences
+
+    def flush(self) -> List[str]:
+        """Return whatever text is left when the stream ends."""
+        tail = self._buffer
+        self._buffer = ""
+        self._scan_from = 0
+        return [tail] if tail else []
+
+
+class _SynthesizedSentence:
+    """Audio for one sentence, ready to hand to the voice client."""
+
+    __slots__ = ("text", "audio_bytes", "audio_file", "source")
+
+    def __init__(
+        self,
+        text: str,
+        audio_bytes: Optional[bytes] = None,
+        audio_file: Optional[Path] = None,
+    ):
+        self.text = text
+        self.audio_bytes = audio_bytes
+        self.audio_file = audio_file
+        self.source = None
+
+    async def prepare(self):
+        """Start Opus encoding off the event loop so playback only pops frames."""
+        from services.voice.playback import prepare_audio
+
+        audio = self.audio_bytes if self.audio_bytes is not None else self.audio_file
+        try:
+            self.source = await prepare_audio(audio, ffmpeg_fallback=False)
+        except (ValueError, OSError) as e:
+            logger.debug(f"Pre-encoding skipped: {e}")
+
+    def to_source(self):
+        if self.source is not None:
+            return self.source
+        if self.audio_bytes is not None:
+            return BytesAudioSource(self.audio_bytes)
+        import discord
+
+        return discord.FFmpegPCMAudio(
+            str(self.audio_file),
+            options="-vn -af aresample=48000,aformat=sample_fmts=s16:channel_layouts=stereo",
+        )
+
+    def cleanup(self):
+        if self.source is not None:
+            self.source.cleanup()
+        if self.audio_file is not None:
+            try:
+                self.audio_file.unlink(missing_ok=True)
+            except Exception as e:
+                logger.debug(f"Failed to delete temp audio: {e}")
+
+
 class StreamingTTSProcessor:
     """Processes streaming text and converts to TTS audio in real-time.
 
-    This class handles:
-    - Buffering text chunks into complete sentences
-    - Generating TTS audio for each sentence
-    - Playing audio through Discord voice client
-    - Applying RVC voice conversion if enabled
+    Runs as a three-stage pipeline:
+    - Sentence segmentation runs incrementally on the token stream
+    - Up to ``lookahead`` upcoming sentences are synthesized concurrently
+      (TTS plus RVC if enabled, then Opus pre-encoding in a worker thread)
+      while the current one plays
+    - Playback starts the next sentence from the player's ``after``
+      callback, so there is no polling gap between sentences
+
+    ``cancel()`` (barge-in) stops playback and cancels queued synthesis.
     """
 
-    def __init__(self, tts_service, rvc_service=None):
+    def __init__(self, tts_service, rvc_service=None, lookahead: Optional[int] = None):
         """Initialize streaming TTS processor.
 
         Args:
             tts_service: TTSService instance for audio generation
             rvc_service: Optional RVCService for voice conversion
+            lookahead: Sentences synthesized ahead of playback
+                (defaults to ``Config.TTS_STREAMING_LOOKAHEAD``)
         """
         self.tts = tts_service
         self.rvc = rvc_service
         self.sentence_endings = {".", "!", "?", "\n"}
+        if lookahead is None:
+            from config import Config
+
+            lookahead = getattr(Config, "TTS_STREAMING_LOOKAHEAD", 2)
+        self.lookahead = max(1, int(lookahead))
+        self._cancelled = asyncio.Event()
+        self._pending: Set[asyncio.Task] = set()
+        self._voice_client = None
+        self._cancel_token = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """Barge-in: stop current playback and drop all queued synthesis."""
+        if self._cancelled.is_set():
+            return
+        self._cancelled.set()
+        in_flight = 0
+        for task in list(self._pending):
+            if not task.done():
+                in_flight += 1
+            task.cancel()
+        interrupted = False
+        voice_client = self._voice_client
+        if voice_client is not None:
+            try:
+                if voice_client.is_playing():
+                    voice_client.stop()
+                    interrupted = True
+            except Exception as e:
+                logger.debug(f"Failed to stop playback on cancel: {e}")
+
+        token = self._cancel_token
+        if token is not None:
+            token.record("tts_syntheses", in_flight)
+            token.record("tts_sentences", len(self._pending))
+            token.record("playback", int(interrupted))
+
+    def _should_stop(self, voice_client) -> bool:
+        return self._cancelled.is_set() or not voice_client.is_connected()
 
     async def process_stream(
         self,
@@ -126,6 +272,7 @@ class StreamingTTSProcessor:
         voice_client,
         speed: float = 1.0,
         rate: str = "+0%",
+        cancel_token=None,
     ):
         """Process text stream and play as TTS audio.
 
@@ -134,43 +281,110 @@ class StreamingTTSProcessor:
             voice_client: Discord voice client to play audio through
             speed: Kokoro TTS speed modifier
             rate: Edge TTS rate modifier
+            cancel_token: Optional ``CancellationToken``; cancelling it
+                (e.g. on barge-in) acts like ``cancel()``
 
         Returns:
-            Full text that was spoken
+            Full text that was received (spoken unless cancelled)
         """
-        buffer = ""
-        full_text = ""
-
-        try:
-            async for chunk in text_stream:
-                if not voice_client.is_connected():
-                    logger.debug("Voice client disconnected during text streaming")
+        self._voice_client = voice_client
+        self._cancel_token = cancel_token
+        remove_callback = None
+        if cancel_token is not None:
+            remove_callback = cancel_token.add_callback(
+                self.cancel, loop=asyncio.get_running_loop()
+            )
+        segmenter = SentenceSegmenter(self.sentence_endings)
+        sentences: asyncio.Queue = asyncio.Queue()
+        ready: asyncio.Queue = asyncio.Queue()
+        # Synthesis slots ahead of the sentence the player is working on
+        slots = asyncio.Semaphore(self.lookahead)
+        parts: List[str] = []
+
+        async def read_text():
+            try:
+                async for chunk in text_stream:
+                    if self._should_stop(voice_client):
+                        logger.debug("Voice output stopped during text streaming")
+                        break
+                    parts.append(chunk)
+                    for sentence in segmenter.feed(chunk):
+                        sentences.put_nowait(sentence)
+                else:
+                    for sentence in segmenter.flush():
+                        sentences.put_nowait(sentence)
+            finally:
+                sentences.put_nowait(None)
+
+        async def schedule_synthesis():
+            while True:
+                sentence = await sentences.get()
+                if sentence is None or self._cancelled.is_set():
                     break
+                if not sentence.strip():
+                    continue
+                # Blocks once `lookahead` sentences are waiting for playback
+                await slots.acquire()
+                task = asyncio.create_task(self._synthesize(sentence, speed, rate))
+                self._pending.add(task)
+                ready.put_nowait(task)
+            ready.put_nowait(None)
+
+        async def play():
+            while True:
+                task = await ready.get()
+                if task is None:
+                    break
+                slots.release()
+                try:
+                    audio = await task
+                except asyncio.CancelledError:
+                    if self._cancelled.is_set():
+                        break
+                    raise
+                finally:
+                    self._pending.discard(task)
+                if audio is None:
+                    continue
+                if self._should_stop(voice_client):
+                    audio.cleanup()
+                    break
+                await self._play(voice_client, audio)
 
-                buffer += chunk
-                full_text += chunk
-
-                if any(ending in buffer for ending in self.sentence_endings):
-                    sentences = self._split_into_sentences(buffer)
-
-                    for sentence in sentences[:-1]:
-                        if sentence.strip():
-                            if not voice_client.is_connected():
-                                logger.debug("Voice client disconnected, stopping")
-                                return full_text
-                            await self._speak_sentence(
-                                sentence, voice_client, speed, rate
-                            )
-
-                    buffer = sentences[-1] if sentences else ""
-
-            if buffer.strip() and voice_client.is_connected():
-                await self._speak_sentence(buffer, voice_client, speed, rate)
-
+        stages = [
+            asyncio.create_task(read_text()),
+            asyncio.create_task(schedule_synthesis()),
+            asyncio.create_task(play()),
+        ]
+        try:
+            # The player finishing (normally or on barge-in) ends the pipeline
+            await stages[2]
+        except asyncio.CancelledError:
+            self.cancel()
+            raise
         except Exception as e:
             logger.error(f"Streaming TTS error: {e}")
-
-        return full_text
+        finally:
+            for stage in stages:
+                stage.cancel()
+            await asyncio.gather(*stages, return_exceptions=True)
+            await self._discard_pending()
+            if remove_callback is not None:
+                remove_callback()
+            self._voice_client = None
+            self._cancel_token = None
+
+        return "".join(parts)
+
+    async def _discard_pending(self):
+        """Cancel unplayed synthesis and delete any audio it already produced."""
+        pending = list(self._pending)
+        self._pending.clear()
+        for task in pending:
+            task.cancel()
+        for result in await asyncio.gather(*pending, return_exceptions=True):
+            if isinstance(result, _SynthesizedSentence):
+                result.cleanup()
 
     def _split_into_sentences(self, text: str) -> list[str]:
         """Split text into sentences.
@@ -181,82 +395,95 @@ class StreamingTTSProcessor:
         Returns:
             List of sentences (last may be incomplete)
         """
-        sentences = []
-        current = ""
+        segmenter = SentenceSegmenter(self.sentence_endings)
+        sentences = segmenter.feed(text) + segmenter.flush()
+        return sentences if sentences else [""]
 
-        for char in text:
-            current += char
-            if char in self.sentence_endings:
-                sentences.append(current)
-                current = ""
+    async def _play(self, voice_client, audio: _SynthesizedSentence):
+        """Play one synthesized sentence and wait for it to finish.
 
-        # Add any remaining text
-        if current:
-            sentences.append(current)
+        Args:
+            voice_client: Discord voice client
+            audio: Synthesized sentence audio
+        """
+        loop = asyncio.get_running_loop()
+        finished = asyncio.Event()
 
-        return sentences if sentences else [""]
+        def after_playing(error):
+            if error:
+                logger.error(f"Audio playback error: {error}")
+            audio.cleanup()
+            loop.call_soon_threadsafe(finished.set)
 
-    async def _speak_sentence(
-        self, sentence: str, voice_client, speed: float, rate: str
-    ):
-        """Generate and play TTS for a single sentence.
+        try:
+            # Another source (e.g. a previous reply) may still be playing
+            while voice_client.is_playing() and not self._should_stop(voice_client):
+                await asyncio.sleep(0.05)
+            if self._should_stop(voice_client):
+                audio.cleanup()
+                return
+            voice_client.play(audio.to_source(), after=after_playing)
+        except Exception as e:
+            logger.error(f"Failed to play sentence: {e}")
+            audio.cleanup()
+            return
+
+        await finished.wait()
+
+    async def _synthesize(
+        self, sentence: str, speed: float, rate: str
+    ) -> Optional[_SynthesizedSentence]:
+        """Generate audio for a single sentence (TTS, then RVC if enabled).
 
         Args:
             sentence: Text to speak
-            voice_client: Discord voice client
             speed: TTS speed
             rate: TTS rate
-        """
-        # Check if voice client is still connected before proceeding
-        if not voice_client.is_connected():
-            logger.debug("Voice client disconnected, skipping sentence")
-            return
-
-        if voice_client.is_playing():
-            while voice_client.is_playing() and voice_client.is_connected():
-                await asyncio.sleep(0.1)
-            # Re-check connection after waiting
-            if not voice_client.is_connected():
-                logger.debug("Voice client disconnected while waiting for playback")
-                return
 
+        Returns:
+            Synthesized audio, or None if generation failed
+        """
         try:
             from config import Config
 
-            use_streaming = self.tts.engine == "qwen3tts"
-
-            if use_streaming:
-                await self._speak_with_streaming(
-                    sentence, voice_client, speed, rate, Config
-                )
-            else:
-                await self._speak_with_file(sentence, voice_client, speed, rate, Config)
-
+            audio = streamed = None
+            if self.tts.engine == "qwen3tts":
+                try:
+                    audio = await self._synthesize_with_streaming(sentence, speed, Config)
+                    streamed = True
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Streaming TTS failed, falling back to file-based: {e}")
+            if not streamed:
+                audio = await self._synthesize_with_file(sentence, speed, rate, Config)
+            if audio is not None:
+                try:
+                    await audio.prepare()
+                except BaseException:
+                    audio.cleanup()
+                    raise
+            return audio
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            logger.error(f"Failed to speak sentence: {e}")
+            logger.error(f"Failed to synthesize sentence: {e}")
+            return None
 
-    async def _speak_with_streaming(
-        self, sentence: str, voice_client, speed: float, rate: str, Config
-    ):
-        """Generate and play TTS using streaming for qwen3tts.
+    async def _synthesize_with_streaming(
+        self, sentence: str, speed: float, Config
+    ) -> Optional[_SynthesizedSentence]:
+        """Generate TTS using streaming for qwen3tts.
 
         Args:
             sentence: Text to speak
-            voice_client: Discord voice client
             speed: TTS speed
-            rate: TTS rate
             Config: Config module
         """
-        import discord
-
         temp_file = None
         rvc_file = None
 
         try:
-            if not voice_client.is_connected():
-                logger.debug("Voice client not connected, skipping streaming TTS")
-                return
-
             audio_chunks = []
             language = getattr(self.tts, "qwen3tts_language", "Auto")
 
@@ -264,22 +491,13 @@ class StreamingTTSProcessor:
             async for chunk in self.tts.generate_stream(
                 sentence, speed=speed, language=language
             ):
-                if not voice_client.is_connected():
-                    logger.debug("Voice client disconnected during streaming, aborting")
-                    return
                 audio_chunks.append(chunk)
 
             full_audio = b"".join(audio_chunks)
 
             if not full_audio:
                 logger.warning("No audio data received from streaming TTS")
-                return
-
-            if not voice_client.is_connected():
-                logger.debug(
-                    "Voice client disconnected after streaming, skipping playback"
-                )
-                return
+                return None
 
             if self.rvc and Config.RVC_ENABLED:
                 temp_file = Path(Config.TEMP_DIR) / f"stream_tts_{uuid.uuid4()}.wav"
@@ -290,86 +508,38 @@ class StreamingTTSProcessor:
 
                 full_audio = rvc_file.read_bytes()
 
-            if not voice_client.is_connected():
-                logger.debug("Voice client disconnected after RVC, skipping playback")
-                return
-
-            audio_source = BytesAudioSource(full_audio)
-            voice_client.play(audio_source)
-
-            while voice_client.is_playing() and voice_client.is_connected():
-                await asyncio.sleep(0.1)
-
-            if not voice_client.is_connected():
-                logger.debug("Voice client disconnected during playback")
-
-        except Exception as e:
-            logger.error(f"Streaming TTS failed, falling back to file-based: {e}")
-            if voice_client.is_connected():
-                await self._speak_with_file(sentence, voice_client, speed, rate, Config)
+            return _SynthesizedSentence(sentence, audio_bytes=full_audio)
         finally:
             if temp_file:
                 temp_file.unlink(missing_ok=True)
             if rvc_file:
                 rvc_file.unlink(missing_ok=True)
 
-    async def _speak_with_file(
-        self, sentence: str, voice_client, speed: float, rate: str, Config
-    ):
-        """Generate and play TTS using file-based approach.
+    async def _synthesize_with_file(
+        self, sentence: str, speed: float, rate: str, Config
+    ) -> Optional[_SynthesizedSentence]:
+        """Generate TTS using file-based approach.
 
         Args:
             sentence: Text to speak
-            voice_client: Discord voice client
             speed: TTS speed
             rate: TTS rate
             Config: Config module
         """
-        import discord
-
-        if not voice_client.is_connected():
-            logger.debug("Voice client not connected, skipping file-based TTS")
-            return
-
         audio_file = Path(Config.TEMP_DIR) / f"stream_tts_{uuid.uuid4()}.wav"
 
         try:
             await self.tts.generate(sentence, str(audio_file), speed=speed, rate=rate)
 
-            if not voice_client.is_connected():
-                logger.debug("Voice client disconnected after TTS generation")
-                audio_file.unlink(missing_ok=True)
-                return
-
             if self.rvc and Config.RVC_ENABLED:
                 rvc_file = Path(Config.TEMP_DIR) / f"stream_rvc_{uuid.uuid4()}.wav"
-                await self.rvc.convert(audio_file, rvc_file)
-                audio_file.unlink(missing_ok=True)
-                audio_file = rvc_file
-
-                if not voice_client.is_connected():
-                    logger.debug("Voice client disconnected after RVC conversion")
-                    audio_file.unlink(missing_ok=True)
-                    return
-
-            audio_source = discord.FFmpegPCMAudio(
-                str(audio_file),
-                options="-vn -af aresample=48000,aformat=sample_fmts=s16:channel_layouts=stereo",
-            )
-
-            def after_playing(error):
-                if error:
-                    logger.error(f"Audio playback error: {error}")
                 try:
+                    await self.rvc.convert(audio_file, rvc_file)
+                finally:
                     audio_file.unlink(missing_ok=True)
-                except Exception as e:
-                    logger.debug(f"Failed to delete temp audio: {e}")
-
-            voice_client.play(audio_source, after=after_playing)
-
-            while voice_client.is_playing() and voice_client.is_connected():
-                await asyncio.sleep(0.1)
+                audio_file = rvc_file
 
-        except Exception as e:
-            logger.error(f"File-based TTS failed: {e}")
+            return _SynthesizedSentence(sentence, audio_file=audio_file)
+        except BaseException:
             audio_file.unlink(missing_ok=True)
+            raise
@@ -5,6 +5,7 @@ from pathlib import Path
 from typing import Optional
 from utils.helpers import clean_text_for_tts
 from services.interfaces import TTSInterface
+from services.voice.tts_cache import PhraseAudioCache
 
 try:
     from services.kokoro_tts import KokoroTTSService
@@ -63,6 +64,7 @@ class TTSService(TTSInterface):
         qwen3tts_voice: str = "Vivian",
         qwen3tts_speed: float = 1.0,
         qwen3tts_language: str = "Auto",
+        cache: Optional[PhraseAudioCache] = None,
     ):
         """Initialize TTS service.
 
@@ -81,6 +83,7 @@ class TTSService(TTSInterface):
             qwen3tts_voice: Default Qwen3-TTS voice to use
             qwen3tts_speed: Qwen3-TTS speech speed multiplier
             qwen3tts_language: Default Qwen3-TTS language code
+            cache: Optional phrase audio cache for short, recurring utterances
         """
         self.engine = engine.lower()
         self.kokoro_voice = kokoro_voice
@@ -96,6 +99,7 @@ class TTSService(TTSInterface):
         self.qwen3tts_voice = qwen3tts_voice
         self.qwen3tts_speed = qwen3tts_speed
         self.qwen3tts_language = qwen3tts_language
+        self.cache = cache
 
         # Initialize Kokoro API client if requested
         self.kokoro_api: Optional[KokoroAPIClient] = None
@@ -255,50 +259,6 @@ class TTSService(TTSInterface):
             ]
         return voices
 
-    async def list_voices(self) -> list:
-        """List all available voices for this TTS engine.
-
-        Returns:
-            List of voice info dicts. Format may vary by implementation,
-            but should include at minimum:
-            [
-                {"name": "voice_id", "description": "Voice description"},
-                ...
-            ]
-        """
-        voices = []
-        if self.engine == "kokoro_api" and self.kokoro_api:
-            voice_names = self.kokoro_api.get_voices()
-            voices = [
-                {"name": voice, "description": f"Kokoro API voice: {voice}"}
-                for voice in voice_names
-            ]
-        elif self.engine == "kokoro" and self.kokoro:
-            voice_names = self.kokoro.get_voices()
-            voices = [
-                {"name": voice, "description": f"Kokoro voice: {voice}"}
-                for voice in voice_names
-            ]
-        elif self.engine == "supertonic" and self.supertonic:
-            voice_names = self.supertonic.get_voices()
-            voices = [
-                {"name": voice, "description": f"Supertonic voice: {voice}"}
-                for voice in voice_names
-            ]
-        elif self.engine == "luxtts" and self.luxtts:
-            voice_names = self.luxtts.get_voices()
-            voices = [
-                {"name": voice, "description": f"LuxTTS voice: {voice}"}
-                for voice in voice_names
-            ]
-        elif self.engine == "qwen3tts" and self.qwen3tts:
-            voice_names = self.qwen3tts.get_voices()
-            voices = [
-                {"name": voice, "description": f"Qwen3-TTS voice: {voice}"}
-                for voice in voice_names
-            ]
-        return voices
-
     def get_voices(self) -> list[str]:
         """Get list of available voices.
 
@@ -334,15 +294,19 @@ class TTSService(TTSInterface):
         output_file: Path,
         voice: Optional[str] = None,
         speed: Optional[float] = None,
+        persona: Optional[str] = None,
         **kwargs,
     ) -> Path:
         """Generate speech from text.
 
+        Short phrases are served from the phrase cache when one is configured.
+
         Args:
             text: Text to convert to speech
             output_file: Path to save audio file
             voice: Optional voice override
             speed: Optional speed override
+            persona: Optional persona ID (part of the cache key)
             **kwargs: Additional engine-specific parameters
 
         Returns:
@@ -354,6 +318,96 @@ class TTSService(TTSInterface):
         # Clean text for TTS
         cleaned_text = clean_text_for_tts(text)
 
+        if self.cache is None or not self.cache.cacheable(cleaned_text):
+            return await self._synthesize(cleaned_text, output_file, voice, speed, **kwargs)
+
+        key = self.cache.make_key(
+            engine=self.engine,
+            voice=voice or self._default_voice(),
+            text=cleaned_text,
+            persona=persona,
+            params=self._cache_params(speed, kwargs),
+        )
+        return await self.cache.get_or_create(
+            key,
+            output_file,
+            lambda path: self._synthesize(cleaned_text, path, voice, speed, **kwargs),
+        )
+
+    def _default_voice(self) -> str:
+        return {
+            "kokoro_api": self.kokoro_voice,
+            "kokoro": self.kokoro_voice,
+            "supertonic": self.supertonic_voice,
+            "luxtts": self.luxtts_voice,
+            "qwen3tts": self.qwen3tts_voice,
+        }.get(self.engine, "")
+
+    def _cache_params(self, speed: Optional[float], kwargs: dict) -> dict:
+        """Engine parameters that change the generated audio."""
+        params = {"speed": speed or self._default_speed()}
+        if self.engine == "supertonic":
+            params["steps"] = kwargs.get("steps", self.supertonic_steps)
+        elif self.engine == "qwen3tts":
+            params["language"] = kwargs.get("language", self.qwen3tts_language)
+        return params
+
+    def _default_speed(self) -> float:
+        return {
+            "kokoro_api": self.kokoro_speed,
+            "kokoro": self.kokoro_speed,
+            "supertonic": self.supertonic_speed,
+            "luxtts": self.luxtts_speed,
+            "qwen3tts": self.qwen3tts_speed,
+        }.get(self.engine, 1.0)
+
+    async def prewarm(
+        self,
+        phrases: list[str],
+        voice: Optional[str] = None,
+        persona: Optional[str] = None,
+        temp_dir: Optional[Path] = None,
+    ) -> int:
+        """Synthesize phrases into the cache ahead of time.
+
+        Args:
+            phrases: Phrases to cache (e.g. from ``persona_prewarm_phrases``)
+            voice: Optional voice override
+            persona: Optional persona ID
+            temp_dir: Directory for the intermediate output files
+
+        Returns:
+            Number of phrases newly synthesized
+        """
+        if self.cache is None:
+            return 0
+
+        import tempfile
+        import uuid
+
+        temp_dir = Path(temp_dir or tempfile.gettempdir())
+        synthesized = 0
+        for phrase in phrases:
+            misses = self.cache.misses
+            output_file = temp_dir / f"tts_prewarm_{uuid.uuid4()}.wav"
+            try:
+                await self.generate(phrase, output_file, voice=voice, persona=persona)
+                synthesized += self.cache.misses - misses
+            except Exception as e:
+                logger.warning(f"TTS cache prewarm failed for '{phrase[:40]}': {e}")
+            finally:
+                output_file.unlink(missing_ok=True)
+        logger.info(f"TTS cache prewarmed {synthesized}/{len(phrases)} phrases")
+        return synthesized
+
+    async def _synthesize(
+        self,
+        cleaned_text: str,
+        output_file: Path,
+        voice: Optional[str] = None,
+        speed: Optional[float] = None,
+        **kwargs,
+    ) -> Path:
         if self.engine == "kokoro_api" and self.kokoro_api:
             return await self.kokoro_api.generate(
                 text=cleaned_text,
@@ -0,0 +1,249 @@
+"""Content-addressed on-disk cache for synthesized phrase audio.
+
+Greetings, acknowledgements and persona catchphrases recur constantly, and
+synthesis is the most expensive step of a voice reply. Audio is stored as
+``<cache_dir>/<key[:2]>/<key>.wav`` where the key is a SHA-256 over the
+engine, voice, persona, normalized text and engine parameters, so any
+change to those produces a new entry rather than stale audio.
+
+The index is rebuilt from the directory on startup (ordered by mtime) and
+kept in LRU order; hits bump the file's mtime so recency survives restarts.
+When the total size exceeds ``max_bytes`` the least recently used files are
+deleted. Concurrent misses for the same key share a single synthesis.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_phrase(text: str) -> str:
+    """Collapse whitespace; casing and punctuation are kept (they affect prosody)."""
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def persona_prewarm_phrases(persona: Any, max_chars: int = 200) -> List[str]:
+    """Collect short recurring lines from a compiled persona definition.
+
+    Uses the character's first message, alternate greetings, and any
+    ``catchphrases`` listed under ``voice_and_tone``.
+    """
+    character = getattr(persona, "character", persona)
+    phrases: List[str] = []
+    first_message = getattr(character, "first_message", "") or ""
+    if first_message:
+        phrases.append(first_message)
+    phrases.extend(getattr(character, "alternate_greetings", None) or [])
+    voice_and_tone = getattr(character, "voice_and_tone", None) or {}
+    phrases.extend(voice_and_tone.get("catchphrases", []) or [])
+
+    seen = set()
+    result = []
+    for phrase in phrases:
+        phrase = normalize_phrase(str(phrase))
+        if phrase and len(phrase) <= max_chars and phrase not in seen:
+            seen.add(phrase)
+            result.append(phrase)
+    return result
+
+
+class PhraseAudioCache:
+    """Size-capped LRU cache of synthesized audio files."""
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_chars: int = 200,
+    ):
+        """Initialize the cache and index existing entries.
+
+        Args:
+            cache_dir: Directory holding cached audio
+            max_bytes: Total size cap before LRU eviction
+            max_chars: Only phrases up to this length are cached
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.max_chars = max_chars
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.shared = 0
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        entries = []
+        for path in self.cache_dir.glob("*/*.wav"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total_bytes += size
+        self._evict()
+        if entries:
+            logger.info(
+                f"TTS phrase cache loaded: {len(self._index)} entries, "
+                f"{self._total_bytes / 1024 / 1024:.1f} MB"
+            )
+
+    def cacheable(self, text: str) -> bool:
+        text = normalize_phrase(text)
+        return bool(text) and len(text) <= self.max_chars
+
+    @staticmethod
+    def make_key(
+        engine: str,
+        voice: str,
+        text: str,
+        persona: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        payload = json.dumps(
+            {
+                "engine": engine,
+                "voice": voice,
+                "persona": persona or "",
+                "text": normalize_phrase(text),
+                "params": params or {},
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.wav"
+
+    def lookup(self, key: str) -> Optional[Path]:
+        """Return the cached file for ``key`` and mark it recently used."""
+        if key not in self._index:
+            return None
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            # Deleted behind our back
+            self._total_bytes -= self._index.pop(key)
+            return None
+        self._index.move_to_end(key)
+        return path
+
+    def store(self, key: str, source: Path) -> Optional[Path]:
+        """Copy ``source`` into the cache under ``key``."""
+        return self._record(key, self._write_entry(key, source))
+
+    def _write_entry(self, key: str, source: Path) -> Optional[int]:
+        """Copy the file in atomically; safe to run in a worker thread."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            shutil.copyfile(source, temp_path)
+            os.replace(temp_path, path)
+            return path.stat().st_size
+        except OSError as e:
+            logger.warning(f"Failed to store TTS cache entry: {e}")
+            temp_path.unlink(missing_ok=True)
+            return None
+
+    def _record(self, key: str, size: Optional[int]) -> Optional[Path]:
+        if size is None:
+            return None
+        self._total_bytes += size - self._index.pop(key, 0)
+        self._index[key] = size
+        self._evict()
+        return self._path(key) if key in self._index else None
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+            try:
+                self._path(key).unlink(missing_ok=True)
+            except OSError as e:
+                logger.debug(f"Failed to evict TTS cache entry: {e}")
+
+    async def get_or_create(
+        self,
+        key: str,
+        output_file: Path,
+        synthesize: Callable[[Path], Awaitable[Any]],
+    ) -> Path:
+        """Write audio for ``key`` to ``output_file``, synthesizing on a miss.
+
+        Args:
+            key: Cache key from ``make_key``
+            output_file: Where the caller wants the audio
+            synthesize: Coroutine function writing fresh audio to a path
+
+        Returns:
+            ``output_file``
+        """
+        output_file = Path(output_file)
+        cached = self.lookup(key)
+        if cached is not None:
+            try:
+                await asyncio.to_thread(shutil.copyfile, cached, output_file)
+                self.hits += 1
+                return output_file
+            except OSError:
+                # Evicted mid-copy; synthesize instead
+                pass
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.shared += 1
+            cached = await asyncio.shield(pending)
+            if cached is not None:
+                await asyncio.to_thread(shutil.copyfile, cached, output_file)
+                return output_file
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        cached = None
+        try:
+            await synthesize(output_file)
+            size = await asyncio.to_thread(self._write_entry, key, output_file)
+            cached = self._record(key, size)
+        finally:
+            future.set_result(cached)
+            self._inflight.pop(key, None)
+        return output_file
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._index),
+            "size_mb": round(self._total_bytes / 1024 / 1024, 2),
+            "max_mb": round(self.max_bytes / 1024 / 1024, 2),
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared": self.shared,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
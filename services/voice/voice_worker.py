@@ -0,0 +1,584 @@
+"""Per-guild voice processing in worker processes.
+
+In-process, every guild's receive thread runs resampling and VAD, and Opus
+encoding runs in the shared thread pool, all competing with text handling
+for the GIL. With ``VOICE_WORKER_PROCESSES`` enabled, each listening guild
+gets its own worker process instead:
+
+- the receive thread only enqueues raw PCM; a sender thread writes it to
+  the worker over a pipe (bounded queue - audio is dropped and counted
+  rather than ever blocking the receive thread)
+- the worker runs the ``UserAudioStream`` front-end per user and sends back
+  speech onsets, closed utterances and partial-transcription snapshots
+- playback audio for the guild is decoded and Opus-encoded in the worker
+  and streamed back as frame batches into a ``FrameSource``
+
+Workers send a heartbeat every second. ``VoiceWorkerPool`` restarts any
+worker that exits or stops heartbeating; after ``max_restarts`` the guild
+falls back to in-process processing.
+
+Workers are started with ``python -m services.voice.voice_worker`` and talk
+over inherited pipe file descriptors, so they never re-import the bot's
+entry point. POSIX only.
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_INTERVAL = 1.0
+FRAME_BATCH = 25  # 500ms of audio per message
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _worker_main(inbox: Connection, outbox: Connection):
+    """Worker process loop: per-user VAD plus an encoding thread."""
+    from services.voice.audio_frontend import UserAudioStream
+
+    send_lock = threading.Lock()
+
+    def send(message):
+        with send_lock:
+            outbox.send(message)
+
+    _, stream_options, partial_samples = inbox.recv()
+    streams: Dict[int, UserAudioStream] = {}
+    marks: Dict[int, int] = {}
+    stats = {"chunks": 0, "utterances": 0, "jobs": 0}
+
+    jobs: "queue.Queue" = queue.Queue()
+    encoder_thread = threading.Thread(
+        target=_encode_loop, args=(jobs, send), name="voice-encoder", daemon=True
+    )
+    encoder_thread.start()
+
+    last_beat = 0.0
+    try:
+        while True:
+            now = time.monotonic()
+            if now - last_beat >= HEARTBEAT_INTERVAL:
+                send(("heartbeat", dict(stats, users=len(streams))))
+                last_beat = now
+            if not inbox.poll(HEARTBEAT_INTERVAL):
+                continue
+            message = inbox.recv()
+            kind = message[0]
+
+            if kind == "audio":
+                _, user_id, pcm = message
+                stream = streams.get(user_id)
+                if stream is None:
+                    stream = streams[user_id] = UserAudioStream(**stream_options)
+                result = stream.feed(pcm)
+                stats["chunks"] += 1
+                if result.speech_started:
+                    send(("speech", user_id))
+                for utterance in result.utterances:
+                    send(("utterance", user_id, utterance))
+                    stats["utterances"] += 1
+                if result.speech_started or result.utterances:
+                    marks[user_id] = 0
+                if partial_samples and stream.speaking:
+                    buffered = len(stream.utterance)
+                    if buffered - marks.get(user_id, 0) >= partial_samples:
+                        marks[user_id] = buffered
+                        send(("partial", user_id, stream.peek()))
+            elif kind == "flush":
+                flushed = [stream.flush() for stream in streams.values()]
+                send(("flushed", message[1], [audio for audio in flushed if audio]))
+            elif kind == "prepare":
+                stats["jobs"] += 1
+                jobs.put(message[1:])
+            elif kind == "stop":
+                break
+    except (EOFError, OSError):
+        # Parent went away
+        pass
+    finally:
+        jobs.put(None)
+
+
+def _encode_loop(jobs: "queue.Queue", send: Callable):
+    from services.voice.playback import _opus_encoder_factory, decode_wav, iter_frames
+
+    while True:
+        job = jobs.get()
+        if job is None:
+            return
+        job_id, audio = job
+        try:
+            pcm = decode_wav(audio)
+        except (ValueError, OSError) as e:
+            send(("prepared", job_id, str(e)))
+            continue
+        encoder = _opus_encoder_factory()
+        opus = encoder is not None
+        batch: List[bytes] = []
+        for frame in iter_frames(pcm, encoder):
+            batch.append(frame)
+            if len(batch) >= FRAME_BATCH:
+                send(("frames", job_id, opus, batch))
+                batch = []
+        if batch:
+            send(("frames", job_id, opus, batch))
+        send(("prepared", job_id, None))
+
+
+class _PrepareJob:
+    __slots__ = ("source", "error", "finished")
+
+    def __init__(self):
+        self.source = None
+        self.error: Optional[str] = None
+        self.finished = False
+
+
+class VoiceWorker:
+    """Parent-side handle for one guild's worker process."""
+
+    def __init__(
+        self,
+        guild_id: int,
+        stream_options: Dict[str, Any],
+        partial_samples: int,
+        on_speech: Callable[[int], Any],
+        on_utterance: Callable[[int, int, bytes], Any],
+        on_partial: Callable[[int, int, bytes], Any],
+        queue_size: int = 500,
+    ):
+        """Initialize the worker handle (call ``start()`` to launch it).
+
+        Args:
+            guild_id: Guild this worker serves
+            stream_options: ``UserAudioStream`` keyword arguments
+            partial_samples: New speech (16kHz samples) between partial
+                snapshots; 0 disables partials
+            on_speech: Called with ``guild_id`` on a speech onset
+            on_utterance: Called with ``(guild_id, user_id, pcm)``
+            on_partial: Called with ``(guild_id, user_id, pcm)``
+            queue_size: Audio chunks buffered for the worker before dropping
+        """
+        self.guild_id = guild_id
+        self.stream_options = stream_options
+        self.partial_samples = partial_samples
+        self.on_speech = on_speech
+        self.on_utterance = on_utterance
+        self.on_partial = on_partial
+
+        self._outbox: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._process: Optional[subprocess.Popen] = None
+        self._send_conn: Optional[Connection] = None
+        self._recv_conn: Optional[Connection] = None
+        self._threads: List[threading.Thread] = []
+        self._ids = itertools.count()
+        self._jobs: Dict[int, _PrepareJob] = {}
+        self._flushes: Dict[int, tuple] = {}
+        self._stopping = False
+
+        self.started_at = 0.0
+        self.last_heartbeat = 0.0
+        self.dropped_chunks = 0
+        self.worker_stats: Dict[str, Any] = {}
+
+    def start(self):
+        child_in, parent_out = os.pipe()
+        parent_in, child_out = os.pipe()
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            filter(None, [str(_PROJECT_ROOT), env.get("PYTHONPATH")])
+        )
+        try:
+            self._process = subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "services.voice.voice_worker",
+                    str(child_in),
+                    str(child_out),
+                ],
+                pass_fds=(child_in, child_out),
+                cwd=str(_PROJECT_ROOT),
+                env=env,
+            )
+        finally:
+            os.close(child_in)
+            os.close(child_out)
+        self._send_conn = Connection(parent_out, readable=False)
+        self._recv_conn = Connection(parent_in, writable=False)
+        self.started_at = self.last_heartbeat = time.monotonic()
+        self._outbox.put(("config", self.stream_options, self.partial_samples))
+
+        self._threads = [
+            threading.Thread(
+                target=loop, name=f"voice-worker-{name}-{self.guild_id}", daemon=True
+            )
+            for name, loop in (("send", self._send_loop), ("recv", self._recv_loop))
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.info(
+            f"Voice worker started for guild {self.guild_id} (pid {self._process.pid})"
+        )
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self._process.pid if self._process else None
+
+    @property
+    def available(self) -> bool:
+        return (
+            not self._stopping
+            and self._process is not None
+            and self._process.poll() is None
+        )
+
+    def healthy(self, heartbeat_timeout: float) -> bool:
+        heartbeat_age = time.monotonic() - self.last_heartbeat
+        return self.available and heartbeat_age <= heartbeat_timeout
+
+    def feed(self, user_id: int, pcm: bytes):
+        """Queue received PCM for the worker; never blocks (receive thread)."""
+        if self._stopping:
+            return
+        try:
+            self._outbox.put_nowait(("audio", user_id, pcm))
+        except queue.Full:
+            self.dropped_chunks += 1
+
+    async def flush(self, timeout: float = 2.0) -> List[bytes]:
+        """Close every in-progress utterance in the worker and return them."""
+        if not self.available:
+            return []
+        request_id = next(self._ids)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._flushes[request_id] = (loop, future)
+        try:
+            # Never block the event loop on a backed-up outbox
+            self._outbox.put_nowait(("flush", request_id))
+            return await asyncio.wait_for(future, timeout)
+        except queue.Full:
+            logger.warning(f"Voice worker outbox full; flush skipped in guild {self.guild_id}")
+            return []
+        except asyncio.TimeoutError:
+            logger.warning(f"Voice worker flush timed out in guild {self.guild_id}")
+            return []
+        finally:
+            self._flushes.pop(request_id, None)
+
+    async def prepare_audio(
+        self, audio: Union[Path, str, bytes], min_buffer_frames: int = 10
+    ):
+        """Decode and Opus-encode playback audio in the worker.
+
+        Same contract as ``playback.prepare_audio``: returns a source once
+        ``min_buffer_frames`` are ready while the rest keeps arriving.
+        Audio the worker cannot decode (non-WAV) is prepared in-process.
+        """
+        from services.voice.playback import prepare_audio
+
+        if not self.available:
+            return await prepare_audio(audio)
+        job_id = next(self._ids)
+        job = self._jobs[job_id] = _PrepareJob()
+        payload = audio if isinstance(audio, bytes) else str(Path(audio).resolve())
+        try:
+            self._outbox.put_nowait(("prepare", job_id, payload))
+        except queue.Full:
+            job.error = "outbox full"
+
+        while job.error is None:
+            source = job.source
+            if source is not None and (
+                source.buffered >= min_buffer_frames or source.finished
+            ):
+                return source
+            if job.finished:
+                break
+            await asyncio.sleep(0.005)
+
+        self._jobs.pop(job_id, None)
+        logger.debug(f"Worker could not prepare audio ({job.error}); using in-process")
+        return await prepare_audio(audio)
+
+    def _send_loop(self):
+        conn = self._send_conn
+        while True:
+            message = self._outbox.get()
+            if message is None:
+                break
+            try:
+                conn.send(message)
+            except (OSError, ValueError):
+                break
+        try:
+            conn.close()
+        except OSError:
+            pass
+
+    def _recv_loop(self):
+        from services.voice.playback import FrameSource
+
+        conn = self._recv_conn
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                break
+            kind = message[0]
+            try:
+                if kind == "heartbeat":
+                    self.last_heartbeat = time.monotonic()
+                    self.worker_stats = message[1]
+                elif kind == "speech":
+                    self.on_speech(self.guild_id)
+                elif kind == "utterance":
+                    self.on_utterance(self.guild_id, message[1], message[2])
+                elif kind == "partial":
+                    self.on_partial(self.guild_id, message[1], message[2])
+                elif kind == "flushed":
+                    self._resolve_flush(message[1], message[2])
+                elif kind == "frames":
+                    _, job_id, opus, frames = message
+                    job = self._jobs.get(job_id)
+                    if job is not None:
+                        if job.source is None:
+                            job.source = FrameSource(opus=opus)
+                        for frame in frames:
+                            job.source.feed(frame)
+                elif kind == "prepared":
+                    _, job_id, error = message
+                    job = self._jobs.pop(job_id, None)
+                    if job is not None:
+                        job.error = error
+                        if job.source is not None:
+                            job.source.finish()
+                        job.finished = True
+            except Exception as e:
+                logger.error(f"Voice worker message handling failed: {e}")
+        self._fail_pending()
+
+    def _resolve_flush(self, request_id: int, utterances: List[bytes]):
+        entry = self._flushes.get(request_id)
+        if entry is None:
+            return
+        loop, future = entry
+
+        def resolve():
+            if not future.done():
+                future.set_result(utterances)
+
+        try:
+            loop.call_soon_threadsafe(resolve)
+        except RuntimeError:
+            pass
+
+    def _fail_pending(self):
+        """Worker gone: end in-flight playback and unblock flush callers."""
+        for job in list(self._jobs.values()):
+            if job.source is not None:
+                job.source.finish()
+            else:
+                job.error = "worker stopped"
+            job.finished = True
+        self._jobs.clear()
+        for request_id in list(self._flushes):
+            self._resolve_flush(request_id, [])
+
+    def stop(self, timeout: float = 2.0):
+        """Stop the worker process (blocking; run off the event loop)."""
+        self._stopping = True
+        # Pending audio is moot; make room for the stop message
+        while True:
+            try:
+                self._outbox.get_nowait()
+            except queue.Empty:
+                break
+        for message in (("stop",), None):
+            try:
+                self._outbox.put_nowait(message)
+            except queue.Full:
+                break
+        process = self._process
+        if process is not None:
+            try:
+                process.wait(timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        if self._recv_conn is not None:
+            try:
+                self._recv_conn.close()
+            except OSError:
+                pass
+        for thread in self._threads:
+            thread.join(timeout)
+        self._fail_pending()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "pid": self.pid,
+            "alive": self.available,
+            "uptime": round(time.monotonic() - self.started_at, 1),
+            "heartbeat_age": round(time.monotonic() - self.last_heartbeat, 2),
+            "queued_chunks": self._outbox.qsize(),
+            "dropped_chunks": self.dropped_chunks,
+            **self.worker_stats,
+        }
+
+
+class VoiceWorkerPool:
+    """Per-guild voice workers with heartbeat monitoring and restarts."""
+
+    def __init__(
+        self,
+        stream_options: Dict[str, Any],
+        partial_samples: int,
+        on_speech: Callable[[int], Any],
+        on_utterance: Callable[[int, int, bytes], Any],
+        on_partial: Callable[[int, int, bytes], Any],
+        heartbeat_timeout: float = 5.0,
+        max_restarts: int = 5,
+        check_interval: float = 1.0,
+    ):
+        """Initialize the pool.
+
+        Args:
+            stream_options: ``UserAudioStream`` keyword arguments
+            partial_samples: Samples of new speech between partial snapshots
+            on_speech: Speech onset callback (``guild_id``)
+            on_utterance: Closed utterance callback (``guild_id, user_id, pcm``)
+            on_partial: Partial snapshot callback (``guild_id, user_id, pcm``)
+            heartbeat_timeout: Seconds without a heartbeat before a restart
+            max_restarts: Restarts per guild before falling back in-process
+            check_interval: Seconds between health checks
+        """
+        self.stream_options = stream_options
+        self.partial_samples = partial_samples
+        self.on_speech = on_speech
+        self.on_utterance = on_utterance
+        self.on_partial = on_partial
+        self.heartbeat_timeout = heartbeat_timeout
+        self.max_restarts = max_restarts
+        self.check_interval = check_interval
+
+        self.workers: Dict[int, VoiceWorker] = {}
+        self.restarts: Dict[int, int] = {}
+        self.failed: set = set()
+        self._monitor_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def supported() -> bool:
+        return os.name == "posix"
+
+    def _new_worker(self, guild_id: int) -> VoiceWorker:
+        worker = VoiceWorker(
+            guild_id,
+            self.stream_options,
+            self.partial_samples,
+            on_speech=self.on_speech,
+            on_utterance=self.on_utterance,
+            on_partial=self.on_partial,
+        )
+        worker.start()
+        return worker
+
+    async def start(self, guild_id: int) -> Optional[VoiceWorker]:
+        """Launch the guild's worker (no-op if it is already running)."""
+        if guild_id in self.failed:
+            return None
+        worker = self.workers.get(guild_id)
+        if worker is not None and worker.available:
+            return worker
+        try:
+            worker = await asyncio.to_thread(self._new_worker, guild_id)
+        except OSError as e:
+            logger.error(f"Failed to start voice worker for guild {guild_id}: {e}")
+            self.failed.add(guild_id)
+            return None
+        self.workers[guild_id] = worker
+        if self._monitor_task is None or self._monitor_task.done():
+            self._monitor_task = asyncio.create_task(self._monitor())
+        return worker
+
+    def get(self, guild_id: int) -> Optional[VoiceWorker]:
+        """The guild's worker if it can take audio right now."""
+        worker = self.workers.get(guild_id)
+        return worker if worker is not None and worker.available else None
+
+    async def stop(self, guild_id: int):
+        worker = self.workers.pop(guild_id, None)
+        self.restarts.pop(guild_id, None)
+        self.failed.discard(guild_id)
+        if worker is not None:
+            await asyncio.to_thread(worker.stop)
+            logger.info(f"Voice worker stopped for guild {guild_id}")
+
+    async def close(self):
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            self._monitor_task = None
+        for guild_id in list(self.workers):
+            await self.stop(guild_id)
+
+    async def _monitor(self):
+        while self.workers:
+            await asyncio.sleep(self.check_interval)
+            for guild_id, worker in list(self.workers.items()):
+                if not worker.healthy(self.heartbeat_timeout):
+                    await self._restart(guild_id, worker)
+
+    async def _restart(self, guild_id: int, worker: VoiceWorker):
+        reason = "exited" if not worker.available else "heartbeat timeout"
+        await asyncio.to_thread(worker.stop, 0.5)
+        if self.workers.get(guild_id) is not worker:
+            # Stopped or replaced meanwhile
+            return
+
+        count = self.restarts.get(guild_id, 0) + 1
+        self.restarts[guild_id] = count
+        if count > self.max_restarts:
+            logger.error(
+                f"Voice worker for guild {guild_id} failed {count - 1} restarts; "
+                "falling back to in-process voice processing"
+            )
+            del self.workers[guild_id]
+            self.failed.add(guild_id)
+            return
+
+        logger.warning(
+            f"Voice worker for guild {guild_id} {reason}; restarting ({count})"
+        )
+        try:
+            self.workers[guild_id] = await asyncio.to_thread(self._new_worker, guild_id)
+        except OSError as e:
+            logger.error(f"Failed to restart voice worker for guild {guild_id}: {e}")
+            del self.workers[guild_id]
+            self.failed.add(guild_id)
+
+    def get_stats(self) -> Dict[int, Dict[str, Any]]:
+        stats = {}
+        for guild_id, worker in self.workers.items():
+            stats[guild_id] = dict(
+                worker.get_stats(), restarts=self.restarts.get(guild_id, 0)
+            )
+        return stats
+
+
+if __name__ == "__main__":
+    _worker_main(
+        Connection(int(sys.argv[1]), writable=False),
+        Connection(int(sys.argv[2]), readable=False),
+    )
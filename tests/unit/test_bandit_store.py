@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from core.social_intelligence.learning.bandit import (
+    BanditContext,
+    LinUCB,
+    UserBanditManager,
+)
+from core.social_intelligence.learning.bandit_store import BanditStore
+from core.social_intelligence.learning.linucb import LinUCBEngine
+
+pytestmark = pytest.mark.unit
+
+
+def _train(store: BanditStore, rng: np.random.Generator, users: int) -> None:
+    for _ in range(300):
+        key = f"user{rng.integers(users)}"
+        store.update(key, int(rng.integers(3)), rng.normal(size=4), rng.random())
+
+
+def test_paging_keeps_state_identical_to_an_unbounded_store(tmp_path) -> None:
+    paged = BanditStore(3, 4, max_resident=4, page_dir=tmp_path / "swap")
+    unbounded = BanditStore(3, 4)
+    _train(paged, np.random.default_rng(0), users=12)
+    _train(unbounded, np.random.default_rng(0), users=12)
+
+    assert paged.resident == 4
+    assert len(paged) == len(unbounded) == 12
+    assert paged.get_stats()["page_outs"] > 0
+    for key in unbounded:
+        expected = unbounded.get_user(key)
+        actual = paged.get_user(key)
+        np.testing.assert_allclose(actual["A_inv"], expected["A_inv"])
+        np.testing.assert_array_equal(actual["counts"], expected["counts"])
+    assert sorted(paged.dirty_keys()) == sorted(unbounded.dirty_keys())
+
+
+def test_select_many_matches_individual_selection(tmp_path) -> None:
+    store = BanditStore(3, 4, alpha=0.5, max_resident=8, page_dir=tmp_path)
+    rng = np.random.default_rng(1)
+    _train(store, rng, users=6)
+
+    keys = [f"user{i}" for i in range(8)]
+    contexts = rng.normal(size=(8, 4))
+    arms, ucbs = store.select_many(keys, contexts)
+
+    for key, x, arm, ucb in zip(keys, contexts, arms, ucbs):
+        assert store.select(key, x) == (arm, pytest.approx(ucb))
+    with pytest.raises(ValueError):
+        store.select_many([f"new{i}" for i in range(9)], rng.normal(size=(9, 4)))
+
+
+def test_manager_saves_only_changed_users_in_linucb_format(tmp_path) -> None:
+    manager = UserBanditManager(storage_dir=str(tmp_path), max_resident=2)
+    reference = LinUCB()
+    context = BanditContext(sentiment=0.8, time_of_day=20)
+    for _ in range(5):
+        reference.update("engage_now", context, 1.0)
+    for user_id in ("a", "b", "c"):
+        for _ in range(5):
+            manager.update(user_id, "engage_now", context, 1.0)
+    manager.save_all()
+
+    bandit = LinUCB.load(str(tmp_path / "a.json"))
+    assert bandit.actions["engage_now"].count == 5
+    action, confidence = bandit.select_action(context)
+    assert (action, pytest.approx(confidence)) == reference.select_action(context)
+
+    (tmp_path / "b.json").unlink()
+    manager.update("a", "wait", context, -0.5)
+    manager.save_all()
+    assert not (tmp_path / "b.json").exists()
+
+    reloaded = UserBanditManager(storage_dir=str(tmp_path))
+    action, confidence = reloaded.select_action("c", context)
+    assert (action, pytest.approx(confidence)) == reference.select_action(context)
+    assert reloaded.get_performance("a")["total_rounds"] == 6
+    batched = reloaded.select_actions(["a", "c"], [context, context])
+    assert [action for action, _ in batched] == [
+        manager.select_action("a", context)[0],
+        manager.select_action("c", context)[0],
+    ]
+
+
+def test_manager_keeps_history_across_saves(tmp_path) -> None:
+    context = BanditContext(sentiment=0.5)
+    manager = UserBanditManager(storage_dir=str(tmp_path))
+    manager.update("a", "wait", context, 0.5)
+    manager.save_all()
+    manager.update("a", "engage_now", context, 1.0)
+    manager.save_all()
+
+    saved = LinUCB.load(str(tmp_path / "a.json"))
+    assert [entry["action"] for entry in saved.history] == ["wait", "engage_now"]
+    snapshot = UserBanditManager(storage_dir=str(tmp_path)).get_bandit_snapshot("a")
+    assert len(snapshot.history) == 2
+
+
+def test_store_refreshes_inverse_and_persists_exact_design_matrix() -> None:
+    store = BanditStore(2, 3, refresh_interval=5)
+    reference = LinUCBEngine(2, 3, refresh_interval=5)
+    rng = np.random.default_rng(2)
+    for _ in range(12):
+        arm, x, reward = int(rng.integers(2)), rng.normal(size=3), rng.random()
+        store.update("u", arm, x, reward)
+        reference.update(arm, x, reward)
+
+    state = store.get_user("u")
+    np.testing.assert_allclose(state["A"], reference.A)
+    np.testing.assert_allclose(state["A_inv"], reference.A_inv)
+    assert int(state["pending"]) == 2
+
+
+def test_loader_replaces_swap_for_clean_users(tmp_path) -> None:
+    saved: dict = {}
+    store = BanditStore(
+        3, 4, max_resident=2, page_dir=tmp_path / "swap", loader=saved.get
+    )
+    _train(store, np.random.default_rng(3), users=2)
+    for key in store.dirty_keys():
+        saved[key] = store.get_user(key)
+    store.mark_clean()
+    expected = {key: state["A_inv"] for key, state in saved.items()}
+
+    # Clean users are dropped; an unsaved one still goes to swap
+    store.update("fresh", 0, np.ones(4), 1.0)
+    store.update("other", 1, np.ones(4), 1.0)
+    store.update("third", 2, np.ones(4), 1.0)
+    stats = store.get_stats()
+    assert stats["drops"] == 2 and stats["page_outs"] == 1
+    assert "user0" not in store and "fresh" in store
+
+    for key, A_inv in expected.items():
+        store.row(key)
+        np.testing.assert_allclose(store.get_user(key)["A_inv"], A_inv)
+    assert store.get_user("fresh")["counts"].tolist() == [1, 0, 0]
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Any
 
 import pytest
@@ -11,7 +12,13 @@ from memory.local_json import LocalJsonMemoryStore
 from memory.rag import RAGStore
 from memory.summary import DeterministicSummary
 from personas.loader import PersonaCatalog, PersonaDefinition
-from providers.base import LLMResponse, LLMStreamChunk, ProviderMessage, ProviderUsage
+from providers.base import (
+    LLMResponse,
+    LLMStreamChunk,
+    ProviderMessage,
+    ProviderToolCall,
+    ProviderUsage,
+)
 from providers.router import ProviderRouter
 from tools.policy import ToolPolicy
 from tools.registry import ToolRegistry
@@ -534,6 +541,54 @@ async def test_runtime_stream_event_emits_text_deltas(tmp_path):
     assert getattr(outputs[0]["output"], "text", "") == "echo:hello runtime"
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_runtime_stream_event_starts_tool_calls_before_stream_ends(tmp_path):
+    tool_ran = asyncio.Event()
+    call = ProviderToolCall(name="lookup", arguments={"q": "vivec"}, call_id="c1")
+    handled = []
+
+    class _ToolStreamingProvider(_FakeProvider):
+        async def stream_chat(self, messages, tools=None, **kwargs):
+            del messages, tools, kwargs
+            yield LLMStreamChunk(kind="tool_call", tool_call=call)
+            # The tool must run while the stream is still open
+            await asyncio.wait_for(tool_ran.wait(), timeout=1.0)
+            yield LLMStreamChunk(
+                kind="response",
+                response=LLMResponse(content="done", tool_calls=[call]),
+            )
+
+    async def lookup(arguments):
+        handled.append(arguments)
+        tool_ran.set()
+        return "found"
+
+    runtime = _build_runtime(tmp_path, provider=_ToolStreamingProvider())
+    runtime.tool_runner.registry.register_tool(
+        name="lookup",
+        schema={"type": "function", "function": {"name": "lookup"}},
+        handler=lookup,
+    )
+
+    items = [
+        item
+        async for item in runtime.stream_event(
+            Event(
+                type="message",
+                text="who is vivec",
+                user_id="u1",
+                room_id="r1",
+                platform="cli",
+                session_id="cli:r1",
+            )
+        )
+    ]
+
+    assert handled == [{"q": "vivec"}]
+    assert any(item.get("type") == "output" for item in items)
+
+
 @pytest.mark.unit
 def test_runtime_surface_decision_ignores_configured_users(tmp_path, monkeypatch):
     runtime = _build_runtime(tmp_path)
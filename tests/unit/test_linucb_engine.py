@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from core.social_intelligence.learning import bandit as social_bandit
+from core.social_intelligence.learning.linucb import LinUCBEngine
+from services.persona.rl.bandit import BanditState, LinUCBBandit
+from services.persona.rl.bandit_types import BanditConfig, BanditContext
+
+pytestmark = pytest.mark.unit
+
+
+def _naive_scores(A, b, x, alpha):
+    scores = []
+    for arm in range(len(A)):
+        A_inv = np.linalg.inv(A[arm])
+        theta = A_inv @ b[arm]
+        scores.append(theta @ x + alpha * np.sqrt(x @ A_inv @ x))
+    return np.array(scores)
+
+
+def test_sherman_morrison_matches_explicit_inverse() -> None:
+    rng = np.random.default_rng(0)
+    engine = LinUCBEngine(4, 6, alpha=0.5, refresh_interval=10_000)
+    for _ in range(500):
+        x = rng.normal(size=6)
+        engine.update(int(rng.integers(4)), x, float(rng.normal()))
+
+    np.testing.assert_allclose(engine.A_inv, np.linalg.inv(engine.A), atol=1e-8)
+    x = rng.normal(size=6)
+    np.testing.assert_allclose(
+        engine.scores(x), _naive_scores(engine.A, engine.b, x, 0.5), atol=1e-8
+    )
+    assert engine.counts.sum() == 500
+
+
+def test_periodic_refresh_recomputes_inverse() -> None:
+    engine = LinUCBEngine(2, 3, refresh_interval=3)
+    for _ in range(3):
+        engine.update(0, np.array([1.0, 0.0, 2.0]), 1.0)
+
+    assert engine._updates_since_refresh == 0
+    np.testing.assert_allclose(engine.A_inv, np.linalg.inv(engine.A))
+    expected = np.linalg.solve(engine.A[0], engine.b[0])
+    np.testing.assert_allclose(engine.theta[0], expected)
+
+
+def test_service_bandit_state_round_trip() -> None:
+    rng = np.random.default_rng(1)
+    config = BanditConfig(alpha=0.7)
+    bandit = LinUCBBandit(config)
+    for i in range(50):
+        context = BanditContext(sentiment=float(rng.uniform(-1, 1)), topic=str(i % 5))
+        action, _ = bandit.select_action(context)
+        bandit.update(action, context, float(rng.random()))
+
+    restored = LinUCBBandit(config)
+    restored.set_state(BanditState.from_dict(bandit.get_state().to_dict()))
+
+    probe = BanditContext(sentiment=0.3, topic="2")
+    action, ucb = restored.select_action(probe)
+    assert action == bandit.select_action(probe)[0]
+    assert ucb == pytest.approx(bandit.select_action(probe)[1])
+    np.testing.assert_allclose(restored.engine.A_inv, bandit.engine.A_inv, atol=1e-8)
+    assert restored.counts == bandit.counts
+    assert sum(restored.counts.values()) == 50
+
+
+def test_social_bandit_serialization_keeps_action_views() -> None:
+    bandit = social_bandit.LinUCB(alpha=0.5)
+    context = social_bandit.BanditContext(sentiment=0.8, time_of_day=20)
+    for _ in range(20):
+        bandit.update("engage_now", context, 1.0)
+
+    restored = social_bandit.LinUCB.from_dict(bandit.to_dict())
+    assert restored.select_action(context)[0] == "engage_now"
+    action = restored.actions["engage_now"]
+    assert action.count == 20
+    assert np.shares_memory(action.A, restored.engine.A)
+    np.testing.assert_allclose(action.A, bandit.actions["engage_now"].A)
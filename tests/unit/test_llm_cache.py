@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import pytest
+
+from services.llm.cache import PersistentLLMCache
+
+
+pytestmark = pytest.mark.unit
+
+
+class _StubEmbedder:
+    """Maps known prompts to fixed vectors so similarity is predictable."""
+
+    def __init__(self, vectors: dict[str, list[float]]) -> None:
+        self.vectors = vectors
+
+    async def embed(self, text: str) -> list[float]:
+        for needle, vector in self.vectors.items():
+            if needle in text:
+                return vector
+        return [0.0, 0.0, 1.0]
+
+
+def _messages(text: str) -> list[dict[str, str]]:
+    return [{"role": "user", "content": text}]
+
+
+def test_exact_tier_survives_restart(tmp_path) -> None:
+    db_path = tmp_path / "llm_cache.db"
+    cache = PersistentLLMCache(db_path=db_path)
+    cache.set(_messages("summarize"), "m", 0.3, "summary text")
+    cache.close()
+
+    reopened = PersistentLLMCache(db_path=db_path)
+    assert reopened.get(_messages("summarize"), "m", 0.3) == "summary text"
+    assert reopened.get_stats()["disk_hits"] == 1
+    assert reopened.get(_messages("other"), "m", 0.3) is None
+
+
+def test_ttl_expires_disk_entries(tmp_path) -> None:
+    cache = PersistentLLMCache(db_path=tmp_path / "c.db", ttl_seconds=-1)
+    cache.set(_messages("hello"), "m", 0.3, "hi")
+    cache.cache.clear()
+
+    assert cache.get(_messages("hello"), "m", 0.3) is None
+    assert cache.get_stats()["disk_size"] == 0
+
+
+def test_disk_size_limit_evicts_least_recently_used(tmp_path) -> None:
+    cache = PersistentLLMCache(db_path=tmp_path / "c.db", max_disk_entries=2)
+    cache.PRUNE_INTERVAL = 1
+    for i in range(4):
+        cache.set(_messages(f"prompt {i}"), "m", 0.3, f"resp {i}")
+
+    assert cache.get_stats()["disk_size"] == 2
+
+
+@pytest.mark.asyncio
+async def test_semantic_tier_matches_near_duplicates_within_persona(tmp_path) -> None:
+    embedder = _StubEmbedder(
+        {
+            "classify topic: cats": [1.0, 0.0, 0.0],
+            "classify topic: kittens": [0.99, 0.05, 0.0],
+        }
+    )
+    cache = PersistentLLMCache(
+        db_path=tmp_path / "c.db",
+        embedding_provider=embedder,
+        semantic_threshold=0.9,
+    )
+    await cache.aset(
+        _messages("classify topic: cats"), "m", 0.3, "ANIMALS", persona_id="dagoth"
+    )
+
+    hit = await cache.aget(
+        _messages("classify topic: kittens"), "m", 0.3, persona_id="dagoth"
+    )
+    other_persona = await cache.aget(
+        _messages("classify topic: kittens"), "m", 0.3, persona_id="toad"
+    )
+    unrelated = await cache.aget(
+        _messages("something else"), "m", 0.3, persona_id="dagoth"
+    )
+
+    assert hit == "ANIMALS"
+    assert other_persona is None
+    assert unrelated is None
+    assert cache.get_stats()["semantic_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_async_tiers_use_worker_threads_and_lazy_db(tmp_path, monkeypatch) -> None:
+    disabled = PersistentLLMCache(db_path=tmp_path / "off.db", enabled=False)
+    await disabled.aset(_messages("hello"), "m", 0.3, "hi")
+    assert await disabled.aget(_messages("hello"), "m", 0.3) is None
+    assert disabled.get_stats()["disk_size"] == 0
+    assert not (tmp_path / "off.db").exists()
+
+    offloaded = []
+
+    async def to_thread(func, *args):
+        offloaded.append(func.__name__)
+        return func(*args)
+
+    monkeypatch.setattr("services.llm.cache.asyncio.to_thread", to_thread)
+    cache = PersistentLLMCache(db_path=tmp_path / "c.db")
+    await cache.aset(_messages("hello"), "m", 0.3, "hi")
+    cache.cache.clear()
+
+    assert await cache.aget(_messages("hello"), "m", 0.3) == "hi"
+    assert offloaded == ["_store_row", "_fetch_row"]
+    assert cache.get_stats()["disk_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_miss_embedding_is_reused_by_the_following_store(tmp_path) -> None:
+    embedder = _StubEmbedder({"cats": [1.0, 0.0, 0.0]})
+    calls = []
+    embed = embedder.embed
+
+    async def counting_embed(text: str) -> list[float]:
+        calls.append(text)
+        return await embed(text)
+
+    embedder.embed = counting_embed
+    cache = PersistentLLMCache(db_path=tmp_path / "c.db", embedding_provider=embedder)
+    await cache.aset(_messages("dogs"), "m", 0.3, "seed", persona_id="dagoth")
+    calls.clear()
+
+    assert await cache.aget(_messages("cats"), "m", 0.3, persona_id="dagoth") is None
+    await cache.aset(_messages("cats"), "m", 0.3, "ANIMALS", persona_id="dagoth")
+
+    assert len(calls) == 1
+    assert not cache._miss_embeddings
+
+
+def test_stats_do_not_query_sqlite(tmp_path) -> None:
+    cache = PersistentLLMCache(db_path=tmp_path / "c.db")
+    cache.set(_messages("a"), "m", 0.3, "1")
+    cache.set(_messages("a"), "m", 0.3, "1 again")
+    cache.set(_messages("b"), "m", 0.3, "2")
+    cache.close()
+
+    reopened = PersistentLLMCache(db_path=tmp_path / "c.db")
+    assert reopened.get_stats()["disk_size"] == 0
+    assert reopened._conn is None
+    reopened.get(_messages("a"), "m", 0.3)
+    assert reopened.get_stats()["disk_size"] == 2
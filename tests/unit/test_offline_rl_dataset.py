@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import sqlite3
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from services.persona.rl.offline_rl import (  # noqa: E402
+    OfflineRLDataset,
+    StreamingOfflineRLDataset,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def _make_history(path, n_messages: int = 90) -> None:
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE messages (
+            id INTEGER PRIMARY KEY, channel_id INTEGER, role TEXT,
+            content TEXT, username TEXT, user_id INTEGER, timestamp REAL
+        );
+        CREATE TABLE rewards (
+            message_id INTEGER, quality_score REAL, reward REAL,
+            action_taken INTEGER
+        );
+        """
+    )
+    for i in range(n_messages):
+        conn.execute(
+            "INSERT INTO messages VALUES (?, ?, 'user', 'hi', 'u', 1, ?)",
+            (i, i % 3, float(i)),
+        )
+        conn.execute(
+            "INSERT INTO rewards VALUES (?, 0.9, ?, ?)", (i, i / 10.0, i % 4)
+        )
+    conn.commit()
+    conn.close()
+
+
+def _rows(states, actions, rewards, next_states):
+    return sorted(
+        (tuple(s), int(a), round(float(r), 4), tuple(n))
+        for s, a, r, n in zip(states, actions, rewards, next_states)
+    )
+
+
+def test_streaming_build_matches_in_memory_loader(tmp_path):
+    db_path = tmp_path / "history.db"
+    _make_history(db_path)
+    in_memory = OfflineRLDataset(db_path)
+    in_memory.load_from_history(max_conversations=1000)
+    dataset = StreamingOfflineRLDataset(db_path, tmp_path / "shards", shard_size=16)
+
+    total = dataset.build(chunk_size=7)
+
+    assert total == len(in_memory.transitions) == 87
+    assert len(dataset.shards) == 6
+    expected = _rows(
+        [t.state for t in in_memory.transitions],
+        [t.action.value for t in in_memory.transitions],
+        [t.reward for t in in_memory.transitions],
+        [t.next_state for t in in_memory.transitions],
+    )
+    shards = [dataset._load_shard(i, "train") for i in range(len(dataset.shards))]
+    merged = {k: np.concatenate([s[k] for s in shards]) for k in shards[0]}
+    assert (
+        _rows(
+            merged["states"],
+            merged["actions"],
+            merged["rewards"],
+            merged["next_states"],
+        )
+        == expected
+    )
+    assert dataset.get_stats()["mean_reward"] == pytest.approx(
+        in_memory.get_stats()["mean_reward"], rel=1e-5
+    )
+
+    # A new instance picks up the existing shards from the manifest
+    assert len(StreamingOfflineRLDataset(db_path, tmp_path / "shards")) == 87
+
+
+def test_iter_batches_covers_each_split_once(tmp_path):
+    db_path = tmp_path / "history.db"
+    _make_history(db_path)
+    dataset = StreamingOfflineRLDataset(
+        db_path, tmp_path / "shards", shard_size=16, state_dim=8
+    )
+    dataset.build(max_transitions=50)
+    train_size, val_size = dataset.split_train_val(val_ratio=0.25, seed=1)
+
+    train = list(dataset.iter_batches(8, seed=3))
+    val = list(dataset.iter_batches(8, shuffle=False, split="val"))
+
+    assert train_size + val_size == 50
+    assert [len(b.actions) for b in train[:-1]] == [8] * (len(train) - 1)
+    assert sum(len(b.actions) for b in train) == train_size
+    assert sum(len(b.actions) for b in val) == val_size
+    assert train[0].states.shape == (8, 8)
+    assert train[0].states.dtype == torch.float32
+    # States are embedded like NeuralAgent's tuple states
+    assert torch.all(train[0].states[:, 0] == 0.5)
+    assert torch.all(train[0].states[:, 3:] == 0)
+
+
+def test_rebuild_keeps_foreign_files_and_skips_unknown_actions(tmp_path):
+    db_path = tmp_path / "history.db"
+    _make_history(db_path, n_messages=12)
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE rewards SET action_taken = 99 WHERE message_id = 3")
+    conn.commit()
+    conn.close()
+    shard_dir = tmp_path / "shards"
+    shard_dir.mkdir()
+    (shard_dir / "notes.txt").write_text("keep me")
+    dataset = StreamingOfflineRLDataset(db_path, shard_dir, shard_size=4)
+
+    assert dataset.build() == 8
+    assert dataset.build() == 8
+
+    assert (shard_dir / "notes.txt").read_text() == "keep me"
+    assert sorted(p.name for p in shard_dir.glob("shard_*.npz")) == [
+        "shard_00000.npz",
+        "shard_00001.npz",
+    ]
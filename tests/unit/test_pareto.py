@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import random
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from services.persona.rl.multi_objective import (
+    REWARD_OBJECTIVES,
+    MultiObjectiveReward,
+    RewardComponents,
+)
+from services.persona.rl.pareto import (
+    ActionProfile,
+    ParetoFront,
+    ParetoSelector,
+    pareto_mask,
+    profiles_to_matrix,
+)
+from services.persona.rl.types import RLAction
+
+pytestmark = pytest.mark.unit
+
+OBJECTIVES = ["engagement", "quality", "affinity", "curiosity"]
+
+
+def _profiles(n: int, seed: int, drop_keys: bool = False):
+    rng = random.Random(seed)
+    profiles = []
+    for i in range(n):
+        q_values = {obj: float(rng.randint(0, 4)) for obj in OBJECTIVES}
+        if drop_keys and i % 3 == 0:
+            q_values.pop(rng.choice(OBJECTIVES))
+        profiles.append(ActionProfile(RLAction(i % len(RLAction)), q_values))
+    return profiles
+
+
+def _brute_force_frontier(profiles):
+    return [
+        p
+        for p in profiles
+        if not any(o is not p and o.dominates(p) for o in profiles)
+    ]
+
+
+@pytest.mark.parametrize("drop_keys", [False, True])
+def test_frontier_matches_pairwise_dominance(drop_keys):
+    selector = ParetoSelector()
+    for seed in range(20):
+        profiles = _profiles(40, seed, drop_keys=drop_keys)
+        profiles.append(ActionProfile(RLAction.WAIT, {}))
+
+        frontier = selector.find_pareto_frontier(profiles)
+
+        assert [id(p) for p in frontier] == [
+            id(p) for p in _brute_force_frontier(profiles)
+        ]
+
+
+def test_incremental_front_matches_batch_mask():
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 6, size=(300, 3)).astype(float)
+    front = ParetoFront(n_objectives=3, capacity=4)
+
+    for i, row in enumerate(values):
+        front.add(row, item=i)
+
+    expected = np.flatnonzero(pareto_mask(values))
+    assert sorted(front.items) == expected.tolist()
+    np.testing.assert_array_equal(front.values, values[front.items])
+    assert not front.add([0.0, 0.0, 0.0])
+
+
+def test_selection_strategies_match_per_profile_scores():
+    weight_sets = [
+        {"engagement": 1.0},
+        {"quality": 2.0, "curiosity": 2.0},
+        {"affinity": 0.3, "engagement": 0.7},
+        {"engagement": 0.0},
+    ]
+    for seed in range(10):
+        profiles = _profiles(12, seed, drop_keys=True)
+        selector = ParetoSelector()
+
+        batched = selector.select_actions_for_weights(profiles, weight_sets)
+
+        for weights, action in zip(weight_sets, batched):
+            single = ParetoSelector()
+            single.set_weights(weights)
+            scores = [p.weighted_sum(single.weights) for p in profiles]
+            # Ties may resolve to any of the best actions
+            top = max(scores)
+            best = {p.action for p, s in zip(profiles, scores) if s >= top - 1e-9}
+            assert action in best
+            assert single.select_action(profiles) in best
+
+        maximin = ParetoSelector(strategy="maximin").select_action(profiles)
+        assert maximin == max(profiles, key=ActionProfile.min_q_value).action
+
+
+def test_profiles_to_matrix_marks_missing_objectives():
+    matrix, objectives = profiles_to_matrix(
+        [
+            ActionProfile(RLAction.WAIT, {"quality": 1.0}),
+            ActionProfile(RLAction.REACT, {"engagement": 2.0, "quality": 3.0}),
+        ]
+    )
+
+    assert objectives == ["quality", "engagement"]
+    assert matrix[1].tolist() == [3.0, 2.0]
+    assert np.isnan(matrix[0, 1])
+
+
+def test_reward_scalarize_matches_calculate():
+    reward = MultiObjectiveReward()
+    state = SimpleNamespace(sentiment_history=[0.4], recent_topics=["music"])
+    components = [
+        reward.calculate(
+            SimpleNamespace(text=text, channel_id="c"),
+            response,
+            state,
+            affinity_delta=delta,
+            latency=latency,
+            exploration_bonus=bonus,
+        )
+        for text, response, delta, latency, bonus in [
+            ("what music do you like?", "I love jazz and lofi playlists!", 3, 0.5, 1),
+            ("ok", "k", -20.0, 30.0, 0),
+            ("tell me about your favorite games " * 5, "Sure 😀😀", 0.0, 2.0, 2),
+        ]
+    ]
+
+    totals = reward.scalarize(components)
+    np.testing.assert_allclose(totals, [c.total for c in components])
+
+    weight_sets = [{"engagement": 1.0}, {"quality": 1.0, "affinity": 1.0}]
+    matrix = np.stack([c.to_array() for c in components])
+    batched = reward.scalarize(matrix, weight_sets)
+    assert batched.shape == (3, 2)
+    for column, weights in enumerate(weight_sets):
+        total = sum(weights.values())
+        expected = [
+            2.0 * sum(getattr(c, obj) * w / total for obj, w in weights.items())
+            for c in components
+        ]
+        np.testing.assert_allclose(batched[:, column], expected)
+    assert matrix.shape[1] == len(REWARD_OBJECTIVES)
+
+    oversized = RewardComponents(20.0, 20.0, 20.0, 20.0, 20.0, total=0.0)
+    assert reward.scalarize([oversized])[0] == pytest.approx(10.0)
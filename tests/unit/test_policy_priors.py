@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from services.persona.rl.neural_agent import NeuralAgent  # noqa: E402
+from services.persona.rl.service import RLService  # noqa: E402
+from services.persona.rl.transfer import (  # noqa: E402
+    GLOBAL_PRIOR,
+    PolicyPriorCache,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def _agent(fill: float, updates: int = 1, epsilon: float = 0.5) -> NeuralAgent:
+    agent = NeuralAgent()
+    with torch.no_grad():
+        for tensor in agent.online_network.parameters():
+            tensor.fill_(fill)
+    agent.total_updates = updates
+    agent.epsilon = epsilon
+    return agent
+
+
+def _first_weight(agent: NeuralAgent, network: str = "online") -> float:
+    net = getattr(agent, f"{network}_network")
+    return float(next(iter(net.state_dict().values())).flatten()[0])
+
+
+def test_build_averages_trained_agents_per_context():
+    shared = _agent(1.0, epsilon=0.2)
+    groups = {
+        ("channel", 1): [shared, _agent(3.0, epsilon=0.4)],
+        ("channel", 2): [shared, _agent(100.0, updates=0)],
+    }
+
+    priors = PolicyPriorCache().build(groups)
+
+    assert set(priors) == {("channel", 1), ("channel", 2), GLOBAL_PRIOR}
+    first = next(iter(priors[("channel", 1)].state_dict.values()))
+    assert torch.allclose(first, torch.full_like(first, 2.0))
+    assert priors[("channel", 1)].epsilon == pytest.approx(0.3)
+    # Untrained agents are left out; shared agents count once globally
+    assert priors[("channel", 2)].agent_count == 1
+    assert priors[GLOBAL_PRIOR].agent_count == 2
+
+    mismatched = NeuralAgent(hidden_dims=(8,))
+    mismatched.total_updates = 1
+    priors = PolicyPriorCache().build({("channel", 3): [shared, mismatched]})
+    assert priors[GLOBAL_PRIOR].agent_count == 1
+
+
+def test_init_agent_copies_nearest_prior():
+    cache = PolicyPriorCache()
+    new_agent = NeuralAgent()
+    assert cache.init_agent(new_agent, ("channel", 1)) is None
+
+    cache.refresh({("channel", 1): [_agent(2.0, epsilon=0.1)]})
+    prior = cache.init_agent(new_agent, ("channel", 1))
+
+    assert prior.key == ("channel", 1)
+    assert _first_weight(new_agent) == _first_weight(new_agent, "target") == 2.0
+    assert new_agent.epsilon == pytest.approx(0.1)
+    # Unknown contexts fall back to the global prior
+    assert cache.get(("channel", 9)).key == GLOBAL_PRIOR
+
+    small = NeuralAgent(hidden_dims=(8,))
+    assert cache.init_agent(small, ("channel", 1)) is None
+    stats = cache.get_stats()
+    assert stats["initialized_agents"] == 1
+    assert stats["misses"] == 2
+
+
+def test_nearest_persona_uses_similarity_once_per_refresh():
+    calls = []
+
+    def similarity(source, target):
+        calls.append((source, target))
+        return {"calm": 0.9, "loud": 0.4}[source]
+
+    transfer = SimpleNamespace(
+        compute_persona_similarity=similarity, similarity_threshold=0.6
+    )
+    cache = PolicyPriorCache(knowledge_transfer=transfer)
+    cache.refresh(
+        {
+            ("persona", "calm"): [_agent(1.0)],
+            ("persona", "loud"): [_agent(5.0)],
+        }
+    )
+
+    assert cache.nearest_persona("gentle").key == ("persona", "calm")
+    assert cache.nearest_persona("gentle").key == ("persona", "calm")
+    assert len(calls) == 2
+    assert cache.nearest_persona("loud").key == ("persona", "loud")
+
+
+@pytest.mark.asyncio
+async def test_service_seeds_new_agents_from_background_priors(tmp_path):
+    config = SimpleNamespace(
+        RL_ENABLED=True,
+        RL_DATA_DIR=str(tmp_path / "rl"),
+        RL_BACKGROUND_TRAINING=False,
+        RL_PRIOR_REFRESH_SEC=3600.0,
+    )
+    service = RLService(config=config, algorithm="dqn")
+    trained = await service.get_neural_agent(1, 1)
+    with torch.no_grad():
+        for tensor in trained.online_network.parameters():
+            tensor.fill_(0.25)
+    trained.total_updates = 10
+
+    await service.start()
+    try:
+        for _ in range(50):
+            if service.policy_priors.get_stats()["priors"]:
+                break
+            await asyncio.sleep(0.01)
+
+        newcomer = await service.get_neural_agent(1, 2)
+        other_channel = await service.get_neural_agent(2, 1)
+
+        assert _first_weight(newcomer) == pytest.approx(0.25)
+        assert _first_weight(other_channel) == pytest.approx(0.25)
+        stats = service.get_training_metrics()["priors"]
+        assert stats["initialized_agents"] == 2
+        assert stats["refreshes"] == 1
+    finally:
+        await service.stop()
+
+    disabled = RLService(
+        config=SimpleNamespace(**vars(config), RL_USE_TRANSFER=False),
+        algorithm="dqn",
+    )
+    assert disabled.policy_priors is None
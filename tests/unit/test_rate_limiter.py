@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from services.core.rate_limiter import Priority, RateLimiter, request_priority
+
+
+pytestmark = pytest.mark.unit
+
+
+async def _hold(limiter: RateLimiter, release: asyncio.Event) -> None:
+    async with limiter.acquire():
+        await release.wait()
+
+
+async def _record(limiter: RateLimiter, order: list[str], name: str, **kwargs) -> None:
+    async with limiter.acquire(**kwargs):
+        order.append(name)
+
+
+@pytest.mark.asyncio
+async def test_interactive_requests_jump_ahead_of_background() -> None:
+    limiter = RateLimiter(max_concurrent=1, requests_per_minute=6000)
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold(limiter, release))
+    await asyncio.sleep(0)
+
+    order: list[str] = []
+    tasks = [
+        asyncio.create_task(_record(limiter, order, "bg1", priority=Priority.BACKGROUND)),
+        asyncio.create_task(_record(limiter, order, "bg2", priority=Priority.BACKGROUND)),
+        asyncio.create_task(_record(limiter, order, "reply", priority=Priority.INTERACTIVE)),
+    ]
+    await asyncio.sleep(0)
+    assert limiter.get_stats()["queued"] == {"interactive": 1, "normal": 0, "background": 2}
+
+    release.set()
+    await asyncio.gather(holder, *tasks)
+    assert order == ["reply", "bg1", "bg2"]
+
+
+@pytest.mark.asyncio
+async def test_tenants_are_interleaved_within_a_priority() -> None:
+    limiter = RateLimiter(max_concurrent=1, requests_per_minute=6000)
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold(limiter, release))
+    await asyncio.sleep(0)
+
+    order: list[str] = []
+    tasks = [
+        asyncio.create_task(_record(limiter, order, f"a{i}", tenant="guild-a"))
+        for i in range(3)
+    ]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(_record(limiter, order, "b0", tenant="guild-b")))
+    await asyncio.sleep(0)
+
+    release.set()
+    await asyncio.gather(holder, *tasks)
+    assert order == ["a0", "b0", "a1", "a2"]
+
+
+@pytest.mark.asyncio
+async def test_ambient_priority_context_is_used_by_default() -> None:
+    limiter = RateLimiter(max_concurrent=1, requests_per_minute=6000)
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold(limiter, release))
+    await asyncio.sleep(0)
+
+    order: list[str] = []
+    with request_priority(Priority.BACKGROUND):
+        background = asyncio.create_task(_record(limiter, order, "summary"))
+    normal = asyncio.create_task(_record(limiter, order, "reply"))
+    await asyncio.sleep(0)
+
+    release.set()
+    await asyncio.gather(holder, background, normal)
+    assert order == ["reply", "summary"]
+    assert limiter.get_stats()["wait"]["background"]["granted"] == 1
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_throttles_after_burst() -> None:
+    limiter = RateLimiter(max_concurrent=5, requests_per_minute=600, burst=2)
+
+    started = time.monotonic()
+    for _ in range(3):
+        async with limiter.acquire():
+            pass
+    elapsed = time.monotonic() - started
+
+    # Third request waits ~0.1s for a token at 10 tokens/second
+    assert elapsed >= 0.08
+    assert limiter.get_stats()["wait"]["normal"]["max_ms"] >= 80
+
+
+@pytest.mark.asyncio
+async def test_idle_tenant_state_is_pruned() -> None:
+    limiter = RateLimiter(
+        max_concurrent=1, requests_per_minute=60000, tenant_requests_per_minute=6000
+    )
+
+    for guild in range(50):
+        async with limiter.acquire(tenant=guild):
+            pass
+        assert len(limiter._tenant_tags) == 0
+
+    # Buckets refill to capacity while idle and are dropped on the next pass
+    for bucket in limiter._tenant_buckets.values():
+        bucket.updated -= 60
+    async with limiter.acquire(tenant="fresh"):
+        pass
+    assert set(limiter._tenant_buckets) <= {"fresh"}
+
+
+@pytest.mark.asyncio
+async def test_openai_compat_provider_requests_take_a_limiter_slot() -> None:
+    from providers.base import ProviderMessage
+    from providers.openai_compat import OpenAICompatProvider
+
+    limiter = RateLimiter(max_concurrent=1, requests_per_minute=6000)
+    active = []
+
+    class _Response:
+        status = 200
+
+        async def __aenter__(self):
+            active.append(limiter.get_stats()["active"])
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def json(self):
+            return {"choices": [{"message": {"content": "ok"}}]}
+
+    class _Session:
+        def post(self, url, **kwargs):
+            return _Response()
+
+    provider = OpenAICompatProvider(
+        base_url="http://example", api_key="", model="m", rate_limiter=limiter
+    )
+    provider._session = _Session()
+
+    with request_priority(Priority.INTERACTIVE, tenant=1):
+        response = await provider.chat(
+            messages=[ProviderMessage(role="user", content="hi")]
+        )
+
+    assert response.content == "ok"
+    assert active == [1]
+    assert limiter.get_stats()["wait"]["interactive"]["granted"] == 1
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from services.persona.rl.neural_agent import TORCH_AVAILABLE, NeuralAgent
+from services.persona.rl.replay_buffer import (
+    PrioritizedReplayBuffer,
+    ReplayBuffer,
+    SumTree,
+    Transition,
+)
+from services.persona.rl.types import RLAction
+
+pytestmark = pytest.mark.unit
+
+
+def _transition(i: int) -> Transition:
+    return Transition(
+        state=(i % 10, i % 100, i % 50),
+        action=RLAction(i % len(RLAction)),
+        reward=float(i),
+        next_state=((i + 1) % 10, (i + 1) % 100, (i + 1) % 50),
+        done=i % 7 == 0,
+    )
+
+
+def test_ring_buffer_overwrites_oldest():
+    buffer = ReplayBuffer(capacity=5)
+    for i in range(8):
+        buffer.add_sync(_transition(i))
+
+    assert len(buffer) == 5
+    assert buffer.is_full
+    assert buffer.get_stats()["position"] == 3
+    assert [t.reward for t in buffer.recent(3)] == [5.0, 6.0, 7.0]
+    rewards = sorted(t.reward for t in buffer.sample_sync(5))
+    assert rewards == [3.0, 4.0, 5.0, 6.0, 7.0]
+
+
+@pytest.mark.asyncio
+async def test_sample_round_trips_transitions():
+    buffer = ReplayBuffer(capacity=16)
+    for i in range(10):
+        await buffer.add(_transition(i))
+
+    for sampled in await buffer.sample(10):
+        expected = _transition(int(sampled.reward))
+        assert sampled == expected
+        assert isinstance(sampled.state, tuple)
+        assert isinstance(sampled.action, RLAction)
+
+    with pytest.raises(RuntimeError):
+        await buffer.sample(11)
+    with pytest.raises(ValueError):
+        await buffer.sample(0)
+
+
+@pytest.mark.skipif(not TORCH_AVAILABLE, reason="PyTorch not installed")
+def test_sample_arrays_embeds_like_neural_agent():
+    buffer = ReplayBuffer(capacity=16)
+    for i in range(10):
+        buffer.add_sync(_transition(i))
+    agent = NeuralAgent(state_dim=32)
+
+    batch = buffer.sample_arrays_sync(4, state_dim=agent.state_dim)
+
+    assert batch.states.shape == (4, 32)
+    assert batch.weights.tolist() == [1.0] * 4
+    for row, reward in zip(batch.states, batch.rewards):
+        expected = agent._state_to_tensor(_transition(int(reward)).state)
+        np.testing.assert_allclose(row, expected.cpu().numpy()[0], rtol=1e-6)
+
+    loss, td_errors = agent.update_batch(
+        batch.states,
+        batch.actions,
+        batch.rewards,
+        batch.next_states,
+        batch.dones,
+        weights=batch.weights,
+    )
+    assert np.isfinite(loss)
+    assert td_errors.shape == (4,)
+    assert agent.get_stats()["total_updates"] == 1
+
+
+def test_sum_tree_find_matches_cumulative_sum():
+    tree = SumTree(6)
+    priorities = np.array([1.0, 0.0, 2.0, 3.0, 0.5, 1.5])
+    tree.update(np.arange(6), priorities)
+
+    values = np.linspace(0.0, priorities.sum() - 1e-9, 50)
+    expected = np.searchsorted(np.cumsum(priorities), values, side="right")
+    assert tree.total == pytest.approx(priorities.sum())
+    assert tree.find(values).tolist() == expected.tolist()
+
+
+def test_prioritized_sampling_prefers_high_td_error():
+    buffer = PrioritizedReplayBuffer(capacity=64, alpha=1.0, beta=1.0)
+    for i in range(64):
+        buffer.add_sync(_transition(i))
+    # Slot 63 holds half of the total priority mass
+    buffer.update_priorities_sync(list(range(64)), [1.0] * 63 + [63.0])
+
+    batch = buffer.sample_arrays_sync(32)
+
+    hot = batch.indices == 63
+    assert hot.sum() >= 15
+    assert batch.weights.max() == pytest.approx(1.0)
+    assert batch.weights[hot].max() < batch.weights[~hot].min()
+
+
+def test_save_load_round_trip(tmp_path):
+    buffer = PrioritizedReplayBuffer(capacity=8)
+    for i in range(11):
+        buffer.add_sync(_transition(i))
+    buffer.update_priorities_sync([0, 1], [5.0, 0.5])
+    path = tmp_path / "replay_buffer.npz"
+
+    buffer.save(path)
+    loaded = PrioritizedReplayBuffer.load(path)
+
+    assert len(loaded) == len(buffer)
+    assert loaded.get_stats() == buffer.get_stats()
+    np.testing.assert_allclose(
+        loaded._tree.get(np.arange(8)), buffer._tree.get(np.arange(8))
+    )
+    restored = ReplayBuffer.load(path)
+    assert sorted(t.reward for t in restored.sample_sync(8)) == [
+        float(i) for i in range(3, 11)
+    ]
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from providers.base import LLMResponse, LLMStreamChunk, ProviderMessage
+from providers.coalescing import RequestCoalescer, request_key
+from providers.openai_compat import OpenAICompatProvider
+from services.core.rate_limiter import Priority, request_priority
+
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_calls_reach_backend_once() -> None:
+    coalescer = RequestCoalescer()
+    calls = 0
+    release = asyncio.Event()
+
+    async def backend() -> str:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "TOPIC"
+
+    waiters = [
+        asyncio.create_task(coalescer.run("k", backend)) for _ in range(5)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*waiters) == ["TOPIC"] * 5
+    assert calls == 1
+    assert coalescer.get_stats()["coalesced"] == 4
+    # Completion-based cleanup: nothing lingers after the call finishes
+    assert coalescer.get_stats()["inflight_calls"] == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_fans_out_all_chunks_to_every_waiter() -> None:
+    coalescer = RequestCoalescer()
+    starts = 0
+    gate = asyncio.Event()
+
+    async def backend():
+        nonlocal starts
+        starts += 1
+        yield "a"
+        await gate.wait()
+        yield "b"
+        yield "c"
+
+    async def consume() -> list[str]:
+        return [chunk async for chunk in coalescer.stream("k", backend)]
+
+    first = asyncio.create_task(consume())
+    await asyncio.sleep(0.01)
+    # Joins after "a" was produced and must still see it
+    second = asyncio.create_task(consume())
+    await asyncio.sleep(0.01)
+    gate.set()
+
+    assert await first == ["a", "b", "c"]
+    assert await second == ["a", "b", "c"]
+    assert starts == 1
+    assert coalescer.get_stats()["inflight_streams"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelling_last_waiter_cancels_backend_call() -> None:
+    coalescer = RequestCoalescer()
+    cancelled = asyncio.Event()
+
+    async def backend() -> str:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return "never"
+
+    waiter = asyncio.create_task(coalescer.run("k", backend))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_openai_compat_provider_coalesces_identical_requests(monkeypatch) -> None:
+    provider = OpenAICompatProvider(
+        base_url="http://example", api_key="", model="m", coalescer=RequestCoalescer()
+    )
+    calls = 0
+
+    async def fake_chat(messages, tools, stream, model):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return LLMResponse(content="ok")
+
+    async def fake_stream(messages, tools, model):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        yield LLMStreamChunk(kind="text_delta", text="ok")
+
+    monkeypatch.setattr(provider, "_chat", fake_chat)
+    monkeypatch.setattr(provider, "_stream_chat", fake_stream)
+    messages = [ProviderMessage(role="user", content="classify this")]
+
+    responses = await asyncio.gather(
+        *(provider.chat(messages=messages) for _ in range(3))
+    )
+
+    async def consume():
+        return [c.text async for c in provider.stream_chat(messages=messages)]
+
+    streamed = await asyncio.gather(consume(), consume())
+
+    assert [r.content for r in responses] == ["ok"] * 3
+    assert streamed == [["ok"], ["ok"]]
+    assert calls == 2
+
+
+def test_request_key_separates_priorities_and_tenants() -> None:
+    messages = [{"role": "user", "content": "hi"}]
+    with request_priority(Priority.BACKGROUND, tenant=1):
+        background = request_key("chat", "ollama", messages, model="m")
+    with request_priority(Priority.INTERACTIVE, tenant=1):
+        interactive = request_key("chat", "ollama", messages, model="m")
+        other_guild = request_key("chat", "ollama", messages, model="m", tenant=2)
+        same_lane = request_key(
+            "chat", "ollama", messages, model="m", priority=Priority.INTERACTIVE
+        )
+
+    assert interactive != background
+    assert interactive != other_guild
+    assert interactive == same_lane
+
+
+@pytest.mark.asyncio
+async def test_interactive_duplicate_does_not_wait_on_background_leader() -> None:
+    coalescer = RequestCoalescer()
+    release_background = asyncio.Event()
+    messages = [{"role": "user", "content": "summarize"}]
+
+    async def backend(label: str) -> str:
+        if label == "background":
+            await release_background.wait()
+        return label
+
+    with request_priority(Priority.BACKGROUND):
+        leader = asyncio.create_task(
+            coalescer.run(
+                request_key("chat", "ollama", messages), lambda: backend("background")
+            )
+        )
+    await asyncio.sleep(0)
+
+    with request_priority(Priority.INTERACTIVE):
+        reply = await asyncio.wait_for(
+            coalescer.run(
+                request_key("chat", "ollama", messages), lambda: backend("interactive")
+            ),
+            timeout=1,
+        )
+
+    assert reply == "interactive"
+    release_background.set()
+    assert await leader == "background"
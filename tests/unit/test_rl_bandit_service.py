@@ -4,7 +4,7 @@ from types import SimpleNamespace
 
 import pytest
 
-from services.persona.rl.bandit import LinUCBBandit
+from services.persona.rl.bandit_types import BanditContext, ModeSwitchAction
 from services.persona.rl.service import RLService
 
 
@@ -26,16 +26,44 @@ def _config(tmp_path):
 def test_rl_service_initializes_bandit_state(tmp_path) -> None:
     service = RLService(config=_config(tmp_path))
 
-    assert service.bandits == {}
-    assert service.bandit_storage.file_path.name == "bandit_states.json"
+    assert len(service.bandits) == 0
+    assert service.bandit_storage.records is service.storage.records
     assert service.bandit_config.feature_dim == 7
 
 
 @pytest.mark.asyncio
 async def test_rl_service_saves_bandits_even_without_dirty_agents(tmp_path) -> None:
     service = RLService(config=_config(tmp_path))
-    service.bandits[(1, 2)] = LinUCBBandit(service.bandit_config)
+    await service.update_bandit(
+        1, 2, ModeSwitchAction.SWITCH_TO_LOGIC, BanditContext(sentiment=0.5), 1.0
+    )
+
+    await service._save_all_dirty()
+
+    assert service.records.count("bandits") == 1
+    assert service.bandits.dirty_keys() == []
 
+
+@pytest.mark.asyncio
+async def test_rl_service_bandits_survive_restart(tmp_path) -> None:
+    service = RLService(config=_config(tmp_path))
+    context = BanditContext(sentiment=0.5, topic="music")
+    for _ in range(10):
+        await service.update_bandit(
+            1, 2, ModeSwitchAction.SWITCH_TO_LOGIC, context, 1.0
+        )
     await service._save_all_dirty()
 
-    assert service.bandit_storage.file_path.exists()
+    restarted = RLService(config=_config(tmp_path))
+    assert restarted.bandit_storage.load(restarted.bandits) == 1
+    # Nothing is restored up front; bandits load on first access
+    assert len(restarted.bandits) == 0
+
+    probe = BanditContext(sentiment=-0.2, topic="games")
+    expected = await service.select_mode_switch_action(1, 2, probe)
+    assert await restarted.select_mode_switch_action(1, 2, probe) == expected
+    stats = restarted.get_bandit_stats(1, 2)
+    assert stats["action_counts"]["SWITCH_TO_LOGIC"] == 10
+    assert await restarted.select_mode_switch_actions(
+        [(1, 2), (3, 4)], [probe, probe]
+    ) == [expected, await restarted.select_mode_switch_action(3, 4, probe)]
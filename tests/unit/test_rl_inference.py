@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from services.persona.rl.inference import (  # noqa: E402
+    InferenceBatcher,
+    NumpyPolicy,
+    build_policy_runtime,
+)
+from services.persona.rl.neural_agent import NeuralAgent  # noqa: E402
+from services.persona.rl.service import SHARED_POLICY, RLService  # noqa: E402
+
+pytestmark = pytest.mark.unit
+
+
+def _states(n: int, dim: int = 16) -> np.ndarray:
+    return np.random.default_rng(0).normal(size=(n, dim)).astype(np.float32)
+
+
+def _reference_q(agent: NeuralAgent, states: np.ndarray) -> np.ndarray:
+    with torch.no_grad():
+        return agent.online_network(torch.from_numpy(states)).numpy()
+
+
+def test_numpy_and_default_runtimes_match_network():
+    agent = NeuralAgent(state_dim=16, hidden_dims=(32, 32))
+    states = _states(5)
+    expected = _reference_q(agent, states)
+
+    numpy_policy = NumpyPolicy.from_state_dict(
+        agent.to_dict()["online_network_state"]
+    )
+    runtime = build_policy_runtime(agent)
+
+    np.testing.assert_allclose(numpy_policy(states), expected, rtol=1e-5, atol=1e-6)
+    np.testing.assert_allclose(runtime(states), expected, rtol=1e-5, atol=1e-6)
+
+    # Runtimes are snapshots; later training doesn't leak into them
+    with torch.no_grad():
+        for param in agent.online_network.parameters():
+            param.add_(1.0)
+    np.testing.assert_allclose(runtime(states), expected, rtol=1e-5, atol=1e-6)
+
+
+@pytest.mark.asyncio
+async def test_batcher_evaluates_concurrent_requests_in_one_pass():
+    agent = NeuralAgent(state_dim=16, hidden_dims=(32,))
+    batcher = InferenceBatcher(window_ms=20.0)
+    batcher.set_policy("p", build_policy_runtime(agent))
+    states = _states(12)
+
+    results = await asyncio.gather(*(batcher.q_values("p", s) for s in states))
+
+    np.testing.assert_allclose(
+        np.stack(results), _reference_q(agent, states), rtol=1e-5, atol=1e-6
+    )
+    stats = batcher.get_stats()
+    assert stats["batches"] == 1
+    assert stats["max_batch_size"] == 12
+
+    with pytest.raises(KeyError):
+        await batcher.q_values("missing", states[0])
+
+
+@pytest.mark.asyncio
+async def test_batcher_flushes_when_batch_is_full():
+    agent = NeuralAgent(state_dim=16, hidden_dims=(32,))
+    batcher = InferenceBatcher(window_ms=10_000.0, max_batch_size=4)
+    batcher.set_policy("p", build_policy_runtime(agent))
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*(batcher.q_values("p", s) for s in _states(8))), timeout=1.0
+    )
+
+    assert len(results) == 8
+    assert batcher.get_stats()["batches"] == 2
+
+
+@pytest.mark.asyncio
+async def test_service_batches_dqn_decisions_across_channels(tmp_path):
+    config = SimpleNamespace(
+        RL_ENABLED=True,
+        RL_DATA_DIR=str(tmp_path / "rl"),
+        RL_INFERENCE_BATCHING=True,
+        RL_INFERENCE_WINDOW_MS=500.0,
+    )
+    service = RLService(config=config, algorithm="dqn")
+    policy = await service._get_training_agent()
+    for channel_id in range(1, 9):
+        agent = await service.get_neural_agent(channel_id, 1)
+        agent.epsilon = 0.0
+
+    state = (5, 10, 3)
+    actions = await asyncio.gather(
+        *(service.get_action(channel_id, 1, state) for channel_id in range(1, 9))
+    )
+
+    expected = int(np.argmax(policy.get_q_values(state)))
+    assert {action.value for action, _ in actions} <= {expected, 0}
+    stats = service.get_training_metrics()["inference"]
+    assert stats["batches"] == 1
+    assert stats["requests"] == 8
+    assert service.inference_batcher.has_policy(SHARED_POLICY)
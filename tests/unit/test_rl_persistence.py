@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from services.persona.rl.agent import RLAgent
+from services.persona.rl.persistence import RecordStore, RLStorage
+from services.persona.rl.service import RLService
+from services.persona.rl.types import RLAction
+
+pytestmark = pytest.mark.unit
+
+
+def _config(tmp_path):
+    return SimpleNamespace(RL_ENABLED=True, RL_DATA_DIR=str(tmp_path / "rl"))
+
+
+def _trained_agent(reward: float) -> RLAgent:
+    agent = RLAgent(epsilon=0.3)
+    agent.update((1, 2, 0), RLAction.ENGAGE, reward, (1, 1, 1))
+    return agent
+
+
+def test_agents_round_trip_as_binary_records(tmp_path) -> None:
+    storage = RLStorage(tmp_path)
+    agents = {(1, 2): _trained_agent(5.0), (3, 4): _trained_agent(-1.0)}
+
+    assert storage.save(agents) == 2
+    loaded = RLStorage(tmp_path).load()
+
+    assert set(loaded) == {(1, 2), (3, 4)}
+    assert loaded[(1, 2)].epsilon == pytest.approx(0.3)
+    assert loaded[(1, 2)].q_table == agents[(1, 2)].q_table
+    assert not loaded[(1, 2)].dirty
+
+
+def test_legacy_json_policies_are_imported(tmp_path) -> None:
+    legacy = {"version": 1, "agents": {"1:2": _trained_agent(2.0).to_dict()}}
+    (tmp_path / "rl_policies.json").write_text(json.dumps(legacy))
+
+    loaded = RLStorage(tmp_path).load()
+
+    assert loaded[(1, 2)].dirty
+    assert loaded[(1, 2)].q_table[(1, 2, 0)][RLAction.ENGAGE] == pytest.approx(
+        _trained_agent(2.0).q_table[(1, 2, 0)][RLAction.ENGAGE]
+    )
+
+
+@pytest.mark.asyncio
+async def test_service_writes_only_changed_agents(tmp_path) -> None:
+    service = RLService(config=_config(tmp_path))
+    for user_id in range(3):
+        agent = await service.get_agent(1, user_id)
+        agent.update((0, 0, 0), RLAction.REACT, 1.0, (0, 0, 1))
+    await service._save_all_dirty()
+    first = service.records.manifest("agents")
+    assert len(first) == 3
+
+    (await service.get_agent(1, 0)).update((0, 0, 0), RLAction.WAIT, 1.0, (0, 0, 1))
+    await service._save_all_dirty()
+    second = service.records.manifest("agents")
+
+    assert second["1:0"]["updated_at"] > first["1:0"]["updated_at"]
+    assert second["1:1"] == first["1:1"]
+    assert second["1:2"] == first["1:2"]
+
+
+@pytest.mark.asyncio
+async def test_evicted_agents_are_reloaded_from_disk(tmp_path) -> None:
+    service = RLService(config=_config(tmp_path))
+    service.max_agents = 1
+
+    agent = await service.get_agent(1, 1)
+    agent.update((0, 0, 0), RLAction.ENGAGE, 3.0, (0, 0, 1))
+    expected = dict(agent.q_table)
+    await service.get_agent(1, 2)  # evicts and saves (1, 1)
+
+    assert (1, 1) not in service.agents
+    reloaded = await service.get_agent(1, 1)
+    assert reloaded is not agent
+    assert reloaded.q_table == expected
+
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_share_one_agent(tmp_path, monkeypatch) -> None:
+    service = RLService(config=_config(tmp_path))
+    monkeypatch.setattr(
+        service.storage, "load_one", lambda key: time.sleep(0.05) or None
+    )
+
+    first, second = await asyncio.gather(
+        service.get_agent(1, 1), service.get_agent(1, 1)
+    )
+
+    assert first is second
+    assert service.agents[(1, 1)] is first
+
+
+@pytest.mark.asyncio
+async def test_failed_write_keeps_agents_dirty(tmp_path, monkeypatch) -> None:
+    service = RLService(config=_config(tmp_path))
+    agent = await service.get_agent(1, 1)
+    agent.update((0, 0, 0), RLAction.ENGAGE, 3.0, (0, 0, 1))
+    monkeypatch.setattr(service.storage, "write", lambda records: 0)
+
+    await service._save_all_dirty()
+
+    assert agent.dirty
+
+
+def test_record_store_upserts_in_place(tmp_path) -> None:
+    records = RecordStore(tmp_path / "state.db")
+    records.write("ns", {"a": b"1", "b": b"2"})
+    records.write("ns", {"a": b"3"})
+
+    assert dict(records.read_all("ns")) == {"a": b"3", "b": b"2"}
+    assert records.count("other") == 0
+    records.close()
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from services.persona.rl.neural_agent import NeuralAgent  # noqa: E402
+from services.persona.rl.replay_buffer import ReplayBuffer, Transition  # noqa: E402
+from services.persona.rl.service import RLService  # noqa: E402
+from services.persona.rl.training import TrainingScheduler  # noqa: E402
+from services.persona.rl.types import RLAction  # noqa: E402
+
+pytestmark = pytest.mark.unit
+
+
+def _filled_buffer(n: int = 64) -> ReplayBuffer:
+    buffer = ReplayBuffer(capacity=128)
+    for i in range(n):
+        buffer.add_sync(
+            Transition(
+                state=(i % 10, i % 100, i % 50),
+                action=RLAction(i % len(RLAction)),
+                reward=1.0,
+                next_state=((i + 1) % 10, (i + 1) % 100, (i + 1) % 50),
+            )
+        )
+    return buffer
+
+
+def _weights(agent: NeuralAgent) -> dict:
+    return {k: v.clone() for k, v in agent.online_network.state_dict().items()}
+
+
+@pytest.mark.asyncio
+async def test_interval_trains_off_loop_and_swaps_weights():
+    agent = NeuralAgent(state_dim=16, hidden_dims=(32,))
+    before = _weights(agent)
+    swapped = []
+
+    async def on_swap(serving, interval):
+        swapped.append(interval)
+
+    scheduler = TrainingScheduler(
+        agent, _filled_buffer(), batch_size=8, budget_ms=5000.0, on_swap=on_swap
+    )
+    loop_thread = threading.get_ident()
+    threads = []
+    original = scheduler.learner.update_batch
+
+    def spy(*args, **kwargs):
+        threads.append(threading.get_ident())
+        return original(*args, **kwargs)
+
+    scheduler.learner.update_batch = spy
+
+    interval = await scheduler.run_interval()
+
+    assert interval.steps == 8
+    assert threads and loop_thread not in threads
+    assert swapped == [interval]
+    after = _weights(agent)
+    assert any(not torch.equal(before[k], after[k]) for k in before)
+    learner = _weights(scheduler.learner)
+    assert all(torch.equal(learner[k], after[k]) for k in after)
+
+
+@pytest.mark.asyncio
+async def test_zero_budget_leaves_serving_weights_untouched():
+    agent = NeuralAgent(state_dim=16, hidden_dims=(32,))
+    before = _weights(agent)
+    scheduler = TrainingScheduler(agent, _filled_buffer(), batch_size=8, budget_ms=0)
+
+    assert await scheduler.run_interval() is None
+    after = _weights(agent)
+    assert all(torch.equal(before[k], after[k]) for k in before)
+
+
+def test_high_latency_pauses_training_until_it_ages_out():
+    agent = NeuralAgent(state_dim=16, hidden_dims=(32,))
+    scheduler = TrainingScheduler(
+        agent, _filled_buffer(), batch_size=8, pause_latency_ms=100.0
+    )
+
+    scheduler.record_latency(0.05)
+    assert not scheduler.should_pause()
+    scheduler.record_latency(0.5)
+    assert scheduler.should_pause()
+
+    scheduler.interval = 0.0  # every sample is now outside the window
+    assert not scheduler.should_pause()
+
+
+@pytest.mark.asyncio
+async def test_only_event_loop_lag_pauses_training():
+    agent = NeuralAgent(state_dim=16, hidden_dims=(32,))
+    scheduler = TrainingScheduler(
+        agent,
+        ReplayBuffer(capacity=8),
+        batch_size=8,
+        interval_sec=0.01,
+        pause_latency_ms=50.0,
+    )
+    scheduler.start()
+    try:
+        # Awaiting slow I/O (an LLM call) leaves the loop free
+        await asyncio.sleep(0.1)
+        assert not scheduler.should_pause()
+
+        time.sleep(0.1)  # a handler blocking the loop
+        await asyncio.sleep(0.03)
+        assert scheduler.should_pause()
+    finally:
+        await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_service_defers_dqn_training_to_scheduler(tmp_path):
+    config = SimpleNamespace(
+        RL_ENABLED=True,
+        RL_DATA_DIR=str(tmp_path / "rl"),
+        RL_TRAIN_INTERVAL_SEC=3600.0,
+    )
+    service = RLService(config=config, algorithm="dqn")
+    service.warmup_steps = 0
+    service.train_every = 1
+    await service.start()
+    try:
+        assert service.training_scheduler is not None
+        for i in range(40):
+            await service.update_agent(
+                1, 2, (5, i, 3), RLAction.ENGAGE, 1.0, (5, i + 1, 3)
+            )
+
+        # Nothing trained inline on the message path
+        assert service.get_training_metrics()["total_training_steps"] == 0
+
+        interval = await service.training_scheduler.run_interval()
+        metrics = service.get_training_metrics()
+        assert metrics["total_training_steps"] == interval.steps > 0
+        assert metrics["scheduler"]["swaps"] == 1
+
+        service.record_latency(10.0)
+        assert service.training_scheduler.should_pause()
+    finally:
+        await service.stop()
+    assert service.training_scheduler is None
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+import json
 from dataclasses import dataclass
 from typing import Any
 
@@ -399,3 +401,151 @@ async def test_runtime_stdio_server_accepts_injected_runtime_host(
     assert host.closed is True
     assert host.runtime.closed is True
     assert capsys.readouterr().out == ""
+
+
+class _SlowChatRuntime(_FakeRuntime):
+    async def handle_event_envelope(self, event: Any):
+        await asyncio.sleep(float(event.metadata.get("delay", 0.05)))
+        return await _FakeRuntime.handle_event_envelope(self, event)
+
+    async def stream_event(self, event: Any, cancel_token: Any = None):
+        for token in ["he", "llo"]:
+            await asyncio.sleep(0)
+            yield {"type": "text_delta", "text": token, "aggregate_text": ""}
+        yield {"type": "output", "output": _FakeOutput(text="hello"), "event_id": "e"}
+
+
+def _stdio_lines(*requests: dict[str, Any]) -> list[str]:
+    return [json.dumps(request) + "\n" for request in requests]
+
+
+def _written(capsys: pytest.CaptureFixture[str]) -> list[dict[str, Any]]:
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+@pytest.mark.asyncio
+async def test_runtime_stdio_slow_request_does_not_block_snapshots(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    monkeypatch.setattr(
+        "sys.stdin",
+        iter(
+            _stdio_lines(
+                {"id": 1, "method": "send_event", "params": {"text": "hi"}},
+                {"id": 2, "method": "get_status", "params": {"persona_id": "tai"}},
+            )
+        ),
+    )
+
+    assert await run_stdio_server(_SlowChatRuntime()) == 0
+
+    responses = _written(capsys)
+    assert [r["id"] for r in responses] == [2, 1]
+    assert all(r["ok"] for r in responses)
+    assert responses[1]["result"]["outputs"][0]["text"] == "echo:hi"
+
+
+@pytest.mark.asyncio
+async def test_runtime_stdio_cancels_in_flight_request(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    monkeypatch.setattr(
+        "sys.stdin",
+        iter(
+            _stdio_lines(
+                {
+                    "id": "slow",
+                    "method": "send_event",
+                    "params": {"text": "hi", "metadata": {"delay": 10}},
+                },
+                {"id": "c1", "method": "cancel", "params": {"id": "slow"}},
+            )
+        ),
+    )
+
+    assert await asyncio.wait_for(run_stdio_server(_SlowChatRuntime()), 2) == 0
+
+    responses = {r["id"]: r for r in _written(capsys)}
+    assert responses["c1"]["result"] == {"cancelled": True}
+    assert responses["slow"]["ok"] is False
+    assert responses["slow"]["error"]["code"] == "RUNTIME_STDIO_CANCELLED"
+
+
+@pytest.mark.asyncio
+async def test_runtime_stdio_cancel_signals_the_request_token(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    tokens = []
+
+    class _HangingStreamRuntime(_FakeRuntime):
+        async def stream_event(self, event: Any, cancel_token: Any = None):
+            tokens.append(cancel_token)
+            yield {"type": "text_delta", "text": "he", "aggregate_text": ""}
+            await asyncio.sleep(10)
+
+    monkeypatch.setattr(
+        "sys.stdin",
+        iter(
+            _stdio_lines(
+                {"id": "s", "method": "send_event", "params": {"text": "hi", "stream": True}},
+                {"id": "c", "method": "cancel", "params": {"id": "s"}},
+            )
+        ),
+    )
+
+    assert await asyncio.wait_for(run_stdio_server(_HangingStreamRuntime()), 2) == 0
+
+    assert tokens[0].cancelled
+    assert tokens[0].reason == "client_cancel"
+    responses = {m["id"]: m for m in _written(capsys) if "id" in m}
+    assert responses["s"]["error"]["code"] == "RUNTIME_STDIO_CANCELLED"
+
+
+@pytest.mark.asyncio
+async def test_runtime_stdio_rejects_duplicate_in_flight_id(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    slow = {"id": "a", "method": "send_event", "params": {"text": "one"}}
+    monkeypatch.setattr(
+        "sys.stdin",
+        iter(_stdio_lines(slow, {**slow, "params": {"text": "two"}})),
+    )
+
+    assert await run_stdio_server(_SlowChatRuntime()) == 0
+
+    responses = _written(capsys)
+    assert [r["ok"] for r in responses] == [False, True]
+    assert responses[0]["error"]["code"] == "RUNTIME_STDIO_DUPLICATE_ID"
+    assert responses[1]["result"]["outputs"][0]["text"] == "echo:one"
+
+
+@pytest.mark.asyncio
+async def test_runtime_stdio_streams_progress_notifications(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    monkeypatch.setattr(
+        "sys.stdin",
+        iter(
+            _stdio_lines(
+                {
+                    "id": 7,
+                    "method": "send_event",
+                    "params": {"text": "hi", "stream": True},
+                }
+            )
+        ),
+    )
+
+    assert await run_stdio_server(_SlowChatRuntime(), max_concurrency=1) == 0
+
+    messages = _written(capsys)
+    progress = [m["params"] for m in messages if m.get("method") == "progress"]
+    assert [p["item"].get("text") for p in progress[:2]] == ["he", "llo"]
+    assert all(p["id"] == 7 for p in progress)
+    assert messages[-1]["id"] == 7
+    assert messages[-1]["result"]["outputs"][0]["text"] == "hello"
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from services.persona.rl.feature_pipeline import (
+    SCOPE_CHANNEL,
+    SCOPE_USER,
+    FeaturePipeline,
+    FeatureSpec,
+)
+from services.persona.rl.state_features import (
+    StateFeatureExtractor,
+    build_state_pipeline,
+)
+from services.persona.rl.types import RLAction
+
+pytestmark = pytest.mark.unit
+
+NOW = datetime(2026, 1, 3, 23, 5)
+
+
+def _channel_state(**overrides):
+    state = SimpleNamespace(
+        message_count=12,
+        last_message_time=NOW - timedelta(minutes=5),
+        sentiment_history=deque([0.5, -0.2, 0.9], maxlen=10),
+        recent_topics=deque(["games", "music", "games"], maxlen=10),
+    )
+    for name, value in overrides.items():
+        setattr(state, name, value)
+    return state
+
+
+def _message(content="what is https://example.com?", attachments=()):
+    return SimpleNamespace(content=content, attachments=list(attachments))
+
+
+@pytest.mark.parametrize("include_one_hot", [False, True])
+def test_pipeline_matches_state_features_vector(include_one_hot):
+    extractor = StateFeatureExtractor()
+    pipeline = build_state_pipeline(include_one_hot=include_one_hot)
+    history = [{"role": "user"}, {"role": "assistant"}, {"role": "user"}]
+    cases = [
+        (_message(attachments=[object()]), _channel_state(), history, RLAction(2)),
+        ("hello there", None, history, None),
+        (None, None, None, None),
+        ({"content": "how are you"}, _channel_state(message_count=0), [], RLAction(1)),
+    ]
+
+    for message, state, hist, action in cases:
+        expected = extractor.extract(message, state, hist, action, NOW).to_vector(
+            include_one_hot=include_one_hot
+        )
+        vector = pipeline.extract(message, state, hist, action, NOW, channel_id=7)
+
+        assert vector.dtype == np.float32
+        assert vector.shape == (len(expected),)
+        np.testing.assert_allclose(vector, expected, rtol=1e-6)
+
+
+def test_extract_vector_fills_preallocated_rows():
+    extractor = StateFeatureExtractor()
+    batch = np.zeros((2, extractor.dimensionality), dtype=np.float32)
+
+    first = extractor.extract_vector(_message(), _channel_state(), out=batch[0])
+    extractor.extract_vector("short", None, out=batch[1])
+
+    assert first.base is batch
+    assert batch[0, 8] > 0 and batch[0, 9] == 1.0
+    assert batch[1, 9] == 0.0
+    assert extractor.extract_vector("x") is extractor.pipeline.buffer
+
+
+def test_channel_aggregates_cached_until_channel_changes():
+    extractor = StateFeatureExtractor()
+    state = _channel_state()
+    sentiment_slot = extractor.pipeline.layout["channel_aggregates"][0]
+
+    first = extractor.extract_vector(_message(), state, channel_id=1).copy()
+    extractor.extract_vector(_message("other"), state, channel_id=1)
+    assert extractor.get_cache_stats()["hits"] >= 1
+
+    # Recording a message changes the stamp
+    state.sentiment_history.append(-1.0)
+    state.message_count += 1
+    updated = extractor.extract_vector(_message(), state, channel_id=1)
+    assert updated[sentiment_slot] < first[sentiment_slot]
+    assert updated[sentiment_slot] == pytest.approx((0.5 - 0.2 + 0.9 - 1.0) / 4)
+
+    # A plain message leaves the sentiment and topic windows alone
+    misses = extractor.get_cache_stats()["misses"]
+    state.message_count += 1
+    extractor.extract_vector(_message(), state, channel_id=1)
+    # extract() reads the same cache at full precision
+    features = extractor.extract(_message(), state, channel_id=1)
+    assert extractor.get_cache_stats()["misses"] == misses
+    assert features.sentiment_trend == (0.5 - 0.2 + 0.9 - 1.0) / 4
+
+    # Channels are cached independently
+    other = extractor.extract_vector(None, _channel_state(), channel_id=2)
+    assert other[sentiment_slot] == pytest.approx(first[sentiment_slot])
+
+
+def test_pipeline_cache_invalidation_and_ttl(monkeypatch):
+    calls = []
+
+    def profile(user):
+        calls.append(user)
+        return len(calls)
+
+    pipeline = FeaturePipeline(
+        [FeatureSpec("profile", profile, ("user",), scope=SCOPE_USER, ttl=60.0)],
+        sources=("user",),
+    )
+    clock = [100.0]
+    monkeypatch.setattr(
+        "services.persona.rl.feature_pipeline.time.monotonic", lambda: clock[0]
+    )
+
+    assert pipeline.extract("alice", user_id=1)[0] == 1
+    assert pipeline.extract("alice", user_id=1)[0] == 1
+    assert pipeline.extract("bob", user_id=2)[0] == 2
+    # No id to cache under
+    assert pipeline.extract("carol")[0] == 3
+
+    pipeline.invalidate(user_id=1)
+    assert pipeline.extract("alice", user_id=1)[0] == 4
+
+    clock[0] += 61.0
+    assert pipeline.extract("alice", user_id=1)[0] == 5
+    assert pipeline.get_cache_stats()["hits"] == 1
+
+
+def test_pipeline_resolves_dependencies_and_rejects_bad_graphs():
+    pipeline = FeaturePipeline(
+        [
+            FeatureSpec("doubled", lambda base: base * 2, ("base",)),
+            FeatureSpec("base", lambda x: x + 1, ("x",), width=0),
+            FeatureSpec("pair", lambda x, base: (x, base), ("x", "base"), width=2),
+        ],
+        sources=("x",),
+    )
+    assert pipeline.feature_names == ["doubled", "pair"]
+    assert pipeline.extract(3).tolist() == [8.0, 3.0, 4.0]
+
+    with pytest.raises(ValueError, match="unknown input"):
+        FeaturePipeline([FeatureSpec("a", abs, ("missing",))], sources=("x",))
+    with pytest.raises(ValueError, match="cycle"):
+        FeaturePipeline(
+            [FeatureSpec("a", abs, ("b",)), FeatureSpec("b", abs, ("a",))],
+            sources=(),
+        )
+    with pytest.raises(ValueError, match="per-message"):
+        FeaturePipeline(
+            [
+                FeatureSpec("a", abs, ("x",), width=0),
+                FeatureSpec("b", abs, ("a",), scope=SCOPE_CHANNEL),
+            ],
+            sources=("x",),
+        )
+
+
+def test_pipeline_cache_evicts_least_recently_used():
+    pipeline = FeaturePipeline(
+        [FeatureSpec("profile", len, ("user",), scope=SCOPE_USER)],
+        sources=("user",),
+        max_cache_entries=2,
+    )
+
+    pipeline.extract("a", user_id=1)
+    pipeline.extract("bb", user_id=2)
+    pipeline.extract("a", user_id=1)
+    pipeline.extract("ccc", user_id=3)
+
+    assert pipeline.get_cache_stats()["size"] == 2
+    # User 2 was least recently used
+    assert pipeline.extract("zzzz", user_id=2)[0] == 4
+    assert pipeline.extract("zzzz", user_id=3)[0] == 3
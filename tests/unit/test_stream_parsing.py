@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from providers.base import ProviderMessage
+from providers.openai_compat import OpenAICompatProvider
+from providers.streaming import (
+    NDJSONParser,
+    SSEParser,
+    StreamMetrics,
+    StreamStalledError,
+    iter_ndjson_lines,
+    iter_sse_events,
+    iter_stream_bytes,
+)
+
+
+pytestmark = pytest.mark.unit
+
+
+def test_sse_parser_handles_events_split_across_chunks() -> None:
+    stream = (
+        b'data: {"n": 1}\r\n\r\n'
+        b": keep-alive comment\n\n"
+        b'event: message\ndata: {"n": 2}\n\n'
+        b"data: [DONE]\n\n"
+    )
+    parser = SSEParser()
+    events: list[bytes] = []
+    # Feed byte-by-byte to exercise every split point
+    for i in range(len(stream)):
+        events.extend(parser.feed(stream[i : i + 1]))
+
+    assert [json.loads(e) for e in events[:2]] == [{"n": 1}, {"n": 2}]
+    assert events[2] == SSEParser.DONE
+    assert parser.flush() == []
+
+
+def test_sse_parser_joins_multiline_data_and_flushes_tail() -> None:
+    parser = SSEParser()
+    assert parser.feed(b"data: line one\ndata: line two\n\ndata: tail") == [
+        b"line one\nline two"
+    ]
+    assert parser.flush() == [b"tail"]
+
+
+def test_ndjson_parser_splits_lines_incrementally() -> None:
+    parser = NDJSONParser()
+    assert parser.feed(b'{"a": 1}\n{"b"') == [b'{"a": 1}']
+    assert parser.feed(b": 2}\n\n") == [b'{"b": 2}']
+    assert parser.feed(b'{"c": 3}') == []
+    assert parser.flush() == [b'{"c": 3}']
+
+
+class _StallingReader:
+    def __init__(self, chunks: list[bytes]) -> None:
+        self.chunks = chunks
+
+    async def readany(self) -> bytes:
+        if self.chunks:
+            return self.chunks.pop(0)
+        await asyncio.sleep(10)
+        return b""
+
+
+@pytest.mark.asyncio
+async def test_iter_stream_bytes_raises_on_stall() -> None:
+    received: list[bytes] = []
+    with pytest.raises(StreamStalledError):
+        async for chunk in iter_stream_bytes(_StallingReader([b"a", b"b"]), 0.05):
+            received.append(chunk)
+    assert received == [b"a", b"b"]
+
+
+def test_stream_metrics_reports_ttft_and_throughput() -> None:
+    metrics = StreamMetrics(started_at=0.0)
+    metrics.first_token_at = 0.25
+    metrics.tokens = 10
+    metrics.chunks = 10
+    metrics.finished_at = 1.25
+
+    summary = metrics.as_dict()
+    assert summary["ttft_ms"] == 250.0
+    assert summary["tokens_per_second"] == 10.0
+
+
+class _ChunkReader:
+    def __init__(self, chunks: list[bytes]) -> None:
+        self.chunks = list(chunks)
+
+    async def readany(self) -> bytes:
+        return self.chunks.pop(0) if self.chunks else b""
+
+
+@pytest.mark.asyncio
+async def test_event_iterators_keep_unterminated_final_event() -> None:
+    sse = [e async for e in iter_sse_events(_ChunkReader([b"data: 1\n\ndata: 2"]))]
+    lines = [e async for e in iter_ndjson_lines(_ChunkReader([b"1\n", b"2"]))]
+
+    assert sse == [b"1", b"2"]
+    assert lines == [b"1", b"2"]
+
+
+class _FakeResponse:
+    status = 200
+
+    def __init__(self, body: bytes) -> None:
+        self.content = _ChunkReader([body])
+
+    async def __aenter__(self) -> _FakeResponse:
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        return None
+
+
+class _FakeSession:
+    def __init__(self, bodies: list[bytes]) -> None:
+        self.bodies = bodies
+
+    def post(self, *args: object, **kwargs: object) -> _FakeResponse:
+        return _FakeResponse(self.bodies.pop(0))
+
+
+@pytest.mark.asyncio
+async def test_openai_compat_stream_keeps_final_usage_and_per_call_metrics():
+    delta = b'data: {"choices": [{"delta": {"content": "hi"}}]}\n\n'
+    # Usage arrives in a last event with no trailing blank line
+    usage = b'data: {"choices": [], "usage": {"completion_tokens": %d}}'
+    provider = OpenAICompatProvider(base_url="http://llm", api_key="", model="m")
+    provider._session = _FakeSession([delta + usage % 7, delta + delta + usage % 9])
+
+    async def final_response(text: str):
+        async for chunk in provider.stream_chat(
+            [ProviderMessage(role="user", content=text)]
+        ):
+            if chunk.kind == "response":
+                return chunk.response
+
+    first, second = await asyncio.gather(final_response("a"), final_response("b"))
+
+    assert first.usage.output_tokens == 7
+    assert second.usage.output_tokens == 9
+    assert first.raw["stream_metrics"]["chunks"] == 1
+    assert second.raw["stream_metrics"]["chunks"] == 2
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+
+from services.voice import streaming_tts
+from services.voice.streaming_tts import SentenceSegmenter, StreamingTTSProcessor
+
+
+pytestmark = pytest.mark.unit
+
+
+class _FakeTTS:
+    engine = "kokoro_api"
+
+    def __init__(self, delay: float = 0.05) -> None:
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self.started: list[str] = []
+
+    async def generate(self, text, output_file, speed=1.0, **kwargs):
+        self.started.append(text)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            Path(output_file).write_text(text)
+        finally:
+            self.active -= 1
+
+
+class _FakeVoiceClient:
+    """Plays each source for a fixed time on a thread, like discord.py."""
+
+    def __init__(self, play_seconds: float = 0.05) -> None:
+        self.play_seconds = play_seconds
+        self.played: list[str] = []
+        self._playing = False
+        self._stop = threading.Event()
+
+    def is_connected(self) -> bool:
+        return True
+
+    def is_playing(self) -> bool:
+        return self._playing
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def play(self, source, after=None) -> None:
+        self._playing = True
+        self._stop.clear()
+        self.played.append(source)
+
+        def run():
+            self._stop.wait(self.play_seconds)
+            self._playing = False
+            after(None)
+
+        threading.Thread(target=run, daemon=True).start()
+
+
+@pytest.fixture(autouse=True)
+def _file_sources(monkeypatch, tmp_path):
+    from config import Config
+
+    monkeypatch.setattr(Config, "TEMP_DIR", tmp_path, raising=False)
+    monkeypatch.setattr(Config, "RVC_ENABLED", False, raising=False)
+    monkeypatch.setattr(
+        streaming_tts._SynthesizedSentence,
+        "to_source",
+        lambda self: self.audio_file.read_text(),
+    )
+
+
+async def _chunks(text: str, size: int = 3):
+    for i in range(0, len(text), size):
+        await asyncio.sleep(0)
+        yield text[i : i + size]
+
+
+def test_segmenter_splits_incrementally() -> None:
+    segmenter = SentenceSegmenter()
+    text = "Version 3.5 is out! Is it good? Yes.\nNext line and a tail"
+    sentences = []
+    for ch in text:
+        sentences.extend(segmenter.feed(ch))
+    sentences.extend(segmenter.flush())
+
+    assert sentences == [
+        "Version 3.5 is out!",
+        " Is it good?",
+        " Yes.",
+        "\n",
+        "Next line and a tail",
+    ]
+    assert "".join(sentences) == text
+
+
+@pytest.mark.asyncio
+async def test_synthesis_runs_ahead_of_playback_in_order() -> None:
+    tts = _FakeTTS(delay=0.05)
+    voice = _FakeVoiceClient(play_seconds=0.05)
+    processor = StreamingTTSProcessor(tts, lookahead=2)
+    text = "One. Two. Three. Four."
+
+    full_text = await processor.process_stream(_chunks(text), voice)
+
+    assert full_text == text
+    assert [s.strip() for s in voice.played] == ["One.", "Two.", "Three.", "Four."]
+    assert tts.max_active >= 2
+    assert tts.max_active <= 3
+
+
+@pytest.mark.asyncio
+async def test_cancel_stops_playback_and_discards_queued_audio(tmp_path) -> None:
+    tts = _FakeTTS(delay=0.01)
+    voice = _FakeVoiceClient(play_seconds=5.0)
+    processor = StreamingTTSProcessor(tts, lookahead=2)
+
+    task = asyncio.create_task(
+        processor.process_stream(_chunks("First. Second. Third. Fourth."), voice)
+    )
+    while not voice.played:
+        await asyncio.sleep(0.01)
+    processor.cancel()
+    await asyncio.wait_for(task, timeout=1.0)
+
+    assert [s.strip() for s in voice.played] == ["First."]
+    assert list(tmp_path.glob("stream_tts_*")) == []
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from providers.tool_calls import ToolCallExtractor, parse_legacy_args
+from services.llm.tools import EnhancedToolSystem
+
+
+pytestmark = pytest.mark.unit
+
+
+def _feed_char_by_char(extractor: ToolCallExtractor, text: str) -> list[dict]:
+    calls = []
+    for ch in text:
+        calls.extend(extractor.feed(ch))
+    return calls + extractor.flush()
+
+
+def test_legacy_and_json_calls_found_in_one_streamed_scan() -> None:
+    text = (
+        'Let me check. TOOL: calculate(expression="(2+3)*4") then '
+        '```json\n{"name": "get_current_time", "arguments": {"timezone": "UTC"}}\n```'
+        " and tool: roll_dice(dice=2d6, count=3)"
+    )
+    calls = _feed_char_by_char(ToolCallExtractor(), text)
+
+    assert [(c["tool"], c["format"]) for c in calls] == [
+        ("calculate", "legacy"),
+        ("get_current_time", "json"),
+        ("roll_dice", "legacy"),
+    ]
+    assert calls[0]["args"] == {"expression": "(2+3)*4"}
+    assert calls[0]["full_match"] == 'TOOL: calculate(expression="(2+3)*4")'
+    assert calls[1]["args"] == {"timezone": "UTC"}
+    assert calls[2]["args"] == {"dice": "2d6", "count": 3}
+
+
+def test_call_is_reported_as_soon_as_it_closes() -> None:
+    extractor = ToolCallExtractor()
+    assert extractor.feed("TOOL: get_current_time(timezone=") == []
+    assert extractor.feed('"UTC"') == []
+    calls = extractor.feed(") and the model keeps talking")
+    assert [c["tool"] for c in calls] == ["get_current_time"]
+
+
+def test_unknown_json_and_stray_braces_do_not_hide_later_calls() -> None:
+    extractor = ToolCallExtractor(tool_names={"calculate"}, max_call_chars=64)
+    text = (
+        '{"name": "not_a_tool", "arguments": {}} '
+        "unbalanced { brace TOOL: calculate(expression=1+1)"
+    )
+    calls = extractor.feed(text) + extractor.flush()
+    assert [(c["tool"], c["args"]) for c in calls] == [
+        ("calculate", {"expression": "1+1"})
+    ]
+
+
+def test_native_tool_call_fragments_are_assembled() -> None:
+    extractor = ToolCallExtractor()
+    arguments = json.dumps({"expression": "6*7"})
+    chunks = [
+        {"choices": [{"delta": {"content": "Working "}}]},
+        {
+            "choices": [
+                {
+                    "delta": {
+                        "tool_calls": [
+                            {
+                                "index": 0,
+                                "id": "call_1",
+                                "function": {"name": "calculate", "arguments": ""},
+                            }
+                        ]
+                    }
+                }
+            ]
+        },
+    ]
+    chunks += [
+        {
+            "choices": [
+                {"delta": {"tool_calls": [{"index": 0, "function": {"arguments": piece}}]}}
+            ]
+        }
+        for piece in (arguments[:7], arguments[7:])
+    ]
+
+    calls = []
+    for chunk in chunks:
+        calls.extend(extractor.feed_delta(chunk))
+    # Complete before finish_reason arrives
+    assert calls == [
+        {
+            "tool": "calculate",
+            "args": {"expression": "6*7"},
+            "format": "native",
+            "tool_call_id": "call_1",
+        }
+    ]
+    assert extractor.feed_delta({"choices": [{"delta": {}, "finish_reason": "tool_calls"}]}) == []
+
+
+def test_parse_legacy_args_coerces_unquoted_values() -> None:
+    assert parse_legacy_args("a=1, b=2.5, c=true, d='x, y'") == {
+        "a": 1,
+        "b": 2.5,
+        "c": True,
+        "d": "x, y",
+    }
+
+
+def test_tool_system_parses_legacy_and_json_calls() -> None:
+    system = EnhancedToolSystem()
+
+    calls = system.parse_tool_calls(
+        'TOOL: calculate(expression="2+2") '
+        '{"tool": "calculate", "args": {"expression": "3*3"}}'
+    )
+
+    assert [call["args"] for call in calls] == [
+        {"expression": "2+2"},
+        {"expression": "3*3"},
+    ]
+    assert system.parse_tool_call("no calls here") is None
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from services.voice.tts import TTSService
+from services.voice.tts_cache import PhraseAudioCache, persona_prewarm_phrases
+
+
+pytestmark = pytest.mark.unit
+
+
+class _FakeEngine:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, str, float]] = []
+
+    async def generate(self, text, output_file, voice, speed):
+        self.calls.append((text, voice, speed))
+        await asyncio.sleep(0.01)
+        Path(output_file).write_bytes(f"{voice}:{speed}:{text}".encode())
+        return Path(output_file)
+
+
+def _service(cache: PhraseAudioCache) -> tuple[TTSService, _FakeEngine]:
+    service = TTSService.__new__(TTSService)
+    engine = _FakeEngine()
+    service.engine = "luxtts"
+    service.luxtts = engine
+    service.luxtts_voice = "default"
+    service.luxtts_speed = 1.0
+    service.kokoro_voice = service.supertonic_voice = service.qwen3tts_voice = ""
+    service.kokoro_speed = service.supertonic_speed = service.qwen3tts_speed = 1.0
+    service.kokoro_api = service.kokoro = service.supertonic = service.qwen3tts = None
+    service.cache = cache
+    return service, engine
+
+
+@pytest.mark.asyncio
+async def test_repeated_phrase_is_served_from_cache(tmp_path) -> None:
+    cache = PhraseAudioCache(tmp_path / "cache")
+    service, engine = _service(cache)
+
+    first = await service.generate("Welcome,  mortal.", tmp_path / "a.wav")
+    second = await service.generate("Welcome, mortal.", tmp_path / "b.wav")
+    other_voice = await service.generate(
+        "Welcome, mortal.", tmp_path / "c.wav", voice="x"
+    )
+
+    assert len(engine.calls) == 2
+    assert first.read_bytes() == second.read_bytes()
+    assert other_voice.read_bytes() != first.read_bytes()
+    assert cache.get_stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_synthesis(tmp_path) -> None:
+    service, engine = _service(PhraseAudioCache(tmp_path / "cache"))
+
+    outputs = await asyncio.gather(
+        *(service.generate("On it!", tmp_path / f"{i}.wav") for i in range(4))
+    )
+
+    assert len(engine.calls) == 1
+    assert len({p.read_bytes() for p in outputs}) == 1
+
+
+@pytest.mark.asyncio
+async def test_long_text_bypasses_cache(tmp_path) -> None:
+    cache = PhraseAudioCache(tmp_path / "cache", max_chars=10)
+    service, engine = _service(cache)
+
+    for _ in range(2):
+        await service.generate("Far too long to cache.", tmp_path / "x.wav")
+
+    assert len(engine.calls) == 2
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_lru_eviction_and_index_survive_restart(tmp_path) -> None:
+    cache_dir = tmp_path / "cache"
+    cache = PhraseAudioCache(cache_dir, max_bytes=250)
+    keys = [PhraseAudioCache.make_key("e", "v", f"phrase {i}") for i in range(3)]
+    for i, key in enumerate(keys):
+        source = tmp_path / f"{i}.wav"
+        source.write_bytes(b"x" * 100)
+        cache.store(key, source)
+        os.utime(cache.lookup(key), (1000 + i, 1000 + i))
+
+    # Third entry pushed the oldest out
+    assert cache.lookup(keys[0]) is None
+    assert cache.get_stats()["evictions"] == 1
+
+    # Touch the older survivor so it becomes most recent, then restart
+    cache.lookup(keys[1])
+    reloaded = PhraseAudioCache(cache_dir, max_bytes=150)
+
+    assert reloaded.lookup(keys[1]) is not None
+    assert reloaded.lookup(keys[2]) is None
+
+
+def test_persona_prewarm_phrases() -> None:
+    persona = SimpleNamespace(
+        character=SimpleNamespace(
+            first_message="Welcome, mortal.",
+            alternate_greetings=["How delightfully disappointing.", "x" * 300],
+            voice_and_tone={"catchphrases": ["Welcome,  mortal."]},
+        )
+    )
+
+    assert persona_prewarm_phrases(persona) == [
+        "Welcome, mortal.",
+        "How delightfully disappointing.",
+    ]
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from services.voice.audio_frontend import (
+    AudioRingBuffer,
+    PolyphaseResampler,
+    UserAudioStream,
+    convert_for_stt,
+)
+from services.voice.listener import EnhancedVoiceListener
+
+
+pytestmark = pytest.mark.unit
+
+RATE = 48000
+
+
+def _stereo_pcm(samples: np.ndarray) -> bytes:
+    pcm = np.clip(samples, -32768, 32767).astype(np.int16)
+    return np.repeat(pcm, 2).tobytes()
+
+
+def _tone(freq: float, seconds: float, amplitude: float = 8000.0) -> np.ndarray:
+    t = np.arange(int(RATE * seconds)) / RATE
+    return amplitude * np.sin(2 * np.pi * freq * t)
+
+
+def _rms(pcm: bytes) -> float:
+    samples = np.frombuffer(pcm, dtype=np.int16).astype(float)[200:]
+    return float(np.sqrt(np.mean(samples**2)))
+
+
+def _frames(samples: np.ndarray, ms: int = 20):
+    pcm = _stereo_pcm(samples)
+    step = RATE * ms // 1000 * 4
+    for i in range(0, len(pcm), step):
+        yield pcm[i : i + step]
+
+
+def test_resampler_passes_speech_band_and_rejects_aliases() -> None:
+    passband = convert_for_stt(_stereo_pcm(_tone(1000, 0.5)))
+    alias = convert_for_stt(_stereo_pcm(_tone(10000, 0.5)))
+
+    assert len(passband) == int(RATE * 0.5) // 3 * 2
+    assert _rms(passband) > 8000 / np.sqrt(2) * 0.9
+    # Naive [::3] decimation would fold this into a 6kHz tone at full level
+    assert _rms(alias) < 8000 * 0.01
+
+
+def test_resampler_is_seamless_across_chunks() -> None:
+    signal = _tone(440, 0.2) + _tone(3000, 0.2, 2000)
+    whole = PolyphaseResampler().process(signal)
+
+    chunked_resampler = PolyphaseResampler()
+    pieces = [
+        chunked_resampler.process(signal[i : i + 961])
+        for i in range(0, len(signal), 961)
+    ]
+
+    np.testing.assert_allclose(np.concatenate(pieces), whole, atol=1e-2)
+
+
+def test_ring_buffer_keeps_most_recent_samples() -> None:
+    ring = AudioRingBuffer(5)
+    ring.write(np.arange(3, dtype=np.int16))
+    ring.write(np.arange(3, 7, dtype=np.int16))
+    assert ring.read().tolist() == [2, 3, 4, 5, 6]
+    assert ring.overwritten == 2
+    ring.write(np.arange(10, 20, dtype=np.int16))
+    assert ring.read().tolist() == [15, 16, 17, 18, 19]
+
+
+def test_stream_closes_utterance_after_hangover() -> None:
+    stream = UserAudioStream(hangover=0.3, min_utterance=0.2)
+    signal = np.concatenate(
+        [np.zeros(RATE // 2), _tone(300, 0.6), np.zeros(RATE // 2)]
+    )
+
+    started = 0
+    utterances = []
+    for chunk in _frames(signal):
+        result = stream.feed(chunk)
+        started += result.speech_started
+        utterances.extend(result.utterances)
+
+    assert started == 1
+    assert len(utterances) == 1
+    seconds = len(utterances[0]) / 2 / 16000
+    # Speech plus pre-roll and a short trailing tail, not the whole hangover
+    assert 0.6 <= seconds <= 1.2
+    assert not stream.speaking
+
+
+def test_stream_force_closes_long_speech() -> None:
+    stream = UserAudioStream(max_utterance=1.0)
+    utterances = []
+    for chunk in _frames(_tone(300, 2.5)):
+        utterances.extend(stream.feed(chunk).utterances)
+
+    assert len(utterances) == 2
+    assert all(len(u) == 16000 * 2 for u in utterances)
+    assert stream.flush()
+
+
+@pytest.mark.asyncio
+async def test_listener_transcribes_submitted_utterances(tmp_path) -> None:
+    transcribed = asyncio.Event()
+    heard = []
+
+    class _STT:
+        async def transcribe_file(self, path):
+            assert path.stat().st_size > 44
+            return {"text": "hello there everyone how are you", "language": "en"}
+
+    async def on_transcription(text, language):
+        heard.append(text)
+        transcribed.set()
+
+    listener = EnhancedVoiceListener(_STT())
+    listener.active_sessions[1] = {
+        "audio_file": tmp_path / "utterance.wav",
+        "voice_client": None,
+        "loop": asyncio.get_running_loop(),
+        "utterances": asyncio.Queue(),
+        "on_transcription": on_transcription,
+        "on_bot_response_needed": None,
+    }
+    worker = asyncio.create_task(listener._transcription_worker(1))
+
+    listener.submit_utterance(1, 42, b"\x00\x01" * 16000)
+    await asyncio.wait_for(transcribed.wait(), timeout=2.0)
+    worker.cancel()
+    await asyncio.gather(worker, return_exceptions=True)
+
+    assert heard == ["hello there everyone how are you"]
@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import gc
+import threading
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from core.cancellation import CancellationToken, cancellable
+from core.persona_engine import PersonaEngine
+from core.router import Router
+from core.runtime import GestaltRuntime
+from core.schemas import Event
+from memory.local_json import LocalJsonMemoryStore
+from memory.manager import MemoryManager
+from memory.rag import RAGStore
+from memory.summary import DeterministicSummary
+from personas.loader import PersonaCatalog, PersonaDefinition
+from providers.base import LLMStreamChunk
+from providers.router import ProviderRouter
+from services.voice import streaming_tts
+from services.voice.streaming_tts import StreamingTTSProcessor
+from tools.policy import ToolPolicy
+from tools.registry import ToolRegistry
+from tools.runner import ToolRunner
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.mark.asyncio
+async def test_cancel_from_another_thread_wakes_waiters_and_callbacks() -> None:
+    token = CancellationToken()
+    loop = asyncio.get_running_loop()
+    called = asyncio.Event()
+    token.add_callback(called.set, loop=loop)
+
+    waiter = asyncio.create_task(token.wait())
+    await asyncio.sleep(0)
+    threading.Thread(target=token.cancel, args=("barge_in",)).start()
+
+    await asyncio.wait_for(waiter, timeout=1)
+    await asyncio.wait_for(called.wait(), timeout=1)
+    assert token.cancelled
+    assert token.reason == "barge_in"
+    assert token.cancel() is False
+
+
+def test_callbacks_registered_after_cancel_run_immediately() -> None:
+    token = CancellationToken()
+    token.cancel()
+    calls = []
+    token.add_callback(lambda: calls.append(1))
+    token.record("tts_syntheses", 2)
+    token.record("tts_syntheses", 0)
+
+    assert calls == [1]
+    assert token.summary()["cancelled_work"] == {"tts_syntheses": 2}
+
+
+@pytest.mark.asyncio
+async def test_cancellable_interrupts_a_pending_item() -> None:
+    closed = asyncio.Event()
+
+    async def slow_stream():
+        try:
+            yield "first"
+            await asyncio.sleep(10)
+            yield "never"
+        finally:
+            closed.set()
+
+    token = CancellationToken()
+    items = []
+
+    async def consume():
+        async for item in cancellable(slow_stream(), token):
+            items.append(item)
+
+    task = asyncio.create_task(consume())
+    await asyncio.sleep(0.01)
+    token.cancel()
+    await asyncio.wait_for(task, timeout=1)
+
+    assert items == ["first"]
+    assert closed.is_set()
+
+
+class _SlowStreamingProvider:
+    def __init__(self) -> None:
+        self.closed = False
+
+    async def chat(self, messages, tools=None, **kwargs):
+        raise AssertionError("cancelled turns must not fall back to chat()")
+
+    async def stream_chat(self, messages, tools=None, **kwargs):
+        try:
+            yield LLMStreamChunk(kind="text_delta", text="Well, ")
+            await asyncio.sleep(10)
+            yield LLMStreamChunk(kind="text_delta", text="never spoken")
+        finally:
+            self.closed = True
+
+
+def _build_runtime(tmp_path: Path, provider: Any) -> GestaltRuntime:
+    memory_manager = MemoryManager(
+        store=LocalJsonMemoryStore(root_dir=tmp_path / "memory"),
+        summary_engine=DeterministicSummary(),
+    )
+    return GestaltRuntime(
+        router=Router(default_persona_id="dagoth_ur"),
+        persona_engine=PersonaEngine(memory_manager=memory_manager),
+        provider_router=ProviderRouter(
+            default_provider_name="fake",
+            providers={"fake": provider},
+            persona_provider_map={},
+        ),
+        tool_runner=ToolRunner(registry=ToolRegistry(), policy=ToolPolicy()),
+        memory_manager=memory_manager,
+        summary_engine=DeterministicSummary(),
+        rag_store=RAGStore(),
+        personas=PersonaCatalog(
+            personas={
+                "dagoth_ur": PersonaDefinition(
+                    persona_id="dagoth_ur", display_name="Dagoth Ur"
+                )
+            }
+        ),
+        tool_policy=ToolPolicy(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_stream_event_stops_provider_stream_on_barge_in(tmp_path) -> None:
+    provider = _SlowStreamingProvider()
+    runtime = _build_runtime(tmp_path, provider)
+    token = CancellationToken()
+    token.record("tts_syntheses", 1)
+    items = []
+
+    async for item in runtime.stream_event(
+        Event(
+            type="message",
+            text="tell me a story",
+            user_id="u1",
+            room_id="r1",
+            platform="discord",
+            session_id="discord:r1",
+        ),
+        cancel_token=token,
+    ):
+        items.append(item)
+        if item.get("type") == "text_delta":
+            token.cancel("barge_in")
+
+    assert provider.closed
+    outputs = [item["output"] for item in items if item.get("type") == "output"]
+    assert outputs[0].text == "Well, "
+    metadata = outputs[1].data
+    assert metadata["cancelled"] is True
+    assert metadata["cancel_reason"] == "barge_in"
+
+    cancel_trace = next(
+        o for o in outputs if getattr(o, "trace_type", "") == "cancellation"
+    )
+    assert cancel_trace.data["stage"] == "provider_stream"
+    assert cancel_trace.data["streamed_chars"] == len("Well, ")
+    assert cancel_trace.data["cancelled_work"] == {
+        "tts_syntheses": 1,
+        "provider_streams": 1,
+    }
+
+
+class _SlowTTS:
+    engine = "kokoro"
+
+    def __init__(self) -> None:
+        self.finished = 0
+
+    async def generate(self, text, output_file, speed=1.0, **kwargs):
+        await asyncio.sleep(10)
+        self.finished += 1
+
+
+class _IdleVoiceClient:
+    def is_connected(self) -> bool:
+        return True
+
+    def is_playing(self) -> bool:
+        return False
+
+    def stop(self) -> None:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_token_cancels_pending_synthesis(monkeypatch, tmp_path) -> None:
+    from config import Config
+
+    monkeypatch.setattr(Config, "TEMP_DIR", tmp_path, raising=False)
+    monkeypatch.setattr(Config, "RVC_ENABLED", False, raising=False)
+    monkeypatch.setattr(
+        streaming_tts._SynthesizedSentence, "to_source", lambda self: None
+    )
+
+    async def text():
+        yield "One. Two. "
+        await asyncio.sleep(10)
+
+    tts = _SlowTTS()
+    processor = StreamingTTSProcessor(tts, lookahead=2)
+    token = CancellationToken()
+    task = asyncio.create_task(
+        processor.process_stream(text(), _IdleVoiceClient(), cancel_token=token)
+    )
+    await asyncio.sleep(0.02)
+    threading.Thread(target=token.cancel, args=("barge_in",)).start()
+
+    await asyncio.wait_for(task, timeout=1)
+    assert processor.cancelled
+    assert tts.finished == 0
+    assert token.cancelled_work["tts_syntheses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_voice_transcription_streams_under_the_cancel_token(tmp_path) -> None:
+    provider = _SlowStreamingProvider()
+    runtime = _build_runtime(tmp_path, provider)
+    token = CancellationToken()
+
+    task = asyncio.create_task(
+        runtime.handle_voice_transcription(
+            session_id="discord:1:2",
+            transcription="tell me a long story",
+            platform="discord",
+            room_id="1",
+            cancel_token=token,
+        )
+    )
+    await asyncio.sleep(0.05)
+    token.cancel("barge_in")
+    envelope = await asyncio.wait_for(task, timeout=1)
+
+    assert provider.closed
+    metadata = next(
+        o.data for o in envelope.outputs if getattr(o, "kind", "") == "response_metadata"
+    )
+    assert metadata["cancelled"] is True
+    assert not any(
+        getattr(o, "kind", "") == "voice_output_intent" for o in envelope.outputs
+    )
+
+
+@pytest.mark.asyncio
+async def test_speech_onset_cancels_the_guild_response_token() -> None:
+    from services.voice.listener import EnhancedVoiceListener
+
+    listener = EnhancedVoiceListener(stt_service=None)
+    listener.active_sessions[1] = {
+        "loop": asyncio.get_running_loop(),
+        "voice_client": None,
+        "response_tokens": set(),
+    }
+    token = listener.response_token(1)
+    other = listener.response_token(1)
+    assert other is not token
+
+    # Called on the voice receive thread; cancellation must not wait for the loop
+    thread = threading.Thread(target=listener.notify_speech_started, args=(1,))
+    thread.start()
+    thread.join()
+
+    assert token.cancelled and other.cancelled
+    assert token.reason == "barge_in"
+    fresh = listener.response_token(1)
+    assert fresh is not token and not fresh.cancelled
+    assert listener.response_token(2) is None
+
+    # Replies in progress stay cancellable however they hold their token
+    playing = listener.response_token(1)
+    playing.add_callback(functools.partial(lambda token: None, playing))
+    playing_id = id(playing)
+    del playing
+    gc.collect()
+    tokens = listener.active_sessions[1]["response_tokens"]
+    assert playing_id in {id(t) for t in tokens}
+
+    # Finished replies release their tokens (and callbacks)
+    for held in list(tokens):
+        listener.release_response_token(1, held)
+    assert len(tokens) == 0
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from core.runtime import GestaltRuntime
+from core.schemas import Event, EventKind
+from memory.base import MemoryNamespace
+from services.voice.streaming_stt import StreamingTranscriber, splice_window_words
+
+
+pytestmark = pytest.mark.unit
+
+SECOND = 16000 * 2
+
+
+class _ScriptedSTT:
+    def __init__(self, hypotheses: list[str], delay: float = 0.0) -> None:
+        self.hypotheses = list(hypotheses)
+        self.delay = delay
+        self.calls: list[int] = []
+
+    async def transcribe_pcm(self, pcm_data: bytes, sample_rate: int = 16000) -> dict:
+        self.calls.append(len(pcm_data))
+        await asyncio.sleep(self.delay)
+        return {"text": self.hypotheses.pop(0)}
+
+
+@pytest.mark.asyncio
+async def test_stable_text_is_the_agreed_word_prefix() -> None:
+    partials = []
+
+    async def on_partial(partial):
+        partials.append(partial)
+
+    stt = _ScriptedSTT(
+        ["what is the", "what is the weather", "What is the weather like today?"]
+    )
+    transcriber = StreamingTranscriber(stt, user_id=7, on_partial=on_partial)
+
+    for seconds in (1, 2, 3):
+        transcriber.offer(b"\x00" * SECOND * seconds)
+        await asyncio.sleep(0.01)
+
+    assert [p.stable_text for p in partials] == [
+        "",
+        "what is the",
+        "What is the weather",
+    ]
+    assert partials[-1].text == "What is the weather like today?"
+    assert partials[-1].audio_seconds == pytest.approx(3.0)
+
+
+@pytest.mark.asyncio
+async def test_offers_during_a_slow_partial_keep_only_the_latest() -> None:
+    partials = []
+
+    async def on_partial(partial):
+        partials.append(partial)
+
+    stt = _ScriptedSTT(["one", "one two three"], delay=0.05)
+    transcriber = StreamingTranscriber(stt, user_id=7, on_partial=on_partial)
+
+    transcriber.offer(b"\x00" * SECOND)
+    for seconds in (2, 3, 4):
+        transcriber.offer(b"\x00" * SECOND * seconds)
+    await asyncio.sleep(0.2)
+
+    assert stt.calls == [SECOND, SECOND * 4]
+    assert transcriber.windows_skipped == 2
+    assert [p.revision for p in partials] == [1, 2]
+
+    transcriber.reset()
+    assert transcriber.stable_text == ""
+
+
+def test_window_words_are_spliced_on_their_overlap() -> None:
+    previous = "so what is the weather like".split()
+
+    # The window starts mid-utterance and cut "what" in half
+    assert splice_window_words(previous, "at is the weather like today".split()) == (
+        "so what is the weather like today".split()
+    )
+    assert splice_window_words(previous, "the weather looks fine".split()) == (
+        "so what is the weather looks fine".split()
+    )
+    assert splice_window_words(previous, "completely new words".split()) is None
+
+
+@pytest.mark.asyncio
+async def test_sliding_window_keeps_words_before_the_window() -> None:
+    partials = []
+
+    async def on_partial(partial):
+        partials.append(partial)
+
+    stt = _ScriptedSTT(["one two three four", "three four five"])
+    transcriber = StreamingTranscriber(
+        stt, user_id=7, on_partial=on_partial, window_seconds=1.0
+    )
+
+    transcriber.offer(b"\x00" * SECOND)
+    await asyncio.sleep(0.01)
+    transcriber.offer(b"\x00" * SECOND * 2)
+    await asyncio.sleep(0.01)
+
+    assert partials[-1].text == "one two three four five"
+    assert partials[-1].stable_text == "one two three four"
+
+
+class _Persona:
+    persona_id = "test"
+    metadata: dict[str, Any] = {}
+
+
+class _Router:
+    default_persona_id = "test"
+
+    def select_persona(self, event: Any, personas: Any) -> Any:
+        return _Persona()
+
+
+class _Memory:
+    def __init__(self) -> None:
+        self.loads = 0
+
+    async def load_context(self, **kwargs: Any) -> str:
+        self.loads += 1
+        return "memory"
+
+
+class _RAG:
+    def __init__(self) -> None:
+        self.queries: list[str] = []
+
+    async def search(self, **kwargs: Any) -> list[str]:
+        self.queries.append(kwargs["query"])
+        return [kwargs["query"]]
+
+
+class _Catalog:
+    def by_id(self, persona_id: str) -> Any:
+        return _Persona()
+
+
+def _runtime() -> GestaltRuntime:
+    return GestaltRuntime(
+        router=_Router(),
+        persona_engine=None,
+        provider_router=None,
+        tool_runner=None,
+        memory_manager=_Memory(),
+        summary_engine=None,
+        rag_store=_RAG(),
+        personas=_Catalog(),
+        tool_policy=None,
+    )
+
+
+async def _final_context(runtime: GestaltRuntime, text: str):
+    event = Event(
+        type="voice_transcription",
+        kind=EventKind.VOICE_TRANSCRIPTION.value,
+        text=text,
+        platform="discord",
+        room_id="r1",
+        session_id="s1",
+    )
+    session = runtime._get_or_create_session(event)
+    context = await runtime._load_turn_context(
+        event=event,
+        session=session,
+        persona_id="test",
+        namespace=MemoryNamespace(persona_id="test", room_id="r1"),
+    )
+    return context, session.last_voice_prefetch
+
+
+@pytest.mark.asyncio
+async def test_stable_partial_prefetches_context_for_the_final_transcript() -> None:
+    runtime = _runtime()
+
+    skipped = await runtime.handle_voice_partial(
+        "s1", "what is", stable_text="what", platform="discord", room_id="r1"
+    )
+    started = await runtime.handle_voice_partial(
+        "s1",
+        "what is the weather like",
+        stable_text="what is the weather like",
+        platform="discord",
+        room_id="r1",
+        revision=2,
+    )
+    assert skipped["prefetch"] == "skipped"
+    assert started["prefetch"] == "started"
+
+    context, state = await _final_context(runtime, "What is the weather like?")
+
+    assert state == "hit"
+    assert context == ("memory", ["what is the weather like"])
+    assert runtime.memory_manager.loads == 1
+    assert runtime.rag_store.queries == ["what is the weather like"]
+
+
+@pytest.mark.asyncio
+async def test_diverging_final_transcript_only_reuses_memory() -> None:
+    runtime = _runtime()
+    await runtime.handle_voice_partial(
+        "s1", "play some music", stable_text="play some music", room_id="r1"
+    )
+
+    context, state = await _final_context(runtime, "play some jazz from the sixties")
+
+    assert state == "memory_only"
+    assert context == ("memory", ["play some jazz from the sixties"])
+    assert runtime.memory_manager.loads == 1
+
+
+@pytest.mark.asyncio
+async def test_unclaimed_prefetches_expire_after_the_ttl() -> None:
+    runtime = _runtime()
+    await runtime.handle_voice_partial(
+        "s1", "play some music", stable_text="play some music", room_id="r1"
+    )
+    abandoned = runtime.voice_prefetch["s1"]
+    abandoned.created_at -= runtime.voice_prefetch_ttl_seconds + 1
+
+    await runtime.handle_voice_partial(
+        "s2", "what is the weather", stable_text="what is the weather", room_id="r1"
+    )
+    await asyncio.sleep(0)
+
+    assert set(runtime.voice_prefetch) == {"s2"}
+    assert abandoned.task.cancelled() or abandoned.task.done()
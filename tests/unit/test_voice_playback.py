@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import threading
+import wave
+
+import numpy as np
+import pytest
+
+from services.voice import playback
+from services.voice.playback import (
+    OPUS_SILENCE,
+    PCM_FRAME_BYTES,
+    FrameSource,
+    GuildPlaybackQueue,
+    decode_wav,
+    prepare_audio,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def _wav_bytes(samples: np.ndarray, rate: int, channels: int = 1) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(samples.astype(np.int16).tobytes())
+    return buffer.getvalue()
+
+
+class _FakeEncoder:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def encode(self, pcm: bytes, frame_size: int) -> bytes:
+        assert len(pcm) == PCM_FRAME_BYTES
+        assert frame_size == 960
+        self.calls += 1
+        return b"opus%d" % self.calls
+
+
+class _FakeVoiceClient:
+    """Drains sources on a thread until they end or stop() is called."""
+
+    def __init__(self) -> None:
+        self.played: list = []
+        self._playing = False
+        self._stop = threading.Event()
+
+    def is_connected(self) -> bool:
+        return True
+
+    def is_playing(self) -> bool:
+        return self._playing
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def play(self, source, after=None) -> None:
+        self._playing = True
+        self._stop.clear()
+        self.played.append(source)
+
+        def run():
+            while not self._stop.wait(0.002):
+                if source.read() == b"":
+                    break
+            self._playing = False
+            after(None)
+
+        threading.Thread(target=run, daemon=True).start()
+
+
+def test_decode_wav_resamples_mono_to_48k_stereo() -> None:
+    tone = 8000 * np.sin(2 * np.pi * 440 * np.arange(24000) / 24000)
+    pcm = decode_wav(_wav_bytes(tone, 24000))
+
+    stereo = np.frombuffer(pcm, dtype=np.int16).reshape(-1, 2)
+    assert len(stereo) == 48000
+    assert np.array_equal(stereo[:, 0], stereo[:, 1])
+    assert np.abs(stereo[1000:-1000, 0]).max() > 7000
+
+
+def test_decode_wav_rejects_non_wav() -> None:
+    with pytest.raises(ValueError):
+        decode_wav(b"definitely not audio")
+
+
+@pytest.mark.asyncio
+async def test_prepare_audio_encodes_opus_frames_off_loop() -> None:
+    encoder = _FakeEncoder()
+    audio = _wav_bytes(np.zeros(48000 // 10 * 3), 48000)  # 300ms mono
+
+    source = await prepare_audio(audio, encoder_factory=lambda: encoder)
+    while not source.finished:
+        await asyncio.sleep(0.001)
+
+    assert source.is_opus()
+    assert source._is_tts
+    frames = []
+    while (frame := source.read()) != b"":
+        frames.append(frame)
+    assert len(frames) == 15
+    assert frames[0] == b"opus1"
+    assert source.underruns == 0
+
+
+@pytest.mark.asyncio
+async def test_prepare_audio_keeps_pcm_frames_without_opus() -> None:
+    audio = _wav_bytes(np.zeros(960), 48000)
+
+    source = await prepare_audio(audio, encoder_factory=lambda: None)
+    while not source.finished:
+        await asyncio.sleep(0.001)
+
+    assert not source.is_opus()
+    frame = source.read()
+    assert len(frame) == PCM_FRAME_BYTES
+    assert source.read() == b""
+
+
+def test_frame_source_counts_underruns() -> None:
+    source = FrameSource(opus=True)
+
+    assert source.read() == OPUS_SILENCE
+    source.feed(b"a")
+    assert source.read() == b"a"
+    source.finish()
+    assert source.read() == b""
+    assert source.underruns == 1
+    assert source.frames_played == 1
+
+
+def _finished_source(frames: int) -> FrameSource:
+    source = FrameSource(opus=True)
+    for _ in range(frames):
+        source.feed(b"x")
+    source.finish()
+    return source
+
+
+@pytest.mark.asyncio
+async def test_queue_plays_in_order() -> None:
+    voice_client = _FakeVoiceClient()
+    queue = GuildPlaybackQueue(1, voice_client)
+    first, second = _finished_source(5), _finished_source(5)
+    done: list = []
+
+    queue.enqueue(first, on_done=lambda e: done.append("first"))
+    item = queue.enqueue(second, on_done=lambda e: done.append("second"))
+    assert await asyncio.wait_for(item.done, timeout=2) is True
+
+    assert voice_client.played == [first, second]
+    assert done == ["first", "second"]
+    assert queue.get_stats()["played"] == 2
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_priority_interrupts_current_and_jumps_queue() -> None:
+    voice_client = _FakeVoiceClient()
+    queue = GuildPlaybackQueue(1, voice_client)
+    long = _finished_source(10_000)
+    queued = _finished_source(5)
+    urgent = _finished_source(5)
+
+    interrupted = queue.enqueue(long)
+    queue.enqueue(queued)
+    while not queue.owns_current_playback():
+        await asyncio.sleep(0.001)
+    queue.enqueue(urgent, priority=True)
+
+    assert await asyncio.wait_for(interrupted.done, timeout=2) is False
+    while len(voice_client.played) < 3 or voice_client.is_playing():
+        await asyncio.sleep(0.005)
+    assert voice_client.played == [long, urgent, queued]
+    assert queue.get_stats()["interrupted"] == 1
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_queue_reports_underruns() -> None:
+    voice_client = _FakeVoiceClient()
+    queue = GuildPlaybackQueue(1, voice_client)
+    source = FrameSource(opus=True)
+
+    item = queue.enqueue(source)
+    await asyncio.sleep(0.03)
+    source.feed(b"late")
+    source.finish()
+    await asyncio.wait_for(item.done, timeout=2)
+
+    assert queue.get_stats()["underruns"] == source.underruns > 0
+    await queue.close()
+
+
+def test_default_encoder_factory_tolerates_missing_libopus() -> None:
+    encoder = playback._opus_encoder_factory()
+    assert encoder is None or hasattr(encoder, "encode")
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import os
+import signal
+import time
+import wave
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from services.voice.voice_worker import VoiceWorker, VoiceWorkerPool
+
+pytestmark = [
+    pytest.mark.unit,
+    pytest.mark.skipif(not VoiceWorkerPool.supported(), reason="POSIX only"),
+]
+
+STREAM_OPTIONS = {"energy_threshold": 500, "hangover": 0.2, "max_utterance": 8.0}
+
+
+class _Events:
+    def __init__(self) -> None:
+        self.speech: list[int] = []
+        self.utterances: list[tuple[int, int, bytes]] = []
+
+    def on_speech(self, guild_id: int) -> None:
+        self.speech.append(guild_id)
+
+    def on_utterance(self, guild_id: int, user_id: int, pcm: bytes) -> None:
+        self.utterances.append((guild_id, user_id, pcm))
+
+    def on_partial(self, guild_id: int, user_id: int, pcm: bytes) -> None:
+        pass
+
+
+def _pool(events: _Events, **kwargs) -> VoiceWorkerPool:
+    return VoiceWorkerPool(
+        STREAM_OPTIONS,
+        0,
+        on_speech=events.on_speech,
+        on_utterance=events.on_utterance,
+        on_partial=events.on_partial,
+        **kwargs,
+    )
+
+
+def _discord_chunks(seconds: float, amplitude: float) -> list[bytes]:
+    """20ms chunks of 48kHz stereo PCM (a tone, or silence at amplitude 0)."""
+    t = np.arange(int(seconds * 48000)) / 48000
+    mono = (amplitude * np.sin(2 * np.pi * 300 * t)).astype(np.int16)
+    stereo = np.repeat(mono, 2).tobytes()
+    return [stereo[i : i + 3840] for i in range(0, len(stereo), 3840)]
+
+
+async def _wait_for(predicate, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_vad_and_returns_utterances() -> None:
+    events = _Events()
+    pool = _pool(events)
+    try:
+        worker = await pool.start(1)
+        assert pool.get(1) is worker
+
+        for chunk in _discord_chunks(1.0, 8000) + _discord_chunks(0.5, 0):
+            worker.feed(42, chunk)
+
+        await _wait_for(lambda: events.utterances)
+        assert events.speech == [1]
+        guild_id, user_id, pcm = events.utterances[0]
+        assert (guild_id, user_id) == (1, 42)
+        # 16kHz mono: about one second of speech plus pre-roll and tail
+        assert 0.9 < len(pcm) / 32000 < 1.6
+
+        worker.feed(42, b"".join(_discord_chunks(0.6, 8000)))
+        flushed = await worker.flush()
+        assert len(flushed) == 1
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_worker_encodes_playback_audio() -> None:
+    events = _Events()
+    pool = _pool(events)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(24000)
+        wav.writeframes(np.zeros(24000, dtype=np.int16).tobytes())
+    try:
+        worker = await pool.start(1)
+        source = await worker.prepare_audio(buffer.getvalue())
+        await _wait_for(lambda: source.finished)
+
+        assert source._is_tts
+        assert source.frames_total == 50
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_full_outbox_never_blocks_the_event_loop() -> None:
+    events = _Events()
+    worker = VoiceWorker(
+        1,
+        STREAM_OPTIONS,
+        0,
+        events.on_speech,
+        events.on_utterance,
+        events.on_partial,
+        queue_size=1,
+    )
+    # Looks alive, but nothing drains the outbox
+    worker._process = SimpleNamespace(poll=lambda: None, pid=0)
+    worker.feed(7, b"\x00" * 3840)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(24000)
+        wav.writeframes(np.zeros(2400, dtype=np.int16).tobytes())
+
+    assert await asyncio.wait_for(worker.flush(timeout=5.0), 1.0) == []
+    source = await asyncio.wait_for(worker.prepare_audio(buffer.getvalue()), 1.0)
+
+    assert source is not None
+    assert worker._jobs == {} and worker._flushes == {}
+
+
+@pytest.mark.asyncio
+async def test_pool_restarts_dead_workers_then_falls_back() -> None:
+    events = _Events()
+    pool = _pool(events, max_restarts=1, check_interval=0.05)
+    try:
+        worker = await pool.start(1)
+        os.kill(worker.pid, signal.SIGKILL)
+
+        await _wait_for(lambda: pool.restarts.get(1) == 1 and pool.get(1) is not None)
+        restarted = pool.get(1)
+        assert restarted is not worker
+
+        os.kill(restarted.pid, signal.SIGKILL)
+        await _wait_for(lambda: 1 in pool.failed)
+        assert pool.get(1) is None
+        assert await pool.start(1) is None
+    finally:
+        await pool.close()
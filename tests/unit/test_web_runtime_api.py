@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any
@@ -262,7 +263,7 @@ class _FakeRuntime:
             mutations=[_Mutation(path="session.mode", old="", new="tai_core")],
         )
 
-    async def stream_event(self, event: Any):
+    async def stream_event(self, event: Any, cancel_token: Any = None):
         if str(event.kind) != "chat":
             envelope = await self.handle_event_envelope(event)
             for output in envelope.outputs:
@@ -868,6 +869,138 @@ def test_runtime_websocket_streams_tai_transcript_deltas(
     assert complete["type"] == "request_complete"
 
 
+def test_runtime_websocket_protocol_v2_sends_appended_text_only(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client = _build_client(monkeypatch)
+    with client.websocket_connect("/api/runtime/ws") as websocket:
+        websocket.send_json(
+            {
+                "type": "connect",
+                "session_id": "web:main",
+                "persona_id": "tai",
+                "room_id": "web_room",
+                "platform": "web",
+                "mode": "",
+                "flags": {},
+                "protocol": 2,
+            }
+        )
+        connected = websocket.receive_json()
+        websocket.receive_json()
+
+        requests: list[list[dict[str, Any]]] = []
+        for _ in range(2):
+            websocket.send_json(
+                {"type": "send_event", "text": "hello from web", "kind": "chat"}
+            )
+            frames = []
+            while not frames or frames[-1]["type"] != "request_complete":
+                frames.append(websocket.receive_json())
+            requests.append(frames)
+
+    assert connected["protocol"] == 2
+    for frames in requests:
+        deltas = [f for f in frames if f["type"] == "transcript_delta"]
+        assert "".join(f["append"] for f in deltas) == "echo:hello from web"
+        assert [f["seq"] for f in deltas] == list(range(1, len(deltas) + 1))
+        assert deltas[-1]["done"] is True
+        assert deltas[-1]["length"] == len("echo:hello from web")
+        assert all("text" not in f for f in deltas)
+        assert any(f["type"] == "trace_entry" for f in frames)
+
+    # Presence is only re-sent when the snapshot changes
+    presence = [f for frames in requests for f in frames if f["type"] == "presence_update"]
+    assert len(presence) == 1
+
+
+def test_runtime_websocket_fans_out_room_frames_to_observers(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    connect = {
+        "type": "connect",
+        "session_id": "web:main",
+        "persona_id": "tai",
+        "room_id": "shared_room",
+        "platform": "web",
+        "mode": "",
+        "flags": {},
+    }
+    with _build_client(monkeypatch) as client:
+        with client.websocket_connect("/api/runtime/ws") as observer, client.websocket_connect(
+            "/api/runtime/ws"
+        ) as bystander, client.websocket_connect("/api/runtime/ws") as other_session:
+            observer.send_json({**connect, "observe": True})
+            other_session.send_json(
+                {**connect, "session_id": "web:other", "observe": True}
+            )
+            bystander.send_json(connect)
+            for websocket in (observer, bystander, other_session):
+                websocket.receive_json()
+                websocket.receive_json()
+            with client.websocket_connect("/api/runtime/ws") as speaker:
+                speaker.send_json(connect)
+                speaker.receive_json()
+                speaker.receive_json()
+                speaker.send_json(
+                    {"type": "send_event", "text": "hello from web", "kind": "chat"}
+                )
+                spoken = []
+                while not spoken or spoken[-1]["type"] != "request_complete":
+                    spoken.append(speaker.receive_json())
+
+            observed = [observer.receive_json() for _ in range(len(spoken))]
+
+            # Neither a non-observer in the room nor an observer of another
+            # session got room frames: their next frame answers their own ping
+            for websocket in (bystander, other_session):
+                websocket.send_json({"type": "ping"})
+                assert websocket.receive_json()["type"] == "request_error"
+
+    assert observed == spoken
+    assert observed[-1]["type"] == "request_complete"
+
+
+def test_runtime_websocket_cancel_frame_cancels_in_flight_request(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    class _SlowRuntime(_FakeRuntime):
+        async def stream_event(self, event: Any, cancel_token: Any = None):
+            yield {
+                "type": "text_delta",
+                "text": "thinking",
+                "aggregate_text": "thinking",
+                "persona_id": "alpha",
+            }
+            while not cancel_token.cancelled:
+                await asyncio.sleep(0.01)
+            yield {
+                "type": "output",
+                "output": _TextOutput(text=cancel_token.reason, persona_id="alpha"),
+                "event_id": "evt-1",
+            }
+
+    monkeypatch.setattr(web_adapter, "create_runtime", lambda: _SlowRuntime())
+    adapter = web_adapter.WebInputAdapter()
+    assert adapter._app is not None
+    client = TestClient(adapter._app)
+
+    with client.websocket_connect("/api/runtime/ws") as websocket:
+        websocket.send_json({"type": "connect", "session_id": "web:main"})
+        websocket.receive_json()
+        websocket.receive_json()
+        websocket.send_json({"type": "send_event", "text": "hi", "kind": "chat"})
+        assert websocket.receive_json()["type"] == "transcript_delta"
+
+        websocket.send_json({"type": "cancel"})
+        frames = []
+        while not frames or frames[-1]["type"] != "request_complete":
+            frames.append(websocket.receive_json())
+
+    finals = [f for f in frames if f["type"] == "transcript_delta" and f["done"]]
+    assert finals[-1]["text"] == "client_cancel"
+
+
 def test_runtime_websocket_forwards_vrm_structured_outputs(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
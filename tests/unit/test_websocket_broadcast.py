@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+import pytest
+
+from adapters.web import broadcast as broadcast_module
+from adapters.web.broadcast import BroadcastHub
+
+
+pytestmark = pytest.mark.unit
+
+
+class _Socket:
+    def __init__(self, stuck: bool = False) -> None:
+        self.stuck = stuck
+        self.received: list[Any] = []
+        self.closed_with: int | None = None
+
+    async def send_text(self, text: str) -> None:
+        if self.stuck:
+            await asyncio.sleep(10)
+        self.received.append(json.loads(text))
+
+    async def close(self, code: int = 1000) -> None:
+        self.closed_with = code
+
+
+async def _drain(hub: BroadcastHub) -> None:
+    for _ in range(50):
+        if hub.get_stats()["queue_depth"]["total"] == 0:
+            return
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_each_event_is_encoded_once_for_all_observers(monkeypatch) -> None:
+    encodes = 0
+    real_encode = broadcast_module.encode_frame
+
+    def counting_encode(payload):
+        nonlocal encodes
+        encodes += 1
+        return real_encode(payload)
+
+    monkeypatch.setattr(broadcast_module, "encode_frame", counting_encode)
+    hub = BroadcastHub()
+    sockets = [_Socket() for _ in range(500)]
+    subscribers = [hub.subscribe("web:room:v1", s) for s in sockets]
+    speaker = subscribers[0]
+
+    for n in range(3):
+        assert hub.publish("web:room:v1", {"type": "transcript_delta", "n": n}, exclude=speaker) == 499
+    await _drain(hub)
+
+    assert encodes == 3
+    assert sockets[0].received == []
+    assert [f["n"] for f in sockets[1].received] == [0, 1, 2]
+    stats = hub.get_stats()
+    assert stats["frames_delivered"] == 3 * 499
+    assert stats["fanout_latency"]["max_ms"] >= 0.0
+    for subscriber in subscribers:
+        await hub.remove(subscriber)
+    assert hub.get_stats()["subscribers"] == 0
+
+
+@pytest.mark.asyncio
+async def test_stuck_subscriber_is_evicted_without_blocking_others() -> None:
+    hub = BroadcastHub(max_queue=4, send_timeout=0.01, evict_after=0.05)
+    healthy, stuck = _Socket(), _Socket(stuck=True)
+    hub.subscribe("room", healthy)
+    hub.subscribe("room", stuck)
+
+    for n in range(10):
+        hub.publish("room", {"type": "presence_update", "n": n})
+        await asyncio.sleep(0.02)
+    await asyncio.sleep(0.05)
+
+    stats = hub.get_stats()
+    assert stats["evictions"] == 1
+    assert stats["subscribers"] == 1
+    assert stuck.closed_with == 1013
+    assert [f["n"] for f in healthy.received] == list(range(10))
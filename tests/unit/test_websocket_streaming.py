@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from adapters.web.streaming import (
+    PROTOCOL_V1,
+    PROTOCOL_V2,
+    WebSocketSender,
+    negotiate_protocol,
+)
+
+
+pytestmark = pytest.mark.unit
+
+
+class _SlowSocket:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.sent: list[dict[str, Any]] = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def send_json(self, payload: dict[str, Any]) -> None:
+        await self.gate.wait()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.sent.append(payload)
+
+
+def test_protocol_negotiation_defaults_to_v1() -> None:
+    assert negotiate_protocol(None) == PROTOCOL_V1
+    assert negotiate_protocol("2") == PROTOCOL_V2
+    assert negotiate_protocol(9) == PROTOCOL_V2
+    assert negotiate_protocol("bogus") == PROTOCOL_V1
+
+
+@pytest.mark.asyncio
+async def test_deltas_are_coalesced_within_flush_interval() -> None:
+    socket = _SlowSocket()
+    sender = WebSocketSender(socket, flush_interval=0.05).start()
+    stream = sender.transcript("e:stream", lane="TAI")
+
+    text = ""
+    for token in ["Hel", "lo", ", ", "wor", "ld"]:
+        text += token
+        stream.push(token, text)
+        sender.flush_transcript(stream)
+        await asyncio.sleep(0.005)
+    stream.finish(text + "!")
+    sender.flush_transcript(stream)
+    await sender.send_json({"type": "request_complete"})
+    await sender.close()
+
+    deltas = [f for f in socket.sent if f["type"] == "transcript_delta"]
+    assert len(deltas) <= 2
+    assert "".join(f["append"] for f in deltas) == "Hello, world!"
+    assert deltas[-1]["done"] is True
+    assert socket.sent[-1]["type"] == "request_complete"
+
+
+@pytest.mark.asyncio
+async def test_rewritten_text_and_periodic_frames_carry_checkpoints() -> None:
+    socket = _SlowSocket()
+    sender = WebSocketSender(socket, flush_interval=0, checkpoint_every=2).start()
+    stream = sender.transcript("e:stream")
+
+    for token in ["a", "b", "c"]:
+        stream.push(token)
+        sender.flush_transcript(stream)
+        await asyncio.sleep(0.01)
+    stream.finish("rewritten")
+    sender.flush_transcript(stream)
+    await sender.close()
+
+    frames = socket.sent
+    assert [f["append"] for f in frames[:3]] == ["a", "b", "c"]
+    assert "text" not in frames[0]
+    assert frames[1]["checkpoint"] is True and frames[1]["text"] == "ab"
+    assert frames[-1]["text"] == "rewritten"
+    assert frames[-1]["append"] == ""
+    assert frames[-1]["done"] is True
+
+
+@pytest.mark.asyncio
+async def test_slow_client_queue_stays_bounded() -> None:
+    socket = _SlowSocket()
+    socket.gate.clear()
+    sender = WebSocketSender(socket, max_queue=4, flush_interval=0).start()
+    stream = sender.transcript("e:stream")
+
+    for i in range(50):
+        stream.push("x")
+        sender.flush_transcript(stream)
+        await sender.send_json({"type": "trace_entry", "span": {"n": i}})
+        await sender.send_json({"type": "presence_update", "snapshot": {"n": i}})
+    assert sender.get_stats()["queue_depth"] <= 4
+
+    socket.gate.set()
+    stream.finish()
+    sender.flush_transcript(stream)
+    await sender.send_json({"type": "request_complete"})
+    await sender.close()
+
+    stats = sender.get_stats()
+    assert stats["frames_dropped"] > 0
+    assert stats["frames_merged"] > 0
+    deltas = [f for f in socket.sent if f["type"] == "transcript_delta"]
+    assert "".join(f["append"] for f in deltas) == "x" * 50
+    presence = [f for f in socket.sent if f["type"] == "presence_update"]
+    assert presence[-1]["snapshot"] == {"n": 49}
+    assert socket.sent[-1]["type"] == "request_complete"
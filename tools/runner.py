@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timezone
 import json
 from time import perf_counter
@@ -163,6 +164,88 @@ class ToolRunner:
         return payload if isinstance(payload, dict) else None
 
 
+class StreamingToolDispatch:
+    """Starts tool calls while the provider is still streaming its response.
+
+    ``start`` runs each call that needs no operator approval as soon as the
+    provider reports it complete, up to the per-turn cap. ``execute`` then
+    takes the authoritative call list from the final response and returns
+    the same results and traces as ``ToolRunner.execute_with_trace``,
+    awaiting early calls and running the rest. Early calls the final
+    response does not contain are cancelled.
+    """
+
+    def __init__(
+        self,
+        runner: ToolRunner,
+        persona_id: str,
+        environment: str,
+        yolo_enabled: bool = False,
+    ) -> None:
+        self.runner = runner
+        self.persona_id = persona_id
+        self.environment = environment
+        self.yolo_enabled = yolo_enabled
+        self._started: list[tuple[ToolCall, asyncio.Task]] = []
+
+    @property
+    def started(self) -> int:
+        return len(self._started)
+
+    def start(self, call: ToolCall) -> bool:
+        """Start ``call`` now if policy allows; returns whether it started."""
+        policy = self.runner.policy
+        if len(self._started) >= policy.max_tool_calls_per_turn:
+            return False
+        if policy.requires_approval(call.name, yolo_enabled=self.yolo_enabled):
+            return False
+        task = asyncio.create_task(self._run([call]))
+        self._started.append((call, task))
+        return True
+
+    async def execute(
+        self, tool_calls: list[ToolCall]
+    ) -> tuple[list[ToolResult], list[dict[str, Any]]]:
+        pending, self._started = self._started, []
+        results: list[ToolResult] = []
+        traces: list[dict[str, Any]] = []
+        try:
+            for call in tool_calls[: self.runner.policy.max_tool_calls_per_turn]:
+                index = next(
+                    (
+                        i
+                        for i, (early, _) in enumerate(pending)
+                        if early.name == call.name and early.arguments == call.arguments
+                    ),
+                    None,
+                )
+                if index is None:
+                    call_results, call_traces = await self._run([call])
+                else:
+                    call_results, call_traces = await pending.pop(index)[1]
+                results.extend(call_results)
+                traces.extend(call_traces)
+        finally:
+            for _, task in pending:
+                task.cancel()
+        return results, traces
+
+    def cancel(self) -> None:
+        """Cancel every early call, e.g. when the turn is abandoned."""
+        for _, task in self._started:
+            task.cancel()
+        self._started = []
+
+    async def _run(
+        self, tool_calls: list[ToolCall]
+    ) -> tuple[list[ToolResult], list[dict[str, Any]]]:
+        return await self.runner.execute_with_trace(
+            persona_id=self.persona_id,
+            environment=self.environment,
+            tool_calls=tool_calls,
+        )
+
+
 async def tool_current_time(_: dict[str, Any]) -> str:
     return datetime.now(timezone.utc).isoformat()
 